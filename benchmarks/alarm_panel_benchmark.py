@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""Benchmark arming many alarm panels at once while other threads read them."""
+
+import asyncio
+import logging
+import argparse
+from time import perf_counter
+from threading import Event, Thread
+
+from pyadtpulse.alarm_panel import ADT_ALARM_OFF, ADTPulseAlarmPanel
+from pyadtpulse.pulse_metrics import PulseHistogram
+from pyadtpulse.pulse_simulator import PulseSimulator, PulseSimulatorTransport
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+
+USERNAME = "panels@example.com"
+PASSWORD = "simulated_password"
+FINGERPRINT = "simulated_fingerprint"
+LATENCY_BUCKETS = (0.0001, 0.001, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def handle_args() -> argparse.Namespace:
+    """Handle program arguments."""
+    parser = argparse.ArgumentParser(description="ADT Pulse alarm panel benchmark")
+    parser.add_argument("--panels", type=int, default=50, help="number of sites")
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="simulated server latency"
+    )
+    parser.add_argument(
+        "--readers", type=int, default=4, help="threads reading panel status"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=5, help="times to arm and disarm every panel"
+    )
+    parser.add_argument("--debug", action="store_true", help="enable debug logging")
+    return parser.parse_args()
+
+
+def print_histogram(name: str, histogram: PulseHistogram) -> None:
+    """Print a latency histogram summary."""
+    if histogram.count == 0:
+        print(f"{name}: no samples")
+        return
+    print(
+        f"{name}: n={histogram.count} "
+        f"mean={histogram.sum / histogram.count * 1000:.2f}ms "
+        f"p99<={histogram.percentile(99) * 1000:.1f}ms "
+        f"max={histogram.max * 1000:.1f}ms"
+    )
+
+
+def read_panels(
+    panels: list[ADTPulseAlarmPanel], stop: Event, histogram: PulseHistogram
+) -> None:
+    """Read every panel's status until stopped, timing each read."""
+    while not stop.is_set():
+        for panel in panels:
+            start = perf_counter()
+            _ = panel.status, panel.is_disarmed, panel.last_update
+            histogram.observe(perf_counter() - start)
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    """Run the benchmark."""
+    arm_latency = PulseHistogram(LATENCY_BUCKETS)
+    round_time = PulseHistogram(LATENCY_BUCKETS)
+    read_histograms: list[PulseHistogram] = []
+    async with PulseSimulator(latency=args.latency) as simulator:
+        simulator.add_account(USERNAME, PASSWORD, zone_count=1)
+        for _ in range(args.panels - 1):
+            simulator.add_site(USERNAME, zone_count=1)
+        transport = PulseSimulatorTransport(simulator.base_url)
+        client = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=transport)
+        start = perf_counter()
+        await client.async_login()
+        print(f"logged in {len(client.sites)} sites in {perf_counter() - start:.2f}s")
+        panels = [site.alarm_control_panel for site in client.sites]
+
+        async def timed(coro) -> bool:
+            start = perf_counter()
+            result = await coro
+            arm_latency.observe(perf_counter() - start)
+            return result
+
+        stop = Event()
+        readers = []
+        for i in range(args.readers):
+            # one histogram per thread, they aren't thread safe
+            histogram = PulseHistogram(LATENCY_BUCKETS)
+            read_histograms.append(histogram)
+            reader = Thread(
+                target=read_panels,
+                args=(panels, stop, histogram),
+                name=f"Panel reader {i}",
+            )
+            reader.start()
+            readers.append(reader)
+        failed = 0
+        for _ in range(args.rounds):
+            for arm in (True, False):
+                start = perf_counter()
+                results = await asyncio.gather(
+                    *(
+                        timed(site.async_arm_away() if arm else site.async_disarm())
+                        for site in client.sites
+                    )
+                )
+                round_time.observe(perf_counter() - start)
+                failed += results.count(False)
+            # panels stay disarming until Pulse next reports their status
+            for panel in panels:
+                panel.status = ADT_ALARM_OFF
+        stop.set()
+        for reader in readers:
+            await asyncio.to_thread(reader.join)
+        await client.async_logout()
+        await transport.close()
+    reads = PulseHistogram(LATENCY_BUCKETS)
+    for histogram in read_histograms:
+        reads.merge(histogram)
+    print_histogram("arm/disarm latency", arm_latency)
+    print_histogram("round time", round_time)
+    if args.latency:
+        print(
+            f"rounds take {round_time.sum / round_time.count / args.latency:.1f}x "
+            f"the server latency, arming one panel at a time takes {args.panels}x"
+        )
+    print_histogram("status read latency", reads)
+    print(f"failed arm/disarm requests: {failed}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = handle_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""Benchmark the time taken to import pyadtpulse, using python -X importtime."""
+
+import sys
+import argparse
+import subprocess
+
+# cumulative import time budgets, in milliseconds, best of --runs.  Most of the
+# async import is typeguard recompiling a module for every @typechecked function.
+IMPORT_BUDGETS = {
+    "pyadtpulse": 25.0,
+    "pyadtpulse.pyadtpulse_async": 2000.0,
+}
+# modules each import must not load
+FORBIDDEN_IMPORTS = {
+    "pyadtpulse": (
+        "aiohttp",
+        "aiohttp_fast_zlib",
+        "lxml",
+        "pyadtpulse.pyadtpulse_async",
+        "pyadtpulse.pyadtpulse_sync",
+        "uvloop",
+    ),
+    "pyadtpulse.pyadtpulse_async": (
+        "aiohttp.web",
+        "aiohttp_fast_zlib",
+        "pyadtpulse.pulse_recorder",
+        "pyadtpulse.pulse_replay",
+        "pyadtpulse.pulse_simulator",
+        "pyadtpulse.pyadtpulse_sync",
+        "uvloop",
+    ),
+}
+
+
+def handle_args() -> argparse.Namespace:
+    """Handle program arguments."""
+    parser = argparse.ArgumentParser(description="pyadtpulse import time benchmark")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="imports of each module to time"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="slowest imported modules to show"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with an error if a budget is exceeded or a forbidden module "
+        "is imported",
+    )
+    return parser.parse_args()
+
+
+def parse_importtime(output: str) -> dict[str, tuple[int, int]]:
+    """
+    Parse -X importtime output.
+
+    Returns:
+        dict[str, tuple[int, int]]: self and cumulative microseconds of each
+            imported module
+
+    """
+    times: dict[str, tuple[int, int]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # the header line
+            continue
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+def time_import(module: str) -> dict[str, tuple[int, int]]:
+    """Import a module in a new interpreter and return its -X importtime times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = handle_args()
+    failures: list[str] = []
+    for module, budget in IMPORT_BUDGETS.items():
+        runs = [time_import(module) for _ in range(args.runs)]
+        best = min(runs, key=lambda times: times[module][1])
+        cumulative = best[module][1] / 1000
+        print(f"import {module}: {cumulative:.1f}ms (budget {budget:.0f}ms)")
+        slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_time, _) in slowest[: args.top]:
+            print(f"  {self_time / 1000:8.1f}ms  {name}")
+        if cumulative > budget:
+            failures.append(f"import {module} took {cumulative:.1f}ms > {budget}ms")
+        failures.extend(
+            f"import {module} imported {forbidden}"
+            for forbidden in FORBIDDEN_IMPORTS.get(module, ())
+            if forbidden in best
+        )
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
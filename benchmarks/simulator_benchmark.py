@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""End to end benchmark of PyADTPulseAsync against the Pulse simulator."""
+
+import asyncio
+import logging
+import argparse
+from time import perf_counter, process_time
+
+from pyadtpulse.pulse_metrics import PulseHistogram
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_account_manager import PulseAccountManager
+
+PASSWORD = "simulated_password"
+FINGERPRINT = "simulated_fingerprint"
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def handle_args() -> argparse.Namespace:
+    """Handle program arguments."""
+    parser = argparse.ArgumentParser(description="ADT Pulse simulator benchmark")
+    parser.add_argument("--accounts", type=int, default=10, help="number of clients")
+    parser.add_argument(
+        "--events", type=int, default=50, help="number of zone events to simulate"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.5, help="seconds between events"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.5,
+        help="client sync check poll interval in seconds",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="simulated server latency"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument(
+        "--manager",
+        action="store_true",
+        help="run the clients with a PulseAccountManager",
+    )
+    parser.add_argument(
+        "--login-interval",
+        type=float,
+        default=0.0,
+        help="seconds between manager logins",
+    )
+    parser.add_argument("--debug", action="store_true", help="enable debug logging")
+    return parser.parse_args()
+
+
+def print_histogram(name: str, histogram: PulseHistogram) -> None:
+    """Print a latency histogram summary."""
+    if histogram.count == 0:
+        print(f"{name}: no samples")
+        return
+    print(
+        f"{name}: n={histogram.count} "
+        f"mean={histogram.sum / histogram.count * 1000:.1f}ms "
+        f"p50<={histogram.percentile(50) * 1000:.0f}ms "
+        f"p99<={histogram.percentile(99) * 1000:.0f}ms "
+        f"max={histogram.max * 1000:.1f}ms"
+    )
+
+
+async def wait_for_updates(
+    client: PyADTPulseAsync,
+    event_times: dict[tuple[str, int], float],
+    username: str,
+    histogram: PulseHistogram,
+) -> None:
+    """Record the time between each event and the client seeing it."""
+    while True:
+        _, zones = await client.wait_for_update()
+        now = perf_counter()
+        for zone in zones:
+            start = event_times.pop((username, zone), None)
+            if start is not None:
+                histogram.observe(now - start)
+
+
+ClientList = list[tuple[str, PyADTPulseAsync, PulseSimulatorTransport]]
+
+
+async def login_clients(
+    args: argparse.Namespace,
+    simulator: PulseSimulator,
+    usernames: list[str],
+    login_latency: PulseHistogram,
+) -> tuple[PulseAccountManager | None, ClientList]:
+    """Create and log in a client for each username."""
+    manager = (
+        PulseAccountManager(login_interval=args.login_interval)
+        if args.manager
+        else None
+    )
+    clients: ClientList = []
+    for username in usernames:
+        transport = PulseSimulatorTransport(simulator.base_url)
+        if manager is not None:
+            client = manager.add_account(username, PASSWORD, FINGERPRINT, transport)
+        else:
+            client = PyADTPulseAsync(
+                username, PASSWORD, FINGERPRINT, transport=transport
+            )
+        clients.append((username, client, transport))
+
+    async def login(client: PyADTPulseAsync) -> None:
+        start = perf_counter()
+        await client.async_login()
+        login_latency.observe(perf_counter() - start)
+
+    if manager is not None:
+        failed = await manager.wait_for_logins()
+        if failed:
+            print(f"{len(failed)} logins failed")
+    else:
+        await asyncio.gather(*(login(client) for _, client, _ in clients))
+    for _, client, _ in clients:
+        client.site.gateway.poll_interval = args.poll_interval
+    return manager, clients
+
+
+async def logout_clients(
+    manager: PulseAccountManager | None, clients: ClientList
+) -> None:
+    """Log out the clients."""
+    if manager is not None:
+        await manager.close()
+        return
+    for _, client, transport in clients:
+        await client.async_logout()
+        await transport.close()
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    """Run the benchmark."""
+    login_latency = PulseHistogram(LATENCY_BUCKETS)
+    update_latency = PulseHistogram(LATENCY_BUCKETS)
+    event_times: dict[tuple[str, int], float] = {}
+    async with PulseSimulator(latency=args.latency) as simulator:
+        usernames = [f"user{i}@example.com" for i in range(args.accounts)]
+        for username in usernames:
+            simulator.add_account(username, PASSWORD)
+        start = perf_counter()
+        manager, clients = await login_clients(
+            args, simulator, usernames, login_latency
+        )
+        print(f"logged in {len(clients)} clients in {perf_counter() - start:.2f}s")
+        waiters = [
+            asyncio.create_task(
+                wait_for_updates(client, event_times, username, update_latency)
+            )
+            for username, client, _ in clients
+        ]
+        events = PulseSimulator.generate_events(
+            usernames, args.events, args.interval, seed=args.seed
+        )
+        requests_before = simulator.requests_total
+        start = perf_counter()
+        cpu_start = process_time()
+        for event in events:
+            await asyncio.sleep(event.delay)
+            event_times[(event.username, event.zone_id or 0)] = perf_counter()
+            simulator.apply_event(event)
+        # give clients time to see the last event
+        await asyncio.sleep(2 * args.poll_interval + 1)
+        elapsed = perf_counter() - start
+        cpu = process_time() - cpu_start
+        requests = simulator.requests_total - requests_before
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await logout_clients(manager, clients)
+    print_histogram("login latency", login_latency)
+    print_histogram("update latency", update_latency)
+    print(f"missed events: {len(event_times)}")
+    print(f"request rate: {requests / elapsed:.1f} requests/s over {elapsed:.1f}s")
+    print(
+        f"cpu: {cpu:.2f}s, {cpu / elapsed * 100:.1f}% of a core "
+        "(includes the simulator)"
+    )
+    for uri, count in sorted(simulator.request_counts.items()):
+        print(f"  {uri}: {count}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = handle_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,17 @@
 """ADT Alarm Panel Dataclass."""
 
 import re
+import asyncio
 import logging
 from time import time
-from asyncio import run_coroutine_threadsafe
 from threading import RLock
-from dataclasses import dataclass
+from dataclasses import field, dataclass
 
 from lxml import html
 from typeguard import typechecked
 
-from .util import make_etree
 from .const import ADT_ARM_DISARM_URI
+from .pulse_events import PulseEventSink, AlarmStateChanged
 from .pulse_connection import PulseConnection
 
 LOG = logging.getLogger(__name__)
@@ -53,8 +53,19 @@ class ADTPulseAlarmPanel:
     manufacturer: str = "ADT"
     online: bool = True
     _is_force_armed: bool = False
-    _state_lock = RLock()
-    _last_arm_disarm: int = int(time())
+    _last_arm_disarm: int = field(default_factory=lambda: int(time()))
+    event_sink: PulseEventSink | None = field(default=None, repr=False, compare=False)
+    # site to arm or disarm, for accounts with several sites
+    network_id: str = field(default="", repr=False, compare=False)
+    # created for each panel, so sites don't contend for one lock
+    _state_lock: RLock = field(
+        default_factory=RLock, init=False, repr=False, compare=False
+    )
+    # serializes arm and disarm requests, held across the request rather
+    # than _state_lock so status reads aren't blocked meanwhile
+    _arm_lock: asyncio.Lock = field(
+        default_factory=asyncio.Lock, init=False, repr=False, compare=False
+    )
 
     @property
     def status(self) -> str:
@@ -80,7 +91,20 @@ class ADTPulseAlarmPanel:
         with self._state_lock:
             if new_status not in ALARM_STATUSES:
                 raise ValueError(f"Alarm status must be one of {ALARM_STATUSES}")
+            old_status = self._status
             self._status = new_status
+        self._notify_status_change(old_status, new_status)
+
+    def _notify_status_change(self, old_status: str, new_status: str) -> None:
+        """
+        Send an AlarmStateChanged event to the event sink if status changed.
+
+        Called without _state_lock held, so event sinks can read the panel.
+        """
+        if self.event_sink is not None and old_status != new_status:
+            self.event_sink(
+                AlarmStateChanged(old_status=old_status, new_status=new_status)
+            )
 
     @property
     def is_away(self) -> bool:
@@ -195,43 +219,48 @@ class ADTPulseAlarmPanel:
 
         """
         LOG.debug("Setting ADT alarm %s to %s, force = %s", self._sat, mode, force_arm)
-        with self._state_lock:
-            if self._status == mode:
+        async with self._arm_lock:
+            with self._state_lock:
+                status = self._status
+                sat = self._sat
+            if status == mode:
                 LOG.warning(
                     "Attempting to set alarm status %s to existing status %s",
                     mode,
-                    self._status,
+                    status,
                 )
-            if ADT_ALARM_OFF not in (self._status, mode):
-                LOG.warning("Cannot set alarm status from %s to %s", self._status, mode)
+            if ADT_ALARM_OFF not in (status, mode):
+                LOG.warning("Cannot set alarm status from %s to %s", status, mode)
                 return False
             params = {
                 "href": "rest/adt/ui/client/security/setArmState",
-                "armstate": self._status,  # existing state
+                "armstate": status,  # existing state
                 "arm": mode,  # new state
-                "sat": self._sat,
+                "sat": sat,
             }
             if force_arm and mode != ADT_ALARM_OFF:
                 params = {
                     "href": "rest/adt/ui/client/security/setForceArm",
                     "armstate": "forcearm",  # existing state
                     "arm": mode,  # new state
-                    "sat": self._sat,
+                    "sat": sat,
                 }
+            if self.network_id:
+                params["networkid"] = self.network_id
 
             response = await connection.async_query(
                 ADT_ARM_DISARM_URI,
                 method="POST",
                 extra_params=params,
-                timeout=10,
             )
 
-            tree = make_etree(
+            tree = connection.make_etree(
+                ADT_ARM_DISARM_URI,
                 response[0],
                 response[1],
                 response[2],
                 logging.WARNING,
-                f"Failed updating ADT Pulse alarm {self._sat} to {mode}",
+                f"Failed updating ADT Pulse alarm {sat} to {mode}",
             )
             if tree is None:
                 return False
@@ -250,12 +279,16 @@ class ADTPulseAlarmPanel:
                         "Could not set alarm state to %s because %s", mode, error_text
                     )
                     return False
-        self._is_force_armed = force_arm
-        if mode == ADT_ALARM_OFF:
-            self._status = ADT_ALARM_DISARMING
-        else:
-            self._status = ADT_ALARM_ARMING
-        self._last_arm_disarm = int(time())
+            with self._state_lock:
+                self._is_force_armed = force_arm
+                old_status = self._status
+                if mode == ADT_ALARM_OFF:
+                    self._status = ADT_ALARM_DISARMING
+                else:
+                    self._status = ADT_ALARM_ARMING
+                self._last_arm_disarm = int(time())
+                new_status = self._status
+            self._notify_status_change(old_status, new_status)
         return True
 
     @typechecked
@@ -266,7 +299,7 @@ class ADTPulseAlarmPanel:
         force_arm: bool = False,
     ) -> bool:
         coro = self._arm(connection, mode, force_arm)
-        return run_coroutine_threadsafe(
+        return asyncio.run_coroutine_threadsafe(
             coro,
             connection.check_sync(
                 "Attempting to sync change alarm mode from async session"
@@ -408,6 +441,7 @@ class ADTPulseAlarmPanel:
         )
         sat_location = "security_button_0"
         with self._state_lock:
+            old_status = self._status
             status_found = False
             last_updated = int(time())
             if value is not None:
@@ -433,8 +467,12 @@ class ADTPulseAlarmPanel:
                     LOG.warning("Failed to get alarm status from '%s'", text)
                 self._status = ADT_ALARM_UNKNOWN
                 self._last_arm_disarm = last_updated
-                return
-            LOG.debug("Alarm status = %s", self._status)
+            new_status = self._status
+        self._notify_status_change(old_status, new_status)
+        if not status_found:
+            return
+        LOG.debug("Alarm status = %s", new_status)
+        with self._state_lock:
             sat_string = f'.//input[@id="{sat_location}"]'
             sat_button = summary_html_etree.find(
                 path=sat_string,
@@ -13,9 +13,23 @@ def compute_retry_time(retry_time: float | None) -> str:
     return str(datetime.datetime.fromtimestamp(retry_time))
 
 
+def _restore_exception(
+    cls: type[Exception], args: tuple, state: dict[str, object]
+) -> Exception:
+    """Recreate a pickled exception without calling its __init__."""
+    exception = cls.__new__(cls)
+    exception.args = args
+    exception.__dict__.update(state)
+    return exception
+
+
 class PulseExceptionWithBackoff(Exception):
     """Exception with backoff."""
 
+    def __reduce__(self):
+        """Pickle without calling __init__, which would increment the backoff."""
+        return (_restore_exception, (type(self), self.args, self.__dict__))
+
     def __init__(self, message: str, backoff: PulseBackoff):
         """Initialize exception."""
         super().__init__(message)
@@ -102,6 +116,10 @@ class PulseLoginException(Exception):
     Base class for catching all login exceptions.
     """
 
+    def __reduce__(self):
+        """Pickle without calling __init__, whose arguments aren't the args."""
+        return (_restore_exception, (type(self), self.args, self.__dict__))
+
 
 class PulseAuthenticationError(PulseLoginException):
     """Authentication error."""
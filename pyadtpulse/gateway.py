@@ -5,12 +5,13 @@ import logging
 from typing import Any
 from ipaddress import IPv4Address, IPv6Address, ip_address
 from threading import RLock
-from dataclasses import dataclass
+from dataclasses import field, dataclass
 
 from typeguard import typechecked
 
 from .util import parse_pulse_datetime
 from .const import ADT_DEFAULT_POLL_INTERVAL, ADT_GATEWAY_MAX_OFFLINE_POLL_INTERVAL
+from .pulse_events import PulseEventSink, GatewayOnlineChanged
 from .pulse_backoff import PulseBackoff
 
 LOG = logging.getLogger(__name__)
@@ -39,16 +40,25 @@ IPADDR_UPDATEABLE_FIELDS = (
 )
 
 
+def _gateway_backoff() -> PulseBackoff:
+    return PulseBackoff(
+        "Gateway", ADT_DEFAULT_POLL_INTERVAL, ADT_GATEWAY_MAX_OFFLINE_POLL_INTERVAL
+    )
+
+
 @dataclass(slots=True)
 class ADTPulseGateway:
     """ADT Pulse Gateway information."""
 
     manufacturer: str = "Unknown"
     _status_text: str = "OFFLINE"
-    backoff = PulseBackoff(
-        "Gateway", ADT_DEFAULT_POLL_INTERVAL, ADT_GATEWAY_MAX_OFFLINE_POLL_INTERVAL
+    # created for each gateway, so sites don't share a backoff or lock
+    backoff: PulseBackoff = field(
+        default_factory=_gateway_backoff, init=False, repr=False, compare=False
+    )
+    _attribute_lock: RLock = field(
+        default_factory=RLock, init=False, repr=False, compare=False
     )
-    _attribute_lock = RLock()
     model: str | None = None
     serial_number: str | None = None
     next_update: int = 0
@@ -65,6 +75,7 @@ class ADTPulseGateway:
     _device_lan_mac: str | None = None
     router_lan_ip_address: IPv4Address | IPv6Address | None = None
     router_wan_ip_address: IPv4Address | IPv6Address | None = None
+    event_sink: PulseEventSink | None = field(default=None, repr=False, compare=False)
 
     @property
     def is_online(self) -> bool:
@@ -110,6 +121,9 @@ class ADTPulseGateway:
                     else self.backoff.get_current_backoff_interval()
                 ),
             )
+        # sent unlocked, so event sinks can read the gateway
+        if self.event_sink is not None:
+            self.event_sink(GatewayOnlineChanged(online=status))
 
     @property
     def poll_interval(self) -> float:
@@ -0,0 +1,375 @@
+"""Run many ADT Pulse accounts in one process."""
+
+import asyncio
+from random import Random
+from logging import getLogger
+from collections.abc import AsyncGenerator
+
+from aiohttp import TCPConnector
+from typeguard import typechecked
+
+from .util import set_debug_lock
+from .const import DEFAULT_API_HOST
+from .pulse_events import PulseEvent
+from .pulse_metrics import PulseMetrics
+from .pulse_event_hub import (
+    OVERFLOW_COALESCE,
+    DEFAULT_QUEUE_SIZE,
+    PulseEventHub,
+    PulseEventSubscription,
+)
+from .pulse_transport import PulseTransport
+from .pyadtpulse_async import PyADTPulseAsync
+from .pulse_timer_wheel import PulseTimerWheel, get_timer_wheel
+from .pulse_rate_limiter import PulseRateLimiter
+from .pulse_session_store import PulseSessionStore
+
+LOG = getLogger(__name__)
+
+DEFAULT_LOGIN_INTERVAL = 0.2
+DEFAULT_MAX_CONCURRENT_LOGINS = 10
+DEFAULT_CONNECTION_LIMIT = 100
+ACCOUNT_LOGIN_TASK_NAME = "ADT Pulse Account Login Task"
+ACCOUNT_EVENT_TASK_NAME = "ADT Pulse Account Event Task"
+
+
+class PulseAccountManager:
+    """
+    Runs many ADT Pulse accounts on one event loop.
+
+    Each account is a PyADTPulseAsync object with its own cookies, keepalive
+    and sync check tasks, but all accounts share one aiohttp connection pool.
+    Logins are started login_interval seconds apart plus a random jitter, and
+    at most max_concurrent_logins at a time, so the accounts' keepalive and
+    sync checks, which are timed from login, don't all run at once.  Requests
+    from every account go through one PulseRateLimiter, so when Pulse asks any
+    account to slow down, they all do.  Events
+    from every account are published on one stream, and metrics can be read
+    for all accounts together.
+    """
+
+    __slots__ = (
+        "_accounts",
+        "_am_lock",
+        "_connection_limit",
+        "_connector",
+        "_debug_locks",
+        "_event_hub",
+        "_event_tasks",
+        "_login_interval",
+        "_login_semaphore",
+        "_login_tasks",
+        "_next_login",
+        "_random",
+        "_rate_limiter",
+        "_service_host",
+        "_session_store",
+    )
+
+    @typechecked
+    def __init__(
+        self,
+        service_host: str = DEFAULT_API_HOST,
+        login_interval: float = DEFAULT_LOGIN_INTERVAL,
+        max_concurrent_logins: int = DEFAULT_MAX_CONCURRENT_LOGINS,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        rate_limiter: PulseRateLimiter | None = None,
+        debug_locks: bool = False,
+        session_store: PulseSessionStore | None = None,
+    ) -> None:
+        """
+        Initialize account manager.
+
+        Args:
+            service_host (str, optional): host prefix to use for all accounts.
+                Defaults to DEFAULT_API_HOST.
+            login_interval (float, optional): seconds between starting logins.
+                Defaults to DEFAULT_LOGIN_INTERVAL.
+            max_concurrent_logins (int, optional): maximum logins in progress.
+                Defaults to DEFAULT_MAX_CONCURRENT_LOGINS.
+            connection_limit (int, optional): maximum connections in the shared
+                pool. Defaults to DEFAULT_CONNECTION_LIMIT.
+            rate_limiter (PulseRateLimiter | None, optional): rate limiter for
+                every account's requests. Defaults to None, which creates one.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+            session_store (PulseSessionStore | None, optional): store every
+                account's session is saved to and resumed from. Defaults to
+                None, which doesn't save sessions.
+
+        Raises:
+            ValueError: if an argument is out of range
+
+        """
+        if login_interval < 0:
+            raise ValueError("login_interval must not be negative")
+        if max_concurrent_logins < 1 or connection_limit < 1:
+            raise ValueError(
+                "max_concurrent_logins and connection_limit must be at least 1"
+            )
+        self._am_lock = set_debug_lock(debug_locks, "pyadtpulse.am_lock")
+        self._service_host = service_host
+        self._login_interval = login_interval
+        self._login_semaphore = asyncio.Semaphore(max_concurrent_logins)
+        self._connection_limit = connection_limit
+        self._rate_limiter = (
+            rate_limiter
+            if rate_limiter is not None
+            else PulseRateLimiter(debug_locks=debug_locks)
+        )
+        self._debug_locks = debug_locks
+        self._session_store = session_store
+        self._accounts: dict[str, PyADTPulseAsync] = {}
+        self._login_tasks: dict[str, asyncio.Task] = {}
+        self._event_tasks: dict[str, asyncio.Task] = {}
+        self._event_hub = PulseEventHub(debug_locks=debug_locks)
+        self._connector: TCPConnector | None = None
+        self._next_login = 0.0
+        self._random = Random()
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return f"<{self.__class__.__name__}: {len(self)} accounts>"
+
+    def __len__(self) -> int:
+        """Return the number of accounts."""
+        with self._am_lock:
+            return len(self._accounts)
+
+    async def __aenter__(self) -> "PulseAccountManager":
+        """Return the manager, closing it on exit."""
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Log out every account and close the connection pool."""
+        await self.close()
+
+    @property
+    def accounts(self) -> dict[str, PyADTPulseAsync]:
+        """Return the accounts, keyed by username."""
+        with self._am_lock:
+            return dict(self._accounts)
+
+    @property
+    def rate_limiter(self) -> PulseRateLimiter:
+        """Return the rate limiter shared by every account."""
+        return self._rate_limiter
+
+    @property
+    def timer_wheel(self) -> PulseTimerWheel:
+        """
+        Return the timer wheel running every account's keepalives and sync checks.
+
+        Must be called from the event loop the accounts run on.
+        """
+        return get_timer_wheel()
+
+    def get_account(self, username: str) -> PyADTPulseAsync:
+        """
+        Return an account.
+
+        Raises:
+            KeyError: if the account wasn't added
+
+        """
+        with self._am_lock:
+            return self._accounts[username]
+
+    def _get_connector(self) -> TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = TCPConnector(limit=self._connection_limit)
+        return self._connector
+
+    def _next_login_delay(self) -> float:
+        """Return how long to wait before starting the next login."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_login)
+        self._next_login = start + self._login_interval
+        return start - now + self._random.uniform(0, self._login_interval)
+
+    @typechecked
+    def add_account(
+        self,
+        username: str,
+        password: str,
+        fingerprint: str,
+        transport: PulseTransport | None = None,
+    ) -> PyADTPulseAsync:
+        """
+        Add an account and schedule its login.
+
+        Must be called from the event loop.  Use wait_for_logins() to wait
+        until scheduled logins finish.
+
+        Args:
+            username (str): Username.
+            password (str): Password.
+            fingerprint (str): 2FA fingerprint.
+            transport (PulseTransport | None, optional): transport used to make
+                requests. Defaults to None, which uses the shared pool.
+
+        Returns:
+            PyADTPulseAsync: the account
+
+        Raises:
+            ValueError: if the account was already added
+
+        """
+        with self._am_lock:
+            if username in self._accounts:
+                raise ValueError(f"Account {username} already added")
+            account = PyADTPulseAsync(
+                username,
+                password,
+                fingerprint,
+                self._service_host,
+                debug_locks=self._debug_locks,
+                transport=transport,
+            )
+            account.rate_limiter = self._rate_limiter
+            account.session_store = self._session_store
+            if transport is None:
+                account._pulse_connection_properties.connector = self._get_connector()
+            self._accounts[username] = account
+            # subscribe before logging in so the connection event is forwarded
+            self._event_tasks[username] = asyncio.create_task(
+                self._forward_events(account.events()),
+                name=f"{ACCOUNT_EVENT_TASK_NAME}: {username}",
+            )
+            self._login_tasks[username] = asyncio.create_task(
+                self._login(account, self._next_login_delay()),
+                name=f"{ACCOUNT_LOGIN_TASK_NAME}: {username}",
+            )
+        return account
+
+    async def _login(self, account: PyADTPulseAsync, delay: float) -> None:
+        await asyncio.sleep(delay)
+        async with self._login_semaphore:
+            try:
+                await account.async_login()
+            except Exception as e:
+                LOG.warning("Could not log in %r: %s", account, e)
+                raise
+
+    async def _forward_events(self, events: AsyncGenerator[PulseEvent]) -> None:
+        try:
+            async for event in events:
+                self._event_hub.publish_event(event)
+        finally:
+            await events.aclose()
+
+    async def wait_for_logins(self) -> dict[str, Exception]:
+        """
+        Wait for every scheduled login to finish.
+
+        Returns:
+            dict[str, Exception]: the exception of each failed login, keyed by
+                username
+
+        """
+        with self._am_lock:
+            tasks = dict(self._login_tasks)
+        if not tasks:
+            return {}
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return {
+            username: result
+            for username, result in zip(tasks, results, strict=True)
+            if isinstance(result, Exception)
+        }
+
+    async def wait_for_login(self, username: str) -> Exception | None:
+        """
+        Wait for an account's scheduled login to finish.
+
+        Returns:
+            Exception | None: the exception if the login failed, otherwise None
+
+        Raises:
+            KeyError: if the account wasn't added
+
+        """
+        with self._am_lock:
+            task = self._login_tasks[username]
+        (result,) = await asyncio.gather(task, return_exceptions=True)
+        return result if isinstance(result, Exception) else None
+
+    async def remove_account(self, username: str) -> None:
+        """
+        Log out and remove an account.
+
+        Raises:
+            KeyError: if the account wasn't added
+
+        """
+        with self._am_lock:
+            account = self._accounts.pop(username)
+            login_task = self._login_tasks.pop(username)
+            event_task = self._event_tasks.pop(username)
+        # stops a login which hasn't finished
+        login_task.cancel()
+        (login_result,) = await asyncio.gather(login_task, return_exceptions=True)
+        if login_result is None:
+            await account.async_logout()
+        event_task.cancel()
+        await asyncio.gather(event_task, return_exceptions=True)
+        await account._pulse_connection_properties.transport.close()
+
+    def events(
+        self,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_COALESCE,
+    ) -> AsyncGenerator[PulseEvent]:
+        """
+        Iterate over typed events from every account.
+
+        Works like PyADTPulseAsync.events(), the site_id of each event tells
+        which account it came from.
+
+        Args:
+            queue_size (int, optional): maximum number of queued events.
+                Defaults to DEFAULT_QUEUE_SIZE.
+            overflow (str, optional): OVERFLOW_COALESCE or OVERFLOW_DROP_OLDEST.
+                Defaults to OVERFLOW_COALESCE.
+
+        Returns:
+            AsyncGenerator[PulseEvent, None]: the events
+
+        """
+        subscription = self._event_hub.subscribe("accounts", queue_size, overflow)
+        return self._iterate_events(subscription)
+
+    @staticmethod
+    async def _iterate_events(
+        subscription: PulseEventSubscription,
+    ) -> AsyncGenerator[PulseEvent]:
+        try:
+            async for event in subscription:
+                if isinstance(event, PulseEvent):
+                    yield event
+        finally:
+            subscription.close()
+
+    @property
+    def metrics(self) -> PulseMetrics:
+        """
+        Return the metrics of every account added together.
+
+        Counters and histograms are summed, gauges hold the last account's value.
+        """
+        metrics = PulseMetrics(self._debug_locks)
+        for account in self.accounts.values():
+            metrics.merge(account.metrics)
+        return metrics
+
+    async def close(self) -> None:
+        """Log out and remove every account, then close the connection pool."""
+        with self._am_lock:
+            usernames = list(self._accounts)
+        await asyncio.gather(
+            *(self.remove_account(username) for username in usernames),
+            return_exceptions=True,
+        )
+        self._event_hub.close()
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
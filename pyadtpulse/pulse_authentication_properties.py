@@ -5,6 +5,7 @@ from re import match
 from typeguard import typechecked
 
 from .util import set_debug_lock
+from .pulse_transport import PulseEncodedForm
 
 
 class PulseAuthenticationProperties:
@@ -13,6 +14,7 @@ class PulseAuthenticationProperties:
     __slots__ = (
         "_fingerprint",
         "_last_login_time",
+        "_login_form",
         "_paa_attribute_lock",
         "_password",
         "_site_id",
@@ -74,6 +76,7 @@ class PulseAuthenticationProperties:
         )
         self._last_login_time = 0
         self._site_id = ""
+        self._login_form: PulseEncodedForm | None = None
 
     @property
     def last_login_time(self) -> int:
@@ -99,6 +102,7 @@ class PulseAuthenticationProperties:
         self.check_username(username)
         with self._paa_attribute_lock:
             self._username = username
+            self._login_form = None
 
     @property
     def password(self) -> str:
@@ -112,6 +116,7 @@ class PulseAuthenticationProperties:
         self.check_password(password)
         with self._paa_attribute_lock:
             self._password = password
+            self._login_form = None
 
     @property
     def fingerprint(self) -> str:
@@ -125,6 +130,7 @@ class PulseAuthenticationProperties:
         self.check_fingerprint(fingerprint)
         with self._paa_attribute_lock:
             self._fingerprint = fingerprint
+            self._login_form = None
 
     @property
     def site_id(self) -> str:
@@ -137,3 +143,24 @@ class PulseAuthenticationProperties:
     def site_id(self, site_id: str) -> None:
         with self._paa_attribute_lock:
             self._site_id = site_id
+            self._login_form = None
+
+    @property
+    def login_form(self) -> PulseEncodedForm:
+        """
+        Get the login form data.
+
+        The form is encoded once and reused until a credential or the site ID
+        changes.
+        """
+        with self._paa_attribute_lock:
+            if self._login_form is None:
+                form = {
+                    "usernameForm": self._username,
+                    "passwordForm": self._password,
+                    "fingerprint": self._fingerprint,
+                }
+                if self._site_id:
+                    form["networkid"] = self._site_id
+                self._login_form = PulseEncodedForm(form)
+            return self._login_form
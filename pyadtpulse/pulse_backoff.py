@@ -61,6 +61,21 @@ class PulseBackoff:
         self._detailed_debug_logging = detailed_debug_logging
         self._threshold = threshold
 
+    def __getstate__(self) -> dict:
+        """Return the values to pickle, leaving out the lock."""
+        with self._b_lock:
+            return {
+                slot: getattr(self, slot)
+                for slot in self.__slots__
+                if slot != "_b_lock"
+            }
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled values with a new lock."""
+        self._b_lock = set_debug_lock(False, "pyadtpulse._b_lock")
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
     def _calculate_backoff_interval(self) -> float:
         """Calculate backoff time."""
         if self._backoff_count == 0:
@@ -132,13 +147,19 @@ class PulseBackoff:
             self._expiration_time = backoff_time
             self._backoff_count = 0
 
-    async def wait_for_backoff(self) -> None:
-        """Wait for backoff."""
+    async def wait_for_backoff(self) -> float:
+        """
+        Wait for backoff.
+
+        Returns:
+            float: the number of seconds waited, 0.0 if no wait was needed
+
+        """
         with self._b_lock:
             curr_time = time()
             if self._expiration_time < curr_time:
                 if self.backoff_count == 0:
-                    return
+                    return 0.0
                 diff = self._calculate_backoff_interval()
             else:
                 diff = self._expiration_time - curr_time
@@ -146,6 +167,8 @@ class PulseBackoff:
                 if self._detailed_debug_logging:
                     LOG.debug("Backoff %s: waiting for %s", self._name, diff)
                 await asyncio.sleep(diff)
+                return diff
+            return 0.0
 
     def will_backoff(self) -> bool:
         """Return if backoff is needed."""
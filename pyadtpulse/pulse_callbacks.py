@@ -0,0 +1,146 @@
+"""Pulse event callback registry."""
+
+import asyncio
+from logging import getLogger
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from typeguard import typechecked
+
+from .util import set_debug_lock
+from .pulse_events import PulseEvent
+
+LOG = getLogger(__name__)
+
+CALLBACK_THREAD_NAME = "PyADTPulse Callback"
+
+PulseCallback = Callable[[PulseEvent], None]
+PulseCallbackTarget = Executor | asyncio.AbstractEventLoop
+
+
+class PulseCallbackRegistration:
+    """A callback registered with PulseCallbackRegistry.register()."""
+
+    __slots__ = ("callback", "event_types", "target")
+
+    def __init__(
+        self,
+        callback: PulseCallback,
+        target: PulseCallbackTarget | None,
+        event_types: tuple[type[PulseEvent], ...],
+    ) -> None:
+        """Initialize registration, use PulseCallbackRegistry.register() instead."""
+        self.callback = callback
+        self.target = target
+        self.event_types = event_types
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return f"<{self.__class__.__name__}: {self.callback!r}>"
+
+    def wants(self, event: PulseEvent) -> bool:
+        """Return whether the callback should be called for an event."""
+        return not self.event_types or isinstance(event, self.event_types)
+
+
+class PulseCallbackRegistry:
+    """
+    Calls registered callbacks with typed events, off the Pulse event loop.
+
+    Each callback runs on the executor or event loop it was registered with.
+    Callbacks registered without one run one at a time, in event order, on a
+    thread owned by the registry, so a slow callback never blocks the event
+    loop.  Exceptions raised by callbacks are logged and otherwise ignored.
+    """
+
+    __slots__ = ("_cr_lock", "_executor", "_registrations")
+
+    @typechecked
+    def __init__(self, debug_locks: bool = False) -> None:
+        """
+        Initialize callback registry.
+
+        Args:
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        """
+        self._cr_lock = set_debug_lock(debug_locks, "pyadtpulse.cr_lock")
+        self._registrations: list[PulseCallbackRegistration] = []
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __len__(self) -> int:
+        """Return the number of registered callbacks."""
+        with self._cr_lock:
+            return len(self._registrations)
+
+    def register(
+        self,
+        callback: PulseCallback,
+        target: PulseCallbackTarget | None = None,
+        event_types: tuple[type[PulseEvent], ...] = (),
+    ) -> Callable[[], None]:
+        """
+        Register a callback.
+
+        Args:
+            callback (PulseCallback): called with each event
+            target (Executor | asyncio.AbstractEventLoop | None, optional):
+                executor or event loop to run the callback on. Defaults to None,
+                which uses the registry's own thread.
+            event_types (tuple[type[PulseEvent], ...], optional): event classes
+                to call the callback for. Defaults to (), meaning all events.
+
+        Returns:
+            Callable[[], None]: function which unregisters the callback
+
+        """
+        registration = PulseCallbackRegistration(callback, target, event_types)
+        with self._cr_lock:
+            self._registrations.append(registration)
+
+        def unregister() -> None:
+            with self._cr_lock:
+                if registration in self._registrations:
+                    self._registrations.remove(registration)
+
+        return unregister
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._cr_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=CALLBACK_THREAD_NAME
+                )
+            return self._executor
+
+    @staticmethod
+    def _run(registration: PulseCallbackRegistration, event: PulseEvent) -> None:
+        try:
+            registration.callback(event)
+        except Exception:  # pylint: disable=broad-except
+            LOG.exception("Pulse callback %r failed on %s", registration, event)
+
+    def dispatch(self, event: PulseEvent) -> None:
+        """Run every callback interested in an event on its target."""
+        with self._cr_lock:
+            registrations = [r for r in self._registrations if r.wants(event)]
+        for registration in registrations:
+            target = registration.target
+            try:
+                if isinstance(target, asyncio.AbstractEventLoop):
+                    target.call_soon_threadsafe(self._run, registration, event)
+                    continue
+                if target is None:
+                    target = self._get_executor()
+                target.submit(self._run, registration, event)
+            except RuntimeError as ex:
+                # target was shut down or its loop closed
+                LOG.warning("Could not run Pulse callback %r: %s", registration, ex)
+
+    def close(self) -> None:
+        """Stop the registry's own thread once queued callbacks have run."""
+        with self._cr_lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False)
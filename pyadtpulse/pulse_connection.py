@@ -13,13 +13,12 @@ from lxml import html
 from yarl import URL
 from typeguard import typechecked
 
-from .util import make_etree, set_debug_lock
+from .util import set_debug_lock
 from .const import (
     ADT_LOGIN_URI,
     ADT_LOGOUT_URI,
     ADT_SUMMARY_URI,
     ADT_MFA_FAIL_URI,
-    ADT_DEFAULT_LOGIN_TIMEOUT,
 )
 from .exceptions import (
     PulseMFARequiredError,
@@ -31,7 +30,10 @@ from .exceptions import (
     PulseServiceTemporarilyUnavailableError,
 )
 from .pulse_backoff import PulseBackoff
+from .pulse_metrics import PulseMetrics
 from .pulse_query_manager import PulseQueryManager
+from .pulse_session_store import PulseSavedSession
+from .pulse_timeout_policy import PulseTimeoutPolicy
 from .pulse_connection_status import PulseConnectionStatus
 from .pulse_connection_properties import PulseConnectionProperties
 from .pulse_authentication_properties import PulseAuthenticationProperties
@@ -59,6 +61,8 @@ class PulseConnection(PulseQueryManager):
         pulse_connection_properties: PulseConnectionProperties,
         pulse_authentication: PulseAuthenticationProperties,
         debug_locks: bool = False,
+        metrics: PulseMetrics | None = None,
+        timeout_policy: PulseTimeoutPolicy | None = None,
     ):
         """Initialize ADT Pulse connection."""
         # need to initialize this after the session since we set cookies
@@ -67,6 +71,8 @@ class PulseConnection(PulseQueryManager):
             pulse_connection_status,
             pulse_connection_properties,
             debug_locks,
+            metrics,
+            timeout_policy,
         )
         self._pc_attribute_lock = set_debug_lock(
             debug_locks, "pyadtpulse.pc_attribute_lock"
@@ -149,7 +155,8 @@ class PulseConnection(PulseQueryManager):
                 if url == response_url_string:
                     raise PulseMFARequiredError()
 
-        tree = make_etree(
+        tree = self.make_etree(
+            ADT_LOGIN_URI,
             response[0],
             response[1],
             response[2],
@@ -178,7 +185,7 @@ class PulseConnection(PulseQueryManager):
 
     @typechecked
     async def async_do_login_query(
-        self, timeout: int = ADT_DEFAULT_LOGIN_TIMEOUT
+        self, timeout: float | None = None
     ) -> html.HtmlElement | None:
         """
         Perform a login query to the Pulse site.
@@ -188,8 +195,8 @@ class PulseConnection(PulseQueryManager):
         Will set login in progress flag.
 
         Args:
-            timeout (int, optional): The timeout value for the query in seconds.
-            Defaults to ADT_DEFAULT_LOGIN_TIMEOUT.
+            timeout (float | None, optional): The timeout value for the query in
+            seconds. Defaults to None, which uses the timeout policy.
 
         Returns:
             tree (html.HtmlElement, optional): the parsed response tree for
@@ -218,19 +225,12 @@ class PulseConnection(PulseQueryManager):
         if lockout_time > time():
             raise PulseServiceTemporarilyUnavailableError(cs_backoff, lockout_time)
         self.login_in_progress = True
-        data = {
-            "usernameForm": self._authentication_properties.username,
-            "passwordForm": self._authentication_properties.password,
-            "fingerprint": self._authentication_properties.fingerprint,
-        }
-        if self._authentication_properties.site_id:
-            data["networkid"] = self._authentication_properties.site_id
         await self._login_backoff.wait_for_backoff()
         try:
             response = await self.async_query(
                 ADT_LOGIN_URI,
                 "POST",
-                extra_params=data,
+                extra_params=self._authentication_properties.login_form,
                 timeout=timeout,
                 requires_authentication=False,
             )
@@ -249,6 +249,67 @@ class PulseConnection(PulseQueryManager):
         self.login_in_progress = False
         return tree
 
+    async def async_restore_session(
+        self, session: PulseSavedSession
+    ) -> html.HtmlElement | None:
+        """
+        Resume a saved Pulse session instead of logging in.
+
+        The session's cookies are put in a new client session and the summary
+        page is fetched, which also checks Pulse still accepts them.
+
+        Will set login in progress flag.
+
+        Args:
+            session (PulseSavedSession): the saved session
+
+        Returns:
+            html.HtmlElement | None: the parsed summary page, or None if the
+                session is no longer valid
+
+        Raises:
+            PulseClientConnectionError: if the client connection fails
+            PulseServerConnectionError: if the server connection fails
+            PulseServiceTemporarilyUnavailableError: if Pulse returns a
+                Retry-After header
+
+        """
+        if self.login_in_progress:
+            return None
+        await self.quick_logout()
+        try:
+            self._connection_properties.api_version = session.api_version
+        except ValueError:
+            return None
+        self._connection_properties.transport.set_cookies(session.cookies)
+        self.login_in_progress = True
+        try:
+            code, response, url = await self.async_query(
+                ADT_SUMMARY_URI, requires_authentication=False
+            )
+        finally:
+            self.login_in_progress = False
+        if url is None or not url.path.endswith(ADT_SUMMARY_URI):
+            LOG.debug("Saved Pulse session was not accepted, redirected to %s", url)
+            await self.quick_logout()
+            # the session may be from an older version of Pulse
+            self._connection_properties.clear_api_version()
+            return None
+        tree = self.make_etree(
+            ADT_SUMMARY_URI,
+            code,
+            response,
+            url,
+            logging.INFO,
+            "Could not resume saved Pulse session",
+        )
+        if tree is None:
+            await self.quick_logout()
+            return None
+        self._connection_status.authenticated_flag.set()
+        self._authentication_properties.last_login_time = session.last_login_time
+        return tree
+
     @typechecked
     async def async_do_logout_query(self, site_id: str | None = None) -> None:
         """Perform a logout query to the ADT Pulse site."""
@@ -265,7 +326,6 @@ class PulseConnection(PulseQueryManager):
             await self.async_query(
                 ADT_LOGOUT_URI,
                 extra_params=params,
-                timeout=10,
                 requires_authentication=False,
             )
         # FIXME: do we care if this raises exceptions?
@@ -3,7 +3,7 @@
 from re import search
 from asyncio import AbstractEventLoop
 
-from aiohttp import ClientSession
+from aiohttp import BaseConnector, ClientSession
 from typeguard import typechecked
 
 from .util import set_debug_lock
@@ -15,6 +15,7 @@ from .const import (
     ADT_DEFAULT_SEC_FETCH_HEADERS,
     ADT_DEFAULT_HTTP_ACCEPT_HEADERS,
 )
+from .pulse_transport import PulseTransport, PulseAiohttpTransport
 
 
 class PulseConnectionProperties:
@@ -23,11 +24,13 @@ class PulseConnectionProperties:
     __slots__ = (
         "_api_host",
         "_api_version",
+        "_connector",
         "_debug_locks",
         "_detailed_debug_logging",
         "_loop",
         "_pci_attribute_lock",
         "_session",
+        "_transport",
         "_user_agent",
     )
 
@@ -72,6 +75,8 @@ class PulseConnectionProperties:
         self.detailed_debug_logging = detailed_debug_logging
         self._loop: AbstractEventLoop | None = None
         self._session: ClientSession | None = None
+        self._connector: BaseConnector | None = None
+        self._transport: PulseTransport = PulseAiohttpTransport(self)
         self.service_host = host
         self._api_version = ""
         self._user_agent = user_agent
@@ -175,10 +180,43 @@ class PulseConnectionProperties:
         """Get the session."""
         with self._pci_attribute_lock:
             if self._session is None:
-                self._session = ClientSession()
+                if self._connector is not None:
+                    self._session = ClientSession(
+                        connector=self._connector, connector_owner=False
+                    )
+                else:
+                    self._session = ClientSession()
             self._set_headers()
             return self._session
 
+    @property
+    def connector(self) -> BaseConnector | None:
+        """Get the connector sessions are created with, None for their own."""
+        with self._pci_attribute_lock:
+            return self._connector
+
+    @connector.setter
+    def connector(self, connector: BaseConnector | None):
+        """
+        Set a connection pool shared with other sessions.
+
+        Only sessions created afterwards use it.  It isn't closed with them.
+        """
+        with self._pci_attribute_lock:
+            self._connector = connector
+
+    @property
+    def transport(self) -> PulseTransport:
+        """Get the transport used to make requests."""
+        with self._pci_attribute_lock:
+            return self._transport
+
+    @transport.setter
+    def transport(self, transport: PulseTransport):
+        """Set the transport used to make requests."""
+        with self._pci_attribute_lock:
+            self._transport = transport
+
     @property
     def api_version(self) -> str:
         """Get the API version."""
@@ -223,6 +261,11 @@ class PulseConnectionProperties:
             check_version_string(version)
             self._api_version = version
 
+    def clear_api_version(self) -> None:
+        """Forget the API version so the next login fetches it again."""
+        with self._pci_attribute_lock:
+            self._api_version = ""
+
     @typechecked
     def make_url(self, uri: str) -> str:
         """
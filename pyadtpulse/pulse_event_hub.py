@@ -0,0 +1,349 @@
+"""Pulse update and event publish/subscribe hub."""
+
+import asyncio
+from time import time
+from logging import getLogger
+from collections import deque
+from dataclasses import field, replace, dataclass
+
+from .util import set_debug_lock
+from .pulse_events import PulseEvent
+
+LOG = getLogger(__name__)
+
+# overflow policies
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE)
+
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_HISTORY_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class PulseUpdate:
+    """
+    An update published by the hub.
+
+    Fields:
+        sequence (int): position of the update in the stream, starting at 1
+        alarm_changed (bool): True if the alarm status changed
+        alarm_status (str): alarm status after the update
+        zones (frozenset[int]): ids of zones which changed
+        exception (Exception | None): error raised while checking for updates,
+            None if the update succeeded
+        timestamp (float): time the update was published
+        coalesced (int): number of updates merged into this one
+    """
+
+    sequence: int
+    alarm_changed: bool = False
+    alarm_status: str = ""
+    zones: frozenset[int] = frozenset()
+    exception: Exception | None = None
+    timestamp: float = field(default_factory=time)
+    coalesced: int = 1
+
+    def merge(self, newer: "PulseUpdate | PulseEvent") -> "PulseUpdate | None":
+        """Return an update combining this update and a newer one, if possible."""
+        if (
+            not isinstance(newer, PulseUpdate)
+            or self.exception is not None
+            or newer.exception is not None
+        ):
+            return None
+        return PulseUpdate(
+            newer.sequence,
+            self.alarm_changed or newer.alarm_changed,
+            newer.alarm_status,
+            self.zones | newer.zones,
+            None,
+            newer.timestamp,
+            self.coalesced + newer.coalesced,
+        )
+
+
+PulseHubItem = PulseUpdate | PulseEvent
+
+
+class PulseEventSubscription:
+    """
+    A subscriber's queue of updates or events.
+
+    Created by PulseEventHub.subscribe().  Items are read with get() or by
+    iterating with async for.  When the queue is full, the overflow policy
+    either drops the oldest item or merges the new item into the newest
+    queued item it can be merged with (see PulseUpdate.merge() and
+    PulseEvent.merge()).  An item merged into keeps its place in the queue,
+    and its sequence number unless it is the newest.  Updates carrying an
+    exception are never merged.
+    """
+
+    __slots__ = (
+        "_closed",
+        "_cursor",
+        "_dropped",
+        "_hub",
+        "_name",
+        "_overflow",
+        "_queue",
+        "_queue_size",
+        "_ready",
+    )
+
+    def __init__(
+        self, hub: "PulseEventHub", name: str, queue_size: int, overflow: str
+    ) -> None:
+        """Initialize subscription, use PulseEventHub.subscribe() instead."""
+        self._hub = hub
+        self._name = name
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._queue: deque[tuple[int, PulseHubItem]] = deque()
+        self._ready = asyncio.Event()
+        self._cursor = 0
+        self._dropped = 0
+        self._closed = False
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return f"<{self.__class__.__name__}: {self._name}>"
+
+    @property
+    def name(self) -> str:
+        """Return the subscriber name."""
+        return self._name
+
+    @property
+    def cursor(self) -> int:
+        """Return the sequence number of the last item read."""
+        return self._cursor
+
+    @property
+    def dropped(self) -> int:
+        """Return the number of updates dropped because the queue was full."""
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued updates."""
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        """Return True if the subscription was closed."""
+        return self._closed
+
+    def _coalesce(self, sequence: int, item: PulseHubItem) -> bool:
+        last = len(self._queue) - 1
+        for i in range(last, -1, -1):
+            queued_sequence, queued = self._queue[i]
+            merged = queued.merge(item)
+            if merged is None:
+                continue
+            if i < last:
+                # keep sequences in queue order, so a cursor read from a later
+                # item never skips the items queued before it
+                sequence = queued_sequence
+                if isinstance(merged, PulseUpdate):
+                    merged = replace(merged, sequence=sequence)
+            self._queue[i] = (sequence, merged)
+            return True
+        return False
+
+    def _put(self, sequence: int, item: PulseHubItem) -> None:
+        if self._closed:
+            return
+        if len(self._queue) >= self._queue_size:
+            if self._overflow == OVERFLOW_COALESCE and self._coalesce(sequence, item):
+                return
+            self._queue.popleft()
+            self._dropped += 1
+        self._queue.append((sequence, item))
+        self._ready.set()
+
+    def get_nowait(self) -> PulseHubItem | None:
+        """Return the next item, None if there isn't one."""
+        if not self._queue:
+            return None
+        self._cursor, item = self._queue.popleft()
+        if not self._queue:
+            self._ready.clear()
+        return item
+
+    async def get(self) -> PulseHubItem:
+        """
+        Wait for the next item.
+
+        Raises:
+            asyncio.CancelledError: if the subscription is closed while waiting
+
+        """
+        while True:
+            item = self.get_nowait()
+            if item is not None:
+                return item
+            if self._closed:
+                raise asyncio.CancelledError(f"Subscription {self._name} closed")
+            await self._ready.wait()
+
+    def close(self) -> None:
+        """Stop receiving updates and wake any waiting reader."""
+        if self._closed:
+            return
+        self._closed = True
+        self._hub._unsubscribe(self)
+        self._ready.set()
+
+    def __aiter__(self) -> "PulseEventSubscription":
+        """Iterate over updates until closed."""
+        return self
+
+    async def __anext__(self) -> PulseHubItem:
+        """Return the next item."""
+        if self._closed and not self._queue:
+            raise StopAsyncIteration
+        try:
+            return await self.get()
+        except asyncio.CancelledError:
+            if self._closed:
+                raise StopAsyncIteration from None
+            raise
+
+
+class PulseEventHub:
+    """
+    Fans out updates or events to any number of subscribers.
+
+    Each subscriber has its own bounded queue and overflow policy, so a slow
+    subscriber never holds up or steals items from the others.  The last
+    history_size items are kept, so a subscriber can resume from the cursor
+    of an earlier subscription.
+    """
+
+    __slots__ = ("_eh_lock", "_history", "_sequence", "_subscribers")
+
+    def __init__(
+        self, history_size: int = DEFAULT_HISTORY_SIZE, debug_locks: bool = False
+    ) -> None:
+        """
+        Initialize event hub.
+
+        Args:
+            history_size (int, optional): number of updates kept for late
+                subscribers. Defaults to DEFAULT_HISTORY_SIZE.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        """
+        self._eh_lock = set_debug_lock(debug_locks, "pyadtpulse.eh_lock")
+        self._history: deque[tuple[int, PulseHubItem]] = deque(maxlen=history_size)
+        self._sequence = 0
+        self._subscribers: list[PulseEventSubscription] = []
+
+    @property
+    def cursor(self) -> int:
+        """Return the sequence number of the last item published."""
+        with self._eh_lock:
+            return self._sequence
+
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of subscribers."""
+        with self._eh_lock:
+            return len(self._subscribers)
+
+    def subscribe(
+        self,
+        name: str = "",
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+        cursor: int | None = None,
+    ) -> PulseEventSubscription:
+        """
+        Add a subscriber.
+
+        Args:
+            name (str, optional): subscriber name used in logging. Defaults to "".
+            queue_size (int, optional): maximum number of queued updates.
+                Defaults to DEFAULT_QUEUE_SIZE.
+            overflow (str, optional): what to do when the queue is full,
+                OVERFLOW_DROP_OLDEST or OVERFLOW_COALESCE.
+                Defaults to OVERFLOW_DROP_OLDEST.
+            cursor (int | None, optional): sequence number to resume after, kept
+                updates published after it are queued immediately. Defaults to
+                None, which only receives new updates.
+
+        Returns:
+            PulseEventSubscription: the subscription
+
+        Raises:
+            ValueError: if queue_size or overflow is not valid
+
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        subscription = PulseEventSubscription(self, name, queue_size, overflow)
+        with self._eh_lock:
+            if cursor is not None:
+                missed = [entry for entry in self._history if entry[0] > cursor]
+                if missed and missed[0][0] > cursor + 1:
+                    LOG.debug(
+                        "Subscriber %s missed items %d to %d",
+                        name,
+                        cursor + 1,
+                        missed[0][0] - 1,
+                    )
+                for sequence, item in missed:
+                    subscription._put(sequence, item)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: PulseEventSubscription) -> None:
+        with self._eh_lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(
+        self,
+        alarm_changed: bool = False,
+        alarm_status: str = "",
+        zones: set[int] | frozenset[int] | None = None,
+        exception: Exception | None = None,
+    ) -> PulseUpdate:
+        """
+        Publish an update to all subscribers.
+
+        Returns:
+            PulseUpdate: the update published
+
+        """
+        with self._eh_lock:
+            update = PulseUpdate(
+                self._sequence + 1,
+                alarm_changed,
+                alarm_status,
+                frozenset(zones) if zones else frozenset(),
+                exception,
+            )
+            self._publish(update)
+        return update
+
+    def publish_event(self, event: PulseEvent) -> None:
+        """Publish a typed event to all subscribers."""
+        with self._eh_lock:
+            self._publish(event)
+
+    def _publish(self, item: PulseHubItem) -> None:
+        self._sequence += 1
+        self._history.append((self._sequence, item))
+        for subscription in self._subscribers:
+            subscription._put(self._sequence, item)
+
+    def close(self) -> None:
+        """Close all subscriptions."""
+        with self._eh_lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.close()
@@ -0,0 +1,143 @@
+"""Pulse typed events."""
+
+from time import time
+from dataclasses import field, replace, dataclass
+from collections.abc import Callable
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PulseEvent:
+    """
+    Base class of typed events.
+
+    Fields:
+        site_id (str): id of the site the event is for, "" if not site specific
+        timestamp (float): time the event happened
+    """
+
+    site_id: str = ""
+    timestamp: float = field(default_factory=time)
+
+    def merge(self, newer: "PulseEvent") -> "PulseEvent | None":
+        """
+        Combine this event with a newer one.
+
+        Returns:
+            PulseEvent | None: an event equivalent to both, or None if they
+                can't be combined
+
+        """
+        return None
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ZoneStateChanged(PulseEvent):
+    """
+    A zone's state changed, i.e. a door opened.
+
+    Fields:
+        zone_id (int): zone id
+        name (str): zone name
+        old_state (str): previous state
+        new_state (str): new state, i.e. OK, Open, Motion, Tamper or Alarm
+        last_activity_timestamp (int): time of the zone's last activity
+    """
+
+    zone_id: int
+    name: str
+    old_state: str
+    new_state: str
+    last_activity_timestamp: int = 0
+
+    def merge(self, newer: PulseEvent) -> PulseEvent | None:
+        """Combine with a newer change of the same zone."""
+        if (
+            not isinstance(newer, ZoneStateChanged)
+            or newer.site_id != self.site_id
+            or newer.zone_id != self.zone_id
+        ):
+            return None
+        return replace(newer, old_state=self.old_state)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ZoneStatusChanged(PulseEvent):
+    """
+    A zone's status changed, i.e. its battery became low.
+
+    Fields:
+        zone_id (int): zone id
+        name (str): zone name
+        old_status (str): previous status
+        new_status (str): new status, i.e. Online or a trouble description
+    """
+
+    zone_id: int
+    name: str
+    old_status: str
+    new_status: str
+
+    def merge(self, newer: PulseEvent) -> PulseEvent | None:
+        """Combine with a newer change of the same zone."""
+        if (
+            not isinstance(newer, ZoneStatusChanged)
+            or newer.site_id != self.site_id
+            or newer.zone_id != self.zone_id
+        ):
+            return None
+        return replace(newer, old_status=self.old_status)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AlarmStateChanged(PulseEvent):
+    """
+    The alarm status changed.
+
+    Fields:
+        old_status (str): previous status
+        new_status (str): new status, one of the ADT_ALARM_* statuses
+    """
+
+    old_status: str
+    new_status: str
+
+    def merge(self, newer: PulseEvent) -> PulseEvent | None:
+        """Combine with a newer change of the same alarm."""
+        if not isinstance(newer, AlarmStateChanged) or newer.site_id != self.site_id:
+            return None
+        return replace(newer, old_status=self.old_status)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class GatewayOnlineChanged(PulseEvent):
+    """
+    The gateway went online or offline.
+
+    Fields:
+        online (bool): True if the gateway is online
+    """
+
+    online: bool
+
+    def merge(self, newer: PulseEvent) -> PulseEvent | None:
+        """Combine with a newer change of the same gateway."""
+        if not isinstance(newer, GatewayOnlineChanged) or newer.site_id != self.site_id:
+            return None
+        return newer
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ConnectionStateChanged(PulseEvent):
+    """
+    The connection to Pulse was made or lost.
+
+    Fields:
+        connected (bool): True if logged in and able to check for updates
+        exception (Exception | None): error which caused the disconnection
+    """
+
+    connected: bool
+    exception: Exception | None = None
+
+
+PulseEventSink = Callable[[PulseEvent], None]
@@ -0,0 +1,287 @@
+"""Process-wide admission control for Pulse logins."""
+
+import asyncio
+from time import monotonic
+from heapq import heappop, heappush
+from logging import getLogger
+from weakref import WeakSet
+from threading import RLock
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+
+from .util import set_debug_lock
+from .pulse_metrics import (
+    METRIC_LOGINS_ACTIVE,
+    METRIC_LOGIN_QUEUE_DEPTH,
+    PulseMetrics,
+)
+
+LOG = getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_LOGINS = 10
+# fraction of the relogin interval first relogins are spread over
+DEFAULT_RELOGIN_SPREAD = 0.5
+
+# lower priorities are admitted first
+LOGIN_PRIORITY_ARMED = 0
+LOGIN_PRIORITY_LOGIN = 1
+LOGIN_PRIORITY_RELOGIN = 2
+
+# successive multiples of this, modulo 1, are evenly spread however many there are
+_GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+_admission_lock = RLock()
+_admission: "PulseLoginAdmission | None" = None
+
+
+class _PulseLoginWaiter:
+    """A login waiting for admission."""
+
+    __slots__ = ("admitted", "cancelled", "future", "loop")
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, future: asyncio.Future[None]
+    ) -> None:
+        self.loop = loop
+        self.future = future
+        self.admitted = False
+        self.cancelled = False
+
+
+class PulseLoginAdmission:
+    """
+    Limits the Pulse logins in progress across sessions.
+
+    At most max_concurrent logins run at once, the rest wait in a queue ordered
+    by priority, then arrival: sessions with an armed alarm first, then first
+    logins and logins after a lost connection, then scheduled relogins.  The
+    sessions may run on any threads and event loops.
+
+    Relogin delays are spread evenly over the last relogin_spread of the relogin
+    interval, so sessions logged in together don't all relogin together.
+
+    The queue depth and logins in progress are exported to every metrics
+    registry added with add_metrics() as they change.
+
+    Use get_login_admission() for the controller shared by every session in the
+    process.
+    """
+
+    __slots__ = (
+        "_active",
+        "_la_lock",
+        "_max_concurrent",
+        "_metrics",
+        "_queue",
+        "_relogin_count",
+        "_relogin_spread",
+        "_sequence",
+        "_waiting",
+    )
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_LOGINS,
+        relogin_spread: float = DEFAULT_RELOGIN_SPREAD,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize login admission.
+
+        Args:
+            max_concurrent (int, optional): maximum logins in progress.
+                Defaults to DEFAULT_MAX_CONCURRENT_LOGINS.
+            relogin_spread (float, optional): fraction of the relogin interval
+                relogins are spread over. Defaults to DEFAULT_RELOGIN_SPREAD.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if max_concurrent is less than 1 or relogin_spread isn't
+                between 0 and 1
+
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if not 0 <= relogin_spread <= 1:
+            raise ValueError("relogin_spread must be between 0 and 1")
+        self._la_lock = set_debug_lock(debug_locks, "pyadtpulse.la_lock")
+        self._max_concurrent = max_concurrent
+        self._relogin_spread = relogin_spread
+        self._active = 0
+        self._queue: list[tuple[int, int, _PulseLoginWaiter]] = []
+        self._sequence = 0
+        # queued waiters which haven't been cancelled
+        self._waiting = 0
+        self._relogin_count = 0
+        self._metrics: WeakSet[PulseMetrics] = WeakSet()
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return (
+            f"<{self.__class__.__name__}: {self.active} active, "
+            f"{self.queue_depth} queued>"
+        )
+
+    @property
+    def max_concurrent(self) -> int:
+        """Return the maximum logins in progress."""
+        with self._la_lock:
+            return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, max_concurrent: int) -> None:
+        """Set the maximum logins in progress, admitting waiters if raised."""
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        with self._la_lock:
+            self._max_concurrent = max_concurrent
+            self._admit_waiters()
+
+    @property
+    def active(self) -> int:
+        """Return the number of logins in progress."""
+        with self._la_lock:
+            return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of logins waiting to be admitted."""
+        with self._la_lock:
+            return self._waiting
+
+    def add_metrics(self, metrics: PulseMetrics) -> None:
+        """
+        Export the queue depth and logins in progress to a metrics registry.
+
+        Registries are held weakly, so they don't need to be removed.
+        """
+        with self._la_lock:
+            self._metrics.add(metrics)
+            self._update_metrics()
+
+    def remove_metrics(self, metrics: PulseMetrics) -> None:
+        """Stop exporting to a metrics registry."""
+        with self._la_lock:
+            self._metrics.discard(metrics)
+
+    def _update_metrics(self) -> None:
+        """Set the gauges of the metrics registries, must hold the lock."""
+        for metrics in self._metrics:
+            metrics.set_gauge(METRIC_LOGIN_QUEUE_DEPTH, self._waiting)
+            metrics.set_gauge(METRIC_LOGINS_ACTIVE, self._active)
+
+    def _admit_waiters(self) -> None:
+        """Admit queued waiters while there's room, must hold the lock."""
+        while self._queue and self._active < self._max_concurrent:
+            _, _, waiter = heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            self._waiting -= 1
+            try:
+                waiter.loop.call_soon_threadsafe(self._wake, waiter.future)
+            except RuntimeError:
+                # the waiter's loop has been closed
+                continue
+            waiter.admitted = True
+            self._active += 1
+        self._update_metrics()
+
+    @staticmethod
+    def _wake(future: asyncio.Future[None]) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    async def acquire(self, priority: int = LOGIN_PRIORITY_LOGIN) -> float:
+        """
+        Wait until a login may start.
+
+        Each successful acquire() must be followed by a release().
+
+        Args:
+            priority (int, optional): one of the LOGIN_PRIORITY_* priorities.
+                Defaults to LOGIN_PRIORITY_LOGIN.
+
+        Returns:
+            float: seconds waited
+
+        """
+        loop = asyncio.get_running_loop()
+        with self._la_lock:
+            if not self._waiting and self._active < self._max_concurrent:
+                self._active += 1
+                self._update_metrics()
+                return 0.0
+            waiter = _PulseLoginWaiter(loop, loop.create_future())
+            heappush(self._queue, (priority, self._sequence, waiter))
+            self._sequence += 1
+            self._waiting += 1
+            self._update_metrics()
+        start = monotonic()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._la_lock:
+                if waiter.admitted:
+                    self._active -= 1
+                    self._admit_waiters()
+                else:
+                    waiter.cancelled = True
+                    self._waiting -= 1
+                    self._update_metrics()
+            raise
+        return monotonic() - start
+
+    def release(self) -> None:
+        """Finish a login started with acquire()."""
+        with self._la_lock:
+            self._active -= 1
+            self._admit_waiters()
+
+    @asynccontextmanager
+    async def admit(self, priority: int = LOGIN_PRIORITY_LOGIN) -> AsyncIterator[float]:
+        """
+        Context manager running its block as an admitted login.
+
+        Yields:
+            float: seconds waited for admission
+
+        """
+        waited = await self.acquire(priority)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def relogin_delay(self, interval: float) -> float:
+        """
+        Return how long after a login the next relogin should be.
+
+        Successive delays are spread evenly over the last relogin_spread of
+        the interval.
+
+        Args:
+            interval (float): the relogin interval
+
+        Returns:
+            float: the delay, between (1 - relogin_spread) * interval and interval
+
+        """
+        with self._la_lock:
+            fraction = (self._relogin_count * _GOLDEN_RATIO_FRACTION) % 1.0
+            self._relogin_count += 1
+            return interval * (1.0 - self._relogin_spread * fraction)
+
+
+def get_login_admission() -> PulseLoginAdmission:
+    """
+    Return the login admission controller shared by every session.
+
+    Returns:
+        PulseLoginAdmission: the controller, created on first use
+
+    """
+    global _admission  # noqa: PLW0603
+    with _admission_lock:
+        if _admission is None:
+            _admission = PulseLoginAdmission()
+        return _admission
@@ -0,0 +1,257 @@
+"""Pulse event loop lag monitor."""
+
+import sys
+import asyncio
+import traceback
+from time import time, monotonic
+from types import FrameType
+from logging import getLogger
+from threading import Event, Thread, get_ident
+from collections import deque
+from dataclasses import dataclass
+
+from .util import set_debug_lock
+from .pulse_metrics import METRIC_LOOP_LAG, METRIC_LOOP_STALLS, PulseMetrics
+
+LOG = getLogger(__name__)
+
+DEFAULT_LAG_INTERVAL = 0.25
+DEFAULT_STALL_THRESHOLD = 0.5
+DEFAULT_STALL_HISTORY = 20
+LOOP_LAG_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+LOOP_MONITOR_TASK_NAME = "ADT Pulse Loop Monitor Task"
+LOOP_WATCHDOG_THREAD_NAME = "PyADTPulse Loop Watchdog"
+STALL_STACK_LIMIT = 10
+
+
+@dataclass(frozen=True, slots=True)
+class PulseLoopStall:
+    """
+    A stall of the event loop.
+
+    Fields:
+        culprit (str): innermost Python function running when the stall was
+            detected, as "file:function"
+        duration (float): seconds the loop had been stalled when detected
+        stack (str): stack of the event loop thread when detected
+        timestamp (float): time the stall was detected
+    """
+
+    culprit: str
+    duration: float
+    stack: str
+    timestamp: float
+
+
+class PulseLoopMonitor:
+    """
+    Measures how late the event loop runs scheduled work.
+
+    A task on the monitored loop wakes every interval seconds and records how
+    late it woke in the loop_lag_seconds histogram.  A watchdog thread checks
+    the task's heartbeat, and when the loop hasn't run it for stall_threshold
+    seconds past its interval, captures what the loop thread is running.  Stalls
+    are counted in loop_stalls_total, labelled with the function running, and
+    logged with its stack.  This works with uvloop, which doesn't support slow
+    callback tracing.
+    """
+
+    __slots__ = (
+        "_heartbeat",
+        "_interval",
+        "_lm_lock",
+        "_loop",
+        "_loop_thread_id",
+        "_metrics",
+        "_stall_threshold",
+        "_stalls",
+        "_stop_event",
+        "_task",
+        "_watchdog",
+    )
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_LAG_INTERVAL,
+        stall_threshold: float = DEFAULT_STALL_THRESHOLD,
+        metrics: PulseMetrics | None = None,
+        stall_history: int = DEFAULT_STALL_HISTORY,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize loop monitor.
+
+        Args:
+            interval (float, optional): seconds between lag measurements.
+                Defaults to DEFAULT_LAG_INTERVAL.
+            stall_threshold (float, optional): seconds late a measurement must be
+                for the loop to be considered stalled.
+                Defaults to DEFAULT_STALL_THRESHOLD.
+            metrics (PulseMetrics | None, optional): registry to record lag and
+                stalls in. Defaults to None, which creates one.
+            stall_history (int, optional): number of stalls kept.
+                Defaults to DEFAULT_STALL_HISTORY.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if interval or stall_threshold is not positive
+
+        """
+        if interval <= 0 or stall_threshold <= 0:
+            raise ValueError("interval and stall_threshold must be positive")
+        self._interval = interval
+        self._stall_threshold = stall_threshold
+        self._metrics = metrics if metrics is not None else PulseMetrics(debug_locks)
+        self._lm_lock = set_debug_lock(debug_locks, "pyadtpulse.lm_lock")
+        self._stalls: deque[PulseLoopStall] = deque(maxlen=stall_history)
+        self._heartbeat = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: Thread | None = None
+        self._stop_event = Event()
+
+    @property
+    def metrics(self) -> PulseMetrics:
+        """Return the metrics registry lag and stalls are recorded in."""
+        return self._metrics
+
+    @property
+    def running(self) -> bool:
+        """Return whether the monitor is running."""
+        with self._lm_lock:
+            return self._loop is not None
+
+    @property
+    def stalls(self) -> list[PulseLoopStall]:
+        """Return the most recent stalls, oldest first."""
+        with self._lm_lock:
+            return list(self._stalls)
+
+    def lag_percentile(self, percentile: float) -> float:
+        """Return a percentile of the measured lag in seconds, 0 if unmeasured."""
+        histogram = self._metrics.get_histogram(METRIC_LOOP_LAG)
+        if histogram is None:
+            return 0.0
+        return histogram.percentile(percentile)
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """
+        Start monitoring an event loop.
+
+        Can be called from any thread.
+
+        Args:
+            loop (asyncio.AbstractEventLoop | None, optional): loop to monitor.
+                Defaults to None, which uses the running loop.
+
+        Raises:
+            RuntimeError: if already running, or no loop is given outside a loop
+
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        with self._lm_lock:
+            if self._loop is not None:
+                raise RuntimeError("Loop monitor already running")
+            self._loop = loop
+            self._heartbeat = monotonic()
+            self._stop_event.clear()
+        loop.call_soon_threadsafe(self._start_task)
+
+    def _start_task(self) -> None:
+        with self._lm_lock:
+            if self._loop is None:
+                return
+            self._loop_thread_id = get_ident()
+            self._heartbeat = monotonic()
+            self._task = self._loop.create_task(
+                self._monitor_task(), name=LOOP_MONITOR_TASK_NAME
+            )
+            self._watchdog = Thread(
+                target=self._watchdog_thread,
+                name=LOOP_WATCHDOG_THREAD_NAME,
+                daemon=True,
+            )
+            self._watchdog.start()
+
+    def stop(self) -> None:
+        """Stop monitoring, can be called from any thread."""
+        with self._lm_lock:
+            loop = self._loop
+            task = self._task
+            watchdog = self._watchdog
+            self._loop = None
+            self._task = None
+            self._watchdog = None
+        self._stop_event.set()
+        if loop is not None and task is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(task.cancel)
+        if watchdog is not None and watchdog.ident != get_ident():
+            watchdog.join()
+
+    async def _monitor_task(self) -> None:
+        """Record how late the loop runs a sleep every interval."""
+        try:
+            while True:
+                expected = monotonic() + self._interval
+                await asyncio.sleep(self._interval)
+                now = monotonic()
+                with self._lm_lock:
+                    self._heartbeat = now
+                self._metrics.observe(
+                    METRIC_LOOP_LAG,
+                    max(now - expected, 0.0),
+                    buckets=LOOP_LAG_BUCKETS,
+                )
+        except asyncio.CancelledError:
+            LOG.debug("%s cancelled", LOOP_MONITOR_TASK_NAME)
+
+    def _watchdog_thread(self) -> None:
+        """Capture what the loop thread is running when it stalls."""
+        reported_heartbeat = 0.0
+        while not self._stop_event.wait(self._stall_threshold / 2):
+            with self._lm_lock:
+                heartbeat = self._heartbeat
+                thread_id = self._loop_thread_id
+            stalled_for = monotonic() - heartbeat - self._interval
+            if (
+                stalled_for < self._stall_threshold
+                or heartbeat == reported_heartbeat
+                or thread_id is None
+            ):
+                continue
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(thread_id)
+            self._record_stall(frame, stalled_for)
+
+    def _record_stall(self, frame: FrameType | None, duration: float) -> None:
+        culprit = "unknown"
+        stack = ""
+        if frame is not None:
+            code = frame.f_code
+            filename = code.co_filename.rsplit("/", 1)[-1]
+            culprit = f"{filename}:{code.co_name}"
+            stack = "".join(traceback.format_stack(frame, limit=STALL_STACK_LIMIT))
+        stall = PulseLoopStall(culprit, duration, stack, time())
+        with self._lm_lock:
+            self._stalls.append(stall)
+        self._metrics.increment(METRIC_LOOP_STALLS, {"culprit": culprit})
+        LOG.warning(
+            "Event loop stalled for at least %.3f seconds in %s:\n%s",
+            duration,
+            culprit,
+            stack,
+        )
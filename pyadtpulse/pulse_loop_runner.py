@@ -0,0 +1,147 @@
+"""Shared background event loops for synchronous Pulse sessions."""
+
+import asyncio
+from logging import getLogger
+from threading import Thread
+
+from typeguard import typechecked
+
+from .util import set_debug_lock
+
+LOG = getLogger(__name__)
+
+LOOP_RUNNER_THREAD_NAME = "PyADTPulse Shared Loop"
+
+
+class PulseLoopRunner:
+    """
+    Runs event loops on background threads shared by synchronous sessions.
+
+    By default each PyADTPulse object runs its own event loop on its own thread.
+    Objects created with a loop runner instead run on one of the runner's loops,
+    each session going to the loop with the fewest sessions, so hundreds of
+    sessions need only loop_count threads.  Loops are started when the first
+    session needs one, and run until close() is called.
+    """
+
+    __slots__ = ("_closed", "_loop_count", "_loops", "_lr_lock", "_threads")
+
+    @typechecked
+    def __init__(self, loop_count: int = 1, debug_locks: bool = False) -> None:
+        """
+        Initialize loop runner.
+
+        Args:
+            loop_count (int, optional): number of loops and threads to run.
+                Defaults to 1.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if loop_count is less than 1
+
+        """
+        if loop_count < 1:
+            raise ValueError("loop_count must be at least 1")
+        self._lr_lock = set_debug_lock(debug_locks, "pyadtpulse.lr_lock")
+        self._loop_count = loop_count
+        # sessions running on each started loop
+        self._loops: dict[asyncio.AbstractEventLoop, int] = {}
+        self._threads: list[Thread] = []
+        self._closed = False
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return f"<{self.__class__.__name__}: {self.session_count} sessions>"
+
+    def __enter__(self) -> "PulseLoopRunner":
+        """Return the runner, closing it on exit."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the runner."""
+        self.close()
+
+    @property
+    def loop_count(self) -> int:
+        """Return the maximum number of loops run."""
+        return self._loop_count
+
+    @property
+    def loops(self) -> list[asyncio.AbstractEventLoop]:
+        """Return the running loops."""
+        with self._lr_lock:
+            return list(self._loops)
+
+    @property
+    def session_count(self) -> int:
+        """Return the number of sessions running on the loops."""
+        with self._lr_lock:
+            return sum(self._loops.values())
+
+    def _start_loop(self) -> asyncio.AbstractEventLoop:
+        # imported here so only sessions that run loops pay for it
+        import uvloop  # noqa: PLC0415
+
+        loop = uvloop.new_event_loop()
+        thread = Thread(
+            target=self._run_loop,
+            args=(loop,),
+            name=f"{LOOP_RUNNER_THREAD_NAME} {len(self._threads) + 1}",
+            daemon=True,
+        )
+        self._loops[loop] = 0
+        self._threads.append(thread)
+        thread.start()
+        return loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    def acquire(self) -> asyncio.AbstractEventLoop:
+        """
+        Return the loop a new session should run on.
+
+        Raises:
+            RuntimeError: if the runner is closed
+
+        """
+        with self._lr_lock:
+            if self._closed:
+                raise RuntimeError("Loop runner is closed")
+            if len(self._loops) < self._loop_count and all(self._loops.values()):
+                loop = self._start_loop()
+            else:
+                loop = min(self._loops, key=self._loops.__getitem__)
+            self._loops[loop] += 1
+            return loop
+
+    def release(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Record a session acquired with acquire() finishing."""
+        with self._lr_lock:
+            if self._loops.get(loop, 0) > 0:
+                self._loops[loop] -= 1
+
+    def close(self) -> None:
+        """
+        Stop the loops and wait for their threads to exit.
+
+        Sessions should be logged out first, their tasks are abandoned.
+        """
+        with self._lr_lock:
+            self._closed = True
+            loops = list(self._loops)
+            threads = self._threads
+            self._loops = {}
+            self._threads = []
+        if loops:
+            LOG.debug("Stopping %d shared Pulse event loops", len(loops))
+        for loop in loops:
+            loop.call_soon_threadsafe(loop.stop)
+        for thread in threads:
+            thread.join()
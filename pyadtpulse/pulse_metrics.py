@@ -0,0 +1,477 @@
+"""Pulse metrics."""
+
+from math import inf
+from time import perf_counter
+from bisect import bisect_left
+from contextlib import contextmanager
+from collections.abc import Iterator
+
+from .util import set_debug_lock
+from .const import (
+    ADT_ARM_URI,
+    ADT_ORB_URI,
+    ADT_LOGIN_URI,
+    ADT_DEVICE_URI,
+    ADT_LOGOUT_URI,
+    ADT_SYSTEM_URI,
+    ADT_GATEWAY_URI,
+    ADT_SUMMARY_URI,
+    ADT_TIMEOUT_URI,
+    ADT_ARM_DISARM_URI,
+    ADT_SYNC_CHECK_URI,
+)
+
+METRICS_PREFIX = "pyadtpulse_"
+
+# query manager metric names
+METRIC_REQUESTS = "requests_total"
+METRIC_RESPONSES = "responses_total"
+METRIC_RETRIES = "retries_total"
+METRIC_ERRORS = "errors_total"
+METRIC_RECEIVED_BYTES = "received_bytes_total"
+METRIC_RESPONSE_SIZE = "response_size_bytes"
+METRIC_BACKOFF_WAIT = "backoff_wait_seconds"
+METRIC_RATE_LIMIT_WAIT = "rate_limit_wait_seconds"
+METRIC_TIME_TO_FIRST_BYTE = "time_to_first_byte_seconds"
+METRIC_REQUEST_LATENCY = "request_latency_seconds"
+METRIC_PARSE_TIME = "parse_seconds"
+METRIC_REQUEST_TIMEOUT = "request_timeout_seconds"
+
+# sync check scheduler metric names
+METRIC_SYNC_CHECK_INTERVAL = "sync_check_interval_seconds"
+METRIC_SYNC_CHECK_RATE = "sync_check_requests_per_second"
+
+# update pipeline metric names
+METRIC_UPDATE_STAGE_LATENCY = "update_stage_latency_seconds"
+METRIC_UPDATE_LATENCY = "update_latency_seconds"
+
+# loop monitor metric names
+METRIC_LOOP_LAG = "loop_lag_seconds"
+METRIC_LOOP_STALLS = "loop_stalls_total"
+
+# sync token tracker metric names
+METRIC_SYNC_TOKEN_RESULTS = "sync_token_results_total"
+
+# login admission metric names
+METRIC_LOGIN_QUEUE_DEPTH = "login_queue_depth"
+METRIC_LOGINS_ACTIVE = "logins_in_progress"
+METRIC_LOGIN_ADMISSION_WAIT = "login_admission_wait_seconds"
+
+# session store metric names
+METRIC_SESSION_RESTORES = "session_restores_total"
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+DEFAULT_SIZE_BUCKETS: tuple[float, ...] = (
+    256,
+    1024,
+    4096,
+    16384,
+    65536,
+    262144,
+    1048576,
+)
+
+ENDPOINT_VERSION = "version"
+ENDPOINT_OTHER = "other"
+
+ENDPOINT_NAMES: dict[str, str] = {
+    ADT_ORB_URI: "orb",
+    ADT_SYNC_CHECK_URI: "sync_check",
+    ADT_TIMEOUT_URI: "keepalive",
+    ADT_DEVICE_URI: "device",
+    ADT_GATEWAY_URI: "gateway",
+    ADT_LOGIN_URI: "login",
+    ADT_LOGOUT_URI: "logout",
+    ADT_SUMMARY_URI: "summary",
+    ADT_SYSTEM_URI: "system",
+    ADT_ARM_URI: "arm",
+    ADT_ARM_DISARM_URI: "arm",
+}
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def get_endpoint_name(uri: str) -> str:
+    """
+    Get the metrics endpoint name for a URI.
+
+    Args:
+        uri (str): the URI being queried
+
+    Returns:
+        str: the endpoint name, or "other" if the URI isn't known
+
+    """
+    return ENDPOINT_NAMES.get(uri, ENDPOINT_OTHER)
+
+
+def _make_label_key(labels: dict[str, str] | None) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: tuple[str, str] | None = None) -> str:
+    items = list(key)
+    if extra is not None:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class PulseHistogram:
+    """Fixed bucket histogram."""
+
+    __slots__ = ("_bucket_counts", "_buckets", "_count", "_max", "_sum")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """
+        Initialize histogram.
+
+        Args:
+            buckets (tuple[float, ...], optional): sorted upper bounds of the buckets.
+                Defaults to DEFAULT_LATENCY_BUCKETS.
+
+        """
+        if not buckets or list(buckets) != sorted(buckets):
+            raise ValueError("Histogram buckets must be a non-empty sorted tuple")
+        self._buckets = buckets
+        # last entry is the +Inf bucket
+        self._bucket_counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the histogram."""
+        self._bucket_counts[bisect_left(self._buckets, value)] += 1
+        self._count += 1
+        self._sum += value
+        self._max = max(value, self._max)
+
+    @property
+    def count(self) -> int:
+        """Return number of observations."""
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        """Return sum of all observations."""
+        return self._sum
+
+    @property
+    def max(self) -> float:
+        """Return largest observation."""
+        return self._max
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        """Return bucket upper bounds."""
+        return self._buckets
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Estimate a percentile from the buckets.
+
+        Args:
+            percentile (float): percentile to estimate, between 0 and 100
+
+        Returns:
+            float: the upper bound of the bucket holding the percentile,
+                or the largest observation if it falls in the +Inf bucket.
+                0.0 if there are no observations.
+
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if self._count == 0:
+            return 0.0
+        rank = percentile / 100 * self._count
+        running = 0
+        for i, bucket_count in enumerate(self._bucket_counts):
+            running += bucket_count
+            if running >= rank and running > 0:
+                if i == len(self._buckets):
+                    return self._max
+                return min(self._buckets[i], self._max)
+        return self._max
+
+    def cumulative_counts(self) -> list[int]:
+        """Return cumulative bucket counts, the last entry being the +Inf bucket."""
+        result: list[int] = []
+        running = 0
+        for bucket_count in self._bucket_counts:
+            running += bucket_count
+            result.append(running)
+        return result
+
+    def merge(self, other: "PulseHistogram") -> None:
+        """
+        Add observations of another histogram to this one.
+
+        Raises:
+            ValueError: if the histograms have different buckets
+
+        """
+        if other.buckets != self._buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        for i, bucket_count in enumerate(other._bucket_counts):
+            self._bucket_counts[i] += bucket_count
+        self._count += other.count
+        self._sum += other.sum
+        self._max = max(other.max, self._max)
+
+    def copy(self) -> "PulseHistogram":
+        """Return a copy of the histogram."""
+        result = PulseHistogram(self._buckets)
+        result.merge(self)
+        return result
+
+    def snapshot(self) -> dict[str, float]:
+        """Return a summary of the histogram."""
+        return {
+            "count": self._count,
+            "sum": self._sum,
+            "max": self._max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class PulseMetrics:
+    """
+    In-process metrics registry.
+
+    Holds counters, gauges and histograms keyed by name and labels.  Values can be
+    read with snapshot() or exported in Prometheus text format with to_prometheus().
+    """
+
+    __slots__ = ("__weakref__", "_counters", "_gauges", "_histograms", "_m_lock")
+
+    def __init__(self, debug_locks: bool = False) -> None:
+        """Initialize metrics registry."""
+        self._m_lock = set_debug_lock(debug_locks, "pyadtpulse.metrics_lock")
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, PulseHistogram]] = {}
+
+    def __getstate__(self) -> dict:
+        """Return the values to pickle, leaving out the lock."""
+        with self._m_lock:
+            return {
+                "counters": {n: dict(v) for n, v in self._counters.items()},
+                "gauges": {n: dict(v) for n, v in self._gauges.items()},
+                "histograms": {
+                    n: {k: h.copy() for k, h in v.items()}
+                    for n, v in self._histograms.items()
+                },
+            }
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled values with a new lock."""
+        self._m_lock = set_debug_lock(False, "pyadtpulse.metrics_lock")
+        self._counters = state["counters"]
+        self._gauges = state["gauges"]
+        self._histograms = state["histograms"]
+
+    def increment(
+        self, name: str, labels: dict[str, str] | None = None, amount: float = 1
+    ) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): counter name
+            labels (dict[str, str] | None, optional): counter labels
+            amount (float, optional): amount to increment by. Defaults to 1.
+
+        """
+        key = _make_label_key(labels)
+        with self._m_lock:
+            counter = self._counters.setdefault(name, {})
+            counter[key] = counter.get(key, 0) + amount
+
+    def set_gauge(
+        self, name: str, value: float, labels: dict[str, str] | None = None
+    ) -> None:
+        """Set a gauge to a value."""
+        key = _make_label_key(labels)
+        with self._m_lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: dict[str, str] | None = None,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        """
+        Add an observation to a histogram.
+
+        Args:
+            name (str): histogram name
+            value (float): value to add
+            labels (dict[str, str] | None, optional): histogram labels
+            buckets (tuple[float, ...], optional): buckets to use if the histogram
+                doesn't exist yet. Defaults to DEFAULT_LATENCY_BUCKETS.
+
+        """
+        key = _make_label_key(labels)
+        with self._m_lock:
+            histograms = self._histograms.setdefault(name, {})
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = PulseHistogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, labels: dict[str, str] | None = None) -> Iterator[None]:
+        """Context manager adding the elapsed time of its block to a histogram."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start, labels)
+
+    def get_counter(self, name: str, labels: dict[str, str] | None = None) -> float:
+        """Return a counter value, 0 if it doesn't exist."""
+        with self._m_lock:
+            return self._counters.get(name, {}).get(_make_label_key(labels), 0)
+
+    def get_gauge(
+        self, name: str, labels: dict[str, str] | None = None
+    ) -> float | None:
+        """Return a gauge value, None if it doesn't exist."""
+        with self._m_lock:
+            return self._gauges.get(name, {}).get(_make_label_key(labels))
+
+    def get_histogram(
+        self, name: str, labels: dict[str, str] | None = None
+    ) -> PulseHistogram | None:
+        """Return a copy of a histogram, None if it doesn't exist."""
+        with self._m_lock:
+            histogram = self._histograms.get(name, {}).get(_make_label_key(labels))
+            if histogram is None:
+                return None
+            return histogram.copy()
+
+    def merge(self, other: "PulseMetrics") -> None:
+        """
+        Add the values of another metrics registry to this one.
+
+        Counters and histograms are summed, gauges are overwritten.
+        """
+        with other._m_lock:
+            counters = {n: dict(v) for n, v in other._counters.items()}
+            gauges = {n: dict(v) for n, v in other._gauges.items()}
+            histograms = {
+                n: {k: h.copy() for k, h in v.items()}
+                for n, v in other._histograms.items()
+            }
+        with self._m_lock:
+            for name, values in counters.items():
+                counter = self._counters.setdefault(name, {})
+                for key, value in values.items():
+                    counter[key] = counter.get(key, 0) + value
+            for name, values in gauges.items():
+                self._gauges.setdefault(name, {}).update(values)
+            for name, hist_values in histograms.items():
+                dest = self._histograms.setdefault(name, {})
+                for key, histogram in hist_values.items():
+                    if key in dest:
+                        dest[key].merge(histogram)
+                    else:
+                        dest[key] = histogram
+
+    def reset(self) -> None:
+        """Remove all metrics."""
+        with self._m_lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[str, dict[str, dict[LabelKey, float | dict]]]:
+        """
+        Return a snapshot of all metrics.
+
+        Returns:
+            dict: with keys "counters", "gauges" and "histograms", each mapping
+                metric name to a dictionary of label tuple to value.  Histogram
+                values are the result of PulseHistogram.snapshot().
+
+        """
+        with self._m_lock:
+            return {
+                "counters": {n: dict(v) for n, v in self._counters.items()},
+                "gauges": {n: dict(v) for n, v in self._gauges.items()},
+                "histograms": {
+                    n: {k: h.snapshot() for k, h in v.items()}
+                    for n, v in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = METRICS_PREFIX) -> str:
+        """
+        Export metrics in Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): prefix to add to metric names.
+                Defaults to METRICS_PREFIX.
+
+        Returns:
+            str: the metrics in Prometheus text format
+
+        """
+        lines: list[str] = []
+        with self._m_lock:
+            for name, values in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                lines.extend(
+                    f"{prefix}{name}{_format_labels(k)} {_format_value(v)}"
+                    for k, v in sorted(values.items())
+                )
+            for name, values in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {prefix}{name} gauge")
+                lines.extend(
+                    f"{prefix}{name}{_format_labels(k)} {_format_value(v)}"
+                    for k, v in sorted(values.items())
+                )
+            for name, hist_values in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for key, histogram in sorted(hist_values.items()):
+                    bounds = (*histogram.buckets, inf)
+                    for bound, count in zip(
+                        bounds, histogram.cumulative_counts(), strict=True
+                    ):
+                        labels = _format_labels(key, ("le", _format_value(bound)))
+                        lines.append(f"{prefix}{name}_bucket{labels} {count}")
+                    labels = _format_labels(key)
+                    lines.append(
+                        f"{prefix}{name}_sum{labels} {_format_value(histogram.sum)}"
+                    )
+                    lines.append(f"{prefix}{name}_count{labels} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,795 @@
+"""Run ADT Pulse accounts in a pool of worker processes."""
+
+import pickle
+import asyncio
+from os import cpu_count
+from bisect import bisect
+from hashlib import blake2b
+from logging import getLogger
+from threading import Thread
+from dataclasses import replace
+from collections.abc import Callable, AsyncGenerator
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+from multiprocessing.connection import Connection
+
+from typeguard import typechecked
+
+from .util import set_debug_lock
+from .const import DEFAULT_API_HOST
+from .pulse_events import PulseEvent, ConnectionStateChanged
+from .pulse_metrics import PulseMetrics
+from .pulse_event_hub import (
+    OVERFLOW_COALESCE,
+    DEFAULT_QUEUE_SIZE,
+    PulseEventHub,
+    PulseEventSubscription,
+)
+from .pulse_transport import PulseTransport
+from .pulse_rate_limiter import PulseRateLimiter
+from .pulse_account_manager import (
+    DEFAULT_LOGIN_INTERVAL,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_MAX_CONCURRENT_LOGINS,
+    PulseAccountManager,
+)
+
+LOG = getLogger(__name__)
+
+DEFAULT_VIRTUAL_NODES = 64
+DEFAULT_METRICS_INTERVAL = 10.0
+WORKER_CLOSE_TIMEOUT = 30.0
+WORKER_PROCESS_NAME = "PyADTPulse Worker"
+WORKER_READER_THREAD_NAME = "PyADTPulse Worker Reader"
+POOL_MOVE_TASK_NAME = "ADT Pulse Account Move Task"
+
+# messages are tuples starting with one of these
+# parent to worker: (_ADD, username, password, fingerprint), (_REMOVE, username)
+# and (_CLOSE,)
+_ADD = 0
+_REMOVE = 1
+_CLOSE = 2
+# worker to parent: (_LOGIN, username, exception or None), (_REMOVED, username),
+# (_EVENT, event), (_METRICS, metrics) and (_CLOSED,)
+_LOGIN = 3
+_REMOVED = 4
+_EVENT = 5
+_METRICS = 6
+_CLOSED = 7
+
+
+class PulseHashRing:
+    """
+    Consistent hash ring assigning keys to nodes.
+
+    Each node is put at virtual_nodes points on the ring, and a key belongs to
+    the node owning the first point after the key's hash.  Adding or removing a
+    node only moves the keys belonging to that node's points.
+    """
+
+    __slots__ = ("_nodes", "_owners", "_points", "_virtual_nodes")
+
+    @typechecked
+    def __init__(self, virtual_nodes: int = DEFAULT_VIRTUAL_NODES) -> None:
+        """
+        Initialize hash ring.
+
+        Args:
+            virtual_nodes (int, optional): points on the ring for each node.
+                Defaults to DEFAULT_VIRTUAL_NODES.
+
+        Raises:
+            ValueError: if virtual_nodes is less than 1
+
+        """
+        if virtual_nodes < 1:
+            raise ValueError("virtual_nodes must be at least 1")
+        self._virtual_nodes = virtual_nodes
+        self._nodes: set[int] = set()
+        # sorted points and the node owning each
+        self._points: list[int] = []
+        self._owners: dict[int, int] = {}
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return f"<{self.__class__.__name__}: {len(self)} nodes>"
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self._nodes)
+
+    @property
+    def nodes(self) -> set[int]:
+        """Return the nodes on the ring."""
+        return set(self._nodes)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    def add(self, node: int) -> None:
+        """Add a node, doing nothing if it is already on the ring."""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self._virtual_nodes):
+            # a point already taken stays with its node
+            self._owners.setdefault(self._hash(f"{node}-{i}"), node)
+        self._points = sorted(self._owners)
+
+    def remove(self, node: int) -> None:
+        """Remove a node, doing nothing if it isn't on the ring."""
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._owners = {p: n for p, n in self._owners.items() if n != node}
+        self._points = sorted(self._owners)
+
+    def get(self, key: str) -> int:
+        """
+        Return the node a key belongs to.
+
+        Raises:
+            LookupError: if the ring has no nodes
+
+        """
+        if not self._points:
+            raise LookupError("hash ring has no nodes")
+        index = bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+def _portable_exception(exception: Exception | None) -> Exception | None:
+    """Return an exception which can be sent to another process."""
+    if exception is None:
+        return None
+    try:
+        pickle.loads(pickle.dumps(exception))
+    except Exception:
+        return RuntimeError(f"{type(exception).__name__}: {exception}")
+    return exception
+
+
+def _run_worker(
+    connection: Connection,
+    manager_args: dict,
+    rate_limits: dict[str, tuple[float, float]] | None,
+    transport_factory: Callable[[], PulseTransport] | None,
+    metrics_interval: float,
+    debug_locks: bool,
+) -> None:
+    """Run a worker process's accounts until the pool closes it."""
+    asyncio.run(
+        _worker_main(
+            connection,
+            manager_args,
+            rate_limits,
+            transport_factory,
+            metrics_interval,
+            debug_locks,
+        )
+    )
+
+
+async def _worker_main(  # noqa: PLR0915
+    connection: Connection,
+    manager_args: dict,
+    rate_limits: dict[str, tuple[float, float]] | None,
+    transport_factory: Callable[[], PulseTransport] | None,
+    metrics_interval: float,
+    debug_locks: bool,
+) -> None:
+    loop = asyncio.get_running_loop()
+    commands: asyncio.Queue[tuple] = asyncio.Queue()
+    tasks: set[asyncio.Task] = set()
+
+    def read_commands() -> None:
+        while True:
+            try:
+                command = connection.recv()
+            except (EOFError, OSError):
+                # the parent has gone
+                command = (_CLOSE,)
+            loop.call_soon_threadsafe(commands.put_nowait, command)
+            if command[0] == _CLOSE:
+                return
+
+    def send(message: tuple) -> None:
+        try:
+            connection.send(message)
+        except (OSError, ValueError):
+            LOG.debug("Could not send message %d to the pool", message[0])
+
+    def start(coro) -> None:
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def forward_events(events: AsyncGenerator[PulseEvent]) -> None:
+        async for event in events:
+            message = event
+            if isinstance(event, ConnectionStateChanged):
+                message = replace(event, exception=_portable_exception(event.exception))
+            send((_EVENT, message))
+
+    async def send_metrics() -> None:
+        while True:
+            await asyncio.sleep(metrics_interval)
+            send((_METRICS, manager.metrics))
+
+    async def report_login(username: str) -> None:
+        exception = await manager.wait_for_login(username)
+        send((_LOGIN, username, _portable_exception(exception)))
+
+    async def remove(username: str) -> None:
+        try:
+            await manager.remove_account(username)
+        except KeyError:
+            pass
+        send((_REMOVED, username))
+
+    manager = PulseAccountManager(
+        **manager_args,
+        rate_limiter=PulseRateLimiter(rate_limits, debug_locks=debug_locks),
+        debug_locks=debug_locks,
+    )
+    Thread(target=read_commands, name=WORKER_READER_THREAD_NAME, daemon=True).start()
+    async with manager:
+        events = manager.events()
+        start(forward_events(events))
+        start(send_metrics())
+        while True:
+            command, *args = await commands.get()
+            if command == _ADD:
+                username, password, fingerprint = args
+                try:
+                    manager.add_account(
+                        username,
+                        password,
+                        fingerprint,
+                        transport_factory() if transport_factory else None,
+                    )
+                except ValueError as e:
+                    send((_LOGIN, username, e))
+                    continue
+                start(report_login(username))
+            elif command == _REMOVE:
+                start(remove(args[0]))
+            elif command == _CLOSE:
+                break
+        send((_METRICS, manager.metrics))
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await events.aclose()
+    send((_CLOSED,))
+    connection.close()
+
+
+class _PulseWorker:
+    """Parent side of a worker process."""
+
+    __slots__ = ("accounts", "closed", "connection", "metrics", "process", "worker_id")
+
+    def __init__(
+        self,
+        worker_id: int,
+        process: BaseProcess,
+        connection: Connection,
+        closed: asyncio.Future,
+    ) -> None:
+        self.worker_id = worker_id
+        self.process = process
+        self.connection = connection
+        # resolved when the worker closes or exits
+        self.closed = closed
+        self.accounts: set[str] = set()
+        self.metrics: PulseMetrics | None = None
+
+
+class PulseProcessPool:
+    """
+    Runs ADT Pulse accounts in a pool of worker processes.
+
+    Works like PulseAccountManager, but spreads the accounts over worker_count
+    processes, each running its own PulseAccountManager, so thousands of
+    accounts aren't limited to one CPU core.  Accounts are assigned to workers
+    by consistent hashing of the username.  When a worker dies its accounts are
+    moved to the remaining workers, and add_worker() moves a share of every
+    worker's accounts to a new one; no other account changes worker.
+
+    Events and metrics are sent back over a pipe to each worker.  Metrics are
+    sent every metrics_interval seconds, so metrics may be that much out of date.
+    The login limits and rate limits apply to each worker separately.
+
+    Workers are spawned, not forked, so programs using the pool must guard their
+    entry point with if __name__ == "__main__", and transport_factory must be
+    picklable, i.e. a module level function or a functools.partial of one.
+    Workers don't inherit the parent's logging configuration.
+    """
+
+    __slots__ = (
+        "_closing",
+        "_credentials",
+        "_debug_locks",
+        "_event_hub",
+        "_exited_metrics",
+        "_logins",
+        "_loop",
+        "_manager_args",
+        "_metrics_interval",
+        "_next_worker_id",
+        "_owners",
+        "_pp_lock",
+        "_rate_limits",
+        "_removals",
+        "_ring",
+        "_tasks",
+        "_transport_factory",
+        "_worker_count",
+        "_workers",
+    )
+
+    @typechecked
+    def __init__(
+        self,
+        worker_count: int | None = None,
+        service_host: str = DEFAULT_API_HOST,
+        login_interval: float = DEFAULT_LOGIN_INTERVAL,
+        max_concurrent_logins: int = DEFAULT_MAX_CONCURRENT_LOGINS,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        rate_limits: dict[str, tuple[float, float]] | None = None,
+        transport_factory: Callable[[], PulseTransport] | None = None,
+        metrics_interval: float = DEFAULT_METRICS_INTERVAL,
+        virtual_nodes: int = DEFAULT_VIRTUAL_NODES,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize process pool.
+
+        Args:
+            worker_count (int | None, optional): number of worker processes.
+                Defaults to None, which uses the number of CPUs.
+            service_host (str, optional): host prefix to use for all accounts.
+                Defaults to DEFAULT_API_HOST.
+            login_interval (float, optional): seconds between starting logins in
+                each worker. Defaults to DEFAULT_LOGIN_INTERVAL.
+            max_concurrent_logins (int, optional): maximum logins in progress in
+                each worker. Defaults to DEFAULT_MAX_CONCURRENT_LOGINS.
+            connection_limit (int, optional): maximum connections in each
+                worker's pool. Defaults to DEFAULT_CONNECTION_LIMIT.
+            rate_limits (dict[str, tuple[float, float]] | None, optional): limits
+                for each worker's PulseRateLimiter. Defaults to None.
+            transport_factory (Callable[[], PulseTransport] | None, optional):
+                called in the worker to create each account's transport.
+                Defaults to None, which uses the worker's shared pool.
+            metrics_interval (float, optional): seconds between workers sending
+                their metrics. Defaults to DEFAULT_METRICS_INTERVAL.
+            virtual_nodes (int, optional): hash ring points for each worker.
+                Defaults to DEFAULT_VIRTUAL_NODES.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if an argument is out of range
+
+        """
+        if worker_count is None:
+            worker_count = cpu_count() or 1
+        if worker_count < 1:
+            raise ValueError("worker_count must be at least 1")
+        if metrics_interval <= 0:
+            raise ValueError("metrics_interval must be positive")
+        self._manager_args = {
+            "service_host": service_host,
+            "login_interval": login_interval,
+            "max_concurrent_logins": max_concurrent_logins,
+            "connection_limit": connection_limit,
+        }
+        # check the arguments here rather than in every worker
+        PulseAccountManager(**self._manager_args)
+        PulseRateLimiter(rate_limits)
+        self._pp_lock = set_debug_lock(debug_locks, "pyadtpulse.pp_lock")
+        self._worker_count = worker_count
+        self._rate_limits = rate_limits
+        self._transport_factory = transport_factory
+        self._metrics_interval = metrics_interval
+        self._debug_locks = debug_locks
+        self._ring = PulseHashRing(virtual_nodes)
+        self._workers: dict[int, _PulseWorker] = {}
+        self._next_worker_id = 0
+        self._credentials: dict[str, tuple[str, str]] = {}
+        # worker id of each account, accounts being moved have none
+        self._owners: dict[str, int] = {}
+        self._logins: dict[str, asyncio.Future[Exception | None]] = {}
+        self._removals: dict[tuple[int, str], asyncio.Future[None]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._event_hub = PulseEventHub(debug_locks=debug_locks)
+        # metrics of workers which have exited
+        self._exited_metrics = PulseMetrics(debug_locks)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closing = False
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return (
+            f"<{self.__class__.__name__}: {len(self)} accounts, "
+            f"{len(self.workers)} workers>"
+        )
+
+    def __len__(self) -> int:
+        """Return the number of accounts."""
+        with self._pp_lock:
+            return len(self._credentials)
+
+    async def __aenter__(self) -> "PulseProcessPool":
+        """Return the pool, closing it on exit."""
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Log out every account and stop the workers."""
+        await self.close()
+
+    @property
+    def usernames(self) -> list[str]:
+        """Return the usernames of the accounts."""
+        with self._pp_lock:
+            return list(self._credentials)
+
+    @property
+    def workers(self) -> list[int]:
+        """Return the ids of the running workers."""
+        with self._pp_lock:
+            return list(self._workers)
+
+    def get_worker(self, username: str) -> int | None:
+        """
+        Return the id of the worker running an account.
+
+        Returns:
+            int | None: the worker id, None if the account is being moved
+
+        Raises:
+            KeyError: if the account wasn't added
+
+        """
+        with self._pp_lock:
+            if username not in self._credentials:
+                raise KeyError(username)
+            return self._owners.get(username)
+
+    def _start_worker(self) -> _PulseWorker:
+        """Start a worker process and put it on the ring."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        context = get_context("spawn")
+        connection, child_connection = context.Pipe()
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        process = context.Process(
+            target=_run_worker,
+            args=(
+                child_connection,
+                self._manager_args,
+                self._rate_limits,
+                self._transport_factory,
+                self._metrics_interval,
+                self._debug_locks,
+            ),
+            name=f"{WORKER_PROCESS_NAME} {worker_id}",
+            daemon=True,
+        )
+        process.start()
+        # so the reader sees EOF when the worker exits
+        child_connection.close()
+        worker = _PulseWorker(
+            worker_id, process, connection, self._loop.create_future()
+        )
+        self._workers[worker_id] = worker
+        self._ring.add(worker_id)
+        Thread(
+            target=self._read_worker,
+            args=(worker, self._loop),
+            name=f"{WORKER_READER_THREAD_NAME} {worker_id}",
+            daemon=True,
+        ).start()
+        return worker
+
+    def _read_worker(
+        self, worker: _PulseWorker, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """Pass a worker's messages to the event loop until it exits."""
+        while True:
+            try:
+                message = worker.connection.recv()
+            except (EOFError, OSError):
+                break
+            except Exception:
+                LOG.exception("Could not read message from worker %d", worker.worker_id)
+                continue
+            try:
+                loop.call_soon_threadsafe(self._handle_message, worker, message)
+            except RuntimeError:
+                # the loop has been closed
+                return
+        try:
+            loop.call_soon_threadsafe(self._worker_exited, worker)
+        except RuntimeError:
+            pass
+
+    def _handle_message(self, worker: _PulseWorker, message: tuple) -> None:
+        kind = message[0]
+        if kind == _EVENT:
+            self._event_hub.publish_event(message[1])
+            return
+        with self._pp_lock:
+            if kind == _LOGIN:
+                username, exception = message[1:]
+                login = self._logins.get(username)
+                if (
+                    login is not None
+                    and not login.done()
+                    and self._owners.get(username) == worker.worker_id
+                ):
+                    login.set_result(exception)
+            elif kind == _REMOVED:
+                removal = self._removals.pop((worker.worker_id, message[1]), None)
+                if removal is not None and not removal.done():
+                    removal.set_result(None)
+            elif kind == _METRICS:
+                worker.metrics = message[1]
+            elif kind == _CLOSED and not worker.closed.done():
+                worker.closed.set_result(None)
+
+    def _worker_exited(self, worker: _PulseWorker) -> None:
+        """Move the accounts of a worker which has exited."""
+        with self._pp_lock:
+            if self._workers.get(worker.worker_id) is not worker:
+                return
+            del self._workers[worker.worker_id]
+            self._ring.remove(worker.worker_id)
+            if worker.metrics is not None:
+                self._exited_metrics.merge(worker.metrics)
+            if not worker.closed.done():
+                worker.closed.set_result(None)
+            # the worker's sessions are gone with it
+            for key in [k for k in self._removals if k[0] == worker.worker_id]:
+                removal = self._removals.pop(key)
+                if not removal.done():
+                    removal.set_result(None)
+            if self._closing:
+                return
+            LOG.warning(
+                "Pulse worker %d exited, moving its %d accounts",
+                worker.worker_id,
+                len(worker.accounts),
+            )
+            for username in worker.accounts:
+                if self._owners.get(username) == worker.worker_id:
+                    del self._owners[username]
+                    self._assign(username)
+
+    def _send(self, worker: _PulseWorker, message: tuple) -> None:
+        try:
+            worker.connection.send(message)
+        except (OSError, ValueError):
+            # the reader thread sees the worker exit
+            LOG.debug(
+                "Could not send message %d to worker %d", message[0], worker.worker_id
+            )
+
+    def _assign(self, username: str) -> None:
+        """Start an account on the worker the ring gives it."""
+        login = self._logins[username]
+        if login.done():
+            login = asyncio.get_running_loop().create_future()
+            self._logins[username] = login
+        try:
+            worker = self._workers[self._ring.get(username)]
+        except LookupError:
+            LOG.error("No Pulse workers left to run %s", username)
+            login.set_result(RuntimeError("No worker processes left"))
+            return
+        self._owners[username] = worker.worker_id
+        worker.accounts.add(username)
+        password, fingerprint = self._credentials[username]
+        self._send(worker, (_ADD, username, password, fingerprint))
+
+    async def _stop_on_worker(self, worker: _PulseWorker, username: str) -> None:
+        """Log out an account on a worker and wait until it has."""
+        removal = asyncio.get_running_loop().create_future()
+        with self._pp_lock:
+            if worker.worker_id not in self._workers:
+                return
+            self._removals[(worker.worker_id, username)] = removal
+        self._send(worker, (_REMOVE, username))
+        await removal
+
+    async def _move(self, worker: _PulseWorker, username: str) -> None:
+        await self._stop_on_worker(worker, username)
+        with self._pp_lock:
+            # it may have been removed meanwhile
+            if username in self._credentials and username not in self._owners:
+                self._assign(username)
+
+    @typechecked
+    def add_account(self, username: str, password: str, fingerprint: str) -> None:
+        """
+        Add an account and schedule its login on a worker.
+
+        Must be called from the event loop.  Workers are started when the first
+        account is added.  Use wait_for_logins() to wait until scheduled logins
+        finish.
+
+        Args:
+            username (str): Username.
+            password (str): Password.
+            fingerprint (str): 2FA fingerprint.
+
+        Raises:
+            ValueError: if the account was already added
+            RuntimeError: if the pool has been closed
+
+        """
+        with self._pp_lock:
+            if self._closing:
+                raise RuntimeError("Process pool is closed")
+            if username in self._credentials:
+                raise ValueError(f"Account {username} already added")
+            if self._loop is None:
+                for _ in range(self._worker_count):
+                    self._start_worker()
+            self._credentials[username] = (password, fingerprint)
+            self._logins[username] = asyncio.get_running_loop().create_future()
+            self._assign(username)
+
+    def add_worker(self) -> int:
+        """
+        Start another worker and move its share of the accounts to it.
+
+        Must be called from the event loop.
+
+        Returns:
+            int: the new worker's id
+
+        Raises:
+            RuntimeError: if the pool has been closed
+
+        """
+        with self._pp_lock:
+            if self._closing:
+                raise RuntimeError("Process pool is closed")
+            worker = self._start_worker()
+            for username, worker_id in list(self._owners.items()):
+                if self._ring.get(username) != worker.worker_id:
+                    continue
+                old_worker = self._workers[worker_id]
+                old_worker.accounts.discard(username)
+                del self._owners[username]
+                # wait_for_logins() waits for the move
+                self._logins[username] = asyncio.get_running_loop().create_future()
+                task = asyncio.create_task(
+                    self._move(old_worker, username),
+                    name=f"{POOL_MOVE_TASK_NAME}: {username}",
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        return worker.worker_id
+
+    async def wait_for_logins(self) -> dict[str, Exception]:
+        """
+        Wait for every scheduled login to finish.
+
+        Returns:
+            dict[str, Exception]: the exception of each failed login, keyed by
+                username
+
+        """
+        while True:
+            with self._pp_lock:
+                logins = dict(self._logins)
+            pending = [login for login in logins.values() if not login.done()]
+            if not pending:
+                break
+            # accounts moved meanwhile get new logins
+            await asyncio.wait(pending)
+        return {
+            username: login.result()
+            for username, login in logins.items()
+            if not login.cancelled() and login.result() is not None
+        }
+
+    async def remove_account(self, username: str) -> None:
+        """
+        Log out and remove an account.
+
+        Raises:
+            KeyError: if the account wasn't added
+
+        """
+        with self._pp_lock:
+            del self._credentials[username]
+            login = self._logins.pop(username)
+            worker_id = self._owners.pop(username, None)
+            worker = self._workers.get(worker_id) if worker_id is not None else None
+            if worker is not None:
+                worker.accounts.discard(username)
+        login.cancel()
+        if worker is not None:
+            await self._stop_on_worker(worker, username)
+
+    def events(
+        self,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_COALESCE,
+    ) -> AsyncGenerator[PulseEvent]:
+        """
+        Iterate over typed events from every account.
+
+        Works like PulseAccountManager.events().
+
+        Args:
+            queue_size (int, optional): maximum number of queued events.
+                Defaults to DEFAULT_QUEUE_SIZE.
+            overflow (str, optional): OVERFLOW_COALESCE or OVERFLOW_DROP_OLDEST.
+                Defaults to OVERFLOW_COALESCE.
+
+        Returns:
+            AsyncGenerator[PulseEvent, None]: the events
+
+        """
+        subscription = self._event_hub.subscribe("workers", queue_size, overflow)
+        return self._iterate_events(subscription)
+
+    @staticmethod
+    async def _iterate_events(
+        subscription: PulseEventSubscription,
+    ) -> AsyncGenerator[PulseEvent]:
+        try:
+            async for event in subscription:
+                if isinstance(event, PulseEvent):
+                    yield event
+        finally:
+            subscription.close()
+
+    @property
+    def metrics(self) -> PulseMetrics:
+        """
+        Return the metrics of every account added together.
+
+        Holds the metrics last sent by each worker, and those of workers which
+        have exited.
+        """
+        metrics = PulseMetrics(self._debug_locks)
+        with self._pp_lock:
+            metrics.merge(self._exited_metrics)
+            for worker in self._workers.values():
+                if worker.metrics is not None:
+                    metrics.merge(worker.metrics)
+        return metrics
+
+    async def close(self) -> None:
+        """Log out every account and stop the workers."""
+        with self._pp_lock:
+            self._closing = True
+            workers = list(self._workers.values())
+            logins = list(self._logins.values())
+            self._credentials.clear()
+            self._logins.clear()
+            self._owners.clear()
+        for login in logins:
+            login.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        for worker in workers:
+            self._send(worker, (_CLOSE,))
+        if workers:
+            await asyncio.wait(
+                [worker.closed for worker in workers], timeout=WORKER_CLOSE_TIMEOUT
+            )
+        for worker in workers:
+            await asyncio.to_thread(worker.process.join, WORKER_CLOSE_TIMEOUT)
+            if worker.process.is_alive():
+                LOG.warning("Pulse worker %d did not stop", worker.worker_id)
+                worker.process.terminate()
+            worker.connection.close()
+        self._event_hub.close()
@@ -1,7 +1,8 @@
 """Pulse Query Manager."""
 
 from http import HTTPStatus
-from time import time
+from time import time, perf_counter
+from typing import TYPE_CHECKING
 from asyncio import wait_for
 from logging import getLogger
 from datetime import datetime
@@ -10,10 +11,7 @@ from lxml import html
 from yarl import URL
 from aiohttp import (
     ClientError,
-    ClientTimeout,
-    ClientResponse,
     ServerTimeoutError,
-    ClientResponseError,
     ClientConnectorError,
     ClientConnectionError,
     ServerConnectionError,
@@ -35,9 +33,33 @@ from .exceptions import (
     PulseServiceTemporarilyUnavailableError,
 )
 from .pulse_backoff import PulseBackoff
+from .pulse_metrics import (
+    METRIC_ERRORS,
+    METRIC_RETRIES,
+    METRIC_REQUESTS,
+    ENDPOINT_VERSION,
+    METRIC_RESPONSES,
+    METRIC_PARSE_TIME,
+    METRIC_BACKOFF_WAIT,
+    DEFAULT_SIZE_BUCKETS,
+    METRIC_RESPONSE_SIZE,
+    METRIC_RECEIVED_BYTES,
+    METRIC_RATE_LIMIT_WAIT,
+    METRIC_REQUEST_LATENCY,
+    METRIC_REQUEST_TIMEOUT,
+    METRIC_TIME_TO_FIRST_BYTE,
+    PulseMetrics,
+    get_endpoint_name,
+)
+from .pulse_transport import PulseResponse
+from .pulse_rate_limiter import PulseRateLimiter
+from .pulse_timeout_policy import PulseTimeoutPolicy
 from .pulse_connection_status import PulseConnectionStatus
 from .pulse_connection_properties import PulseConnectionProperties
 
+if TYPE_CHECKING:
+    from .pulse_recorder import PulseRecorder
+
 LOG = getLogger(__name__)
 
 RECOVERABLE_ERRORS = {
@@ -56,7 +78,11 @@ class PulseQueryManager:
         "_connection_properties",
         "_connection_status",
         "_debug_locks",
+        "_metrics",
         "_pqm_attribute_lock",
+        "_rate_limiter",
+        "_recorder",
+        "_timeout_policy",
     )
 
     @staticmethod
@@ -72,27 +98,154 @@ class PulseQueryManager:
         connection_status: PulseConnectionStatus,
         connection_properties: PulseConnectionProperties,
         debug_locks: bool = False,
+        metrics: PulseMetrics | None = None,
+        timeout_policy: PulseTimeoutPolicy | None = None,
     ) -> None:
-        """Initialize Pulse Query Manager."""
+        """
+        Initialize Pulse Query Manager.
+
+        Args:
+            connection_status (PulseConnectionStatus): connection status
+            connection_properties (PulseConnectionProperties): connection properties
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+            metrics (PulseMetrics | None, optional): metrics registry to record
+                query metrics into.  Defaults to None, which creates a new registry.
+            timeout_policy (PulseTimeoutPolicy | None, optional): policy choosing
+                request timeouts.  Defaults to None, which creates a new policy.
+
+        """
         self._pqm_attribute_lock = set_debug_lock(
             debug_locks, "pyadtpulse.pqm_attribute_lock"
         )
         self._connection_status = connection_status
         self._connection_properties = connection_properties
         self._debug_locks = debug_locks
+        self._metrics = metrics if metrics is not None else PulseMetrics(debug_locks)
+        self._recorder: PulseRecorder | None = None
+        self._rate_limiter: PulseRateLimiter | None = None
+        self._timeout_policy = (
+            timeout_policy
+            if timeout_policy is not None
+            else PulseTimeoutPolicy(debug_locks=debug_locks)
+        )
+
+    @property
+    def metrics(self) -> PulseMetrics:
+        """Return the metrics registry."""
+        return self._metrics
+
+    @property
+    def timeout_policy(self) -> PulseTimeoutPolicy:
+        """Return the request timeout policy."""
+        with self._pqm_attribute_lock:
+            return self._timeout_policy
+
+    @timeout_policy.setter
+    def timeout_policy(self, timeout_policy: PulseTimeoutPolicy) -> None:
+        """Set the request timeout policy."""
+        with self._pqm_attribute_lock:
+            self._timeout_policy = timeout_policy
+
+    def _get_timeout(self, endpoint: str, timeout: float | None) -> float:
+        """Return the timeout for a request, recording it as a gauge."""
+        if timeout is None:
+            timeout = self.timeout_policy.get_timeout(endpoint)
+        self._metrics.set_gauge(METRIC_REQUEST_TIMEOUT, timeout, {"endpoint": endpoint})
+        return timeout
+
+    @property
+    def recorder(self) -> "PulseRecorder | None":
+        """Return the session recorder, None if not recording."""
+        with self._pqm_attribute_lock:
+            return self._recorder
+
+    @recorder.setter
+    def recorder(self, recorder: "PulseRecorder | None") -> None:
+        """Set the session recorder, None to stop recording."""
+        with self._pqm_attribute_lock:
+            self._recorder = recorder
+
+    @property
+    def rate_limiter(self) -> PulseRateLimiter | None:
+        """Return the request rate limiter, None if requests aren't limited."""
+        with self._pqm_attribute_lock:
+            return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: PulseRateLimiter | None) -> None:
+        """Set the request rate limiter, None to stop limiting requests."""
+        with self._pqm_attribute_lock:
+            self._rate_limiter = rate_limiter
+
+    async def _wait_for_rate_limiter(self, endpoint: str) -> None:
+        """Wait for the rate limiter, recording the time waited."""
+        rate_limiter = self.rate_limiter
+        if rate_limiter is None:
+            return
+        waited = await rate_limiter.acquire(
+            self._connection_properties.service_host, endpoint
+        )
+        if waited > 0:
+            self._metrics.observe(
+                METRIC_RATE_LIMIT_WAIT,
+                waited,
+                {"endpoint": endpoint},
+            )
+
+    async def _transport_request(
+        self,
+        method: str,
+        uri: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        data: dict[str, str] | None = None,
+        timeout: float,
+    ) -> PulseResponse:
+        """Make a request with the transport, recording it if recording."""
+        transport = self._connection_properties.transport
+        recorder = self.recorder
+        if recorder is None:
+            return await transport.request(
+                method, url, headers=headers, params=params, data=data, timeout=timeout
+            )
+        request_params = params if params is not None else data
+        request_start = perf_counter()
+        try:
+            response = await transport.request(
+                method, url, headers=headers, params=params, data=data, timeout=timeout
+            )
+        except (ClientError, TimeoutError) as ex:
+            recorder.record(
+                method, uri, request_params, None, perf_counter() - request_start, ex
+            )
+            raise
+        recorder.record(
+            method, uri, request_params, response, perf_counter() - request_start
+        )
+        return response
+
+    async def _wait_for_backoff(self, backoff: PulseBackoff, endpoint: str) -> None:
+        """Wait for a backoff, recording the time waited."""
+        waited = await backoff.wait_for_backoff()
+        if waited > 0:
+            self._metrics.observe(
+                METRIC_BACKOFF_WAIT,
+                waited,
+                {"endpoint": endpoint, "backoff": backoff.name},
+            )
 
     @staticmethod
     @typechecked
-    async def _handle_query_response(
-        response: ClientResponse | None,
+    def _handle_query_response(
+        response: PulseResponse | None,
     ) -> tuple[int, str | None, URL | None, str | None]:
         if response is None:
             return 0, None, None, None
-        response_text = await response.text()
-
         return (
             response.status,
-            response_text,
+            response.text,
             response.url,
             response.headers.get("Retry-After"),
         )
@@ -147,6 +300,9 @@ class PulseQueryManager:
             retry = None
             if return_value[3]:
                 retry = get_retry_after(return_value[3])
+            rate_limiter = self.rate_limiter
+            if rate_limiter is not None:
+                rate_limiter.penalize(self._connection_properties.service_host, retry)
             raise PulseServiceTemporarilyUnavailableError(
                 self._connection_status.get_backoff(),
                 retry,
@@ -188,7 +344,7 @@ class PulseQueryManager:
         method: str = "GET",
         extra_params: dict[str, str] | None = None,
         extra_headers: dict[str, str] | None = None,
-        timeout: int = 1,
+        timeout: float | None = None,
         requires_authentication: bool = True,
     ) -> tuple[int, str | None, URL | None]:
         """
@@ -201,7 +357,8 @@ class PulseQueryManager:
                                                     Defaults to None.
             extra_headers (Optional[Dict], optional): extra HTTP headers.
                                                     Defaults to None.
-            timeout (int, optional): timeout in seconds. Defaults to 1.
+            timeout (float | None, optional): timeout in seconds. Defaults to None,
+                                                    which uses the timeout policy.
             requires_authentication (bool, optional): True if authentication is
                                                     required to perform query.
                                                     Defaults to True.
@@ -224,15 +381,23 @@ class PulseQueryManager:
         async def setup_query():
             if method not in ("GET", "POST"):
                 raise ValueError("method must be GET or POST")
-            await self._connection_status.get_backoff().wait_for_backoff()
+            await self._wait_for_backoff(
+                self._connection_status.get_backoff(), endpoint
+            )
             if not self._connection_properties.api_version:
                 await self.async_fetch_version()
                 if not self._connection_properties.api_version:
                     raise ValueError("Could not determine API version for connection")
 
+        endpoint = get_endpoint_name(uri)
+        endpoint_labels = {"endpoint": endpoint}
         retry_after = self._connection_status.retry_after
         now = time()
         if retry_after > now:
+            self._metrics.increment(
+                METRIC_ERRORS,
+                {"endpoint": endpoint, "error": "retry_after"},
+            )
             raise PulseServiceTemporarilyUnavailableError(
                 self._connection_status.get_backoff(), retry_after
             )
@@ -241,9 +406,10 @@ class PulseQueryManager:
         headers = extra_headers if extra_headers is not None else {}
         if uri in ADT_HTTP_BACKGROUND_URIS:
             headers.setdefault("Accept", ADT_OTHER_HTTP_ACCEPT_HEADERS["Accept"])
+        timeout = self._get_timeout(endpoint, timeout)
         if self._connection_properties.detailed_debug_logging:
             LOG.debug(
-                "Attempting %s %s params=%s timeout=%d",
+                "Attempting %s %s params=%s timeout=%.1f",
                 method,
                 url,
                 extra_params,
@@ -270,7 +436,9 @@ class PulseQueryManager:
         )
         while retry < max_retries:
             try:
-                await query_backoff.wait_for_backoff()
+                await self._wait_for_backoff(query_backoff, endpoint)
+                if retry > 0:
+                    self._metrics.increment(METRIC_RETRIES, endpoint_labels)
                 retry += 1
                 if (
                     requires_authentication
@@ -296,36 +464,45 @@ class PulseQueryManager:
                             uri,
                         )
                         raise PulseNotLoggedInError() from ex
-                async with self._connection_properties.session.request(
+                await self._wait_for_rate_limiter(endpoint)
+                self._metrics.increment(
+                    METRIC_REQUESTS, {"endpoint": endpoint, "method": method}
+                )
+                request_start = perf_counter()
+                response = await self._transport_request(
                     method,
+                    uri,
                     url,
-                    headers=extra_headers,
+                    headers=headers,
                     params=extra_params if method == "GET" else None,
                     data=extra_params if method == "POST" else None,
-                    timeout=ClientTimeout(total=float(timeout)),
-                ) as response:
-                    return_value = await self._handle_query_response(response)
-                    if return_value[0] in RECOVERABLE_ERRORS:
-                        LOG.debug(
-                            "query returned recoverable error code %s: %s,"
-                            "retrying (count = %d)",
-                            return_value[0],
-                            self._get_http_status_description(return_value[0]),
-                            retry,
-                        )
-                        if max_retries > 1 and retry == max_retries:
-                            LOG.debug(
-                                "Exceeded max retries of %d, giving up", max_retries
-                            )
-                        else:
-                            query_backoff.increment_backoff()
-                            response.raise_for_status()
-                        continue
-                    response.raise_for_status()
-                    break
-
-            except ClientResponseError:
-                self._handle_http_errors(return_value)
+                    timeout=timeout,
+                )
+                return_value = self._handle_query_response(response)
+                self._record_response(
+                    endpoint,
+                    response.status,
+                    response.size,
+                    response.time_to_first_byte,
+                    perf_counter() - request_start,
+                )
+                if response.status in RECOVERABLE_ERRORS:
+                    LOG.debug(
+                        "query returned recoverable error code %s: %s,"
+                        "retrying (count = %d)",
+                        response.status,
+                        self._get_http_status_description(response.status),
+                        retry,
+                    )
+                    if max_retries > 1 and retry == max_retries:
+                        LOG.debug("Exceeded max retries of %d, giving up", max_retries)
+                    else:
+                        query_backoff.increment_backoff()
+                        self._handle_http_errors(return_value)
+                    continue
+                if response.status >= HTTPStatus.BAD_REQUEST:
+                    self._handle_http_errors(return_value)
+                break
             except (
                 ClientConnectorError,
                 ServerTimeoutError,
@@ -340,11 +517,18 @@ class PulseQueryManager:
                     url,
                     exc_info=True,
                 )
+                self._metrics.increment(
+                    METRIC_ERRORS, {"endpoint": endpoint, "error": type(ex).__name__}
+                )
                 if retry == max_retries:
                     self._handle_network_errors(ex)
                 query_backoff.increment_backoff()
                 continue
             except TimeoutError as ex:
+                self._metrics.increment(
+                    METRIC_ERRORS, {"endpoint": endpoint, "error": "timeout"}
+                )
+                self.timeout_policy.observe(endpoint, timeout)
                 if retry == max_retries:
                     LOG.debug("Exceeded max retries of %d, giving up", max_retries)
                     raise PulseServerConnectionError(
@@ -358,7 +542,10 @@ class PulseQueryManager:
         return (return_value[0], return_value[1], return_value[2])
 
     async def query_orb(
-        self, level: int, error_message: str
+        self,
+        level: int,
+        error_message: str,
+        extra_params: dict[str, str] | None = None,
     ) -> html.HtmlElement | None:
         """
         Query ADT Pulse ORB.
@@ -366,6 +553,8 @@ class PulseQueryManager:
         Args:
             level (int): error level to log on failure
             error_message (str): error message to use on failure
+            extra_params (dict[str, str] | None, optional): query parameters,
+                i.e. the networkid of a site. Defaults to None.
 
         Returns:
             Optional[html.HtmlElement]: the parsed response tree
@@ -379,10 +568,60 @@ class PulseQueryManager:
         """
         code, response, url = await self.async_query(
             ADT_ORB_URI,
+            extra_params=extra_params,
             extra_headers={"Sec-Fetch-Mode": "cors", "Sec-Fetch-Dest": "empty"},
         )
+        return self.make_etree(ADT_ORB_URI, code, response, url, level, error_message)
+
+    def _record_response(
+        self,
+        endpoint: str,
+        status: int,
+        response_size: int,
+        time_to_first_byte: float,
+        latency: float,
+    ) -> None:
+        """Record metrics for a received response."""
+        labels = {"endpoint": endpoint}
+        self._metrics.increment(
+            METRIC_RESPONSES, {"endpoint": endpoint, "status": str(status)}
+        )
+        self._metrics.increment(METRIC_RECEIVED_BYTES, labels, response_size)
+        self._metrics.observe(
+            METRIC_RESPONSE_SIZE, response_size, labels, DEFAULT_SIZE_BUCKETS
+        )
+        self._metrics.observe(METRIC_TIME_TO_FIRST_BYTE, time_to_first_byte, labels)
+        self._metrics.observe(METRIC_REQUEST_LATENCY, latency, labels)
+        self.timeout_policy.observe(endpoint, latency)
+
+    def make_etree(
+        self,
+        uri: str,
+        code: int,
+        response_text: str | None,
+        url: URL | None,
+        level: int,
+        error_message: str,
+    ) -> html.HtmlElement | None:
+        """
+        Make a parsed HTML tree from a response, recording the parse time.
+
+        Args:
+            uri (str): the URI that was queried, used for the metrics endpoint
+            code (int): the return code
+            response_text (str | None): the response text
+            url (URL | None): the URL that was queried
+            level (int): the logging level on error
+            error_message (str): the error message
+
+        Returns:
+            html.HtmlElement | None: a parsed HTML tree, or None on failure
 
-        return make_etree(code, response, url, level, error_message)
+        """
+        with self._metrics.timer(
+            METRIC_PARSE_TIME, {"endpoint": get_endpoint_name(uri)}
+        ):
+            return make_etree(code, response_text, url, level, error_message)
 
     async def async_fetch_version(self) -> None:
         """
@@ -401,22 +640,30 @@ class PulseQueryManager:
             return
 
         signin_url = self._connection_properties.service_host
+        timeout = self._get_timeout(ENDPOINT_VERSION, None)
+        await self._wait_for_rate_limiter(ENDPOINT_VERSION)
+        self._metrics.increment(
+            METRIC_REQUESTS, {"endpoint": ENDPOINT_VERSION, "method": "GET"}
+        )
         try:
-            async with self._connection_properties.session.get(
-                signin_url,
-                timeout=ClientTimeout(total=float(10)),
-            ) as response:
-                response_values = await self._handle_query_response(response)
-                response.raise_for_status()
-
-        except ClientResponseError as ex:
-            LOG.error(
-                "Error %s occurred determining Pulse API version",
-                ex.args,
-                exc_info=True,
+            request_start = perf_counter()
+            response = await self._transport_request(
+                "GET", "/", signin_url, timeout=timeout
             )
-            self._handle_http_errors(response_values)
-            return
+            response_values = self._handle_query_response(response)
+            self._record_response(
+                ENDPOINT_VERSION,
+                response.status,
+                response.size,
+                response.time_to_first_byte,
+                perf_counter() - request_start,
+            )
+            if response.status >= HTTPStatus.BAD_REQUEST:
+                LOG.error(
+                    "Error %s occurred determining Pulse API version",
+                    response.status,
+                )
+                self._handle_http_errors(response_values)
         except (
             ClientConnectorError,
             ServerTimeoutError,
@@ -428,13 +675,21 @@ class PulseQueryManager:
                 ex.args,
                 exc_info=True,
             )
+            self._metrics.increment(
+                METRIC_ERRORS,
+                {"endpoint": ENDPOINT_VERSION, "error": type(ex).__name__},
+            )
             self._handle_network_errors(ex)
         except TimeoutError as ex:
+            self._metrics.increment(
+                METRIC_ERRORS, {"endpoint": ENDPOINT_VERSION, "error": "timeout"}
+            )
             LOG.error(
                 "Timeout occurred determining Pulse API version %s",
                 ex.args,
                 exc_info=True,
             )
+            self.timeout_policy.observe(ENDPOINT_VERSION, timeout)
             raise PulseServerConnectionError(
                 "Timeout occurred determining Pulse API version",
                 self._connection_status.get_backoff(),
@@ -0,0 +1,214 @@
+"""Pulse request rate limiting shared between connections."""
+
+import asyncio
+from time import time, monotonic
+from logging import getLogger
+
+from .util import set_debug_lock
+
+LOG = getLogger(__name__)
+
+# endpoint classes, each with its own bucket per host
+ENDPOINT_CLASS_SYNC_CHECK = "sync_check"
+ENDPOINT_CLASS_ORB = "orb"
+ENDPOINT_CLASS_DEVICE = "device"
+ENDPOINT_CLASS_LOGIN = "login"
+ENDPOINT_CLASS_OTHER = "other"
+# metrics endpoint names (see pulse_metrics.ENDPOINT_NAMES) to endpoint class
+ENDPOINT_CLASSES: dict[str, str] = {
+    "sync_check": ENDPOINT_CLASS_SYNC_CHECK,
+    "orb": ENDPOINT_CLASS_ORB,
+    "device": ENDPOINT_CLASS_DEVICE,
+    "gateway": ENDPOINT_CLASS_DEVICE,
+    "system": ENDPOINT_CLASS_DEVICE,
+    "summary": ENDPOINT_CLASS_DEVICE,
+    "login": ENDPOINT_CLASS_LOGIN,
+    "logout": ENDPOINT_CLASS_LOGIN,
+    "version": ENDPOINT_CLASS_LOGIN,
+}
+# (requests per second, burst) for each endpoint class
+DEFAULT_RATE_LIMITS: dict[str, tuple[float, float]] = {
+    ENDPOINT_CLASS_SYNC_CHECK: (50.0, 100.0),
+    ENDPOINT_CLASS_ORB: (20.0, 40.0),
+    ENDPOINT_CLASS_DEVICE: (20.0, 40.0),
+    ENDPOINT_CLASS_LOGIN: (10.0, 20.0),
+    ENDPOINT_CLASS_OTHER: (20.0, 40.0),
+}
+# rates are multiplied by this on each 429/503, down to MIN_RATE_FACTOR
+TIGHTEN_FACTOR = 0.5
+MIN_RATE_FACTOR = 1 / 16
+# rates double after this many seconds without a 429/503, back up to 1
+DEFAULT_RECOVERY_INTERVAL = 60.0
+
+
+class _PulseTokenBucket:
+    """Token bucket for one endpoint class of one host."""
+
+    __slots__ = ("burst", "rate", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def reserve(self, now: float, factor: float) -> float:
+        """Take a token, returning the seconds until it is available."""
+        rate = self.rate * factor
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / rate
+
+
+class _PulseHostLimits:
+    """Rate limiting state of one host."""
+
+    __slots__ = ("blocked_until", "buckets", "factor", "factor_changed")
+
+    def __init__(self, now: float) -> None:
+        self.buckets: dict[str, _PulseTokenBucket] = {}
+        self.blocked_until = 0.0
+        self.factor = 1.0
+        self.factor_changed = now
+
+
+class PulseRateLimiter:
+    """
+    Limits the rate of requests to each Pulse host, across connections.
+
+    Each host has a token bucket for each endpoint class (sync checks, orb,
+    device pages, login and other) with its own rate and burst.  Share one
+    limiter between PyADTPulseAsync objects to limit their requests together.
+
+    When any connection gets a 429 or 503 response, every rate for the host is
+    halved, down to MIN_RATE_FACTOR of its configured value, and if the
+    response had a Retry-After header no requests are made to the host until
+    then.  Rates double again after each recovery_interval seconds without
+    such a response.  Can be used from any thread or event loop.
+    """
+
+    __slots__ = ("_hosts", "_limits", "_recovery_interval", "_rl_lock")
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, float]] | None = None,
+        recovery_interval: float = DEFAULT_RECOVERY_INTERVAL,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize rate limiter.
+
+        Args:
+            limits (dict[str, tuple[float, float]] | None, optional): requests
+                per second and burst for endpoint classes, overriding
+                DEFAULT_RATE_LIMITS. Defaults to None.
+            recovery_interval (float, optional): seconds without a 429/503
+                before rates are doubled. Defaults to DEFAULT_RECOVERY_INTERVAL.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if a limit isn't positive or an endpoint class is unknown
+
+        """
+        self._limits = dict(DEFAULT_RATE_LIMITS)
+        for endpoint_class, (rate, burst) in (limits or {}).items():
+            if endpoint_class not in DEFAULT_RATE_LIMITS:
+                raise ValueError(
+                    f"endpoint class must be one of {tuple(DEFAULT_RATE_LIMITS)}"
+                )
+            if rate <= 0 or burst < 1:
+                raise ValueError("rate must be positive and burst at least 1")
+            self._limits[endpoint_class] = (rate, burst)
+        self._recovery_interval = recovery_interval
+        self._rl_lock = set_debug_lock(debug_locks, "pyadtpulse.rl_lock")
+        self._hosts: dict[str, _PulseHostLimits] = {}
+
+    @staticmethod
+    def get_endpoint_class(endpoint: str) -> str:
+        """Return the endpoint class of a metrics endpoint name."""
+        return ENDPOINT_CLASSES.get(endpoint, ENDPOINT_CLASS_OTHER)
+
+    def _get_host(self, host: str, now: float) -> _PulseHostLimits:
+        limits = self._hosts.get(host)
+        if limits is None:
+            limits = self._hosts[host] = _PulseHostLimits(now)
+        elif (
+            limits.factor < 1.0
+            and now - limits.factor_changed >= self._recovery_interval
+        ):
+            limits.factor = min(1.0, limits.factor * 2)
+            limits.factor_changed = now
+            LOG.debug("Raising request rates for %s to %.2f", host, limits.factor)
+        return limits
+
+    def rate_factor(self, host: str) -> float:
+        """Return the fraction of the configured rates currently allowed."""
+        with self._rl_lock:
+            return self._get_host(host, monotonic()).factor
+
+    def _reserve(self, host: str, endpoint_class: str) -> tuple[float, bool]:
+        """Return the seconds to wait, and whether a token was taken."""
+        now = monotonic()
+        with self._rl_lock:
+            limits = self._get_host(host, now)
+            if limits.blocked_until > now:
+                return limits.blocked_until - now, False
+            bucket = limits.buckets.get(endpoint_class)
+            if bucket is None:
+                rate, burst = self._limits[endpoint_class]
+                bucket = limits.buckets[endpoint_class] = _PulseTokenBucket(
+                    rate, burst, now
+                )
+            return bucket.reserve(now, limits.factor), True
+
+    async def acquire(self, host: str, endpoint: str) -> float:
+        """
+        Wait until a request can be made.
+
+        Args:
+            host (str): the service host
+            endpoint (str): the metrics endpoint name of the request
+
+        Returns:
+            float: seconds waited
+
+        """
+        endpoint_class = self.get_endpoint_class(endpoint)
+        waited = 0.0
+        while True:
+            delay, reserved = self._reserve(host, endpoint_class)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                waited += delay
+            if reserved:
+                return waited
+
+    def penalize(self, host: str, retry_after: float | None = None) -> None:
+        """
+        Tighten the limits of a host after a 429 or 503 response.
+
+        Args:
+            host (str): the service host
+            retry_after (float | None, optional): time, as from time.time(),
+                the response asked to wait until. Defaults to None.
+
+        """
+        now = monotonic()
+        with self._rl_lock:
+            limits = self._get_host(host, now)
+            limits.factor = max(MIN_RATE_FACTOR, limits.factor * TIGHTEN_FACTOR)
+            limits.factor_changed = now
+            if retry_after is not None:
+                limits.blocked_until = max(
+                    limits.blocked_until, now + max(retry_after - time(), 0.0)
+                )
+            factor = limits.factor
+        LOG.warning(
+            "Pulse host %s asked clients to slow down, lowering request rates to "
+            "%.2f of their limits",
+            host,
+            factor,
+        )
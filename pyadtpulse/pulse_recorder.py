@@ -0,0 +1,412 @@
+"""Pulse session recorder and player."""
+
+import os
+import json
+import asyncio
+from time import time, perf_counter
+from typing import TYPE_CHECKING, Any
+from logging import getLogger
+from dataclasses import dataclass
+
+from aiohttp import (
+    ServerTimeoutError,
+    ClientConnectionError,
+    ServerDisconnectedError,
+)
+from typeguard import typechecked
+
+from .util import set_debug_lock
+from .const import ADT_DEVICE_URI
+from .exceptions import PulseNotLoggedInError
+from .pulse_replay import PulseReplayEntry, PulseReplayTransport, get_relative_uri
+from .pulse_transport import PulseResponse
+
+if TYPE_CHECKING:
+    from .pyadtpulse_async import PyADTPulseAsync
+
+LOG = getLogger(__name__)
+
+REDACTED = "REDACTED"
+REDACTED_PARAMS = frozenset(("usernameForm", "passwordForm", "fingerprint"))
+# parameters used to tell apart requests to the same URI on playback
+MATCHED_PARAMS = {ADT_DEVICE_URI: ("id",)}
+DEFAULT_FLUSH_THRESHOLD = 100
+
+_PLAYBACK_ERRORS: dict[str, type[Exception]] = {
+    "ServerDisconnectedError": ServerDisconnectedError,
+    "ServerTimeoutError": ServerTimeoutError,
+    "TimeoutError": TimeoutError,
+}
+
+
+@dataclass(slots=True)
+class PulseRecordedExchange:
+    """
+    A recorded request and its response.
+
+    Fields:
+        time (float): time the request was made, in seconds since the epoch
+        method (str): HTTP method
+        uri (str): URI relative to the API prefix
+        params (dict[str, str] | None): redacted query or form parameters
+        status (int): HTTP status, 0 if the request failed
+        body (str | None): redacted response body
+        redirect_uri (str | None): URI of the response if it was redirected
+        retry_after (str | None): Retry-After header of the response
+        latency (float): seconds taken by the request
+        error (str | None): name of the exception raised by the request
+    """
+
+    time: float
+    method: str
+    uri: str
+    params: dict[str, str] | None = None
+    status: int = 0
+    body: str | None = None
+    redirect_uri: str | None = None
+    retry_after: str | None = None
+    latency: float = 0.0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a dictionary, leaving out empty fields."""
+        result: dict[str, Any] = {
+            "time": round(self.time, 3),
+            "method": self.method,
+            "uri": self.uri,
+            "status": self.status,
+            "latency": round(self.latency, 4),
+        }
+        for name in ("params", "body", "redirect_uri", "retry_after", "error"):
+            value = getattr(self, name)
+            if value is not None:
+                result[name] = value
+        return result
+
+    @classmethod
+    def from_dict(cls, value: dict[str, Any]) -> "PulseRecordedExchange":
+        """Create from a dictionary written by to_dict."""
+        return cls(**value)
+
+
+class PulseRecorder:
+    """
+    Records Pulse requests and responses to a JSON lines file.
+
+    Credentials and the fingerprint are replaced with REDACTED in request
+    parameters, and any occurrence of them in response bodies is scrubbed too.
+    Records are buffered and appended to the file every flush_threshold records
+    and on close().
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_flush_threshold",
+        "_path",
+        "_pr_lock",
+        "_record_count",
+        "_secrets",
+    )
+
+    @typechecked
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize recorder.
+
+        Args:
+            path (str | os.PathLike[str]): file to append records to
+            flush_threshold (int, optional): number of records to buffer before
+                writing them. Defaults to DEFAULT_FLUSH_THRESHOLD.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if flush_threshold is less than 1
+
+        """
+        if flush_threshold < 1:
+            raise ValueError("flush_threshold must be at least 1")
+        self._path = path
+        self._flush_threshold = flush_threshold
+        self._buffer: list[str] = []
+        self._secrets: set[str] = set()
+        self._record_count = 0
+        self._pr_lock = set_debug_lock(debug_locks, "pyadtpulse.pr_lock")
+
+    @property
+    def record_count(self) -> int:
+        """Return the number of records made."""
+        with self._pr_lock:
+            return self._record_count
+
+    def _redact_params(self, params: dict[str, str] | None) -> dict[str, str] | None:
+        if params is None:
+            return None
+        result = {}
+        for key, value in params.items():
+            if key not in REDACTED_PARAMS:
+                result[key] = value
+                continue
+            if value:
+                self._secrets.add(value)
+            result[key] = REDACTED
+        return result
+
+    def _redact_text(self, text: str | None) -> str | None:
+        if not text:
+            return text
+        for secret in self._secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    def record(
+        self,
+        method: str,
+        uri: str,
+        params: dict[str, str] | None,
+        response: PulseResponse | None,
+        latency: float,
+        error: BaseException | None = None,
+    ) -> None:
+        """
+        Record a request.
+
+        Args:
+            method (str): HTTP method
+            uri (str): URI relative to the API prefix
+            params (dict[str, str] | None): query or form parameters
+            response (PulseResponse | None): the response, None if the request
+                failed
+            latency (float): seconds taken by the request
+            error (BaseException | None, optional): exception raised by the
+                request. Defaults to None.
+
+        """
+        with self._pr_lock:
+            exchange = PulseRecordedExchange(
+                time() - latency,
+                method,
+                uri,
+                self._redact_params(params),
+                latency=latency,
+            )
+            if response is not None:
+                exchange.status = response.status
+                exchange.body = self._redact_text(response.text)
+                response_uri = get_relative_uri(response.url)
+                if response_uri != uri:
+                    exchange.redirect_uri = response_uri
+                exchange.retry_after = response.headers.get("Retry-After")
+            if error is not None:
+                exchange.error = type(error).__name__
+            self._buffer.append(json.dumps(exchange.to_dict(), separators=(",", ":")))
+            self._record_count += 1
+            if len(self._buffer) >= self._flush_threshold:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.write("\n".join(self._buffer))
+            f.write("\n")
+        self._buffer.clear()
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        with self._pr_lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Write buffered records and forget recorded secrets."""
+        with self._pr_lock:
+            self._flush()
+            self._secrets.clear()
+
+    @staticmethod
+    @typechecked
+    def load(path: str | os.PathLike[str]) -> list[PulseRecordedExchange]:
+        """
+        Load records from a file written by a recorder.
+
+        Args:
+            path (str | os.PathLike[str]): file to read
+
+        Returns:
+            list[PulseRecordedExchange]: the records, in the order they were made
+
+        """
+        with open(path, encoding="utf-8") as f:
+            return [
+                PulseRecordedExchange.from_dict(json.loads(line))
+                for line in f
+                if line.strip()
+            ]
+
+
+@dataclass(slots=True)
+class PulsePlaybackResult:
+    """
+    Result of playing back a recorded session.
+
+    Fields:
+        updates (int): number of updates reported by wait_for_update()
+        errors (int): number of exceptions raised by wait_for_update()
+        requests (int): number of requests made by the client
+        elapsed (float): seconds taken by the playback
+    """
+
+    updates: int = 0
+    errors: int = 0
+    requests: int = 0
+    elapsed: float = 0.0
+
+
+class PulsePlayer:
+    """
+    Plays a recorded session back to a PyADTPulseAsync object.
+
+    Responses to each method/URI are served in the order they were recorded,
+    with their recorded latency.  Once the recording for a method/URI is used
+    up, its last response is served forever.  Latency and the sync check poll
+    interval are divided by speed, so speed=10 plays a session back 10 times
+    faster than it was recorded.
+    """
+
+    __slots__ = ("_duration", "_speed", "_transport")
+
+    @typechecked
+    def __init__(
+        self, exchanges: list[PulseRecordedExchange], speed: float = 1.0
+    ) -> None:
+        """
+        Initialize player.
+
+        Args:
+            exchanges (list[PulseRecordedExchange]): the recording
+            speed (float, optional): playback speed. Defaults to 1.0.
+
+        Raises:
+            ValueError: if speed is not positive
+
+        """
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self._speed = speed
+        self._duration = (
+            (exchanges[-1].time - exchanges[0].time) / speed if exchanges else 0.0
+        )
+        self._transport = PulseReplayTransport()
+        last_entries: dict[tuple[str, str, tuple[tuple[str, str], ...]], Any] = {}
+        for exchange in exchanges:
+            params = None
+            if exchange.params is not None and exchange.uri in MATCHED_PARAMS:
+                params = {
+                    k: v
+                    for k, v in exchange.params.items()
+                    if k in MATCHED_PARAMS[exchange.uri]
+                }
+            entry = self._make_entry(exchange)
+            self._transport.add(exchange.method, exchange.uri, entry, params)
+            key = (exchange.method, exchange.uri, tuple((params or {}).items()))
+            last_entries[key] = (params, entry)
+        for (method, uri, _), (params, entry) in last_entries.items():
+            self._transport.add(method, uri, entry, params, repeat=True)
+
+    def _make_entry(self, exchange: PulseRecordedExchange) -> PulseReplayEntry:
+        entry = PulseReplayEntry(
+            status=exchange.status,
+            body=exchange.body or "",
+            redirect_uri=exchange.redirect_uri,
+            latency=exchange.latency / self._speed,
+        )
+        if exchange.retry_after is not None:
+            entry.headers["Retry-After"] = exchange.retry_after
+        if exchange.error is not None:
+            entry.exception = _PLAYBACK_ERRORS.get(
+                exchange.error, ClientConnectionError
+            )(exchange.error)
+        return entry
+
+    @classmethod
+    @typechecked
+    def from_file(
+        cls, path: str | os.PathLike[str], speed: float = 1.0
+    ) -> "PulsePlayer":
+        """Create a player from a file written by a recorder."""
+        return cls(PulseRecorder.load(path), speed)
+
+    @property
+    def transport(self) -> PulseReplayTransport:
+        """
+        Return the transport serving the recording.
+
+        Pass it as the transport argument of PyADTPulseAsync.
+        """
+        return self._transport
+
+    @property
+    def duration(self) -> float:
+        """Return the length of the recording in seconds at playback speed."""
+        return self._duration
+
+    async def play(
+        self, pulse: "PyADTPulseAsync", timeout: float | None = None
+    ) -> PulsePlaybackResult:
+        """
+        Log in and wait for updates until the recording is used up.
+
+        Playback also stops if no recorded responses are served for a while,
+        which happens when the client no longer makes the recorded requests.
+
+        Args:
+            pulse (PyADTPulseAsync): client created with transport=self.transport
+            timeout (float | None, optional): maximum seconds to play for.
+                Defaults to None, which allows twice the recording duration plus
+                one minute.
+
+        Returns:
+            PulsePlaybackResult: the result
+
+        """
+        if timeout is None:
+            timeout = 2 * self._duration + 60.0
+        result = PulsePlaybackResult()
+        start = perf_counter()
+        deadline = start + timeout
+        await pulse.async_login()
+        try:
+            gateway = pulse.site.gateway
+            gateway.poll_interval = gateway.poll_interval / self._speed
+            # wait in slices so playback stops soon after the recording is used up
+            wait_slice = max(10 * gateway.poll_interval, 1.0)
+            last_pending = -1
+            while self._transport.pending and perf_counter() < deadline:
+                try:
+                    await asyncio.wait_for(
+                        pulse.wait_for_update(),
+                        min(wait_slice, max(deadline - perf_counter(), 0.0)),
+                    )
+                except TimeoutError:
+                    # stop once the client no longer follows the recording
+                    if self._transport.pending == last_pending:
+                        break
+                    last_pending = self._transport.pending
+                    continue
+                except PulseNotLoggedInError:
+                    result.errors += 1
+                    break
+                except Exception as e:
+                    LOG.debug("Playback raised %s", e)
+                    result.errors += 1
+                else:
+                    result.updates += 1
+        finally:
+            await pulse.async_logout()
+        result.requests = self._transport.requests_total
+        result.elapsed = perf_counter() - start
+        return result
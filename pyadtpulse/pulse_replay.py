@@ -0,0 +1,375 @@
+"""Pulse replay transport, serving recorded responses without a network."""
+
+import os
+import re
+import asyncio
+from random import Random
+from collections import deque
+from dataclasses import field, dataclass
+from collections.abc import Callable
+
+from yarl import URL
+from aiohttp import ServerDisconnectedError
+from typeguard import typechecked
+
+from .const import (
+    API_PREFIX,
+    ADT_ORB_URI,
+    ADT_LOGIN_URI,
+    ADT_DEVICE_URI,
+    ADT_LOGOUT_URI,
+    ADT_SYSTEM_URI,
+    ADT_GATEWAY_URI,
+    ADT_SUMMARY_URI,
+    ADT_TIMEOUT_URI,
+    DEFAULT_API_HOST,
+    ADT_ARM_DISARM_URI,
+    ADT_SYNC_CHECK_URI,
+)
+from .pulse_transport import PulseResponse, PulseTransport
+
+DEFAULT_REPLAY_API_VERSION = "27.0.0-140"
+DEFAULT_REPLAY_SYNC_CHECK = "234532-456432-0"
+
+DEVICE_FILE_PATTERN = re.compile(r"device_(\d+)\.html")
+
+
+def get_relative_uri(url: URL) -> str:
+    """
+    Get the URI of a Pulse URL relative to the API prefix.
+
+    Args:
+        url (URL): the URL, i.e. https://portal.adtpulse.com/myhome/27.0.0-140/ajax/orb.jsp
+
+    Returns:
+        str: the URI with the host and API prefix and version removed, i.e.
+            /ajax/orb.jsp, or the path if the URL is not under the API prefix
+
+    """
+    path = url.path
+    if not path.startswith(API_PREFIX):
+        return path or "/"
+    _, _, rest = path[len(API_PREFIX) :].partition("/")
+    return f"/{rest}"
+
+
+@dataclass(slots=True)
+class PulseReplayEntry:
+    """
+    A response served by the replay transport.
+
+    Fields:
+        status (int): HTTP status code, defaults to 200
+        body (str): response body
+        redirect_uri (str | None): URI the request was redirected to, used as the
+            URL of the response.  None means the response URL is the request URL.
+        headers (dict[str, str]): response headers
+        latency (float): seconds to wait before responding
+        exception (BaseException | None): exception to raise instead of responding
+    """
+
+    status: int = 200
+    body: str = ""
+    redirect_uri: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    exception: BaseException | None = None
+
+
+class _PulseReplayRoute:
+    """Entries for a method/URI, optionally restricted to query parameters."""
+
+    __slots__ = ("entries", "params", "repeat")
+
+    def __init__(self, params: dict[str, str] | None) -> None:
+        self.params = params
+        self.entries: deque[PulseReplayEntry] = deque()
+        self.repeat: PulseReplayEntry | None = None
+
+    def matches(self, params: dict[str, str] | None) -> bool:
+        if not self.params:
+            return True
+        if not params:
+            return False
+        return all(params.get(k) == v for k, v in self.params.items())
+
+    def next_entry(self) -> PulseReplayEntry | None:
+        if self.entries:
+            return self.entries.popleft()
+        return self.repeat
+
+
+class PulseReplayTransport(PulseTransport):
+    """
+    Transport serving scripted responses instead of making HTTP requests.
+
+    Responses are looked up by method and URI relative to the Pulse API prefix,
+    so the same script works regardless of the API version in use.  Scripted
+    entries are served once in order, after which the repeat entry (if any) is
+    served forever.  Requests with no matching entry get a 404.
+    """
+
+    __slots__ = (
+        "_api_version",
+        "_default_latency",
+        "_error_factory",
+        "_error_rate",
+        "_injected_errors",
+        "_random",
+        "_request_counts",
+        "_routes",
+        "_service_host",
+    )
+
+    @typechecked
+    def __init__(
+        self,
+        api_version: str = DEFAULT_REPLAY_API_VERSION,
+        service_host: str = DEFAULT_API_HOST,
+        default_latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_factory: Callable[[], BaseException] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Initialize replay transport.
+
+        Args:
+            api_version (str, optional): API version to redirect the root page to.
+                Defaults to DEFAULT_REPLAY_API_VERSION.
+            service_host (str, optional): host used to build redirect URLs.
+                Defaults to DEFAULT_API_HOST.
+            default_latency (float, optional): latency in seconds added to every
+                response. Defaults to 0.0.
+            error_rate (float, optional): probability between 0 and 1 that a
+                request fails with an injected error. Defaults to 0.0.
+            error_factory (Callable[[], BaseException] | None, optional): creates
+                the injected errors. Defaults to ServerDisconnectedError.
+            seed (int | None, optional): seed for error injection. Defaults to None.
+
+        Raises:
+            ValueError: if error_rate is not between 0 and 1 or default_latency is
+                negative
+
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        if default_latency < 0:
+            raise ValueError("default_latency must be non-negative")
+        self._api_version = api_version
+        self._service_host = service_host
+        self._default_latency = default_latency
+        self._error_rate = error_rate
+        self._error_factory: Callable[[], BaseException] = (
+            error_factory if error_factory is not None else ServerDisconnectedError
+        )
+        self._random = Random(seed)
+        self._routes: dict[tuple[str, str], list[_PulseReplayRoute]] = {}
+        self._request_counts: dict[tuple[str, str], int] = {}
+        self._injected_errors = 0
+
+    @typechecked
+    def add(
+        self,
+        method: str,
+        uri: str,
+        entry: PulseReplayEntry,
+        params: dict[str, str] | None = None,
+        repeat: bool = False,
+    ) -> None:
+        """
+        Add a response.
+
+        Args:
+            method (str): HTTP method, GET or POST
+            uri (str): URI relative to the API prefix, i.e. ADT_ORB_URI, or "/"
+                for the service host root
+            entry (PulseReplayEntry): the response
+            params (dict[str, str] | None, optional): query or form parameters
+                which must be present in the request for this entry to match.
+                Defaults to None.
+            repeat (bool, optional): serve this entry whenever no scripted entries
+                are left, replacing any previous repeat entry. Defaults to False.
+
+        """
+        routes = self._routes.setdefault((method.upper(), uri), [])
+        for route in routes:
+            if route.params == params:
+                break
+        else:
+            route = _PulseReplayRoute(params)
+            # routes restricted to parameters are matched first
+            if params:
+                routes.insert(0, route)
+            else:
+                routes.append(route)
+        if repeat:
+            route.repeat = entry
+        else:
+            route.entries.append(entry)
+
+    @classmethod
+    @typechecked
+    def from_directory(
+        cls,
+        directory: str | os.PathLike[str],
+        sync_check: str = DEFAULT_REPLAY_SYNC_CHECK,
+        **kwargs,
+    ) -> "PulseReplayTransport":
+        """
+        Create a replay transport serving the pages in a directory.
+
+        The directory uses the layout of tests/data_files: signin.html,
+        summary.html, system.html, gateway.html, orb.html and device_<id>.html.
+        Missing pages are skipped.
+
+        Args:
+            directory (str | os.PathLike[str]): directory containing the pages
+            sync_check (str, optional): sync check response to serve.
+                Defaults to DEFAULT_REPLAY_SYNC_CHECK (no updates).
+            **kwargs: passed to the constructor
+
+        Returns:
+            PulseReplayTransport: the transport
+
+        """
+        transport = cls(**kwargs)
+
+        def read(file_name: str) -> str | None:
+            path = os.path.join(directory, file_name)
+            if not os.path.isfile(path):
+                return None
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+
+        signin = read("signin.html")
+        if signin is not None:
+            transport.add(
+                "GET",
+                "/",
+                PulseReplayEntry(body=signin, redirect_uri=ADT_LOGIN_URI),
+                repeat=True,
+            )
+            transport.add(
+                "GET", ADT_LOGIN_URI, PulseReplayEntry(body=signin), repeat=True
+            )
+            transport.add(
+                "GET",
+                ADT_LOGOUT_URI,
+                PulseReplayEntry(body=signin, redirect_uri=ADT_LOGIN_URI),
+                repeat=True,
+            )
+        for file_name, method, uri in (
+            ("summary.html", "POST", ADT_LOGIN_URI),
+            ("summary.html", "GET", ADT_SUMMARY_URI),
+            ("system.html", "GET", ADT_SYSTEM_URI),
+            ("gateway.html", "GET", ADT_GATEWAY_URI),
+            ("orb.html", "GET", ADT_ORB_URI),
+        ):
+            body = read(file_name)
+            if body is None:
+                continue
+            redirect_uri = ADT_SUMMARY_URI if uri == ADT_LOGIN_URI else None
+            transport.add(
+                method,
+                uri,
+                PulseReplayEntry(body=body, redirect_uri=redirect_uri),
+                repeat=True,
+            )
+        for file_name in sorted(os.listdir(directory)):
+            match = DEVICE_FILE_PATTERN.fullmatch(file_name)
+            body = read(file_name) if match else None
+            if match is None or body is None:
+                continue
+            transport.add(
+                "GET",
+                ADT_DEVICE_URI,
+                PulseReplayEntry(body=body),
+                params={"id": match.group(1)},
+                repeat=True,
+            )
+        transport.add(
+            "GET", ADT_SYNC_CHECK_URI, PulseReplayEntry(body=sync_check), repeat=True
+        )
+        transport.add("POST", ADT_TIMEOUT_URI, PulseReplayEntry(), repeat=True)
+        transport.add(
+            "POST",
+            ADT_ARM_DISARM_URI,
+            PulseReplayEntry(body="<html></html>"),
+            repeat=True,
+        )
+        return transport
+
+    def request_count(self, method: str, uri: str) -> int:
+        """Return the number of requests made for a method and URI."""
+        return self._request_counts.get((method.upper(), uri), 0)
+
+    @property
+    def requests_total(self) -> int:
+        """Return the total number of requests made."""
+        return sum(self._request_counts.values())
+
+    @property
+    def pending(self) -> int:
+        """Return the number of scripted entries not served yet."""
+        return sum(
+            len(route.entries) for routes in self._routes.values() for route in routes
+        )
+
+    @property
+    def injected_errors(self) -> int:
+        """Return the number of injected errors raised."""
+        return self._injected_errors
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        data: dict[str, str] | None = None,
+        timeout: float,
+    ) -> PulseResponse:
+        """Serve a scripted response."""
+        request_url = URL(url)
+        uri = get_relative_uri(request_url)
+        key = (method.upper(), uri)
+        self._request_counts[key] = self._request_counts.get(key, 0) + 1
+        if self._error_rate and self._random.random() < self._error_rate:
+            self._injected_errors += 1
+            raise self._error_factory()
+        request_params = params if params is not None else data
+        entry: PulseReplayEntry | None = None
+        for route in self._routes.get(key, ()):
+            if route.matches(request_params):
+                entry = route.next_entry()
+                if entry is not None:
+                    break
+        if entry is None:
+            entry = PulseReplayEntry(status=404, body="Not Found")
+        latency = entry.latency + self._default_latency
+        if latency > timeout:
+            await asyncio.sleep(timeout)
+            raise TimeoutError(f"Replayed request to {uri} timed out")
+        if latency > 0:
+            await asyncio.sleep(latency)
+        if entry.exception is not None:
+            raise entry.exception
+        if entry.redirect_uri is not None:
+            response_url = URL(
+                f"{self._service_host}{API_PREFIX}{self._api_version}"
+                f"{entry.redirect_uri}"
+            )
+        elif params:
+            response_url = request_url.update_query(params)
+        else:
+            response_url = request_url
+        return PulseResponse(
+            entry.status,
+            entry.body,
+            response_url,
+            entry.headers,
+            len(entry.body.encode()),
+            latency,
+        )
@@ -0,0 +1,268 @@
+"""On-disk store of Pulse sessions, used to skip logging in on restart."""
+
+import os
+import json
+import hashlib
+import tempfile
+from time import time
+from types import ModuleType
+from typing import TYPE_CHECKING
+from logging import getLogger
+from dataclasses import asdict, dataclass
+
+from typeguard import typechecked
+
+from .const import ADT_DEFAULT_RELOGIN_INTERVAL
+from .pulse_transport import PulseCookie
+
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+LOG = getLogger(__name__)
+
+# sessions older than this are not restored, Pulse will have expired them
+DEFAULT_SESSION_MAX_AGE = ADT_DEFAULT_RELOGIN_INTERVAL * 60.0
+
+_FILE_SUFFIX = ".session"
+_FORMAT_VERSION = 2
+
+
+def _import_fernet() -> ModuleType:
+    """
+    Import cryptography's Fernet module.
+
+    Raises:
+        ImportError: if cryptography isn't installed
+
+    """
+    try:
+        from cryptography import fernet  # noqa: PLC0415
+    except ImportError as e:
+        raise ImportError(
+            "Encrypting sessions requires the cryptography package, "
+            "install pyadtpulse[session-store]"
+        ) from e
+    return fernet
+
+
+@dataclass(slots=True, frozen=True)
+class PulseSavedSession:
+    """
+    A logged in Pulse session.
+
+    Fields:
+        username (str): account username
+        service_host (str): Pulse host the session is on
+        api_version (str): Pulse API version
+        last_login_time (int): time of the login, in seconds since the epoch
+        cookies (tuple[PulseCookie, ...]): session cookies
+    """
+
+    username: str
+    service_host: str
+    api_version: str
+    last_login_time: int
+    cookies: tuple[PulseCookie, ...] = ()
+
+
+class PulseSessionStore:
+    """
+    Saves Pulse sessions to a directory so a restarted process can reuse them.
+
+    Each account's session is kept in its own file, named by a hash of the
+    host and username.  Files are encrypted and authenticated with Fernet
+    (AES-128-CBC and HMAC-SHA256) from the cryptography package, the
+    session-store extra, so they can't be read or altered without the key.
+    Only if asked to with unencrypted=True are they plain JSON, holding live
+    session cookies.  Either way files are only readable by their owner.
+
+    Share one store between PyADTPulseAsync objects with their session_store
+    property.
+    """
+
+    __slots__ = ("_directory", "_fernet", "_max_age")
+
+    @typechecked
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        key: bytes | None = None,
+        max_age: float = DEFAULT_SESSION_MAX_AGE,
+        unencrypted: bool = False,
+    ) -> None:
+        """
+        Initialize session store.
+
+        Args:
+            directory (str | os.PathLike[str]): directory to keep sessions in,
+                created if it doesn't exist
+            key (bytes | None, optional): Fernet key to encrypt sessions with,
+                see generate_key(). Defaults to None, which requires unencrypted.
+            max_age (float, optional): seconds after login a session is no
+                longer restored. Defaults to DEFAULT_SESSION_MAX_AGE.
+            unencrypted (bool, optional): save sessions as plain JSON instead,
+                without a key. Defaults to False.
+
+        Raises:
+            ImportError: if a key is given and cryptography isn't installed
+            ValueError: if key isn't a Fernet key, neither or both of key and
+                unencrypted are given, or max_age isn't positive
+
+        """
+        if max_age <= 0:
+            raise ValueError("max_age must be positive")
+        if (key is None) != unencrypted:
+            raise ValueError("give either a key or unencrypted=True")
+        self._fernet: Fernet | None = None
+        if key is not None:
+            self._fernet = _import_fernet().Fernet(key)
+        self._directory = os.fspath(directory)
+        if unencrypted:
+            LOG.warning(
+                "Pulse sessions in %s are saved unencrypted, anyone who can read "
+                "them can use the sessions",
+                self._directory,
+            )
+        os.makedirs(self._directory, mode=0o700, exist_ok=True)
+        self._max_age = max_age
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return (
+            f"<{self.__class__.__name__}: {self._directory}, "
+            f"{'encrypted' if self.encrypted else 'unencrypted'}>"
+        )
+
+    @staticmethod
+    def generate_key() -> bytes:
+        """
+        Return a new random Fernet key.
+
+        Raises:
+            ImportError: if cryptography isn't installed
+
+        """
+        return _import_fernet().Fernet.generate_key()
+
+    @property
+    def directory(self) -> str:
+        """Return the directory sessions are kept in."""
+        return self._directory
+
+    @property
+    def encrypted(self) -> bool:
+        """Return whether sessions are encrypted."""
+        return self._fernet is not None
+
+    @property
+    def max_age(self) -> float:
+        """Return the seconds after login a session is no longer restored."""
+        return self._max_age
+
+    def _path(self, username: str, service_host: str) -> str:
+        name = hashlib.sha256(f"{service_host}\n{username}".encode()).hexdigest()
+        return os.path.join(self._directory, name + _FILE_SUFFIX)
+
+    def _encode(self, plaintext: bytes) -> bytes:
+        if self._fernet is None:
+            return plaintext
+        return self._fernet.encrypt(plaintext)
+
+    def _decode(self, data: bytes) -> bytes:
+        """
+        Decode a session file.
+
+        Raises:
+            ValueError: if the file isn't encrypted, was altered or was
+                encrypted with another key
+
+        """
+        if self._fernet is None:
+            return data
+        try:
+            return self._fernet.decrypt(data)
+        except _import_fernet().InvalidToken as e:
+            raise ValueError(
+                "session isn't encrypted, was altered or has another key"
+            ) from e
+
+    @typechecked
+    def save(self, session: PulseSavedSession) -> None:
+        """
+        Save a session, replacing the account's previous one.
+
+        Args:
+            session (PulseSavedSession): the session
+
+        Raises:
+            OSError: if the session can't be written
+
+        """
+        contents = {"version": _FORMAT_VERSION, **asdict(session)}
+        data = self._encode(json.dumps(contents).encode())
+        # mkstemp creates files only the owner can read
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self._path(session.username, session.service_host))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @typechecked
+    def load(self, username: str, service_host: str) -> PulseSavedSession | None:
+        """
+        Load an account's session.
+
+        Args:
+            username (str): account username
+            service_host (str): Pulse host
+
+        Returns:
+            PulseSavedSession | None: the session, None if there isn't one, it's
+                older than max_age or it can't be read
+
+        """
+        path = self._path(username, service_host)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            LOG.warning("Could not read saved Pulse session %s: %s", path, e)
+            return None
+        try:
+            contents = json.loads(self._decode(data))
+            if contents.pop("version", None) != _FORMAT_VERSION:
+                raise ValueError("unknown session format")
+            cookies = tuple(PulseCookie(**cookie) for cookie in contents["cookies"])
+            session = PulseSavedSession(**{**contents, "cookies": cookies})
+        except (ValueError, TypeError, AttributeError, KeyError) as e:
+            LOG.warning("Ignoring saved Pulse session %s: %s", path, e)
+            return None
+        if (session.username, session.service_host) != (username, service_host):
+            return None
+        if time() - session.last_login_time > self._max_age:
+            LOG.debug("Saved Pulse session for %s has expired", username)
+            return None
+        return session
+
+    @typechecked
+    def delete(self, username: str, service_host: str) -> None:
+        """
+        Delete an account's session, if there is one.
+
+        Args:
+            username (str): account username
+            service_host (str): Pulse host
+
+        """
+        try:
+            os.unlink(self._path(username, service_host))
+        except FileNotFoundError:
+            pass
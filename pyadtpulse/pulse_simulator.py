@@ -0,0 +1,850 @@
+"""Local ADT Pulse portal simulator."""
+
+import asyncio
+from html import escape
+from time import time
+from uuid import uuid4
+from random import Random
+from logging import getLogger
+from datetime import datetime
+from dataclasses import field, replace, dataclass
+from collections.abc import Iterable
+
+from yarl import URL
+from aiohttp import CookieJar, ClientSession, web
+from typeguard import typechecked
+
+from .const import (
+    API_PREFIX,
+    ADT_ORB_URI,
+    ADT_LOGIN_URI,
+    ADT_DEVICE_URI,
+    ADT_LOGOUT_URI,
+    ADT_SYSTEM_URI,
+    ADT_GATEWAY_URI,
+    ADT_SUMMARY_URI,
+    ADT_TIMEOUT_URI,
+    ADT_ARM_DISARM_URI,
+    ADT_SYNC_CHECK_URI,
+)
+from .pulse_transport import (
+    PulseCookie,
+    PulseResponse,
+    PulseTransport,
+    aiohttp_request,
+    get_jar_cookies,
+    update_jar_cookies,
+)
+
+LOG = getLogger(__name__)
+
+DEFAULT_SIMULATOR_API_VERSION = "27.0.0-140"
+SESSION_COOKIE = "JSESSIONID"
+SECURITY_PANEL_DEVICE_ID = 1
+
+ALARM_DISARMED = "Disarmed"
+ALARM_ARMED_AWAY = "Armed Away"
+ALARM_ARMED_STAY = "Armed Stay"
+ALARM_ARMED_NIGHT = "Armed Night"
+ALARM_MODE_TO_STATUS = {
+    "off": ALARM_DISARMED,
+    "away": ALARM_ARMED_AWAY,
+    "stay": ALARM_ARMED_STAY,
+    "night": ALARM_ARMED_NIGHT,
+}
+
+# (name, type) of the zones created for simulated accounts, cycled through
+DEFAULT_ZONE_TYPES = (
+    ("Front Door", "Door/Window Sensor"),
+    ("Back Door", "Door/Window Sensor"),
+    ("Living Room Motion", "Motion Sensor"),
+    ("Kitchen Window", "Door/Window Sensor"),
+    ("Family Glass Break", "Glass Break Detector"),
+    ("Basement Smoke", "Fire (Smoke/Heat) Detector"),
+    ("Basement Flood", "Water/Flood Sensor"),
+    ("Garage Door", "Door/Window Sensor"),
+)
+
+# sync check tokens whose first two parts are 9 or less signal changes
+STABLE_TOKEN_BASE = 234532
+
+
+def _format_event_time(value: datetime) -> str:
+    hour = value.hour % 12 or 12
+    am_pm = "AM" if value.hour < 12 else "PM"
+    if value.date() == datetime.today().date():
+        day = "Today"
+    else:
+        day = f"{value.month}/{value.day}"
+    return f"{day}\xa0{hour}:{value.minute:02d}\xa0{am_pm}"
+
+
+@dataclass(slots=True)
+class PulseSimulatedZone:
+    """
+    A simulated zone.
+
+    Fields:
+        zone_id (int): zone number
+        device_id (int): Pulse device id, used by device.jsp
+        name (str): zone name
+        device_type (str): device type, i.e. "Door/Window Sensor"
+        state (str): zone state, one of OK, Open, Motion, Tamper or Alarm
+        trouble (str | None): trouble description, None if the zone is online
+        last_event (datetime): time of the last zone event
+    """
+
+    zone_id: int
+    device_id: int
+    name: str
+    device_type: str
+    state: str = "OK"
+    trouble: str | None = None
+    last_event: datetime = field(default_factory=datetime.now)
+
+
+@dataclass(slots=True)
+class PulseSimulatedAccount:
+    """
+    A simulated Pulse account and its first site.
+
+    Further sites of the login are kept in other_sites, each with its own site
+    fields.  Requests select a site with their networkid parameter, and go to
+    the first site without one.
+
+    Fields:
+        username (str): username
+        password (str): password
+        site_id (str): network id of the site
+        site_name (str): name of the site
+        zones (dict[int, PulseSimulatedZone]): zones of the site by zone id
+        alarm_status (str): alarm status, i.e. ALARM_DISARMED
+        gateway_online (bool): False to serve gateway offline orbs
+        sat (str): security token used to arm and disarm
+        failed_logins (int): failed logins since the last successful one
+        locked_until (float): time the account lockout expires
+        sync_version (int): incremented on every change
+        transient_polls (int): sync checks left which report a change
+        other_sites (list[PulseSimulatedAccount]): the login's other sites,
+            whose username and password are unused
+    """
+
+    username: str
+    password: str
+    site_id: str
+    site_name: str
+    zones: dict[int, PulseSimulatedZone] = field(default_factory=dict)
+    alarm_status: str = ALARM_DISARMED
+    gateway_online: bool = True
+    sat: str = field(default_factory=lambda: str(uuid4()))
+    failed_logins: int = 0
+    locked_until: float = 0.0
+    sync_version: int = 0
+    transient_polls: int = 0
+    other_sites: list["PulseSimulatedAccount"] = field(default_factory=list)
+
+    @property
+    def sites(self) -> list["PulseSimulatedAccount"]:
+        """Return every site of the login, first site first."""
+        return [self, *self.other_sites]
+
+    def get_site(self, site_id: str | None) -> "PulseSimulatedAccount | None":
+        """Return a site by network id, the first site if site_id is None."""
+        if site_id is None:
+            return self
+        for site in self.sites:
+            if site.site_id == site_id:
+                return site
+        return None
+
+    @property
+    def sync_token(self) -> str:
+        """Return the current sync check token, consuming transient ones."""
+        if self.transient_polls > 0:
+            self.transient_polls -= 1
+            return f"{min(self.sync_version, 9)}-0-0"
+        return f"{STABLE_TOKEN_BASE + self.sync_version}-456432-0"
+
+
+@dataclass(slots=True)
+class PulseSimulatedEvent:
+    """
+    A scripted state change.
+
+    Fields set to None are left unchanged.
+
+    Fields:
+        delay (float): seconds to wait after the previous event
+        username (str): account to change
+        zone_id (int | None): zone to change
+        state (str | None): new zone state
+        trouble (str | None): new zone trouble description, "" to clear it
+        alarm_status (str | None): new alarm status
+        gateway_online (bool | None): new gateway online status
+        site_id (str | None): site to change, None for the account's first site
+    """
+
+    delay: float
+    username: str
+    zone_id: int | None = None
+    state: str | None = None
+    trouble: str | None = None
+    alarm_status: str | None = None
+    gateway_online: bool | None = None
+    site_id: str | None = None
+
+
+class PulseSimulator:
+    """
+    aiohttp server emulating the Pulse portal endpoints used by pyadtpulse.
+
+    Serves any number of accounts, each with one or more sites.  State changes made
+    with apply_event() or run_events() produce sync check tokens signalling the
+    change, followed by updated orb, summary and system pages.  Use
+    PulseSimulatorTransport to point a PyADTPulseAsync object at the simulator.
+    """
+
+    __slots__ = (
+        "_accounts",
+        "_api_version",
+        "_app",
+        "_latency",
+        "_lockout_duration",
+        "_lockout_threshold",
+        "_request_counts",
+        "_runner",
+        "_sessions",
+        "_site",
+        "_site_count",
+        "_transient_polls",
+        "_unavailable_status",
+        "_unavailable_until",
+    )
+
+    @typechecked
+    def __init__(
+        self,
+        api_version: str = DEFAULT_SIMULATOR_API_VERSION,
+        latency: float = 0.0,
+        lockout_threshold: int = 5,
+        lockout_duration: int = 30 * 60,
+        transient_polls: int = 1,
+    ) -> None:
+        """
+        Initialize simulator.
+
+        Args:
+            api_version (str, optional): API version to serve.
+                Defaults to DEFAULT_SIMULATOR_API_VERSION.
+            latency (float, optional): seconds to wait before every response.
+                Defaults to 0.0.
+            lockout_threshold (int, optional): failed logins before an account
+                is locked. Defaults to 5.
+            lockout_duration (int, optional): seconds an account stays locked.
+                Defaults to 30 minutes.
+            transient_polls (int, optional): number of sync checks reporting a
+                change before the new stable token is served. Defaults to 1.
+
+        """
+        self._api_version = api_version
+        self._latency = latency
+        self._lockout_threshold = lockout_threshold
+        self._lockout_duration = lockout_duration
+        self._transient_polls = transient_polls
+        self._accounts: dict[str, PulseSimulatedAccount] = {}
+        self._site_count = 0
+        self._sessions: dict[str, str] = {}
+        self._request_counts: dict[str, int] = {}
+        self._unavailable_until = 0.0
+        self._unavailable_status = 429
+        self._app = web.Application()
+        self._app.router.add_route("*", "/{path_info:.*}", self._handler)
+        self._runner: web.AppRunner | None = None
+        self._site: web.TCPSite | None = None
+
+    @typechecked
+    def add_account(
+        self,
+        username: str,
+        password: str,
+        zone_count: int = len(DEFAULT_ZONE_TYPES),
+        site_name: str | None = None,
+    ) -> PulseSimulatedAccount:
+        """
+        Add an account.
+
+        Args:
+            username (str): username
+            password (str): password
+            zone_count (int, optional): number of zones to create.
+                Defaults to len(DEFAULT_ZONE_TYPES).
+            site_name (str | None, optional): site name. Defaults to None, which
+                uses the username.
+
+        Returns:
+            PulseSimulatedAccount: the account
+
+        """
+        account = PulseSimulatedAccount(
+            username, password, self._next_site_id(), site_name or username
+        )
+        self._add_zones(account, zone_count)
+        self._accounts[username] = account
+        return account
+
+    @typechecked
+    def add_site(
+        self,
+        username: str,
+        zone_count: int = len(DEFAULT_ZONE_TYPES),
+        site_name: str | None = None,
+    ) -> PulseSimulatedAccount:
+        """
+        Add another site to an account.
+
+        Args:
+            username (str): username of the account
+            zone_count (int, optional): number of zones to create.
+                Defaults to len(DEFAULT_ZONE_TYPES).
+            site_name (str | None, optional): site name. Defaults to None, which
+                uses the username and the site's number.
+
+        Returns:
+            PulseSimulatedAccount: the site
+
+        """
+        account = self._accounts[username]
+        site = PulseSimulatedAccount(
+            username,
+            account.password,
+            self._next_site_id(),
+            site_name or f"{username} {len(account.sites) + 1}",
+        )
+        self._add_zones(site, zone_count)
+        account.other_sites.append(site)
+        return site
+
+    def _next_site_id(self) -> str:
+        site_id = f"{160301 + self._site_count}za{self._site_count:06d}"
+        self._site_count += 1
+        return site_id
+
+    @staticmethod
+    def _add_zones(site: PulseSimulatedAccount, zone_count: int) -> None:
+        for i in range(zone_count):
+            name, device_type = DEFAULT_ZONE_TYPES[i % len(DEFAULT_ZONE_TYPES)]
+            if i >= len(DEFAULT_ZONE_TYPES):
+                name = f"{name} {i // len(DEFAULT_ZONE_TYPES) + 1}"
+            site.zones[i + 10] = PulseSimulatedZone(
+                i + 10, i + 10 + SECURITY_PANEL_DEVICE_ID, name, device_type
+            )
+
+    def get_account(self, username: str) -> PulseSimulatedAccount:
+        """Return an account by username."""
+        return self._accounts[username]
+
+    @property
+    def accounts(self) -> list[PulseSimulatedAccount]:
+        """Return all accounts."""
+        return list(self._accounts.values())
+
+    def _changed(self, account: PulseSimulatedAccount) -> None:
+        account.sync_version += 1
+        account.transient_polls = self._transient_polls
+
+    def apply_event(self, event: PulseSimulatedEvent) -> None:
+        """Apply a state change immediately, ignoring its delay."""
+        account = self._accounts[event.username].get_site(event.site_id)
+        if account is None:
+            raise KeyError(f"{event.username} has no site {event.site_id}")
+        if event.zone_id is not None:
+            zone = account.zones[event.zone_id]
+            if event.state is not None:
+                zone.state = event.state
+            if event.trouble is not None:
+                zone.trouble = event.trouble or None
+            zone.last_event = datetime.now()
+        if event.alarm_status is not None:
+            account.alarm_status = event.alarm_status
+        if event.gateway_online is not None:
+            account.gateway_online = event.gateway_online
+        self._changed(account)
+
+    async def run_events(self, events: list[PulseSimulatedEvent]) -> None:
+        """Apply state changes in order, waiting for each event's delay."""
+        for event in events:
+            if event.delay > 0:
+                await asyncio.sleep(event.delay)
+            self.apply_event(event)
+
+    @staticmethod
+    @typechecked
+    def generate_events(
+        usernames: list[str],
+        count: int,
+        interval: float,
+        zone_ids: list[int] | None = None,
+        seed: int | None = None,
+    ) -> list[PulseSimulatedEvent]:
+        """
+        Generate zones opening and closing at random.
+
+        Args:
+            usernames (list[str]): accounts to generate events for
+            count (int): number of events
+            interval (float): seconds between events
+            zone_ids (list[int] | None, optional): zones to change. Defaults to
+                None, which uses the first 4 default zones.
+            seed (int | None, optional): random seed. Defaults to None.
+
+        Returns:
+            list[PulseSimulatedEvent]: the events
+
+        """
+        rng = Random(seed)
+        zones = zone_ids or [10, 11, 13, 17]
+        open_zones: set[tuple[str, int]] = set()
+        events = []
+        for _ in range(count):
+            key = (rng.choice(usernames), rng.choice(zones))
+            state = "OK" if key in open_zones else "Open"
+            open_zones.symmetric_difference_update({key})
+            events.append(PulseSimulatedEvent(interval, key[0], key[1], state))
+        return events
+
+    @typechecked
+    def set_unavailable(self, retry_after: int, status: int = 429) -> None:
+        """
+        Respond to every request with an error for a while.
+
+        Args:
+            retry_after (int): seconds until requests are served again, sent as
+                the Retry-After header
+            status (int, optional): HTTP status to return, 429 or 503.
+                Defaults to 429.
+
+        """
+        self._unavailable_status = status
+        self._unavailable_until = time() + retry_after
+
+    def lock_account(self, username: str) -> None:
+        """Lock an account as if too many logins failed."""
+        self._accounts[username].locked_until = time() + self._lockout_duration
+
+    def logout_all(self) -> None:
+        """Invalidate every session, as Pulse does when a session times out."""
+        self._sessions.clear()
+
+    @property
+    def request_counts(self) -> dict[str, int]:
+        """Return the number of requests served by URI."""
+        return dict(self._request_counts)
+
+    @property
+    def requests_total(self) -> int:
+        """Return the total number of requests served."""
+        return sum(self._request_counts.values())
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL the simulator is listening on."""
+        if self._site is None or self._runner is None:
+            raise RuntimeError("Simulator is not running")
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving, on a random free port by default."""
+        self._runner = web.AppRunner(self._app, access_log=None)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, host, port)
+        await self._site.start()
+        LOG.debug("Pulse simulator listening on %s", self.base_url)
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+        self._runner = None
+        self._site = None
+
+    async def __aenter__(self) -> "PulseSimulator":
+        """Start the simulator."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Stop the simulator."""
+        await self.stop()
+
+    def _url(self, uri: str) -> str:
+        return f"{API_PREFIX}{self._api_version}{uri}"
+
+    # request handling
+
+    async def _handler(self, request: web.Request) -> web.StreamResponse:  # noqa: PLR0911
+        path = request.path
+        prefix = f"{API_PREFIX}{self._api_version}"
+        uri = path[len(prefix) :] if path.startswith(prefix) else path
+        self._request_counts[uri] = self._request_counts.get(uri, 0) + 1
+        if self._latency > 0:
+            await asyncio.sleep(self._latency)
+        remaining = self._unavailable_until - time()
+        if remaining > 0:
+            return web.Response(
+                status=self._unavailable_status,
+                text="Service Unavailable",
+                headers={"Retry-After": str(int(remaining) + 1)},
+            )
+        if uri in ("", "/"):
+            return self._redirect(ADT_LOGIN_URI)
+        if uri == ADT_LOGIN_URI:
+            if request.method == "POST":
+                return await self._login(request)
+            return self._html(
+                _signin_page(
+                    "You have not yet signed in."
+                    if request.query.get("e") == "ns"
+                    else None
+                )
+            )
+        account = self._accounts.get(
+            self._sessions.get(request.cookies.get(SESSION_COOKIE, ""), "")
+        )
+        if uri == ADT_LOGOUT_URI:
+            self._sessions.pop(request.cookies.get(SESSION_COOKIE, ""), None)
+            return self._redirect(ADT_LOGIN_URI)
+        if account is None:
+            return self._redirect(f"{ADT_LOGIN_URI}?e=ns")
+        return await self._handle_authenticated(request, uri, account)
+
+    async def _handle_authenticated(  # noqa: PLR0911
+        self, request: web.Request, uri: str, login: PulseSimulatedAccount
+    ) -> web.StreamResponse:
+        network_id = request.query.get("networkid")
+        if network_id is None and request.method == "POST":
+            network_id = (await request.post()).get("networkid")  # type: ignore[assignment]
+        account = login.get_site(network_id)
+        if account is None:
+            return web.Response(status=404, text="Not Found")
+        if uri == ADT_SYNC_CHECK_URI:
+            return web.Response(text=account.sync_token, content_type="text/html")
+        if uri == ADT_TIMEOUT_URI:
+            return web.Response(text="", content_type="text/html")
+        if uri == ADT_SUMMARY_URI:
+            return self._html(_summary_page(login, account, self._api_version))
+        if uri == ADT_ORB_URI:
+            return self._html(_orb_fragment(account))
+        if uri == ADT_SYSTEM_URI:
+            return self._html(_system_page(account))
+        if uri == ADT_GATEWAY_URI:
+            return self._html(_gateway_page(account))
+        if uri == ADT_DEVICE_URI:
+            return self._device(request, account)
+        if uri == ADT_ARM_DISARM_URI and request.method == "POST":
+            return await self._arm_disarm(request, account)
+        return web.Response(status=404, text="Not Found")
+
+    def _redirect(self, uri: str) -> web.Response:
+        return web.Response(status=302, headers={"Location": self._url(uri)})
+
+    def _html(self, body: str) -> web.Response:
+        return web.Response(text=body, content_type="text/html")
+
+    async def _login(self, request: web.Request) -> web.StreamResponse:
+        form = await request.post()
+        account = self._accounts.get(str(form.get("usernameForm", "")))
+        now = time()
+        if account is not None and account.locked_until > now:
+            minutes = int((account.locked_until - now) // 60) + 1
+            return self._html(
+                _signin_page(
+                    "Sign In unsuccessful. Your account has been locked after "
+                    f"multiple sign in attempts.<br/>Try again in {minutes} minutes."
+                )
+            )
+        if account is None or form.get("passwordForm") != account.password:
+            if account is not None:
+                account.failed_logins += 1
+                if account.failed_logins >= self._lockout_threshold:
+                    account.locked_until = now + self._lockout_duration
+            return self._html(
+                _signin_page("Sign In Unsuccessful. Check your Caps Lock key.")
+            )
+        account.failed_logins = 0
+        session_id = uuid4().hex
+        self._sessions[session_id] = account.username
+        response = self._redirect(ADT_SUMMARY_URI)
+        response.set_cookie(SESSION_COOKIE, session_id, path="/")
+        return response
+
+    def _device(
+        self, request: web.Request, account: PulseSimulatedAccount
+    ) -> web.Response:
+        device_id = request.query.get("id", "")
+        if device_id == str(SECURITY_PANEL_DEVICE_ID):
+            return self._html(
+                _attribute_page(
+                    {
+                        "Name": "Security Panel",
+                        "Manufacturer/Provider": "ADT",
+                        "Type/Model": "Security Panel - Simulated",
+                        "Status": "Online",
+                    }
+                )
+            )
+        for zone in account.zones.values():
+            if str(zone.device_id) == device_id:
+                return self._html(
+                    _attribute_page(
+                        {
+                            "Name": zone.name,
+                            "Zone": str(zone.zone_id),
+                            "Type/Model": zone.device_type,
+                            "Status": "Online" if zone.trouble is None else "Trouble",
+                        }
+                    )
+                )
+        return web.Response(status=404, text="Not Found")
+
+    async def _arm_disarm(
+        self, request: web.Request, account: PulseSimulatedAccount
+    ) -> web.Response:
+        form = await request.post()
+        status = ALARM_MODE_TO_STATUS.get(str(form.get("arm", "")))
+        if status is None or form.get("sat") != account.sat:
+            return self._html(
+                "<html><body><div class='p_armDisarmWrapper'><div>"
+                "Unable to change the system state.</div></div></body></html>"
+            )
+        account.alarm_status = status
+        self._changed(account)
+        return self._html("<html><body></body></html>")
+
+
+class PulseSimulatorTransport(PulseTransport):
+    """
+    Transport sending requests to a PulseSimulator.
+
+    The Pulse host in request URLs is replaced with the simulator URL, and the
+    simulator URL in response URLs is replaced with the Pulse host, so the client
+    sees the same URLs it would see from Pulse.  Each transport has its own
+    cookie jar, and so its own simulator session.
+    """
+
+    __slots__ = ("_base_url", "_session")
+
+    def __init__(self, base_url: str) -> None:
+        """Initialize simulator transport."""
+        self._base_url = URL(base_url)
+        self._session: ClientSession | None = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        data: dict[str, str] | None = None,
+        timeout: float,
+    ) -> PulseResponse:
+        """Perform an HTTP request to the simulator."""
+        session = self._get_session()
+        request_url = URL(url)
+        simulator_url = request_url.with_scheme(self._base_url.scheme).with_host(
+            str(self._base_url.host)
+        )
+        simulator_url = simulator_url.with_port(self._base_url.port)
+        response = await aiohttp_request(
+            session,
+            method,
+            str(simulator_url),
+            headers=headers,
+            params=params,
+            data=data,
+            timeout=timeout,
+        )
+        pulse_url = (
+            response.url.with_scheme(request_url.scheme)
+            .with_host(str(request_url.host))
+            .with_port(request_url.explicit_port)
+        )
+        return replace(response, url=pulse_url)
+
+    def _get_session(self) -> ClientSession:
+        if self._session is None:
+            # cookies from IP addresses are only accepted by unsafe cookie jars
+            self._session = ClientSession(cookie_jar=CookieJar(unsafe=True))
+        return self._session
+
+    def get_cookies(self) -> list[PulseCookie]:
+        """Return the cookies of the simulator session."""
+        if self._session is None:
+            return []
+        return get_jar_cookies(self._session.cookie_jar)
+
+    def set_cookies(self, cookies: Iterable[PulseCookie]) -> None:
+        """Add cookies to the simulator session."""
+        update_jar_cookies(self._get_session().cookie_jar, cookies)
+
+    async def close(self) -> None:
+        """Close the session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+# page generation
+
+
+def _signin_page(error: str | None) -> str:
+    warning = ""
+    if error is not None:
+        warning = f'<div id="warnMsgContents" role="alert">{error}</div>'
+    return (
+        "<html><head><title>ADT Pulse(TM) Interactive Solutions - Sign In</title>"
+        f'</head><body>{warning}<form name="loginForm" method="post">'
+        '<input type="text" name="usernameForm"/>'
+        '<input type="password" name="passwordForm"/>'
+        "</form></body></html>"
+    )
+
+
+def _zone_rows(account: PulseSimulatedAccount) -> str:
+    # Pulse lists zones in trouble first, then tripped zones, then the rest
+    zones = sorted(
+        account.zones.values(),
+        key=lambda z: (z.trouble is None, z.state == "OK", z.zone_id),
+    )
+    rows = []
+    for zone in zones:
+        status = f"Trouble {zone.trouble}" if zone.trouble else zone.state
+        rows.append(
+            "<tr class='p_listRow'>"
+            "<td class='p_iconCellSummary'><span class=\"devStatIcon\" "
+            f'title="Last Event: {_format_event_time(zone.last_event)}">'
+            f'<canvas icon="devStat{zone.state}" class="p_ic_icon_device">'
+            "</canvas></span></td>"
+            "<td class='p_listRow'>"
+            f'<a class="p_deviceNameText">{escape(zone.name)}</a>&nbsp;'
+            f'<div class="p_grayNormalText">Zone&nbsp;{zone.zone_id}</div></td>'
+            f"<td class='p_listRow'>{escape(status)}&nbsp;</td></tr>"
+        )
+    return "".join(rows)
+
+
+def _orb_fragment(account: PulseSimulatedAccount) -> str:
+    if account.gateway_online:
+        orb = account.alarm_status.lower().replace(" ", "")
+        status = f"{account.alarm_status}."
+    else:
+        orb = "offline"
+        status = "Status Unavailable."
+    open_zones = sum(1 for z in account.zones.values() if z.state != "OK")
+    return (
+        '<div id="orbContent">'
+        f'<canvas id="ic_orb" orb="{orb}" numOpen="{open_zones}"></canvas>'
+        '<span class="p_boldNormalTextLarge">'
+        f'<span id="spanOrbStatusText">{status}</span></span>'
+        f"<table>{_zone_rows(account)}</table></div>"
+    )
+
+
+def _premises(login: PulseSimulatedAccount, account: PulseSimulatedAccount) -> str:
+    if not login.other_sites:
+        return f'<span id="p_singlePremise">{escape(account.site_name)}</span>'
+    options = "".join(
+        f'<option value="{site.site_id}"'
+        f"{' selected' if site is account else ''}>{escape(site.site_name)}</option>"
+        for site in login.sites
+    )
+    return f'<select id="p_premiseSelect" name="networkid">{options}</select>'
+
+
+def _summary_page(
+    login: PulseSimulatedAccount, account: PulseSimulatedAccount, api_version: str
+) -> str:
+    mode = "off" if account.alarm_status != ALARM_DISARMED else "away"
+    armstate = "off" if account.alarm_status == ALARM_DISARMED else "armed"
+    return (
+        "<html><head><title>ADT Pulse(TM) Interactive Solutions - Summary</title>"
+        "</head><body>"
+        '<a id="p_signout1" class="p_signoutlink" '
+        f'href="{API_PREFIX}{api_version}{ADT_LOGOUT_URI}'
+        f'?networkid={account.site_id}&partner=adt">Sign Out</a>'
+        f"{_premises(login, account)}"
+        '<input type="button" id="security_button_0" '
+        "onclick=\"setArmState('quickcontrol/armDisarm.jsp','','0','2','false',"
+        f"'href=rest/adt/ui/client/security/setArmState&armstate={armstate}"
+        f"&arm={mode}&sat={account.sat}')\"/>"
+        f"{_orb_fragment(account)}</body></html>"
+    )
+
+
+def _system_row(device_id: str, name: str, zone: str, device_type: str) -> str:
+    onclick = (
+        "goToUrl('gateway.jsp');"
+        if device_id == "gateway"
+        else f"goToUrl('device.jsp?id={device_id}');"
+    )
+    return (
+        f"<tr class='p_listRow' onClick=\"{onclick}\">"
+        '<td><canvas class="p_ic_icon_device" title="Online"></canvas></td>'
+        f"<td class='p_listRow'><a href=\"#\">{escape(name)}</a></td>"
+        f"<td class='p_listRow'>{zone}</td><td class='p_listRow'>&nbsp;</td>"
+        f"<td>{escape(device_type)}</td></tr>"
+    )
+
+
+def _system_page(account: PulseSimulatedAccount) -> str:
+    rows = [
+        _system_row(
+            str(SECURITY_PANEL_DEVICE_ID),
+            "Security Panel",
+            "&nbsp;",
+            "ADT: Security Panel - Simulated",
+        ),
+        _system_row("gateway", "Gateway", "&nbsp;", "ADT Pulse Gateway: SIMULATED"),
+    ]
+    rows.extend(
+        _system_row(str(z.device_id), z.name, str(z.zone_id), z.device_type)
+        for z in account.zones.values()
+    )
+    return (
+        "<html><head><title>ADT Pulse(TM) Interactive Solutions - System</title>"
+        f"</head><body><table>{''.join(rows)}</table></body></html>"
+    )
+
+
+def _attribute_page(attributes: dict[str, str]) -> str:
+    rows = "".join(
+        f'<tr><td class="InputFieldDescriptionL">{name}:</td>'
+        f'<td align="left">{escape(value)}</td></tr>'
+        for name, value in attributes.items()
+    )
+    return f"<html><body><table>{rows}</table></body></html>"
+
+
+def _gateway_page(account: PulseSimulatedAccount) -> str:
+    now = datetime.now()
+    return _attribute_page(
+        {
+            "Status": "Online" if account.gateway_online else "Offline",
+            "Manufacturer": "ADT Pulse Gateway",
+            "Model": "SIMULATED",
+            "Serial Number": account.site_id,
+            "Next Update": _format_event_time(now.replace(hour=23, minute=59)),
+            "Last Update": _format_event_time(now),
+            "Firmware Version": "24.0.0-9",
+            "Hardware Version": "HW=3, BL=1.1.9b, PL=9.4.0.32.5, SKU=PGZNG1-2ADNAS",
+            "Primary Connection Type": "Broadband",
+            "Broadband Connection Status": "Active",
+            "Broadband LAN IP Address": "192.168.1.31",
+            "Broadband LAN MAC": "a4:11:62:35:07:96",
+            "Device LAN IP Address": "192.168.107.1",
+            "Device LAN MAC": "a4:11:62:35:07:97",
+            "Router LAN IP Address": "192.168.1.1",
+            "Router WAN IP Address": "",
+        }
+    )
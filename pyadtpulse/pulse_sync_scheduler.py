@@ -0,0 +1,348 @@
+"""Pulse adaptive sync check scheduler."""
+
+import asyncio
+from time import monotonic
+from collections import deque
+
+from .util import set_debug_lock
+from .pulse_metrics import (
+    METRIC_SYNC_CHECK_RATE,
+    METRIC_SYNC_CHECK_INTERVAL,
+    PulseMetrics,
+)
+from .pulse_timer_wheel import get_timer_wheel
+
+DEFAULT_ACTIVE_SLO = 1.0
+DEFAULT_IDLE_SLO = 10.0
+DEFAULT_ACTIVE_WINDOW = 60.0
+DEFAULT_IDLE_AFTER = 120.0
+DEFAULT_IDLE_GROWTH = 1.5
+DEFAULT_RATE_WINDOW = 300.0
+DEFAULT_COALESCE_WINDOW = 0.15
+
+
+class PulseSyncCheckScheduler:
+    """
+    Chooses how long to wait between sync checks.
+
+    The sync check poll interval is the gateway poll interval, except:
+
+    - for active_window seconds after a change is seen, or while the alarm is
+      arming or disarming, it is shortened so changes are seen within
+      active_slo seconds
+    - once nothing has changed for idle_after seconds, it grows by idle_growth
+      every poll, up to idle_slo seconds
+
+    A stretched wait is cut short by wake(), so activity started locally (i.e.
+    arming) does not have to wait out an idle interval.
+
+    Once a sync check signals updates, the orb fetch is held back for up to
+    coalesce_window seconds so a burst of changes (i.e. a door opening, motion
+    and the panel arming) is picked up by a single fetch.
+    """
+
+    __slots__ = (
+        "_active_slo",
+        "_active_until",
+        "_active_window",
+        "_burst_deadline",
+        "_coalesce_window",
+        "_idle_after",
+        "_idle_growth",
+        "_idle_interval",
+        "_idle_slo",
+        "_interval",
+        "_last_activity",
+        "_loop",
+        "_metric_labels",
+        "_metrics",
+        "_poll_count",
+        "_polls",
+        "_rate_window",
+        "_ss_lock",
+        "_started",
+        "_stretched",
+        "_wake_event",
+    )
+
+    def __init__(
+        self,
+        active_slo: float = DEFAULT_ACTIVE_SLO,
+        idle_slo: float = DEFAULT_IDLE_SLO,
+        active_window: float = DEFAULT_ACTIVE_WINDOW,
+        idle_after: float = DEFAULT_IDLE_AFTER,
+        idle_growth: float = DEFAULT_IDLE_GROWTH,
+        rate_window: float = DEFAULT_RATE_WINDOW,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        metrics: PulseMetrics | None = None,
+        site_id: str | None = None,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize sync check scheduler.
+
+        Args:
+            active_slo (float, optional): longest seconds to detect a change
+                while active. Defaults to DEFAULT_ACTIVE_SLO.
+            idle_slo (float, optional): longest seconds to detect a change while
+                idle. Defaults to DEFAULT_IDLE_SLO.
+            active_window (float, optional): seconds to stay active after a
+                change. Defaults to DEFAULT_ACTIVE_WINDOW.
+            idle_after (float, optional): seconds without changes before the
+                interval is stretched. Defaults to DEFAULT_IDLE_AFTER.
+            idle_growth (float, optional): factor the interval grows by each
+                idle poll. Defaults to DEFAULT_IDLE_GROWTH.
+            rate_window (float, optional): seconds of polls used to compute the
+                request rate. Defaults to DEFAULT_RATE_WINDOW.
+            coalesce_window (float, optional): longest seconds an orb fetch is
+                delayed to pick up further changes, 0 to not delay it and fetch
+                once the sync check token settles, however long that takes.
+                Defaults to DEFAULT_COALESCE_WINDOW.
+            metrics (PulseMetrics | None, optional): registry to export the
+                interval and request rate to. Defaults to None.
+            site_id (str | None, optional): site the metrics are labelled with.
+                Defaults to None, which doesn't label them.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if an argument is out of range
+
+        """
+        if not 0 < active_slo <= idle_slo:
+            raise ValueError("active_slo must be positive and no larger than idle_slo")
+        if idle_growth < 1:
+            raise ValueError("idle_growth must be at least 1")
+        if (
+            active_window < 0
+            or idle_after < 0
+            or rate_window <= 0
+            or coalesce_window < 0
+        ):
+            raise ValueError("windows must not be negative")
+        self._active_slo = active_slo
+        self._idle_slo = idle_slo
+        self._active_window = active_window
+        self._idle_after = idle_after
+        self._idle_growth = idle_growth
+        self._rate_window = rate_window
+        self._coalesce_window = coalesce_window
+        self._burst_deadline = 0.0
+        self._metrics = metrics
+        self._metric_labels = None if site_id is None else {"site": site_id}
+        self._ss_lock = set_debug_lock(debug_locks, "pyadtpulse.ss_lock")
+        now = monotonic()
+        self._started = now
+        self._last_activity = now
+        self._active_until = 0.0
+        self._idle_interval = 0.0
+        self._interval = 0.0
+        self._stretched = False
+        self._poll_count = 0
+        self._polls: deque[float] = deque()
+        self._wake_event = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def interval(self) -> float:
+        """Return the last interval chosen."""
+        with self._ss_lock:
+            return self._interval
+
+    @property
+    def poll_count(self) -> int:
+        """Return the number of sync checks made."""
+        with self._ss_lock:
+            return self._poll_count
+
+    @property
+    def coalesce_window(self) -> float:
+        """Return the longest seconds an orb fetch is delayed."""
+        with self._ss_lock:
+            return self._coalesce_window
+
+    @coalesce_window.setter
+    def coalesce_window(self, window: float) -> None:
+        """Set the longest seconds an orb fetch is delayed."""
+        if window < 0:
+            raise ValueError("coalesce_window must not be negative")
+        with self._ss_lock:
+            self._coalesce_window = window
+
+    @property
+    def is_active(self) -> bool:
+        """Return whether a change was seen within the active window."""
+        with self._ss_lock:
+            return monotonic() < self._active_until
+
+    def request_rate(self, now: float | None = None) -> float:
+        """
+        Return the sync check rate.
+
+        Args:
+            now (float | None, optional): monotonic time. Defaults to None,
+                which uses the current time.
+
+        Returns:
+            float: sync checks per second over the rate window
+
+        """
+        if now is None:
+            now = monotonic()
+        with self._ss_lock:
+            self._expire_polls(now)
+            elapsed = min(now - self._started, self._rate_window)
+            if elapsed <= 0:
+                return 0.0
+            return len(self._polls) / elapsed
+
+    def _expire_polls(self, now: float) -> None:
+        while self._polls and self._polls[0] <= now - self._rate_window:
+            self._polls.popleft()
+
+    def record_poll(self, now: float | None = None) -> None:
+        """Record a sync check being made."""
+        if now is None:
+            now = monotonic()
+        with self._ss_lock:
+            self._poll_count += 1
+            self._polls.append(now)
+            self._expire_polls(now)
+        if self._metrics is not None:
+            self._metrics.set_gauge(
+                METRIC_SYNC_CHECK_RATE, self.request_rate(now), self._metric_labels
+            )
+
+    def record_activity(self, now: float | None = None) -> None:
+        """Record a change being seen or made, shortening the interval."""
+        if now is None:
+            now = monotonic()
+        with self._ss_lock:
+            self._last_activity = now
+            self._active_until = now + self._active_window
+            self._idle_interval = 0.0
+
+    def start_burst(self, now: float | None = None) -> None:
+        """
+        Start the coalescing window after a sync check signals updates.
+
+        Does nothing if coalesce_window is 0, so the burst never expires.
+        """
+        if now is None:
+            now = monotonic()
+        with self._ss_lock:
+            if not self._burst_deadline and self._coalesce_window:
+                self._burst_deadline = now + self._coalesce_window
+
+    def end_burst(self) -> None:
+        """End the coalescing window once the orb has been fetched."""
+        with self._ss_lock:
+            self._burst_deadline = 0.0
+
+    def coalesce_delay(self, now: float | None = None) -> float:
+        """Return seconds left in the coalescing window."""
+        if now is None:
+            now = monotonic()
+        with self._ss_lock:
+            if not self._burst_deadline:
+                return 0.0
+            return max(self._burst_deadline - now, 0.0)
+
+    def burst_expired(self, now: float | None = None) -> bool:
+        """
+        Return whether the orb should be fetched without waiting for the token.
+
+        True once the coalescing window of a burst has passed, so a stream of
+        changes can't delay the fetch by more than coalesce_window.
+        """
+        if now is None:
+            now = monotonic()
+        with self._ss_lock:
+            return bool(self._burst_deadline) and now >= self._burst_deadline
+
+    def wake(self) -> None:
+        """
+        Cut short the current wait, if it is a stretched one.
+
+        Can be called from any thread.
+        """
+        with self._ss_lock:
+            loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is None or loop is running or loop.is_closed():
+            self._wake_event.set()
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake_event.set)
+        except RuntimeError:
+            # the loop closed after the check above
+            self._wake_event.set()
+
+    def next_interval(
+        self, base: float, urgent: bool = False, now: float | None = None
+    ) -> float:
+        """
+        Return how long to wait before the next sync check.
+
+        Args:
+            base (float): the normal poll interval
+            urgent (bool, optional): True if a change is expected soon, i.e.
+                the alarm is arming. Defaults to False.
+            now (float | None, optional): monotonic time. Defaults to None,
+                which uses the current time.
+
+        Returns:
+            float: seconds to wait
+
+        """
+        if now is None:
+            now = monotonic()
+        with self._ss_lock:
+            stretched = False
+            if urgent or now < self._active_until:
+                interval = min(base, self._active_slo)
+            elif now - self._last_activity < self._idle_after:
+                interval = base
+            else:
+                self._idle_interval = min(
+                    max(self._idle_interval * self._idle_growth, base),
+                    max(base, self._idle_slo),
+                )
+                interval = self._idle_interval
+                stretched = interval > base
+            self._interval = interval
+            self._stretched = stretched
+        if self._metrics is not None:
+            self._metrics.set_gauge(
+                METRIC_SYNC_CHECK_INTERVAL, interval, self._metric_labels
+            )
+        return interval
+
+    async def sleep(self, interval: float, name: str = "") -> None:
+        """
+        Wait for an interval returned by next_interval().
+
+        The wait is timed by the loop's shared timer wheel.  Stretched waits end
+        early if wake() is called.
+
+        Args:
+            interval (float): seconds to wait
+            name (str, optional): name of the wait on the timer wheel.
+                Defaults to "".
+
+        """
+        with self._ss_lock:
+            stretched = self._stretched
+            self._loop = asyncio.get_running_loop()
+        wheel = get_timer_wheel()
+        if not stretched:
+            await wheel.sleep(interval, name=name)
+        elif not self._wake_event.is_set():
+            timer = wheel.call_later(interval, self._wake_event.set, name=name)
+            try:
+                await self._wake_event.wait()
+            finally:
+                timer.cancel()
+        self._wake_event.clear()
@@ -0,0 +1,208 @@
+"""Pulse sync check token tracking."""
+
+import re
+from logging import getLogger
+from dataclasses import dataclass
+
+from .util import set_debug_lock
+from .pulse_metrics import METRIC_SYNC_TOKEN_RESULTS, PulseMetrics
+
+LOG = getLogger(__name__)
+
+SYNC_TOKEN_PATTERN = re.compile(r"(\d+)-(\d+)-(\d+)")
+# tokens whose first or second part is at or below this signal changes in progress
+TRANSIENT_TOKEN_MAX = 9
+
+# sync token results, used as the "result" label of METRIC_SYNC_TOKEN_RESULTS
+RESULT_TRUE_POSITIVE = "true_positive"
+RESULT_FALSE_POSITIVE = "false_positive"
+RESULT_TRUE_NEGATIVE = "true_negative"
+RESULT_FALSE_NEGATIVE = "false_negative"
+
+
+@dataclass(frozen=True, slots=True)
+class PulseSyncToken:
+    """
+    A parsed sync check token.
+
+    Sync check responses look like "234532-456432-0".  While Pulse is
+    processing a change the token drops to small values such as "1-0-0", then
+    settles on a new stable token.
+
+    Fields:
+        first (int): first part of the token
+        second (int): second part of the token
+        third (int): third part of the token, which doesn't signal changes
+    """
+
+    first: int
+    second: int
+    third: int
+
+    @staticmethod
+    def parse(text: str) -> "PulseSyncToken | None":
+        """
+        Parse a sync check response.
+
+        Returns:
+            PulseSyncToken | None: the token, None if the text isn't a token
+
+        """
+        match = SYNC_TOKEN_PATTERN.match(text)
+        if match is None:
+            return None
+        return PulseSyncToken(*(int(part) for part in match.groups()))
+
+    def __str__(self) -> str:
+        """Return the token as Pulse sends it."""
+        return f"{self.first}-{self.second}-{self.third}"
+
+    @property
+    def is_transient(self) -> bool:
+        """Return True if the token signals changes are being processed."""
+        return self.first <= TRANSIENT_TOKEN_MAX or self.second <= TRANSIENT_TOKEN_MAX
+
+    def advanced_from(self, previous: "PulseSyncToken") -> bool:
+        """Return True if the parts which signal changes differ from previous."""
+        return (self.first, self.second) != (previous.first, previous.second)
+
+
+class PulseSyncTokenTracker:
+    """
+    Remembers a site's sync check tokens to decide when to fetch the orb.
+
+    A token signals updates if it is transient, or if it is a stable token
+    which advanced from the last stable token seen.  Each orb fetch is then
+    scored against whether anything actually changed, giving false positive
+    (fetched, nothing changed) and false negative (not signalled, but something
+    changed) rates.
+    """
+
+    __slots__ = (
+        "_false_negatives",
+        "_false_positives",
+        "_last_token",
+        "_metrics",
+        "_pending",
+        "_signalled_fetches",
+        "_st_lock",
+        "_stable_token",
+        "_unsignalled_fetches",
+    )
+
+    def __init__(
+        self, metrics: PulseMetrics | None = None, debug_locks: bool = False
+    ) -> None:
+        """
+        Initialize sync token tracker.
+
+        Args:
+            metrics (PulseMetrics | None, optional): registry to count orb fetch
+                results in. Defaults to None.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        """
+        self._st_lock = set_debug_lock(debug_locks, "pyadtpulse.st_lock")
+        self._metrics = metrics
+        self._last_token: PulseSyncToken | None = None
+        self._stable_token: PulseSyncToken | None = None
+        self._pending = False
+        self._signalled_fetches = 0
+        self._unsignalled_fetches = 0
+        self._false_positives = 0
+        self._false_negatives = 0
+
+    @property
+    def last_token(self) -> PulseSyncToken | None:
+        """Return the last token seen."""
+        with self._st_lock:
+            return self._last_token
+
+    @property
+    def stable_token(self) -> PulseSyncToken | None:
+        """Return the last stable token seen."""
+        with self._st_lock:
+            return self._stable_token
+
+    @property
+    def false_positives(self) -> int:
+        """Return the number of signalled orb fetches which found no changes."""
+        with self._st_lock:
+            return self._false_positives
+
+    @property
+    def false_negatives(self) -> int:
+        """Return the number of unsignalled orb fetches which found changes."""
+        with self._st_lock:
+            return self._false_negatives
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Return the fraction of signalled orb fetches which found no changes."""
+        with self._st_lock:
+            if not self._signalled_fetches:
+                return 0.0
+            return self._false_positives / self._signalled_fetches
+
+    @property
+    def false_negative_rate(self) -> float:
+        """Return the fraction of unsignalled orb fetches which found changes."""
+        with self._st_lock:
+            if not self._unsignalled_fetches:
+                return 0.0
+            return self._false_negatives / self._unsignalled_fetches
+
+    def observe(self, token: PulseSyncToken) -> bool:
+        """
+        Record a sync check token.
+
+        Returns:
+            bool: True if the token signals updates
+
+        """
+        with self._st_lock:
+            self._last_token = token
+            if token.is_transient:
+                signalled = True
+            else:
+                signalled = self._stable_token is not None and token.advanced_from(
+                    self._stable_token
+                )
+                self._stable_token = token
+            if signalled:
+                self._pending = True
+            return signalled
+
+    def record_orb_fetch(self, changed: bool) -> None:
+        """
+        Score an orb fetch against the tokens seen since the previous one.
+
+        Args:
+            changed (bool): True if the fetch found any changes
+
+        """
+        with self._st_lock:
+            signalled = self._pending
+            self._pending = False
+            if signalled:
+                self._signalled_fetches += 1
+                result = RESULT_TRUE_POSITIVE if changed else RESULT_FALSE_POSITIVE
+                if not changed:
+                    self._false_positives += 1
+            else:
+                self._unsignalled_fetches += 1
+                result = RESULT_FALSE_NEGATIVE if changed else RESULT_TRUE_NEGATIVE
+                if changed:
+                    self._false_negatives += 1
+            token = self._last_token
+        if self._metrics is not None:
+            self._metrics.increment(METRIC_SYNC_TOKEN_RESULTS, {"result": result})
+        if result in (RESULT_FALSE_POSITIVE, RESULT_FALSE_NEGATIVE):
+            LOG.debug(
+                "Orb fetch after sync token %s was a %s, false positive rate %.2f, "
+                "false negative rate %.2f",
+                token,
+                result.replace("_", " "),
+                self.false_positive_rate,
+                self.false_negative_rate,
+            )
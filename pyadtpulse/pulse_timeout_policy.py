@@ -0,0 +1,174 @@
+"""Pulse adaptive request timeouts."""
+
+from math import ceil
+from collections import deque
+
+from .util import set_debug_lock
+from .const import ADT_DEFAULT_LOGIN_TIMEOUT
+from .pulse_metrics import ENDPOINT_VERSION
+
+DEFAULT_QUERY_TIMEOUT = 1.0
+# timeouts used until enough latency samples have been seen
+DEFAULT_ENDPOINT_TIMEOUTS: dict[str, float] = {
+    "login": float(ADT_DEFAULT_LOGIN_TIMEOUT),
+    "logout": 10.0,
+    "gateway": 10.0,
+    "arm": 10.0,
+    ENDPOINT_VERSION: 10.0,
+}
+DEFAULT_TIMEOUT_PERCENTILE = 99.0
+DEFAULT_TIMEOUT_MULTIPLIER = 3.0
+DEFAULT_TIMEOUT_FLOOR = 1.0
+DEFAULT_TIMEOUT_CAP = 60.0
+DEFAULT_TIMEOUT_WINDOW = 100
+DEFAULT_TIMEOUT_MIN_SAMPLES = 10
+
+
+class PulseTimeoutPolicy:
+    """
+    Derives per-endpoint request timeouts from observed latency.
+
+    Once an endpoint has min_samples observations, its timeout is the given
+    percentile of its last window latencies times multiplier, clamped between
+    floor and cap.  Until then the endpoint's default timeout is used.
+    Requests which time out are observed with the timeout they were given, so
+    repeated timeouts raise the timeout towards the cap.
+    """
+
+    __slots__ = (
+        "_cap",
+        "_default_timeouts",
+        "_floor",
+        "_min_samples",
+        "_multiplier",
+        "_percentile",
+        "_samples",
+        "_timeouts",
+        "_tp_lock",
+        "_window",
+    )
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_TIMEOUT_PERCENTILE,
+        multiplier: float = DEFAULT_TIMEOUT_MULTIPLIER,
+        floor: float = DEFAULT_TIMEOUT_FLOOR,
+        cap: float = DEFAULT_TIMEOUT_CAP,
+        window: int = DEFAULT_TIMEOUT_WINDOW,
+        min_samples: int = DEFAULT_TIMEOUT_MIN_SAMPLES,
+        default_timeouts: dict[str, float] | None = None,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize timeout policy.
+
+        Args:
+            percentile (float, optional): latency percentile to base timeouts
+                on. Defaults to DEFAULT_TIMEOUT_PERCENTILE.
+            multiplier (float, optional): factor applied to the percentile.
+                Defaults to DEFAULT_TIMEOUT_MULTIPLIER.
+            floor (float, optional): smallest timeout in seconds.
+                Defaults to DEFAULT_TIMEOUT_FLOOR.
+            cap (float, optional): largest timeout in seconds.
+                Defaults to DEFAULT_TIMEOUT_CAP.
+            window (int, optional): number of recent latencies kept per
+                endpoint. Defaults to DEFAULT_TIMEOUT_WINDOW.
+            min_samples (int, optional): latencies needed before adapting.
+                Defaults to DEFAULT_TIMEOUT_MIN_SAMPLES.
+            default_timeouts (dict[str, float] | None, optional): timeouts by
+                endpoint name used before adapting, endpoints not listed use
+                DEFAULT_QUERY_TIMEOUT. Defaults to DEFAULT_ENDPOINT_TIMEOUTS.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if an argument is out of range
+
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if multiplier < 1:
+            raise ValueError("multiplier must be at least 1")
+        if not 0 < floor <= cap:
+            raise ValueError("floor must be positive and no larger than cap")
+        if not 0 < min_samples <= window:
+            raise ValueError("min_samples must be between 1 and window")
+        self._percentile = percentile
+        self._multiplier = multiplier
+        self._floor = floor
+        self._cap = cap
+        self._window = window
+        self._min_samples = min_samples
+        self._default_timeouts = (
+            dict(default_timeouts)
+            if default_timeouts is not None
+            else dict(DEFAULT_ENDPOINT_TIMEOUTS)
+        )
+        self._samples: dict[str, deque[float]] = {}
+        self._timeouts: dict[str, float] = {}
+        self._tp_lock = set_debug_lock(debug_locks, "pyadtpulse.tp_lock")
+
+    @property
+    def floor(self) -> float:
+        """Return the smallest adaptive timeout."""
+        return self._floor
+
+    @property
+    def cap(self) -> float:
+        """Return the largest adaptive timeout."""
+        return self._cap
+
+    def default_timeout(self, endpoint: str) -> float:
+        """Return the timeout used for an endpoint before adapting."""
+        return self._default_timeouts.get(endpoint, DEFAULT_QUERY_TIMEOUT)
+
+    def get_timeout(self, endpoint: str) -> float:
+        """
+        Return the timeout to use for a request.
+
+        Args:
+            endpoint (str): metrics endpoint name of the request
+
+        Returns:
+            float: timeout in seconds
+
+        """
+        with self._tp_lock:
+            timeout = self._timeouts.get(endpoint)
+        if timeout is None:
+            return self.default_timeout(endpoint)
+        return timeout
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        """
+        Add the latency of a completed or timed out request.
+
+        Args:
+            endpoint (str): metrics endpoint name of the request
+            latency (float): seconds taken by the request, or the timeout if it
+                timed out
+
+        """
+        with self._tp_lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self._window)
+            samples.append(latency)
+            if len(samples) < self._min_samples:
+                return
+            ordered = sorted(samples)
+            # nearest rank percentile
+            index = max(ceil(self._percentile / 100 * len(ordered)) - 1, 0)
+            self._timeouts[endpoint] = min(
+                max(ordered[index] * self._multiplier, self._floor), self._cap
+            )
+
+    def reset(self) -> None:
+        """Forget all observed latencies."""
+        with self._tp_lock:
+            self._samples.clear()
+            self._timeouts.clear()
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the adapted timeouts by endpoint name."""
+        with self._tp_lock:
+            return dict(self._timeouts)
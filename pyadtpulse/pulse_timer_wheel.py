@@ -0,0 +1,418 @@
+"""Hierarchical timer wheel driving periodic Pulse work."""
+
+import asyncio
+from random import uniform
+from logging import getLogger
+from weakref import WeakKeyDictionary, ref
+from threading import RLock
+from collections.abc import Callable
+
+from .util import set_debug_lock
+
+LOG = getLogger(__name__)
+
+DEFAULT_RESOLUTION = 0.05
+# each level has 2 ** WHEEL_BITS slots
+WHEEL_BITS = 6
+WHEEL_LEVELS = 4
+WHEEL_SLOTS = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SLOTS - 1
+# timers further out than this many ticks wait in the top level and are
+# re-filed each time it turns
+MAX_TICKS = 1 << (WHEEL_BITS * WHEEL_LEVELS)
+
+_wheels_lock = RLock()
+_wheels: "WeakKeyDictionary[asyncio.AbstractEventLoop, PulseTimerWheel]" = (
+    WeakKeyDictionary()
+)
+
+
+def jittered(delay: float, jitter: float) -> float:
+    """
+    Return delay shortened by a random amount of up to jitter seconds.
+
+    Args:
+        delay (float): the longest delay
+        jitter (float): the most the delay is shortened by
+
+    Returns:
+        float: the delay, never less than 0
+
+    """
+    if jitter <= 0:
+        return delay
+    return max(delay - uniform(0, min(jitter, delay)), 0.0)
+
+
+class PulseTimer:
+    """A timer scheduled on a PulseTimerWheel."""
+
+    __slots__ = (
+        "_callback",
+        "_cancelled",
+        "_expiry",
+        "_level",
+        "_slot",
+        "_wheel",
+        "name",
+        "when",
+    )
+
+    def __init__(
+        self,
+        wheel: "PulseTimerWheel",
+        when: float,
+        expiry: int,
+        callback: Callable[[], None],
+        name: str,
+    ) -> None:
+        self._wheel = wheel
+        self._callback = callback
+        self._cancelled = False
+        # tick the timer fires on
+        self._expiry = expiry
+        # wheel slot holding the timer, None once fired or cancelled
+        self._slot: dict[PulseTimer, None] | None = None
+        self._level = 0
+        self.when = when
+        self.name = name
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return f"<{self.__class__.__name__}: {self.name} at {self.when:.2f}>"
+
+    @property
+    def cancelled(self) -> bool:
+        """Return whether the timer was cancelled."""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Cancel the timer, doing nothing if it has already fired."""
+        if self._cancelled:
+            return
+        self._cancelled = True
+        self._wheel._remove(self)
+
+
+class PulseTimerWheel:
+    """
+    Runs timers for every Pulse session on an event loop.
+
+    Timers are kept in a hierarchical wheel of WHEEL_LEVELS levels of
+    WHEEL_SLOTS slots.  A slot of the first level holds the timers due on one
+    tick of resolution seconds, and a slot of each higher level holds the timers
+    due in a span covered by a whole turn of the level below, which are moved
+    down as it comes round.  Scheduling and cancelling timers take constant time
+    however many are pending, and the wheel keeps at most one asyncio timer,
+    for the next tick with work to do.  Timers fire on the first tick at or
+    after their time, so up to resolution seconds late.
+
+    Use get_timer_wheel() to get the wheel shared by every session on a loop.
+    Timers must be scheduled and cancelled from the wheel's loop.
+    """
+
+    __slots__ = (
+        "_count",
+        "_handle",
+        "_handle_tick",
+        "_levels",
+        "_loop_ref",
+        "_origin",
+        "_resolution",
+        "_tick",
+        "_tw_lock",
+    )
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop | None = None,
+        resolution: float = DEFAULT_RESOLUTION,
+        debug_locks: bool = False,
+    ) -> None:
+        """
+        Initialize timer wheel.
+
+        Args:
+            loop (asyncio.AbstractEventLoop | None, optional): loop to run timers
+                on. Defaults to None, which uses the running loop.
+            resolution (float, optional): seconds per tick.
+                Defaults to DEFAULT_RESOLUTION.
+            debug_locks (bool, optional): use debugging locks. Defaults to False.
+
+        Raises:
+            ValueError: if resolution is not positive
+
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        # weak, so the shared wheel of a loop doesn't keep it alive
+        self._loop_ref = ref(loop)
+        self._resolution = resolution
+        self._tw_lock = set_debug_lock(debug_locks, "pyadtpulse.tw_lock")
+        self._origin = loop.time()
+        # last tick processed
+        self._tick = 0
+        self._levels: list[list[dict[PulseTimer, None]]] = [
+            [{} for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)
+        ]
+        # timers on each level
+        self._count = [0] * WHEEL_LEVELS
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_tick = 0
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return f"<{self.__class__.__name__}: {len(self)} timers>"
+
+    def __len__(self) -> int:
+        """Return the number of pending timers."""
+        with self._tw_lock:
+            return sum(self._count)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Return the loop timers run on.
+
+        Raises:
+            RuntimeError: if the loop no longer exists
+
+        """
+        loop = self._loop_ref()
+        if loop is None:
+            raise RuntimeError("timer wheel's event loop no longer exists")
+        return loop
+
+    @property
+    def resolution(self) -> float:
+        """Return the seconds per tick."""
+        return self._resolution
+
+    def _file(self, timer: PulseTimer) -> None:
+        """Put a timer in the slot for its expiry."""
+        delta = timer._expiry - self._tick
+        level = 0
+        while level < WHEEL_LEVELS - 1 and delta >= 1 << (WHEEL_BITS * (level + 1)):
+            level += 1
+        expiry = timer._expiry
+        if delta >= MAX_TICKS:
+            expiry = self._tick + MAX_TICKS - 1
+        slot = self._levels[level][(expiry >> (WHEEL_BITS * level)) & WHEEL_MASK]
+        slot[timer] = None
+        timer._slot = slot
+        timer._level = level
+        self._count[level] += 1
+
+    def _remove(self, timer: PulseTimer) -> None:
+        with self._tw_lock:
+            slot = timer._slot
+            if slot is None:
+                return
+            del slot[timer]
+            timer._slot = None
+            self._count[timer._level] -= 1
+            if not sum(self._count) and self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+
+    def _cascade(self, level: int) -> bool:
+        """
+        Move the timers of the current slot of a level down a level.
+
+        Returns:
+            bool: True if the level has also turned, so the next must cascade
+
+        """
+        index = (self._tick >> (WHEEL_BITS * level)) & WHEEL_MASK
+        slot = self._levels[level][index]
+        if slot:
+            self._levels[level][index] = {}
+            self._count[level] -= len(slot)
+            for timer in slot:
+                self._file(timer)
+        return index == 0
+
+    def _next_tick(self) -> int | None:
+        """Return the next tick with timers to fire or move, None if none."""
+        best: int | None = None
+        for level in range(WHEEL_LEVELS):
+            if not self._count[level]:
+                continue
+            shift = WHEEL_BITS * level
+            index = (self._tick >> shift) & WHEEL_MASK
+            slots = self._levels[level]
+            for step in range(1, WHEEL_SLOTS + 1):
+                if slots[(index + step) & WHEEL_MASK]:
+                    break
+            if level == 0:
+                tick = self._tick + step
+            else:
+                # the slot is moved down when the level turns to it
+                tick = ((self._tick >> shift) + step) << shift
+            if best is None or tick < best:
+                best = tick
+        return best
+
+    def _advance(self, target: int) -> list[PulseTimer]:
+        """Process ticks up to target, returning the timers due."""
+        due: list[PulseTimer] = []
+        while self._tick < target:
+            # skip ticks with nothing to fire or move down
+            next_tick = self._next_tick()
+            if next_tick is None or next_tick > target:
+                self._tick = target
+                break
+            self._tick = next_tick - 1
+            self._tick += 1
+            index = self._tick & WHEEL_MASK
+            if index == 0:
+                level = 1
+                while level < WHEEL_LEVELS and self._cascade(level):
+                    level += 1
+            slot = self._levels[0][index]
+            if slot:
+                self._levels[0][index] = {}
+                self._count[0] -= len(slot)
+                for timer in slot:
+                    timer._slot = None
+                    due.append(timer)
+        return due
+
+    def _current_tick(self) -> int:
+        # allow for rounding when run at the time scheduled for a tick
+        return int((self.loop.time() - self._origin) / self._resolution + 1e-6)
+
+    def _arm(self) -> None:
+        """Schedule the loop callback for the next tick with work."""
+        tick = self._next_tick()
+        if tick is None:
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+            return
+        if self._handle is not None:
+            if self._handle_tick <= tick:
+                return
+            self._handle.cancel()
+        self._handle_tick = tick
+        self._handle = self.loop.call_at(
+            self._origin + tick * self._resolution, self._run
+        )
+
+    def _run(self) -> None:
+        with self._tw_lock:
+            self._handle = None
+            due = self._advance(self._current_tick())
+        for timer in due:
+            if timer._cancelled:
+                continue
+            try:
+                timer._callback()
+            except Exception:
+                LOG.exception("Timer %s raised an exception", timer.name)
+        with self._tw_lock:
+            self._arm()
+
+    def call_later(
+        self,
+        delay: float,
+        callback: Callable[[], None],
+        jitter: float = 0.0,
+        name: str = "",
+    ) -> PulseTimer:
+        """
+        Schedule a callback.
+
+        Args:
+            delay (float): seconds until the callback is called
+            callback (Callable[[], None]): the callback, called on the loop
+            jitter (float, optional): up to how many seconds earlier than delay
+                the callback may be called, chosen at random to spread out work
+                scheduled together. Defaults to 0.0.
+            name (str, optional): name shown by upcoming(). Defaults to "".
+
+        Returns:
+            PulseTimer: the timer, which can be cancelled
+
+        """
+        when = self.loop.time() + jittered(delay, jitter)
+        with self._tw_lock:
+            if not sum(self._count):
+                # nothing to process in between, catch up to now
+                self._tick = max(self._tick, self._current_tick())
+            expiry = max(
+                -int(-(when - self._origin) // self._resolution), self._tick + 1
+            )
+            timer = PulseTimer(self, when, expiry, callback, name)
+            self._file(timer)
+            self._arm()
+        return timer
+
+    async def sleep(self, delay: float, jitter: float = 0.0, name: str = "") -> None:
+        """
+        Sleep on the wheel instead of an asyncio timer of its own.
+
+        Args:
+            delay (float): seconds to sleep
+            jitter (float, optional): up to how many seconds shorter the sleep
+                may be. Defaults to 0.0.
+            name (str, optional): name shown by upcoming(). Defaults to "".
+
+        """
+        future = self.loop.create_future()
+
+        def wake() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        timer = self.call_later(delay, wake, jitter, name)
+        try:
+            await future
+        finally:
+            timer.cancel()
+
+    def upcoming(self, count: int | None = None) -> list[PulseTimer]:
+        """
+        Return pending timers, soonest first.
+
+        Args:
+            count (int | None, optional): most timers to return. Defaults to
+                None, which returns all of them.
+
+        Returns:
+            list[PulseTimer]: the timers
+
+        """
+        with self._tw_lock:
+            timers = [
+                timer for level in self._levels for slot in level for timer in slot
+            ]
+        timers.sort(key=lambda timer: timer.when)
+        if count is not None:
+            return timers[:count]
+        return timers
+
+
+def get_timer_wheel(
+    loop: asyncio.AbstractEventLoop | None = None,
+) -> PulseTimerWheel:
+    """
+    Return the timer wheel shared by every session on a loop.
+
+    Args:
+        loop (asyncio.AbstractEventLoop | None, optional): the loop.
+            Defaults to None, which uses the running loop.
+
+    Returns:
+        PulseTimerWheel: the loop's wheel, created on first use
+
+    """
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    with _wheels_lock:
+        wheel = _wheels.get(loop)
+        if wheel is None:
+            wheel = _wheels[loop] = PulseTimerWheel(loop)
+        return wheel
@@ -0,0 +1,298 @@
+"""Pulse HTTP transports."""
+
+from abc import ABC, abstractmethod
+from time import time, perf_counter
+from typing import TYPE_CHECKING
+from dataclasses import field, dataclass
+from http.cookies import Morsel, SimpleCookie
+from urllib.parse import urlencode
+from http.cookiejar import http2time
+from collections.abc import Mapping, Iterable
+
+from yarl import URL
+from aiohttp import ClientSession, ClientTimeout
+from aiohttp.abc import AbstractCookieJar
+
+if TYPE_CHECKING:
+    from .pulse_connection_properties import PulseConnectionProperties
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+
+class PulseEncodedForm(dict[str, str]):
+    """
+    Form data that is URL encoded once, for forms posted repeatedly.
+
+    It's still a dict, so it can be logged and redacted like other form data,
+    but the aiohttp transports post the encoded body.  Don't change it after
+    creating it; the encoded body isn't updated.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, fields: dict[str, str]) -> None:
+        """Initialize and encode the form."""
+        super().__init__(fields)
+        self.encoded = urlencode(fields).encode("ascii")
+
+
+@dataclass(slots=True, frozen=True)
+class PulseCookie:
+    """
+    A cookie of a transport's session.
+
+    Fields:
+        name (str): cookie name
+        value (str): cookie value
+        domain (str): domain the cookie is sent to
+        path (str): path the cookie is sent under. Defaults to "/".
+        expires (float | None): time the cookie expires, in seconds since the
+            epoch, None if it lasts as long as the session. Defaults to None.
+        secure (bool): only sent over HTTPS. Defaults to False.
+        http_only (bool): not readable by scripts. Defaults to False.
+    """
+
+    name: str
+    value: str
+    domain: str
+    path: str = "/"
+    expires: float | None = None
+    secure: bool = False
+    http_only: bool = False
+
+    def expired(self, now: float | None = None) -> bool:
+        """Return whether the cookie has expired."""
+        if self.expires is None:
+            return False
+        return self.expires <= (time() if now is None else now)
+
+    @classmethod
+    def from_morsel(cls, morsel: Morsel, now: float | None = None) -> "PulseCookie":
+        """
+        Create a cookie from a cookie jar's morsel.
+
+        Args:
+            morsel (Morsel): the morsel
+            now (float | None, optional): time max-age is counted from.
+                Defaults to None, the current time.
+
+        """
+        expires: float | None = None
+        if morsel["max-age"]:
+            try:
+                max_age = int(morsel["max-age"])
+            except ValueError:
+                pass
+            else:
+                expires = (time() if now is None else now) + max_age
+        if expires is None and morsel["expires"]:
+            expires = http2time(morsel["expires"])
+        return cls(
+            morsel.key,
+            morsel.value,
+            morsel["domain"],
+            morsel["path"] or "/",
+            expires,
+            bool(morsel["secure"]),
+            bool(morsel["httponly"]),
+        )
+
+    def to_morsels(self, now: float | None = None) -> SimpleCookie:
+        """Return the cookie as morsels for a cookie jar."""
+        morsels: SimpleCookie = SimpleCookie()
+        morsels[self.name] = self.value
+        morsel = morsels[self.name]
+        morsel["domain"] = self.domain
+        morsel["path"] = self.path
+        if self.expires is not None:
+            remaining = self.expires - (time() if now is None else now)
+            morsel["max-age"] = str(max(int(remaining), 0))
+        morsel["secure"] = self.secure
+        morsel["httponly"] = self.http_only
+        return morsels
+
+
+def get_jar_cookies(jar: AbstractCookieJar) -> list[PulseCookie]:
+    """Return the cookies of an aiohttp cookie jar."""
+    now = time()
+    return [PulseCookie.from_morsel(morsel, now) for morsel in jar]
+
+
+def update_jar_cookies(jar: AbstractCookieJar, cookies: Iterable[PulseCookie]) -> None:
+    """Add cookies to an aiohttp cookie jar, skipping expired ones."""
+    now = time()
+    for cookie in cookies:
+        if cookie.expired(now):
+            continue
+        url = URL.build(scheme="https", host=cookie.domain.lstrip("."))
+        jar.update_cookies(cookie.to_morsels(now), url)
+
+
+@dataclass(slots=True, frozen=True)
+class PulseResponse:
+    """
+    Response returned by a Pulse transport.
+
+    Fields:
+        status (int): HTTP status code
+        text (str | None): decoded response body
+        url (URL): final URL of the response, after redirects
+        headers (Mapping[str, str]): response headers
+        size (int): number of bytes received in the body
+        time_to_first_byte (float): seconds between sending the request and
+            receiving the response headers
+    """
+
+    status: int
+    text: str | None
+    url: URL
+    headers: Mapping[str, str] = field(default_factory=dict)
+    size: int = 0
+    time_to_first_byte: float = 0.0
+
+
+async def aiohttp_request(
+    session: ClientSession,
+    method: str,
+    url: str,
+    *,
+    headers: dict[str, str] | None = None,
+    params: dict[str, str] | None = None,
+    data: dict[str, str] | None = None,
+    timeout: float,
+) -> PulseResponse:
+    """
+    Perform an HTTP request with an aiohttp session.
+
+    Args are the same as PulseTransport.request(), plus the session to use.
+    """
+    body: dict[str, str] | bytes | None = data
+    if isinstance(data, PulseEncodedForm):
+        body = data.encoded
+        headers = {**(headers or {}), "Content-Type": FORM_CONTENT_TYPE}
+    request_start = perf_counter()
+    async with session.request(
+        method,
+        url,
+        headers=headers,
+        params=params,
+        data=body,
+        timeout=ClientTimeout(total=timeout),
+    ) as response:
+        time_to_first_byte = perf_counter() - request_start
+        body = await response.read()
+        return PulseResponse(
+            response.status,
+            await response.text(),
+            response.url,
+            response.headers,
+            len(body),
+            time_to_first_byte,
+        )
+
+
+class PulseTransport(ABC):
+    """
+    Base class for transports used to make Pulse HTTP requests.
+
+    Transports raise the same aiohttp and timeout exceptions as aiohttp itself so
+    the query manager's error handling is the same for all of them.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        data: dict[str, str] | None = None,
+        timeout: float,
+    ) -> PulseResponse:
+        """
+        Perform an HTTP request.
+
+        Args:
+            method (str): HTTP method, GET or POST
+            url (str): URL to query
+            headers (dict[str, str] | None, optional): extra HTTP headers
+            params (dict[str, str] | None, optional): query string parameters
+            data (dict[str, str] | None, optional): form data to post
+            timeout (float): total timeout in seconds
+
+        Returns:
+            PulseResponse: the response
+
+        Raises:
+            aiohttp.ClientError: on connection errors
+            TimeoutError: if the request times out
+
+        """
+
+    def get_cookies(self) -> list[PulseCookie]:
+        """
+        Return the cookies of the transport's session.
+
+        Transports without cookies return an empty list.
+        """
+        return []
+
+    def set_cookies(self, cookies: Iterable[PulseCookie]) -> None:
+        """
+        Add cookies to the transport's session.
+
+        Cookies keep their domain, path and flags; expired ones are skipped.
+
+        Args:
+            cookies (Iterable[PulseCookie]): the cookies
+
+        """
+
+    async def close(self) -> None:
+        """Release any resources held by the transport."""
+
+
+class PulseAiohttpTransport(PulseTransport):
+    """Transport using the aiohttp session of the connection properties."""
+
+    __slots__ = ("_connection_properties",)
+
+    def __init__(self, connection_properties: "PulseConnectionProperties") -> None:
+        """Initialize aiohttp transport."""
+        self._connection_properties = connection_properties
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        data: dict[str, str] | None = None,
+        timeout: float,
+    ) -> PulseResponse:
+        """Perform an HTTP request with aiohttp."""
+        return await aiohttp_request(
+            self._connection_properties.session,
+            method,
+            url,
+            headers=headers,
+            params=params,
+            data=data,
+            timeout=timeout,
+        )
+
+    def get_cookies(self) -> list[PulseCookie]:
+        """Return the cookies of the aiohttp session."""
+        return get_jar_cookies(self._connection_properties.session.cookie_jar)
+
+    def set_cookies(self, cookies: Iterable[PulseCookie]) -> None:
+        """Add cookies to the aiohttp session."""
+        update_jar_cookies(self._connection_properties.session.cookie_jar, cookies)
+
+    async def close(self) -> None:
+        """Close the aiohttp session."""
+        await self._connection_properties.clear_session()
@@ -0,0 +1,117 @@
+"""Pulse update pipeline latency tracing."""
+
+from time import monotonic
+
+from .pulse_metrics import (
+    METRIC_UPDATE_LATENCY,
+    METRIC_UPDATE_STAGE_LATENCY,
+    PulseMetrics,
+)
+
+# pipeline stages, in order.  Each stage's latency is measured from the end of
+# the previous stage, the first from the start of the sync check request.
+STAGE_TOKEN_CHANGED = "token_changed"
+STAGE_ORB_REQUEST = "orb_request"
+STAGE_ORB_PARSED = "orb_parsed"
+STAGE_APPLIED = "applied"
+STAGE_SIGNALLED = "signalled"
+STAGE_DELIVERED = "delivered"
+UPDATE_STAGES = (
+    STAGE_TOKEN_CHANGED,
+    STAGE_ORB_REQUEST,
+    STAGE_ORB_PARSED,
+    STAGE_APPLIED,
+    STAGE_SIGNALLED,
+    STAGE_DELIVERED,
+)
+# stages the total latency from the sync check request is recorded at
+TOTAL_LATENCY_STAGES = (STAGE_SIGNALLED, STAGE_DELIVERED)
+
+
+class PulseUpdateTrace:
+    """
+    Timestamps of one update as it moves through the pipeline.
+
+    A trace starts when the sync check request which detects a change is made,
+    and is marked as the update reaches each stage:
+
+    - token_changed: the sync check token signalled the change
+    - orb_request: the orb request started, after any coalescing wait
+    - orb_parsed: the orb response was received and parsed
+    - applied: zones and alarm were updated
+    - signalled: updates_exist was set
+    - delivered: wait_for_update() returned the update to its caller
+
+    Each stage's latency is recorded in the update_stage_latency_seconds
+    histogram, and the total latency when signalled and delivered in the
+    update_latency_seconds histogram, both labelled with the stage.
+    """
+
+    __slots__ = ("_last", "_marks", "_metrics", "_started")
+
+    def __init__(
+        self, metrics: PulseMetrics | None = None, started: float | None = None
+    ) -> None:
+        """
+        Initialize update trace.
+
+        Args:
+            metrics (PulseMetrics | None, optional): registry to record latencies
+                in. Defaults to None.
+            started (float | None, optional): monotonic time the sync check
+                request started. Defaults to None, which uses the current time.
+
+        """
+        self._metrics = metrics
+        self._started = monotonic() if started is None else started
+        self._last = self._started
+        self._marks: dict[str, float] = {}
+
+    @property
+    def started(self) -> float:
+        """Return the monotonic time the trace started."""
+        return self._started
+
+    @property
+    def stage_latencies(self) -> dict[str, float]:
+        """Return the latency of each stage reached, in seconds."""
+        return dict(self._marks)
+
+    @property
+    def total_latency(self) -> float:
+        """Return the seconds from the start of the trace to the last stage."""
+        return self._last - self._started
+
+    def reached(self, stage: str) -> bool:
+        """Return whether the trace reached a stage."""
+        return stage in self._marks
+
+    def mark(self, stage: str, now: float | None = None) -> float:
+        """
+        Record the update reaching a stage.
+
+        Args:
+            stage (str): one of UPDATE_STAGES
+            now (float | None, optional): monotonic time. Defaults to None,
+                which uses the current time.
+
+        Returns:
+            float: seconds since the previous stage
+
+        Raises:
+            ValueError: if stage is not a valid stage
+
+        """
+        if stage not in UPDATE_STAGES:
+            raise ValueError(f"stage must be one of {UPDATE_STAGES}")
+        if now is None:
+            now = monotonic()
+        latency = max(now - self._last, 0.0)
+        self._last = now
+        self._marks[stage] = latency
+        if self._metrics is not None:
+            labels = {"stage": stage}
+            self._metrics.observe(METRIC_UPDATE_STAGE_LATENCY, latency, labels)
+            if stage in TOTAL_LATENCY_STAGES:
+                self._metrics.observe(METRIC_UPDATE_LATENCY, self.total_latency, labels)
+        return latency
@@ -4,8 +4,8 @@ import re
 import time
 import asyncio
 import logging
-from random import randint
-from warnings import warn
+from typing import TYPE_CHECKING
+from collections.abc import AsyncGenerator
 
 from lxml import html
 from yarl import URL
@@ -14,6 +14,7 @@ from typeguard import typechecked
 from .site import ADTPulseSite
 from .util import set_debug_lock, handle_response
 from .const import (
+    ADT_SUMMARY_URI,
     ADT_TIMEOUT_URI,
     DEFAULT_API_HOST,
     ADT_GATEWAY_STRING,
@@ -32,13 +33,56 @@ from .exceptions import (
     PulseServerConnectionError,
     PulseServiceTemporarilyUnavailableError,
 )
-from .alarm_panel import ADT_ALARM_UNKNOWN
+from .alarm_panel import ADT_ALARM_OFF, ADT_ALARM_UNKNOWN
+from .pulse_events import PulseEvent, ConnectionStateChanged
+from .pulse_metrics import (
+    METRIC_SESSION_RESTORES,
+    METRIC_LOGIN_ADMISSION_WAIT,
+    PulseMetrics,
+)
+from .pulse_event_hub import (
+    OVERFLOW_COALESCE,
+    DEFAULT_QUEUE_SIZE,
+    OVERFLOW_DROP_OLDEST,
+    PulseEventHub,
+    PulseEventSubscription,
+)
+from .pulse_transport import PulseTransport
 from .pulse_connection import PulseConnection
+from .pulse_sync_token import PulseSyncToken
+from .pulse_timer_wheel import PulseTimerWheel, get_timer_wheel
+from .pulse_loop_monitor import (
+    DEFAULT_LAG_INTERVAL,
+    DEFAULT_STALL_THRESHOLD,
+    PulseLoopMonitor,
+)
+from .pulse_rate_limiter import PulseRateLimiter
+from .pulse_update_trace import (
+    STAGE_APPLIED,
+    STAGE_DELIVERED,
+    STAGE_SIGNALLED,
+    STAGE_ORB_PARSED,
+    STAGE_ORB_REQUEST,
+    STAGE_TOKEN_CHANGED,
+    PulseUpdateTrace,
+)
+from .pulse_session_store import PulseSavedSession, PulseSessionStore
+from .pulse_timeout_policy import PulseTimeoutPolicy
+from .pulse_login_admission import (
+    LOGIN_PRIORITY_ARMED,
+    LOGIN_PRIORITY_LOGIN,
+    LOGIN_PRIORITY_RELOGIN,
+    PulseLoginAdmission,
+    get_login_admission,
+)
 from .pyadtpulse_properties import PyADTPulseProperties
 from .pulse_connection_status import PulseConnectionStatus
 from .pulse_connection_properties import PulseConnectionProperties
 from .pulse_authentication_properties import PulseAuthenticationProperties
 
+if TYPE_CHECKING:
+    from .pulse_recorder import PulseRecorder
+
 LOG = logging.getLogger(__name__)
 SYNC_CHECK_TASK_NAME = "ADT Pulse Sync Check Task"
 KEEPALIVE_TASK_NAME = "ADT Pulse Keepalive Task"
@@ -52,17 +96,25 @@ class PyADTPulseAsync:
 
     __slots__ = (
         "_authentication_properties",
+        "_connected",
         "_detailed_debug_logging",
+        "_event_hub",
+        "_hub_zones",
+        "_login_admission",
+        "_loop_monitor",
         "_pa_attribute_lock",
+        "_published_alarm_status",
         "_pulse_connection",
         "_pulse_connection_properties",
         "_pulse_connection_status",
         "_pulse_properties",
-        "_site",
+        "_session_store",
         "_sync_check_exception",
         "_sync_check_sleeping",
         "_sync_task",
         "_timeout_task",
+        "_typed_event_hub",
+        "_update_trace",
         "_updated_zones",
     )
 
@@ -78,6 +130,7 @@ class PyADTPulseAsync:
         keepalive_interval: int = ADT_DEFAULT_KEEPALIVE_INTERVAL,
         relogin_interval: int = ADT_DEFAULT_RELOGIN_INTERVAL,
         detailed_debug_logging: bool = False,
+        transport: PulseTransport | None = None,
     ) -> None:
         """
         Create a PyADTPulse object.
@@ -100,6 +153,8 @@ class PyADTPulseAsync:
                         defaults to ADT_DEFAULT_RELOGIN_INTERVAL,
                         minimum is ADT_MIN_RELOGIN_INTERVAL
             detailed_debug_logging (bool, optional): enable detailed debug logging
+            transport (PulseTransport | None, optional): transport used to make
+                        requests, defaults to None, which uses aiohttp
 
         """
         self._pa_attribute_lock = set_debug_lock(
@@ -108,6 +163,8 @@ class PyADTPulseAsync:
         self._pulse_connection_properties = PulseConnectionProperties(
             service_host, user_agent, detailed_debug_logging, debug_locks
         )
+        if transport is not None:
+            self._pulse_connection_properties.transport = transport
         self._authentication_properties = PulseAuthenticationProperties(
             username=username,
             password=password,
@@ -130,13 +187,24 @@ class PyADTPulseAsync:
         )
         self._sync_task: asyncio.Task | None = None
         self._timeout_task: asyncio.Task | None = None
-        self._site: ADTPulseSite | None = None
+        self._login_admission: PulseLoginAdmission | None = None
+        get_login_admission().add_metrics(self._pulse_connection.metrics)
+        self._session_store: PulseSessionStore | None = None
         self._detailed_debug_logging = detailed_debug_logging
         pc_backoff = self._pulse_connection.get_login_backoff()
         self._sync_check_exception: Exception | None = PulseNotLoggedInError()
         pc_backoff.reset_backoff()
-        self._sync_check_sleeping = asyncio.Event()
+        # sync check loops waiting for their next check, by site id
+        self._sync_check_sleeping: dict[str, asyncio.Event] = {}
         self._updated_zones: set[int] = set()
+        self._event_hub = PulseEventHub(debug_locks=debug_locks)
+        self._hub_zones: set[int] = set()
+        self._published_alarm_status: str | None = None
+        self._typed_event_hub = PulseEventHub(debug_locks=debug_locks)
+        self._connected = False
+        # latency traces of updates in progress, by site id
+        self._update_trace: dict[str, PulseUpdateTrace] = {}
+        self._loop_monitor: PulseLoopMonitor | None = None
 
     def __repr__(self) -> str:
         """Object representation."""
@@ -144,25 +212,91 @@ class PyADTPulseAsync:
             f"<{self.__class__.__name__}: {self._authentication_properties.username}>"
         )
 
-    async def _update_site(self, tree: html.HtmlElement) -> None:
+    async def _update_site(
+        self, tree: html.HtmlElement, site: ADTPulseSite | None = None
+    ) -> None:
         with self._pa_attribute_lock:
             start_time = 0.0
             if self._pulse_connection.detailed_debug_logging:
                 start_time = time.time()
-            if self._site is None:
+            initializing = not self._pulse_properties.has_sites
+            if initializing:
                 await self._initialize_sites(tree)
-                if self._site is None:
+                if not self._pulse_properties.has_sites:
                     raise RuntimeError("pyadtpulse could not retrieve site")
-            self._site.alarm_control_panel.update_alarm_from_etree(tree)
-            updated_zones = self._site.update_zone_from_etree(tree)
-            self._updated_zones.update(updated_zones)
+            primary_site = self._pulse_properties.site
+            if site is None:
+                site = primary_site
+            change_count = site.change_count
+            site.alarm_control_panel.update_alarm_from_etree(tree)
+            updated_zones = site.update_zone_from_etree(tree)
+            if not initializing:
+                site.sync_tokens.record_orb_fetch(site.change_count != change_count)
+            # zone ids are only unique within a site, wait_for_update() and
+            # subscribers report the primary site's zones
+            if site is primary_site:
+                self._updated_zones.update(updated_zones)
+                self._hub_zones.update(updated_zones)
             if self._pulse_connection.detailed_debug_logging:
                 LOG.debug(
                     "Updated site %s in %s seconds",
-                    self._site.id,
+                    site.id,
                     time.time() - start_time,
                 )
 
+    async def _initialize_site(
+        self, site: ADTPulseSite, tree: html.HtmlElement | None
+    ) -> bool:
+        """
+        Fetch the devices and status of a site.
+
+        Args:
+            site (ADTPulseSite): the site
+            tree (html.HtmlElement | None): the parsed summary page of the site,
+                None to fetch it
+
+        Returns:
+            bool: True if the site's status was retrieved
+
+        Raises:
+            PulseGatewayOfflineError: if the gateway is offline
+
+        """
+        if tree is None:
+            code, response, url = await self._pulse_connection.async_query(
+                ADT_SUMMARY_URI, extra_params=site.network_params or None
+            )
+            tree = self._pulse_connection.make_etree(
+                ADT_SUMMARY_URI,
+                code,
+                response,
+                url,
+                logging.WARNING,
+                f"Could not retrieve summary of site {site.id}",
+            )
+            if tree is None:
+                return False
+        start_time = 0.0
+        if self._pulse_connection.detailed_debug_logging:
+            start_time = time.time()
+        # fetch zones first, so that we can have the status
+        # updated with _update_alarm_status
+        if not await site.fetch_devices(None):
+            LOG.error("Could not fetch zones from ADT site %s", site.id)
+        site.alarm_control_panel.update_alarm_from_etree(tree)
+        if site.alarm_control_panel.status == ADT_ALARM_UNKNOWN:
+            site.gateway.is_online = False
+        site.update_zone_from_etree(tree)
+        # only send events for changes after the initial population
+        site.event_sink = self._typed_event_hub.publish_event
+        if self._pulse_connection.detailed_debug_logging:
+            LOG.debug(
+                "Initialized site %s in %s seconds",
+                site.id,
+                time.time() - start_time,
+            )
+        return True
+
     async def _initialize_sites(self, tree: html.HtmlElement) -> None:
         """
         Initialize the sites in the ADT Pulse account.
@@ -180,9 +314,6 @@ class PyADTPulseAsync:
         )
         if single_premise is not None and single_premise.text:
             site_name = single_premise.text
-            start_time = 0.0
-            if self._pulse_connection.detailed_debug_logging:
-                start_time = time.time()
             temp = tree.find(
                 path=".//a[@class='p_signoutlink']",
                 namespaces=None,
@@ -196,29 +327,68 @@ class PyADTPulseAsync:
                     site_id = m.group(1)
                     LOG.debug("Discovered site id %s: %s", site_id, site_name)
                     new_site = ADTPulseSite(self._pulse_connection, site_id, site_name)
-
-                    # fetch zones first, so that we can have the status
-                    # updated with _update_alarm_status
-                    if not await new_site.fetch_devices(None):
-                        LOG.error("Could not fetch zones from ADT site")
-                    new_site.alarm_control_panel.update_alarm_from_etree(tree)
-                    if new_site.alarm_control_panel.status == ADT_ALARM_UNKNOWN:
-                        new_site.gateway.is_online = False
-                    new_site.update_zone_from_etree(tree)
-                    self._site = new_site
-                    if self._pulse_connection.detailed_debug_logging:
-                        LOG.debug(
-                            "Initialized site %s in %s seconds",
-                            self._site.id,
-                            time.time() - start_time,
-                        )
+                    await self._initialize_site(new_site, tree)
+                    self._pulse_properties.set_sites([new_site])
                     return
             else:
                 LOG.warning(
                     "Couldn't find site id for %s in %s", site_name, signout_link
                 )
-        else:
-            LOG.error("ADT Pulse accounts with MULTIPLE sites not supported!!!")
+            return
+        await self._initialize_multiple_sites(tree)
+
+    async def _initialize_multiple_sites(self, tree: html.HtmlElement) -> None:
+        """
+        Initialize the sites of an account with several sites.
+
+        The sites are listed in the premise selector of the summary page, with
+        the one the page shows selected.  The other sites' summary pages are
+        fetched concurrently, selecting each with its networkid.
+
+        Args:
+            tree: html.HtmlElement: the parsed summary page
+
+        """
+        sites: list[ADTPulseSite] = []
+        shown_site: ADTPulseSite | None = None
+        for option in tree.findall(
+            path=".//select[@id='p_premiseSelect']/option",
+            namespaces=None,
+        ):
+            site_id = option.get("value")
+            site_name = option.text_content().strip()
+            if not site_id:
+                LOG.debug("Skipping site %s as it has no id", site_name)
+                continue
+            LOG.debug("Discovered site id %s: %s", site_id, site_name)
+            site = ADTPulseSite(
+                self._pulse_connection, site_id, site_name, select_site=True
+            )
+            if shown_site is None and option.get("selected") is not None:
+                shown_site = site
+            else:
+                sites.append(site)
+        if shown_site is not None:
+            # the site the login shows is the primary site
+            sites.insert(0, shown_site)
+        if not sites:
+            LOG.error("Could not find any sites in ADT Pulse account")
+            return
+        results = await asyncio.gather(
+            *(
+                self._initialize_site(site, tree if site is shown_site else None)
+                for site in sites
+            ),
+            return_exceptions=True,
+        )
+        for site, result in zip(sites, results, strict=True):
+            if isinstance(result, PulseGatewayOfflineError):
+                LOG.warning("Gateway of site %s is offline", site.id)
+            elif isinstance(result, BaseException):
+                raise result
+            elif not result:
+                LOG.warning("Could not retrieve status of site %s", site.id)
+        self._pulse_properties.set_sites(sites)
 
     # ...and current network id from:
     # <a id="p_signout1" class="p_signoutlink"
@@ -250,10 +420,77 @@ class PyADTPulseAsync:
     def _get_timeout_task_name(self) -> str:
         return self._get_task_name(self._timeout_task, KEEPALIVE_TASK_NAME)
 
-    def _set_update_exception(self, e: Exception | None) -> None:
+    def _set_update_exception(
+        self, e: Exception | None, site: ADTPulseSite | None = None
+    ) -> None:
+        """
+        Signal an update or an exception to wait_for_update().
+
+        Args:
+            e (Exception | None): the exception, None for an update
+            site (ADTPulseSite | None, optional): the site updated or failing.
+                Defaults to None, for every site.
+
+        """
         self.sync_check_exception = e
+        with self._pa_attribute_lock:
+            if site is None:
+                traces = list(self._update_trace.values())
+                if e is not None:
+                    self._update_trace.clear()
+            elif e is not None:
+                self._update_trace.pop(site.id, None)
+                traces = []
+            else:
+                trace = self._update_trace.get(site.id)
+                traces = [] if trace is None else [trace]
+        if e is None:
+            for trace in traces:
+                if trace.reached(STAGE_APPLIED) and not trace.reached(STAGE_SIGNALLED):
+                    trace.mark(STAGE_SIGNALLED)
+        self._publish_update(e)
+        self._set_connected(e is None or isinstance(e, PulseGatewayOfflineError), e)
         self._pulse_properties.updates_exist.set()
 
+    def _set_connected(self, connected: bool, e: Exception | None = None) -> None:
+        """Send a ConnectionStateChanged event if the connection state changed."""
+        with self._pa_attribute_lock:
+            if connected == self._connected:
+                return
+            self._connected = connected
+        self._typed_event_hub.publish_event(
+            ConnectionStateChanged(connected=connected, exception=e)
+        )
+
+    def _publish_update(self, e: Exception | None) -> None:
+        """Publish an update or error to event hub subscribers."""
+        with self._pa_attribute_lock:
+            alarm_status = (
+                self._pulse_properties.site.alarm_control_panel.status
+                if self._pulse_properties.has_sites
+                else ""
+            )
+            alarm_changed = False
+            zones: set[int] = set()
+            if e is None:
+                alarm_changed = self._published_alarm_status not in (
+                    None,
+                    alarm_status,
+                )
+                self._published_alarm_status = alarm_status
+                zones = self._hub_zones
+                self._hub_zones = set()
+        self._event_hub.publish(alarm_changed, alarm_status, zones, e)
+
+    def _start_sync_task(self) -> None:
+        """Start the sync check task if it isn't running."""
+        with self._pa_attribute_lock:
+            if self._sync_task is None:
+                coro = self._sync_check_task()
+                self._sync_task = asyncio.create_task(
+                    coro, name=f"{SYNC_CHECK_TASK_NAME}: Async session"
+                )
+
     async def _keepalive_task(self) -> None:  # noqa: PLR0912, PLR0915
         """
         Async keepalive task.
@@ -266,28 +503,47 @@ class PyADTPulseAsync:
         async def reset_pulse_cloud_timeout() -> tuple[int, str | None, URL | None]:
             return await self._pulse_connection.async_query(ADT_TIMEOUT_URI, "POST")
 
-        async def update_gateway_device_if_needed() -> None:
-            if self.site.gateway.next_update < time.time():
-                await self.site.set_device(ADT_GATEWAY_STRING)
+        async def update_gateway_devices_if_needed() -> None:
+            now = time.time()
+            await asyncio.gather(
+                *(
+                    site.set_device(ADT_GATEWAY_STRING)
+                    for site in self.sites
+                    if site.gateway.next_update < now
+                )
+            )
 
-        def should_relogin(relogin_interval: int) -> bool:
-            return (
-                relogin_interval != 0
-                and time.time() - self._authentication_properties.last_login_time
-                > randint(int(0.75 * relogin_interval), relogin_interval)
+        def next_relogin_time(relogin_interval: int, scheduled: bool) -> float:
+            # the first relogin is spread over the fleet's relogin window, after
+            # that relogins keep their place in it
+            if scheduled:
+                delay = float(relogin_interval)
+            else:
+                delay = self.login_admission.relogin_delay(relogin_interval)
+            return self._authentication_properties.last_login_time + delay
+
+        def next_full_logout() -> float:
+            return time.time() + self.login_admission.relogin_delay(
+                FULL_LOGOUT_INTERVAL
             )
 
-        next_full_logout_time = time.time() + randint(
-            int(0.75 * FULL_LOGOUT_INTERVAL), FULL_LOGOUT_INTERVAL
-        )
+        next_full_logout_time = next_full_logout()
+        relogin_time = 0.0
+        # login time and relogin interval relogin_time was chosen for
+        relogin_chosen_for: tuple[float, int] | None = None
+        # the last login was a scheduled relogin by this task
+        scheduled_relogin = False
         response: str | None
         task_name: str = self._get_task_name(self._timeout_task, KEEPALIVE_TASK_NAME)
+        timer_name = f"{task_name}: {self._authentication_properties.username}"
         LOG.debug("creating %s", task_name)
 
         while True:
             relogin_interval = self._pulse_properties.relogin_interval * 60
             try:
-                await asyncio.sleep(self._pulse_properties.keepalive_interval * 60)
+                await get_timer_wheel().sleep(
+                    self._pulse_properties.keepalive_interval * 60, name=timer_name
+                )
                 if (
                     self._pulse_connection_status.retry_after > time.time()
                     or self._pulse_connection_status.get_backoff().backoff_count
@@ -300,31 +556,40 @@ class PyADTPulseAsync:
                 if not self._pulse_connection.is_connected:
                     LOG.debug("%s: Skipping relogin because not connected", task_name)
                     continue
-                if should_relogin(relogin_interval):
+                chosen_for = (
+                    self._authentication_properties.last_login_time,
+                    relogin_interval,
+                )
+                if chosen_for != relogin_chosen_for:
+                    relogin_chosen_for = chosen_for
+                    relogin_time = next_relogin_time(
+                        relogin_interval, scheduled_relogin
+                    )
+                    scheduled_relogin = False
+                if relogin_interval != 0 and time.time() > relogin_time:
                     msg = "quick"
                     if time.time() > next_full_logout_time:
                         msg = "full"
                     with self._pa_attribute_lock:
-                        if self._sync_task:
-                            if self._detailed_debug_logging:
-                                LOG.debug(
-                                    "%s: waiting for sync check task to sleep",
-                                    task_name,
-                                )
-                            await self._sync_check_sleeping.wait()
-                    if msg == "full":
-                        next_full_logout_time = time.time() + randint(
-                            int(0.75 * FULL_LOGOUT_INTERVAL), FULL_LOGOUT_INTERVAL
+                        sleeping = list(self._sync_check_sleeping.values())
+                    if sleeping and self._detailed_debug_logging:
+                        LOG.debug(
+                            "%s: waiting for sync check tasks to sleep", task_name
                         )
+                    while not all(event.is_set() for event in sleeping):
+                        await asyncio.gather(*(event.wait() for event in sleeping))
+                    if msg == "full":
+                        next_full_logout_time = next_full_logout()
                         await self.async_logout()
                     else:
                         await self._pulse_connection.quick_logout()
                     LOG.debug("%s: performing %s logout", task_name, msg)
                     try:
-                        await self._login_looped(task_name)
+                        await self._login_looped(task_name, LOGIN_PRIORITY_RELOGIN)
                     except (PulseAuthenticationError, PulseMFARequiredError) as ex:
                         LOG.error("%s task exiting due to %s", task_name, ex.args[0])
                         return
+                    scheduled_relogin = True
                     continue
                 LOG.debug("Resetting timeout")
                 try:
@@ -349,7 +614,7 @@ class PyADTPulseAsync:
                     or response is None
                 ):
                     continue
-                await update_gateway_device_if_needed()
+                await update_gateway_devices_if_needed()
 
             except asyncio.CancelledError:
                 LOG.debug("%s cancelled", task_name)
@@ -390,12 +655,19 @@ class PyADTPulseAsync:
                 self._timeout_task = None
         LOG.debug("%s successfully cancelled", task_name)
 
-    async def _login_looped(self, task_name: str) -> None:
+    async def _login_looped(
+        self, task_name: str, priority: int = LOGIN_PRIORITY_LOGIN
+    ) -> None:
         """
         Log in and loop until successful.
 
+        Each attempt waits for admission separately, so a failing login gives
+        up its place to other sessions between attempts.
+
         Args:
             task_name: str: name of the task.
+            priority: int: login admission priority, defaults to
+                LOGIN_PRIORITY_LOGIN
 
         Returns:
             None
@@ -410,7 +682,7 @@ class PyADTPulseAsync:
                 log_level = logging.WARNING
             LOG.log(log_level, "%s performming loop login", task_name)
             try:
-                await self.async_login()
+                await self._async_login(priority)
             except (
                 PulseClientConnectionError,
                 PulseServerConnectionError,
@@ -429,18 +701,68 @@ class PyADTPulseAsync:
             # success, return
             return
 
-    async def _sync_check_task(self) -> None:  # noqa: PLR0912, PLR0915
-        """Asynchronous function that performs a synchronization check task."""
+    async def _sync_check_task(self) -> None:
+        """
+        Asynchronous function that performs a synchronization check task.
+
+        Each site of the account is checked and updated by its own loop, so a
+        change at one site doesn't wait for, or refetch, the others.
+        """
+        task_name = self._get_sync_task_name()
+        sites = self.sites
+        with self._pa_attribute_lock:
+            self._sync_check_sleeping = {site.id: asyncio.Event() for site in sites}
+        try:
+            if len(sites) == 1:
+                await self._site_sync_check_task(sites[0], task_name)
+                return
+            site_tasks = [
+                asyncio.create_task(
+                    self._site_sync_check_task(site, f"{task_name}: {site.id}"),
+                    name=f"{task_name}: {site.id}",
+                )
+                for site in sites
+            ]
+            try:
+                # a site's loop only ends when the session can't go on
+                await asyncio.wait(site_tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for site_task in site_tasks:
+                    site_task.cancel()
+                await asyncio.gather(*site_tasks, return_exceptions=True)
+        finally:
+            with self._pa_attribute_lock:
+                # release a keepalive waiting for the stopped loops
+                for sleeping in self._sync_check_sleeping.values():
+                    sleeping.set()
+                self._sync_check_sleeping = {}
+
+    async def _site_sync_check_task(  # noqa: PLR0912, PLR0915
+        self, site: ADTPulseSite, task_name: str
+    ) -> None:
+        """
+        Perform sync checks for a site and update it when it changes.
+
+        Args:
+            site (ADTPulseSite): the site
+            task_name (str): name of the task for logging
+
+        """
 
         async def perform_sync_check_query():
             return await self._pulse_connection.async_query(
                 ADT_SYNC_CHECK_URI,
                 extra_headers={"Sec-Fetch-Mode": "iframe"},
-                extra_params={"ts": str(int(time.time() * 1000))},
+                extra_params={
+                    "ts": str(int(time.time() * 1000)),
+                    **site.network_params,
+                },
             )
 
-        task_name = self._get_sync_task_name()
+        timer_name = f"{task_name}: {self._authentication_properties.username}"
         LOG.debug("creating %s", task_name)
+        with self._pa_attribute_lock:
+            sleeping = self._sync_check_sleeping[site.id]
 
         response_text: str | None = None
         code: int = 200
@@ -451,6 +773,9 @@ class PyADTPulseAsync:
             """
             Validate the sync check response received from the ADT Pulse site.
 
+            The token is compared with the site's previous tokens.  While updates
+            are already pending, only a transient token indicates more updates.
+
             Returns:
                 bool: True if the sync check response indicates updates, False otherwise
 
@@ -468,8 +793,8 @@ class PyADTPulseAsync:
             if response_text is None:
                 LOG.warning("Internal Error: response_text is None")
                 return False
-            pattern = r"\d+[-]\d+[-]\d+"
-            if not re.match(pattern, response_text):
+            token = PulseSyncToken.parse(response_text)
+            if token is None:
                 warning_msg = "Unexpected sync check format"
                 try:
                     self._pulse_connection.check_login_errors(
@@ -483,22 +808,22 @@ class PyADTPulseAsync:
                 finally:
                     LOG.warning(warning_msg)
                 return False
-            split_text = response_text.split("-")
-            if int(split_text[0]) > 9 or int(split_text[1]) > 9:
-                return False
-            return True
+            signalled = site.sync_tokens.observe(token)
+            if have_updates:
+                return token.is_transient
+            return signalled
 
         async def handle_no_updates_exist() -> None:
             if have_updates:
                 try:
-                    success = await self.async_update()
+                    success = await self._async_update_site(site)
                 except (
                     PulseClientConnectionError,
                     PulseServerConnectionError,
                     PulseGatewayOfflineError,
                 ) as e:
                     LOG.debug("Pulse update failed in task %s due to %s", task_name, e)
-                    self._set_update_exception(e)
+                    self._set_update_exception(e, site)
                     return
                 except PulseNotLoggedInError:
                     LOG.info(
@@ -511,13 +836,13 @@ class PyADTPulseAsync:
                 if not success:
                     LOG.debug("Pulse data update failed in task %s", task_name)
                     return
-                self._set_update_exception(None)
+                self._set_update_exception(None, site)
             else:
                 additional_msg = ""
-                if not self.site.gateway.is_online:
+                if not site.gateway.is_online:
                     # bump backoff and resignal since offline and nothing updated
                     self._set_update_exception(
-                        PulseGatewayOfflineError(self.site.gateway.backoff)
+                        PulseGatewayOfflineError(site.gateway.backoff), site
                     )
                     additional_msg = ", gateway offline so backoff incremented"
                 if self._detailed_debug_logging:
@@ -527,6 +852,17 @@ class PyADTPulseAsync:
                         additional_msg,
                     )
 
+        async def wait_for_next_sync_check() -> None:
+            scheduler = site.sync_scheduler
+            alarm = site.alarm_control_panel
+            await scheduler.sleep(
+                scheduler.next_interval(
+                    site.gateway.poll_interval,
+                    alarm.is_arming or alarm.is_disarming,
+                ),
+                timer_name,
+            )
+
         async def shutdown_task(ex: Exception):
             await self._pulse_connection.quick_logout()
             await self._cancel_task(self._timeout_task)
@@ -534,15 +870,20 @@ class PyADTPulseAsync:
 
         while True:
             try:
-                self._sync_check_sleeping.set()
-                if not have_updates and not self.site.gateway.is_online:
+                sleeping.set()
+                if not have_updates and not site.gateway.is_online:
                     # gateway going back online will trigger a sync check of 1-0-0
-                    await self.site.gateway.backoff.wait_for_backoff()
-                else:
-                    await asyncio.sleep(
-                        self.site.gateway.poll_interval if not have_updates else 0.0
+                    await site.gateway.backoff.wait_for_backoff()
+                elif have_updates:
+                    # give other changes in a burst time to land before the fetch
+                    await get_timer_wheel().sleep(
+                        site.sync_scheduler.coalesce_delay(), name=timer_name
                     )
-                self._sync_check_sleeping.clear()
+                else:
+                    await wait_for_next_sync_check()
+                sleeping.clear()
+                site.sync_scheduler.record_poll()
+                sync_check_started = time.monotonic()
                 try:
                     code, response_text, url = await perform_sync_check_query()
                 except (
@@ -553,14 +894,14 @@ class PyADTPulseAsync:
                     # since the next query will sleep until the retry-after is over
                     msg = ""
                     if e.backoff.backoff_count > WARN_TRANSIENT_FAILURE_THRESHOLD:
-                        self._set_update_exception(e)
+                        self._set_update_exception(e, site)
                     else:
                         msg = ", ignoring..."
                     LOG.debug("Pulse sync check query failed due to %s%s", e, msg)
                     continue
                 except PulseServiceTemporarilyUnavailableError as e:
                     LOG.error("Pulse sync check query failed due to %s", e)
-                    self._set_update_exception(e)
+                    self._set_update_exception(e, site)
                     continue
                 except PulseNotLoggedInError:
                     LOG.info(
@@ -579,9 +920,21 @@ class PyADTPulseAsync:
                 more_updates = True
                 try:
                     if have_updates:
-                        more_updates = check_sync_check_response()
+                        more_updates = (
+                            check_sync_check_response()
+                            and not site.sync_scheduler.burst_expired()
+                        )
                     else:
                         have_updates = check_sync_check_response()
+                        if have_updates:
+                            site.sync_scheduler.record_activity()
+                            site.sync_scheduler.start_burst()
+                            trace = PulseUpdateTrace(
+                                self._pulse_connection.metrics, sync_check_started
+                            )
+                            trace.mark(STAGE_TOKEN_CHANGED)
+                            with self._pa_attribute_lock:
+                                self._update_trace[site.id] = trace
                 except PulseNotLoggedInError:
                     LOG.info(
                         "Pulse sync check text indicates logged out, re-logging in...."
@@ -604,6 +957,7 @@ class PyADTPulseAsync:
                     LOG.debug("Updates exist: %s, requerying", response_text)
                     continue
                 await handle_no_updates_exist()
+                site.sync_scheduler.end_burst()
                 have_updates = False
                 continue
             except asyncio.CancelledError:
@@ -633,38 +987,153 @@ class PyADTPulseAsync:
                 if login fails
 
         """
-        if self._pulse_connection.login_in_progress:
-            LOG.debug("Login already in progress, returning")
-            return
+        await self._async_login(LOGIN_PRIORITY_LOGIN)
+
+    def _login_priority(self, priority: int) -> int:
+        """Return the admission priority of a login, armed sites going first."""
+        if not self._pulse_properties.has_sites:
+            return priority
+        for site in self.sites:
+            if site.alarm_control_panel.status not in (
+                ADT_ALARM_OFF,
+                ADT_ALARM_UNKNOWN,
+            ):
+                return LOGIN_PRIORITY_ARMED
+        return priority
+
+    async def _restore_saved_session(self) -> html.HtmlElement | None:
+        """
+        Resume the session saved by a previous process, if there is one.
+
+        Only tried before this object's first login.
+
+        Returns:
+            html.HtmlElement | None: the parsed summary page, None if there's no
+                saved session or Pulse didn't accept it
+
+        """
+        store = self.session_store
+        if store is None or self._authentication_properties.last_login_time:
+            return None
+        session = await asyncio.to_thread(
+            store.load,
+            self._authentication_properties.username,
+            self._pulse_connection_properties.service_host,
+        )
+        if session is None:
+            return None
+        try:
+            tree = await self._pulse_connection.async_restore_session(session)
+        except (
+            PulseClientConnectionError,
+            PulseServerConnectionError,
+            PulseServiceTemporarilyUnavailableError,
+        ) as ex:
+            LOG.debug("Could not resume saved Pulse session: %s", ex.args[0])
+            tree = None
+        result = "restored" if tree is not None else "rejected"
+        self._pulse_connection.metrics.increment(
+            METRIC_SESSION_RESTORES, {"result": result}
+        )
         LOG.debug(
-            "Authenticating to ADT Pulse cloud service as %s",
+            "Saved Pulse session for %s %s",
             self._authentication_properties.username,
+            result,
         )
-        await self._pulse_connection.async_fetch_version()
-        tree = await self._pulse_connection.async_do_login_query()
-        if tree is None:
-            await self._pulse_connection.quick_logout()
-            ex = PulseNotLoggedInError()
-            self.sync_check_exception = ex
-            raise ex
-        self.sync_check_exception = None
-        # if tasks are started, we've already logged in before
-        # clean up completed tasks first
-        await self._clean_done_tasks()
-        if self._timeout_task is not None:
+        return tree
+
+    async def _save_session(self) -> None:
+        """Save the session just logged in, so a restart can resume it."""
+        store = self.session_store
+        if store is None:
             return
-        if not self._site:
-            await self._update_site(tree)
-        if self._site is None:
-            LOG.error("Could not retrieve any sites, login failed")
-            await self._pulse_connection.quick_logout()
-            ex = PulseNotLoggedInError()
-            self.sync_check_exception = ex
-            raise ex
-        self.sync_check_exception = None
-        self._timeout_task = asyncio.create_task(
-            self._keepalive_task(), name=KEEPALIVE_TASK_NAME
+        session = PulseSavedSession(
+            self._authentication_properties.username,
+            self._pulse_connection_properties.service_host,
+            self._pulse_connection_properties.api_version,
+            self._authentication_properties.last_login_time,
+            tuple(self._pulse_connection_properties.transport.get_cookies()),
         )
+        try:
+            await asyncio.to_thread(store.save, session)
+        except OSError as ex:
+            LOG.warning("Could not save Pulse session: %s", ex)
+
+    async def _delete_saved_session(self) -> None:
+        store = self.session_store
+        if store is None:
+            return
+        try:
+            await asyncio.to_thread(
+                store.delete,
+                self._authentication_properties.username,
+                self._pulse_connection_properties.service_host,
+            )
+        except OSError as ex:
+            LOG.warning("Could not delete saved Pulse session: %s", ex)
+
+    async def _async_login(self, priority: int) -> None:
+        """
+        Log in once admitted by the login admission controller.
+
+        Args:
+            priority (int): login admission priority, raised to
+                LOGIN_PRIORITY_ARMED if a site is armed
+
+        Raises:
+            see async_login()
+
+        """
+        if self._pulse_connection.login_in_progress:
+            LOG.debug("Login already in progress, returning")
+            return
+        admission = self.login_admission
+        async with admission.admit(self._login_priority(priority)) as waited:
+            self._pulse_connection.metrics.observe(METRIC_LOGIN_ADMISSION_WAIT, waited)
+            if self._pulse_connection.login_in_progress:
+                LOG.debug("Login started while waiting for admission, returning")
+                return
+            tree = await self._restore_saved_session()
+            if tree is None:
+                LOG.debug(
+                    "Authenticating to ADT Pulse cloud service as %s",
+                    self._authentication_properties.username,
+                )
+                await self._pulse_connection.async_fetch_version()
+                tree = await self._pulse_connection.async_do_login_query()
+                if tree is None:
+                    await self._pulse_connection.quick_logout()
+                    ex = PulseNotLoggedInError()
+                    self.sync_check_exception = ex
+                    raise ex
+                await self._save_session()
+            self.sync_check_exception = None
+            # if tasks are started, we've already logged in before
+            # clean up completed tasks first
+            await self._clean_done_tasks()
+            if self._timeout_task is not None:
+                return
+            if not self._pulse_properties.has_sites:
+                await self._update_site(tree)
+            if not self._pulse_properties.has_sites:
+                LOG.error("Could not retrieve any sites, login failed")
+                await self._pulse_connection.quick_logout()
+                ex = PulseNotLoggedInError()
+                self.sync_check_exception = ex
+                raise ex
+            self.sync_check_exception = None
+            with self._pa_attribute_lock:
+                self._published_alarm_status = self.site.alarm_control_panel.status
+                self._hub_zones.clear()
+            self._set_connected(True)
+            self._timeout_task = asyncio.create_task(
+                self._keepalive_task(), name=KEEPALIVE_TASK_NAME
+            )
+            if (
+                self._event_hub.subscriber_count
+                or self._typed_event_hub.subscriber_count
+            ):
+                self._start_sync_task()
         await asyncio.sleep(0)
 
     async def async_logout(self) -> None:
@@ -684,10 +1153,15 @@ class PyADTPulseAsync:
         except (RuntimeError, ValueError):
             site_id = None
         await self._pulse_connection.async_do_logout_query(site_id)
+        # the saved session was just ended
+        await self._delete_saved_session()
 
-    async def async_update(self) -> bool:
+    async def _async_update_site(self, site: ADTPulseSite | None) -> bool:
         """
-        Update ADT Pulse data.
+        Update a site from the orb.
+
+        Args:
+            site (ADTPulseSite | None): the site, None before sites are retrieved
 
         Returns:
             bool: True if update succeeded.
@@ -696,18 +1170,50 @@ class PyADTPulseAsync:
             PulseGatewayOfflineError: if the gateway is offline
 
         """
-        LOG.debug("Checking ADT Pulse cloud service for updates")
-
+        with self._pa_attribute_lock:
+            trace = self._update_trace.get(site.id) if site is not None else None
+        if trace is not None and trace.reached(STAGE_APPLIED):
+            # already applied, this fetch isn't for the traced update
+            trace = None
+        if trace is not None:
+            trace.mark(STAGE_ORB_REQUEST)
+        params = site.network_params if site is not None else {}
         # FIXME will have to query other URIs for camera/zwave/etc
         tree = await self._pulse_connection.query_orb(
-            logging.INFO, "Error returned from ADT Pulse service check"
+            logging.INFO, "Error returned from ADT Pulse service check", params or None
         )
         if tree is not None:
-            await self._update_site(tree)
+            if trace is not None:
+                trace.mark(STAGE_ORB_PARSED)
+            await self._update_site(tree, site)
+            if trace is not None:
+                trace.mark(STAGE_APPLIED)
             return True
 
         return False
 
+    async def async_update(self) -> bool:
+        """
+        Update ADT Pulse data.
+
+        Sites of accounts with several sites are updated concurrently.
+
+        Returns:
+            bool: True if update succeeded for every site.
+
+        Raises:
+            PulseGatewayOfflineError: if the gateway is offline
+
+        """
+        LOG.debug("Checking ADT Pulse cloud service for updates")
+
+        if not self._pulse_properties.has_sites:
+            return await self._async_update_site(None)
+        results = await asyncio.gather(
+            *(self._async_update_site(site) for site in self.sites)
+        )
+        return all(results)
+
     async def wait_for_update(self) -> tuple[bool, set[int]]:
         """
         Wait for update.
@@ -723,7 +1229,7 @@ class PyADTPulseAsync:
             Every exception from exceptions.py are possible
 
         """
-        # FIXME?: This code probably won't work with multiple waiters.
+        # Only one task should call this, use subscribe() for multiple consumers.
         await self._clean_done_tasks()
         if self.sync_check_exception:
             raise self.sync_check_exception
@@ -731,14 +1237,19 @@ class PyADTPulseAsync:
             if self._timeout_task is None:
                 raise PulseNotLoggedInError()
             if self._sync_task is None:
-                coro = self._sync_check_task()
-                self._sync_task = asyncio.create_task(
-                    coro, name=f"{SYNC_CHECK_TASK_NAME}: Async session"
-                )
+                self._start_sync_task()
                 await asyncio.sleep(0)
         old_alarm_status = self.site.alarm_control_panel.status
         await self._pulse_properties.updates_exist.wait()
         self._pulse_properties.updates_exist.clear()
+        with self._pa_attribute_lock:
+            delivered = [
+                site_id
+                for site_id, trace in self._update_trace.items()
+                if trace.reached(STAGE_SIGNALLED)
+            ]
+            for site_id in delivered:
+                self._update_trace.pop(site_id).mark(STAGE_DELIVERED)
         curr_exception = self.sync_check_exception
         self.sync_check_exception = None
         if curr_exception:
@@ -749,34 +1260,268 @@ class PyADTPulseAsync:
 
     @property
     def sites(self) -> list[ADTPulseSite]:
-        """Return all sites for this ADT Pulse account."""
-        warn(
-            "multiple sites being removed, use pyADTPulse.site instead",
-            PendingDeprecationWarning,
-            stacklevel=2,
-        )
-        with self._pa_attribute_lock:
-            if self._site is None:
-                raise RuntimeError(
-                    "No sites have been retrieved, have you logged in yet?"
-                )
-            return [self._site]
+        """Return all sites for this ADT Pulse account, primary site first."""
+        return self._pulse_properties.sites
 
     @property
     def site(self) -> ADTPulseSite:
-        """Return the site associated with the Pulse login."""
-        with self._pa_attribute_lock:
-            if self._site is None:
-                raise RuntimeError(
-                    "No sites have been retrieved, have you logged in yet?"
-                )
-            return self._site
+        """Return the primary site associated with the Pulse login."""
+        return self._pulse_properties.site
+
+    def get_site(self, site_id: str) -> ADTPulseSite:
+        """
+        Return a site by id.
+
+        Raises:
+            KeyError: if the account has no such site
+
+        """
+        return self._pulse_properties.get_site(site_id)
 
     @property
     def is_connected(self) -> bool:
         """Convenience method to return whether ADT Pulse is connected."""
         return self._pulse_connection.is_connected
 
+    @property
+    def metrics(self) -> PulseMetrics:
+        """
+        Return the metrics registry for this connection.
+
+        Use metrics.snapshot() for an in-process view or metrics.to_prometheus()
+        for Prometheus text format.
+        """
+        return self._pulse_connection.metrics
+
+    @property
+    def timer_wheel(self) -> PulseTimerWheel:
+        """
+        Return the timer wheel running keepalives and sync checks.
+
+        Every session on an event loop shares one wheel, use
+        timer_wheel.upcoming() to see their scheduled work.  Async sessions must
+        call this from their event loop.
+        """
+        return get_timer_wheel(self._pulse_connection_properties.loop)
+
+    @property
+    def loop_monitor(self) -> PulseLoopMonitor | None:
+        """Return the event loop lag monitor, None if not monitoring."""
+        return self._loop_monitor
+
+    def start_loop_monitor(
+        self,
+        interval: float = DEFAULT_LAG_INTERVAL,
+        stall_threshold: float = DEFAULT_STALL_THRESHOLD,
+    ) -> PulseLoopMonitor:
+        """
+        Start measuring event loop lag and detecting stalls.
+
+        Lag is recorded in the loop_lag_seconds histogram and stalls in the
+        loop_stalls_total counter of metrics.  Async sessions must call this
+        from their event loop.
+
+        Args:
+            interval (float, optional): seconds between lag measurements.
+                Defaults to DEFAULT_LAG_INTERVAL.
+            stall_threshold (float, optional): seconds late a measurement must be
+                to be reported as a stall. Defaults to DEFAULT_STALL_THRESHOLD.
+
+        Returns:
+            PulseLoopMonitor: the monitor
+
+        """
+        with self._pa_attribute_lock:
+            if self._loop_monitor is not None:
+                return self._loop_monitor
+            monitor = PulseLoopMonitor(
+                interval,
+                stall_threshold,
+                self.metrics,
+                debug_locks=self._pulse_connection.debug_locks,
+            )
+            # synchronous sessions run their own loop in a background thread
+            monitor.start(self._pulse_connection_properties.loop)
+            self._loop_monitor = monitor
+        return monitor
+
+    def stop_loop_monitor(self) -> None:
+        """Stop the event loop lag monitor."""
+        with self._pa_attribute_lock:
+            monitor = self._loop_monitor
+            self._loop_monitor = None
+        if monitor is not None:
+            monitor.stop()
+
+    @property
+    def recorder(self) -> "PulseRecorder | None":
+        """Return the session recorder, None if not recording."""
+        return self._pulse_connection.recorder
+
+    @recorder.setter
+    def recorder(self, recorder: "PulseRecorder | None") -> None:
+        """
+        Set the session recorder.
+
+        Every request and its response will be recorded until the recorder is set
+        to None.
+        """
+        self._pulse_connection.recorder = recorder
+
+    @property
+    def event_hub(self) -> PulseEventHub:
+        """Return the hub publishing updates to subscribers."""
+        return self._event_hub
+
+    def subscribe(
+        self,
+        name: str = "",
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+        cursor: int | None = None,
+    ) -> PulseEventSubscription:
+        """
+        Subscribe to updates.
+
+        Unlike wait_for_update(), any number of subscribers can consume updates
+        at once, each receiving every update.  Errors are delivered as updates
+        with the exception set rather than raised.  Checking for updates starts
+        when logged in and there is at least one subscriber.
+
+        Args:
+            name (str, optional): subscriber name used in logging. Defaults to "".
+            queue_size (int, optional): maximum number of queued updates.
+                Defaults to DEFAULT_QUEUE_SIZE.
+            overflow (str, optional): OVERFLOW_DROP_OLDEST to drop the oldest
+                update when the queue is full, OVERFLOW_COALESCE to merge zone
+                changes into the newest queued update.
+                Defaults to OVERFLOW_DROP_OLDEST.
+            cursor (int | None, optional): cursor of an earlier subscription to
+                resume from. Defaults to None.
+
+        Returns:
+            PulseEventSubscription: the subscription, close() it when done
+
+        """
+        subscription = self._event_hub.subscribe(name, queue_size, overflow, cursor)
+        with self._pa_attribute_lock:
+            if self._timeout_task is not None:
+                self._start_sync_task()
+        return subscription
+
+    def events(
+        self,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_COALESCE,
+    ) -> AsyncGenerator[PulseEvent]:
+        """
+        Iterate over typed events.
+
+        Yields a ZoneStateChanged, ZoneStatusChanged, AlarmStateChanged,
+        GatewayOnlineChanged or ConnectionStateChanged event for each change
+        seen, i.e.
+
+            async for event in pulse.events():
+                if isinstance(event, ZoneStateChanged):
+                    ...
+
+        Events are queued from when events() is called, even before iteration
+        starts.  Checking for updates starts when logged in.  Iteration
+        continues across logins and logouts until the caller stops iterating.
+
+        Args:
+            queue_size (int, optional): maximum number of queued events.
+                Defaults to DEFAULT_QUEUE_SIZE.
+            overflow (str, optional): OVERFLOW_COALESCE to merge an event into
+                a queued event for the same zone, alarm or gateway when the queue
+                is full, OVERFLOW_DROP_OLDEST to drop the oldest event.
+                Defaults to OVERFLOW_COALESCE.
+
+        Returns:
+            AsyncGenerator[PulseEvent, None]: the events, aclose() it to stop
+                receiving events without iterating to the end
+
+        """
+        subscription = self._typed_event_hub.subscribe("events", queue_size, overflow)
+        with self._pa_attribute_lock:
+            if self._timeout_task is not None:
+                self._start_sync_task()
+        return self._iterate_events(subscription)
+
+    @staticmethod
+    async def _iterate_events(
+        subscription: PulseEventSubscription,
+    ) -> AsyncGenerator[PulseEvent]:
+        try:
+            async for event in subscription:
+                if isinstance(event, PulseEvent):
+                    yield event
+        finally:
+            subscription.close()
+
+    @property
+    def timeout_policy(self) -> PulseTimeoutPolicy:
+        """Return the policy choosing request timeouts."""
+        return self._pulse_connection.timeout_policy
+
+    @timeout_policy.setter
+    def timeout_policy(self, timeout_policy: PulseTimeoutPolicy) -> None:
+        """Set the policy choosing request timeouts."""
+        self._pulse_connection.timeout_policy = timeout_policy
+
+    @property
+    def rate_limiter(self) -> PulseRateLimiter | None:
+        """Return the request rate limiter, None if requests aren't limited."""
+        return self._pulse_connection.rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: PulseRateLimiter | None) -> None:
+        """
+        Set the request rate limiter, None to stop limiting requests.
+
+        Share one PulseRateLimiter between objects to limit them together.
+        """
+        self._pulse_connection.rate_limiter = rate_limiter
+
+    @property
+    def session_store(self) -> PulseSessionStore | None:
+        """Return the store sessions are saved to, None if they aren't saved."""
+        with self._pa_attribute_lock:
+            return self._session_store
+
+    @session_store.setter
+    def session_store(self, session_store: PulseSessionStore | None) -> None:
+        """
+        Set the store sessions are saved to, None to not save them.
+
+        Each login is saved to the store, and the first login of a new object
+        resumes the saved session if Pulse still accepts it.  Logging out
+        deletes the saved session.
+        """
+        with self._pa_attribute_lock:
+            self._session_store = session_store
+
+    @property
+    def login_admission(self) -> PulseLoginAdmission:
+        """Return the login admission controller, shared by default."""
+        with self._pa_attribute_lock:
+            if self._login_admission is None:
+                return get_login_admission()
+            return self._login_admission
+
+    @login_admission.setter
+    def login_admission(self, login_admission: PulseLoginAdmission | None) -> None:
+        """
+        Set the login admission controller, None for the shared one.
+
+        Logins already waiting for admission keep waiting on the old controller.
+        """
+        with self._pa_attribute_lock:
+            metrics = self._pulse_connection.metrics
+            (self._login_admission or get_login_admission()).remove_metrics(metrics)
+            self._login_admission = login_admission
+            (login_admission or get_login_admission()).add_metrics(metrics)
+
     @property
     def detailed_debug_logging(self) -> bool:
         """Return detailed debug logging."""
@@ -2,7 +2,6 @@
 
 import asyncio
 import logging
-from warnings import warn
 
 from typeguard import typechecked
 
@@ -25,7 +24,7 @@ class PyADTPulseProperties:
         "_keepalive_interval",
         "_pp_attribute_lock",
         "_relogin_interval",
-        "_site",
+        "_sites",
         "_updates_exist",
     )
 
@@ -72,7 +71,8 @@ class PyADTPulseProperties:
             debug_locks, "pyadtpulse.async_attribute_lock"
         )
 
-        self._site: ADTPulseSite | None = None
+        # sites by site id, the first is the primary site
+        self._sites: dict[str, ADTPulseSite] = {}
         self.keepalive_interval = keepalive_interval
         self.relogin_interval = relogin_interval
 
@@ -151,27 +151,50 @@ class PyADTPulseProperties:
     @property
     def sites(self) -> list[ADTPulseSite]:
         """Return all sites for this ADT Pulse account."""
-        warn(
-            "multiple sites being removed, use pyADTPulse.site instead",
-            PendingDeprecationWarning,
-            stacklevel=2,
-        )
         with self._pp_attribute_lock:
-            if self._site is None:
+            if not self._sites:
                 raise RuntimeError(
                     "No sites have been retrieved, have you logged in yet?"
                 )
-            return [self._site]
+            return list(self._sites.values())
 
     @property
     def site(self) -> ADTPulseSite:
-        """Return the site associated with the Pulse login."""
+        """Return the primary site associated with the Pulse login."""
         with self._pp_attribute_lock:
-            if self._site is None:
+            if not self._sites:
                 raise RuntimeError(
                     "No sites have been retrieved, have you logged in yet?"
                 )
-            return self._site
+            return next(iter(self._sites.values()))
+
+    @property
+    def has_sites(self) -> bool:
+        """Return whether sites have been retrieved."""
+        with self._pp_attribute_lock:
+            return bool(self._sites)
+
+    def get_site(self, site_id: str) -> ADTPulseSite:
+        """
+        Return a site by id.
+
+        Raises:
+            KeyError: if the account has no such site
+
+        """
+        with self._pp_attribute_lock:
+            return self._sites[site_id]
+
+    def set_sites(self, sites: list[ADTPulseSite]) -> None:
+        """
+        Set the sites of the account.
+
+        Args:
+            sites (list[ADTPulseSite]): the sites, primary site first
+
+        """
+        with self._pp_attribute_lock:
+            self._sites = {site.id: site for site in sites}
 
     def set_update_status(self) -> None:
         """Set updates_exist to notify wait_for_update."""
@@ -0,0 +1,425 @@
+"""Synchronous ADT Pulse API, running an async session on a background thread."""
+
+import asyncio
+import logging
+from warnings import warn
+from threading import RLock, Thread
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from .util import DebugRLock, set_debug_lock
+from .const import (
+    DEFAULT_API_HOST,
+    ADT_DEFAULT_HTTP_USER_AGENT,
+    ADT_DEFAULT_RELOGIN_INTERVAL,
+    ADT_DEFAULT_KEEPALIVE_INTERVAL,
+)
+from .pulse_events import PulseEvent
+from .pulse_callbacks import PulseCallback, PulseCallbackTarget, PulseCallbackRegistry
+from .pulse_event_hub import OVERFLOW_COALESCE, PulseEventSubscription
+from .pyadtpulse_async import SYNC_CHECK_TASK_NAME, PyADTPulseAsync
+from .pulse_loop_runner import PulseLoopRunner
+
+LOG = logging.getLogger(__name__)
+CALLBACK_TASK_NAME = "ADT Pulse Callback Task"
+
+
+class PyADTPulse(PyADTPulseAsync):
+    """Base object for ADT Pulse service."""
+
+    __slots__ = (
+        "_callback_task",
+        "_callbacks",
+        "_loop_runner",
+        "_p_attribute_lock",
+        "_session_future",
+        "_session_thread",
+        "_shutdown_event",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        username: str,
+        password: str,
+        fingerprint: str,
+        service_host: str = DEFAULT_API_HOST,
+        user_agent=ADT_DEFAULT_HTTP_USER_AGENT["User-Agent"],
+        do_login: bool = True,
+        debug_locks: bool = False,
+        keepalive_interval: int = ADT_DEFAULT_KEEPALIVE_INTERVAL,
+        relogin_interval: int = ADT_DEFAULT_RELOGIN_INTERVAL,
+        detailed_debug_logging: bool = False,
+        *,
+        loop_runner: PulseLoopRunner | None = None,
+    ):
+        """
+        Init for the PyADTPull object.
+
+        Pass a PulseLoopRunner as loop_runner to run on one of its shared event
+        loops instead of a thread and event loop of our own.
+        """
+        self._p_attribute_lock = set_debug_lock(
+            debug_locks, "pyadtpulse._p_attribute_lockattribute_lock"
+        )
+        warn(
+            "PyADTPulse is deprecated, please use PyADTPulseAsync instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        super().__init__(
+            username,
+            password,
+            fingerprint,
+            service_host,
+            user_agent,
+            debug_locks,
+            keepalive_interval,
+            relogin_interval,
+            detailed_debug_logging,
+        )
+        self._loop_runner = loop_runner
+        self._session_thread: Thread | None = None
+        self._session_future: Future[None] | None = None
+        self._shutdown_event: asyncio.Event | None = None
+        self._callbacks = PulseCallbackRegistry(debug_locks)
+        self._callback_task: asyncio.Task | None = None
+        if do_login:
+            self.login()
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return (
+            f"<{self.__class__.__name__}: {self._authentication_properties.username}>"
+        )
+
+    # ADTPulse API endpoint is configurable (besides default US ADT Pulse endpoint) to
+    # support testing as well as alternative ADT Pulse endpoints such as
+    # portal-ca.adtpulse.com
+
+    def _pulse_session_thread(self, login_future: "Future[None]") -> None:
+        """
+        Pulse the session thread.
+
+        Creates an event loop for the ADT Pulse API and runs `_sync_loop()` on it
+        until logout.  Once the loop finishes, it is closed, the pulse connection's
+        event loop is set to `None`, and the session thread is set to `None`.
+
+        Args:
+            login_future (Future[None]): completed by `_sync_loop()` once login
+                succeeds, failed here once the loop is closed if login fails
+        """
+        import uvloop  # noqa: PLC0415
+
+        LOG.debug("Creating ADT Pulse background thread")
+        loop = uvloop.new_event_loop()
+        self._pulse_connection_properties.loop = loop
+        error: Exception | None = None
+        try:
+            loop.run_until_complete(self._sync_loop(login_future))
+        except Exception as e:
+            error = e
+        finally:
+            loop.close()
+            self._session_finished(login_future, error)
+
+    async def _shared_loop_session(
+        self, login_future: "Future[None]", runner: PulseLoopRunner
+    ) -> None:
+        """
+        Run `_sync_loop()` on an event loop shared through a PulseLoopRunner.
+
+        The same as `_pulse_session_thread()`, except the loop is left running
+        for the runner's other sessions.
+        """
+        error: Exception | None = None
+        try:
+            await self._sync_loop(login_future)
+        except Exception as e:
+            error = e
+        finally:
+            runner.release(asyncio.get_running_loop())
+            self._session_finished(login_future, error)
+
+    def _session_finished(
+        self, login_future: "Future[None]", error: Exception | None
+    ) -> None:
+        """Clear the session's loop, failing login_future if login didn't finish."""
+        self._pulse_connection_properties.loop = None
+        with self._p_attribute_lock:
+            self._session_thread = None
+            self._session_future = None
+        if not login_future.done():
+            login_future.set_exception(
+                error or RuntimeError("ADT Pulse background session exited")
+            )
+        elif error is not None:
+            LOG.error("ADT Pulse background session failed: %s", error)
+
+    async def _sync_loop(self, login_future: "Future[None]") -> None:
+        """
+        Async function that represents the main loop of the process.
+
+        Logs in with `async_login`, then completes `login_future` so `login()`
+        returns as soon as login is done.
+
+        It then waits for `logout()` to set the shutdown event and logs out with
+        `async_logout`, or returns if the session ends on its own first.  The
+        transport is closed before returning, as its connections can't outlive
+        the loop.
+
+        Args:
+            login_future (Future[None]): future `login()` is waiting on
+
+        Raises:
+            Exception from async_login
+            RuntimeError: if login didn't create the keepalive task
+        """
+        self._shutdown_event = asyncio.Event()
+        try:
+            await self._run_sync_session(login_future, self._shutdown_event)
+        finally:
+            # the transport's connections belong to this loop, which closes next
+            await self._pulse_connection_properties.transport.close()
+
+    async def _run_sync_session(
+        self, login_future: "Future[None]", shutdown_event: asyncio.Event
+    ) -> None:
+        # subscribe before logging in so callbacks see the connection being made
+        self._start_callback_task()
+        try:
+            await self.async_login()
+            login_future.set_result(None)
+            timeout_task = self._timeout_task
+            if timeout_task is None:
+                # we should never get here
+                raise RuntimeError("Background pyadtpulse tasks not created")
+            shutdown_task = asyncio.create_task(shutdown_event.wait())
+            try:
+                await asyncio.wait(
+                    (timeout_task, shutdown_task), return_when=asyncio.FIRST_COMPLETED
+                )
+                if (
+                    not shutdown_task.done()
+                    and not self._pulse_connection_status.authenticated_flag.is_set()
+                ):
+                    # session was shut down by a background task
+                    return
+                await shutdown_task
+            finally:
+                shutdown_task.cancel()
+            await self.async_logout()
+        finally:
+            # not done by async_logout(), which keepalive relogins also call
+            await self._cancel_callback_task()
+            # the background loop stops once the session ends
+            self.stop_loop_monitor()
+
+    def _start_callback_task(self) -> None:
+        """Start sending events to callbacks, if any are registered."""
+        with self._p_attribute_lock:
+            if self._callback_task is not None or not len(self._callbacks):
+                return
+            subscription = self._typed_event_hub.subscribe(
+                "callbacks", overflow=OVERFLOW_COALESCE
+            )
+            self._callback_task = asyncio.create_task(
+                self._callback_dispatch_task(subscription), name=CALLBACK_TASK_NAME
+            )
+            if self._timeout_task is not None:
+                self._start_sync_task()
+
+    async def _callback_dispatch_task(
+        self, subscription: PulseEventSubscription
+    ) -> None:
+        """Pass events from the background loop to the callback registry."""
+        try:
+            async for event in subscription:
+                if isinstance(event, PulseEvent):
+                    self._callbacks.dispatch(event)
+        finally:
+            subscription.close()
+
+    async def _cancel_callback_task(self) -> None:
+        with self._p_attribute_lock:
+            task = self._callback_task
+            self._callback_task = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def register_callback(
+        self,
+        callback: PulseCallback,
+        target: PulseCallbackTarget | None = None,
+        event_types: tuple[type[PulseEvent], ...] = (),
+    ) -> Callable[[], None]:
+        """
+        Register a callback for zone, alarm, gateway and connection changes.
+
+        The callback is called with a PulseEvent (i.e. ZoneStateChanged) for
+        each change seen by the background thread, so there is no need to poll
+        updates_exist.  It never runs on the background thread's event loop.
+
+        Args:
+            callback (PulseCallback): called with each event
+            target (Executor | asyncio.AbstractEventLoop | None, optional):
+                executor or event loop to run the callback on. Defaults to None,
+                which runs callbacks one at a time on a dedicated thread.
+            event_types (tuple[type[PulseEvent], ...], optional): event classes
+                to call the callback for. Defaults to (), meaning all events.
+
+        Returns:
+            Callable[[], None]: function which unregisters the callback
+
+        """
+        unregister = self._callbacks.register(callback, target, event_types)
+        loop = self._pulse_connection_properties.loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._start_callback_task)
+        return unregister
+
+    def login(self) -> None:
+        """
+        Login to ADT Pulse and generate access token.
+
+        Returns as soon as the background thread, or the shared loop if a loop
+        runner was given, has logged in.
+
+        Raises:
+            Exception from async_login
+            RuntimeError: if the loop runner is closed
+
+        """
+        login_future: Future[None] = Future()
+        with self._p_attribute_lock:
+            if self._loop_runner is not None:
+                loop = self._loop_runner.acquire()
+                self._pulse_connection_properties.loop = loop
+                self._session_future = asyncio.run_coroutine_threadsafe(
+                    self._shared_loop_session(login_future, self._loop_runner), loop
+                )
+            else:
+                # probably shouldn't be a daemon thread
+                self._session_thread = Thread(
+                    target=self._pulse_session_thread,
+                    args=(login_future,),
+                    name="PyADTPulse Session",
+                    daemon=True,
+                )
+                self._session_thread.start()
+        login_future.result()
+
+    def logout(self) -> None:
+        """Log out of ADT Pulse, returning once the background session exits."""
+        loop = self._pulse_connection.check_sync(
+            "Attempting to call sync logout without sync login"
+        )
+        with self._p_attribute_lock:
+            sync_thread = self._session_thread
+            session_future = self._session_future
+        shutdown_event = self._shutdown_event
+        if shutdown_event is not None:
+            loop.call_soon_threadsafe(shutdown_event.set)
+        if sync_thread is not None:
+            sync_thread.join()
+        if session_future is not None:
+            session_future.result()
+        self._callbacks.close()
+
+    @property
+    def attribute_lock(self) -> "RLock| DebugRLock":
+        """
+        Get attribute lock for PyADTPulse object.
+
+        Returns:
+            RLock: thread Rlock
+
+        """
+        return self._p_attribute_lock
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        """
+        Get event loop.
+
+        Returns:
+            Optional[asyncio.AbstractEventLoop]: the event loop object or
+                                                 None if no thread is running
+
+        """
+        return self._pulse_connection_properties.loop
+
+    @property
+    def updates_exist(self) -> bool:
+        """
+        Check if updated data exists.
+
+        Returns:
+            bool: True if updated data exists
+
+        """
+        with self._p_attribute_lock:
+            if self._sync_task is None:
+                loop = self._pulse_connection_properties.loop
+                if loop is None:
+                    raise RuntimeError(
+                        "ADT pulse sync function updates_exist() "
+                        "called from async session"
+                    )
+                coro = self._sync_check_task()
+                self._sync_task = loop.create_task(
+                    coro, name=f"{SYNC_CHECK_TASK_NAME}: Sync session"
+                )
+            if self._pulse_properties.updates_exist.is_set():
+                self._pulse_properties.updates_exist.clear()
+                return True
+            return False
+
+    def update(self) -> bool:
+        """
+        Update ADT Pulse data.
+
+        Returns:
+            bool: True on success
+
+        """
+        coro = self.async_update()
+        return asyncio.run_coroutine_threadsafe(
+            coro,
+            self._pulse_connection.check_sync(
+                "Attempting to run sync update from async login"
+            ),
+        ).result()
+
+    def _check_async(self, message: str) -> None:
+        """
+        Check an async method isn't called on a synchronous session.
+
+        Calls made by the background thread itself are allowed.
+
+        Raises:
+            RuntimeError: with the given message if called from another event loop
+        """
+        loop = self._pulse_connection_properties.loop
+        if loop is not None and asyncio.get_running_loop() is loop:
+            return
+        self._pulse_connection_properties.check_async(message)
+
+    async def async_login(self) -> None:
+        """Login to ADT Pulse asynchronously."""
+        self._check_async("Cannot login asynchronously with a synchronous session")
+        await super().async_login()
+
+    async def async_logout(self) -> None:
+        """Logout of ADT Pulse asynchronously."""
+        self._check_async("Cannot logout asynchronously with a synchronous session")
+        await super().async_logout()
+
+    async def async_update(self) -> bool:
+        """Update ADT Pulse data asynchronously."""
+        self._check_async("Cannot update asynchronously with a synchronous session")
+        return await super().async_update()
@@ -5,11 +5,12 @@ import logging
 from time import time
 from asyncio import Task, gather, create_task, get_event_loop, run_coroutine_threadsafe
 from datetime import datetime
+from dataclasses import replace
 
 from lxml import html
 from typeguard import typechecked
 
-from .util import make_etree, remove_prefix, parse_pulse_datetime
+from .util import remove_prefix, parse_pulse_datetime
 from .const import ADT_DEVICE_URI, ADT_SYSTEM_URI, ADT_GATEWAY_URI, ADT_GATEWAY_STRING
 from .zones import ADTPulseZones, ADTPulseFlattendZone
 from .exceptions import (
@@ -18,8 +19,16 @@ from .exceptions import (
     PulseServerConnectionError,
     PulseServiceTemporarilyUnavailableError,
 )
+from .pulse_events import (
+    PulseEvent,
+    PulseEventSink,
+    ZoneStateChanged,
+    ZoneStatusChanged,
+)
 from .site_properties import ADTPulseSiteProperties
 from .pulse_connection import PulseConnection
+from .pulse_sync_token import PulseSyncTokenTracker
+from .pulse_sync_scheduler import PulseSyncCheckScheduler
 
 LOG = logging.getLogger(__name__)
 
@@ -30,10 +39,25 @@ SECURITY_PANEL_NAME = "Security Panel"
 class ADTPulseSite(ADTPulseSiteProperties):
     """Represents an individual ADT Pulse site."""
 
-    __slots__ = ("_pulse_connection", "_tripped_zones", "_trouble_zones")
+    __slots__ = (
+        "_change_count",
+        "_event_sink",
+        "_network_params",
+        "_pulse_connection",
+        "_sync_scheduler",
+        "_sync_tokens",
+        "_tripped_zones",
+        "_trouble_zones",
+    )
 
     @typechecked
-    def __init__(self, pulse_connection: PulseConnection, site_id: str, name: str):
+    def __init__(
+        self,
+        pulse_connection: PulseConnection,
+        site_id: str,
+        name: str,
+        select_site: bool = False,
+    ):
         """
         Initialize.
 
@@ -41,16 +65,83 @@ class ADTPulseSite(ADTPulseSiteProperties):
             pulse_connection (PulseConnection): Pulse connection.
             site_id (str): Site ID.
             name (str): Site name.
+            select_site (bool, optional): send the site id with every request,
+                for accounts with several sites. Defaults to False.
 
         """
         self._pulse_connection = pulse_connection
         super().__init__(site_id, name, pulse_connection.debug_locks)
+        # Pulse answers requests carrying a networkid for that site, so sites of
+        # one login can be queried concurrently on the same session
+        self._network_params: dict[str, str] = {}
+        if select_site:
+            self._network_params["networkid"] = site_id
+            self._alarm_panel.network_id = site_id
         self._trouble_zones: set[int] | None = None
         self._tripped_zones: set[int] = set()
+        self._sync_scheduler = PulseSyncCheckScheduler(
+            metrics=pulse_connection.metrics,
+            site_id=site_id,
+            debug_locks=pulse_connection.debug_locks,
+        )
+        self._sync_tokens = PulseSyncTokenTracker(
+            metrics=pulse_connection.metrics, debug_locks=pulse_connection.debug_locks
+        )
+        self._event_sink: PulseEventSink | None = None
+        self._change_count = 0
+        self._alarm_panel.event_sink = self._emit
+        self._gateway.event_sink = self._emit
+
+    @property
+    def network_params(self) -> dict[str, str]:
+        """Return the parameters selecting this site to add to its requests."""
+        return dict(self._network_params)
+
+    @property
+    def sync_scheduler(self) -> PulseSyncCheckScheduler:
+        """Return the scheduler choosing the sync check poll interval."""
+        return self._sync_scheduler
+
+    @property
+    def sync_tokens(self) -> PulseSyncTokenTracker:
+        """Return the tracker of this site's sync check tokens."""
+        return self._sync_tokens
+
+    @property
+    def change_count(self) -> int:
+        """Return the number of zone, alarm and gateway changes seen."""
+        with self._site_lock:
+            return self._change_count
+
+    @property
+    def event_sink(self) -> PulseEventSink | None:
+        """Return the callable typed events for this site are sent to."""
+        return self._event_sink
+
+    @event_sink.setter
+    def event_sink(self, sink: PulseEventSink | None) -> None:
+        """Set the callable typed events for this site are sent to."""
+        self._event_sink = sink
+
+    def _emit(self, event: PulseEvent) -> None:
+        """Count a change and send its event to the event sink."""
+        with self._site_lock:
+            self._change_count += 1
+        if self._event_sink is None:
+            return
+        if not event.site_id:
+            event = replace(event, site_id=self._id)
+        self._event_sink(event)
+
+    def _expect_change(self) -> None:
+        """Poll quickly after arming or disarming."""
+        self._sync_scheduler.record_activity()
+        self._sync_scheduler.wake()
 
     @typechecked
     def arm_home(self, force_arm: bool = False) -> bool:
         """Arm system home."""
+        self._expect_change()
         return self.alarm_control_panel.arm_home(
             self._pulse_connection, force_arm=force_arm
         )
@@ -58,17 +149,20 @@ class ADTPulseSite(ADTPulseSiteProperties):
     @typechecked
     def arm_away(self, force_arm: bool = False) -> bool:
         """Arm system away."""
+        self._expect_change()
         return self.alarm_control_panel.arm_away(
             self._pulse_connection, force_arm=force_arm
         )
 
     def disarm(self) -> bool:
         """Disarm system."""
+        self._expect_change()
         return self.alarm_control_panel.disarm(self._pulse_connection)
 
     @typechecked
     async def async_arm_home(self, force_arm: bool = False) -> bool:
         """Arm system home async."""
+        self._expect_change()
         return await self.alarm_control_panel.async_arm_home(
             self._pulse_connection, force_arm=force_arm
         )
@@ -76,6 +170,7 @@ class ADTPulseSite(ADTPulseSiteProperties):
     @typechecked
     async def async_arm_away(self, force_arm: bool = False) -> bool:
         """Arm system away async."""
+        self._expect_change()
         return await self.alarm_control_panel.async_arm_away(
             self._pulse_connection, force_arm=force_arm
         )
@@ -83,12 +178,14 @@ class ADTPulseSite(ADTPulseSiteProperties):
     @typechecked
     async def async_arm_night(self, force_arm: bool = False) -> bool:
         """Arm system away async."""
+        self._expect_change()
         return await self.alarm_control_panel.async_arm_night(
             self._pulse_connection, force_arm=force_arm
         )
 
     async def async_disarm(self) -> bool:
         """Disarm system async."""
+        self._expect_change()
         return await self.alarm_control_panel.async_disarm(self._pulse_connection)
 
         #        status_orb = summary_html_soup.find('canvas', {'id': 'ic_orb'})
@@ -118,13 +215,14 @@ class ADTPulseSite(ADTPulseSiteProperties):
         result: dict[str, str] = {}
         if device_id == ADT_GATEWAY_STRING:
             device_response = await self._pulse_connection.async_query(
-                ADT_GATEWAY_URI, timeout=10
+                ADT_GATEWAY_URI, extra_params=self.network_params or None
             )
         else:
             device_response = await self._pulse_connection.async_query(
-                ADT_DEVICE_URI, extra_params={"id": device_id}
+                ADT_DEVICE_URI, extra_params={"id": device_id, **self._network_params}
             )
-        device_response_etree = make_etree(
+        device_response_etree = self._pulse_connection.make_etree(
+            ADT_GATEWAY_URI if device_id == ADT_GATEWAY_STRING else ADT_DEVICE_URI,
             device_response[0],
             device_response[1],
             device_response[2],
@@ -250,8 +348,11 @@ class ADTPulseSite(ADTPulseSiteProperties):
             return None
 
         if tree is None:
-            response = await self._pulse_connection.async_query(ADT_SYSTEM_URI)
-            tree = make_etree(
+            response = await self._pulse_connection.async_query(
+                ADT_SYSTEM_URI, extra_params=self.network_params or None
+            )
+            tree = self._pulse_connection.make_etree(
+                ADT_SYSTEM_URI,
                 response[0],
                 response[1],
                 response[2],
@@ -322,7 +423,9 @@ class ADTPulseSite(ADTPulseSiteProperties):
                 # call ADT orb uri
                 try:
                     tree = await self._pulse_connection.query_orb(
-                        logging.WARNING, "Could not fetch zone status updates"
+                        logging.WARNING,
+                        "Could not fetch zone status updates",
+                        self.network_params or None,
                     )
                 except (
                     PulseServiceTemporarilyUnavailableError,
@@ -335,7 +438,7 @@ class ADTPulseSite(ADTPulseSiteProperties):
                     return None
             if tree is None:
                 return None
-            self.update_zone_from_etree(tree)
+        self.update_zone_from_etree(tree)
         return self._zones
 
     def update_zone_from_etree(self, tree: html.HtmlElement) -> set[int]:  # noqa: PLR0912, PLR0915
@@ -452,7 +555,30 @@ class ADTPulseSite(ADTPulseSiteProperties):
             if not self._zones:
                 LOG.warning("No zones exist")
                 return
+            old_zone = self._zones.get(zone)
+            old_state = old_zone.state if old_zone else state
+            old_status = old_zone.status if old_zone else status
             self._zones.update_device_info(zone, state, status, last_update)
+            new_zone = self._zones[zone]
+            if old_state != new_zone.state:
+                events.append(
+                    ZoneStateChanged(
+                        zone_id=zone,
+                        name=new_zone.name,
+                        old_state=old_state,
+                        new_state=new_zone.state,
+                        last_activity_timestamp=new_zone.last_activity_timestamp,
+                    )
+                )
+            if old_status != new_zone.status:
+                events.append(
+                    ZoneStatusChanged(
+                        zone_id=zone,
+                        name=new_zone.name,
+                        old_status=old_status,
+                        new_status=new_zone.status,
+                    )
+                )
             LOG.debug(
                 "Set zone %d - to %s, status %s with timestamp %s",
                 zone,
@@ -463,25 +589,28 @@ class ADTPulseSite(ADTPulseSiteProperties):
             retval.add(zone)
 
         retval: set[int] = set()
+        # sent once the site lock is released, so event sinks can read the site
+        events: list[PulseEvent] = []
         start_time = 0.0
         if self._pulse_connection.detailed_debug_logging:
             start_time = time()
+        # the gateway sends its own event, so is set without the site lock held
+        try:
+            orb_status = tree.find(
+                path=".//canvas[@id='ic_orb']",
+                namespaces=None,
+            ).get("orb")
+            if orb_status == "offline":
+                self.gateway.is_online = False
+                raise PulseGatewayOfflineError(self.gateway.backoff)
+            else:
+                self.gateway.is_online = True
+                self.gateway.backoff.reset_backoff()
+
+        except (AttributeError, ValueError):
+            LOG.error("Failed to retrieve alarm status from orb!")
         # parse ADT's convulated html to get sensor status
         with self._site_lock:
-            try:
-                orb_status = tree.find(
-                    path=".//canvas[@id='ic_orb']",
-                    namespaces=None,
-                ).get("orb")
-                if orb_status == "offline":
-                    self.gateway.is_online = False
-                    raise PulseGatewayOfflineError(self.gateway.backoff)
-                else:
-                    self.gateway.is_online = True
-                    self.gateway.backoff.reset_backoff()
-
-            except (AttributeError, ValueError):
-                LOG.error("Failed to retrieve alarm status from orb!")
             first_pass = False
             if self._trouble_zones is None:
                 first_pass = True
@@ -530,6 +659,8 @@ class ADTPulseSite(ADTPulseSiteProperties):
 
             if self._pulse_connection.detailed_debug_logging:
                 LOG.debug("Updated zones in %f seconds", time() - start_time)
+        for event in events:
+            self._emit(event)
         return retval
 
     async def _async_update_zones(self) -> list[ADTPulseFlattendZone] | None:
@@ -545,10 +676,10 @@ class ADTPulseSite(ADTPulseSiteProperties):
         with self._site_lock:
             if not self._zones:
                 return None
-            zonelist = await self._async_update_zones_as_dict(None)
-            if not zonelist:
-                return None
-            return zonelist.flatten()
+        zonelist = await self._async_update_zones_as_dict(None)
+        if not zonelist:
+            return None
+        return zonelist.flatten()
 
     def update_zones(self) -> list[ADTPulseFlattendZone] | None:
         """
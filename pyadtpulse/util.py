@@ -1,11 +1,11 @@
 """Utility functions for pyadtpulse."""
 
+import os
 import sys
 import string
 import logging
 from base64 import urlsafe_b64encode
-from random import randint
-from pathlib import Path
+from secrets import token_bytes
 from datetime import datetime, timedelta
 from threading import RLock, current_thread
 
@@ -82,6 +82,16 @@ def make_etree(
 FINGERPRINT_LENGTH = 2292
 ALLOWABLE_CHARACTERS = list(string.ascii_letters + string.digits)
 FINGERPRINT_RANGE_LEN = len(ALLOWABLE_CHARACTERS)
+# random bytes at or above this are dropped so every character is equally likely
+_FINGERPRINT_BYTE_LIMIT = 256 - 256 % FINGERPRINT_RANGE_LEN
+_FINGERPRINT_TABLE = bytes(
+    ord(ALLOWABLE_CHARACTERS[i % FINGERPRINT_RANGE_LEN]) for i in range(256)
+)
+_FINGERPRINT_REJECTED = bytes(range(_FINGERPRINT_BYTE_LIMIT, 256))
+
+# browser JSON fingerprints by absolute path, with the file's mtime and size
+_browser_fingerprints: dict[str, tuple[int, int, str]] = {}
+_browser_fingerprints_lock = RLock()
 
 
 def generate_random_fingerprint() -> str:
@@ -92,17 +102,20 @@ def generate_random_fingerprint() -> str:
         str: a fingerprint string
 
     """
-    fingerprint = [
-        ALLOWABLE_CHARACTERS[(randint(0, FINGERPRINT_RANGE_LEN - 1))]
-        for i in range(FINGERPRINT_LENGTH)
-    ]
-    return "".join(fingerprint)
+    fingerprint = b""
+    while len(fingerprint) < FINGERPRINT_LENGTH:
+        # about 3% of bytes are dropped, so one extra 1/16 is nearly always enough
+        random_bytes = token_bytes(FINGERPRINT_LENGTH + FINGERPRINT_LENGTH // 16)
+        fingerprint += random_bytes.translate(_FINGERPRINT_TABLE, _FINGERPRINT_REJECTED)
+    return fingerprint[:FINGERPRINT_LENGTH].decode("ascii")
 
 
 def generate_fingerprint_from_browser_json(filename: str) -> str:
     """
     Generate a browser fingerprint from a JSON file.
 
+    The fingerprint is cached until the file changes.
+
     Args:
         filename (str): JSON file containing fingerprint information
 
@@ -110,11 +123,21 @@ def generate_fingerprint_from_browser_json(filename: str) -> str:
         str: the fingerprint
 
     """
-    data = Path(filename).read_text(encoding="utf-8")
+    path = os.path.abspath(filename)
+    with open(path, encoding="utf-8") as f:
+        stat = os.fstat(f.fileno())
+        with _browser_fingerprints_lock:
+            cached = _browser_fingerprints.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        data = f.read()
     # Pulse just calls JSON.Stringify() and btoa() in javascript, so we need to
     # do this to emulate that
     data2 = "".join(data.split())
-    return str(urlsafe_b64encode(data2.encode("utf-8")), "utf-8")
+    fingerprint = str(urlsafe_b64encode(data2.encode("utf-8")), "utf-8")
+    with _browser_fingerprints_lock:
+        _browser_fingerprints[path] = (stat.st_mtime_ns, stat.st_size, fingerprint)
+    return fingerprint
 
 
 class DebugRLock:
@@ -0,0 +1,98 @@
+"""Test the ADT Pulse alarm panel."""
+
+import asyncio
+from time import perf_counter
+from threading import Event, Thread
+
+import pytest
+
+from pyadtpulse.alarm_panel import (
+    ADT_ALARM_AWAY,
+    ADT_ALARM_ARMING,
+    ADTPulseAlarmPanel,
+)
+from pyadtpulse.pulse_simulator import (
+    ALARM_ARMED_AWAY,
+    PulseSimulator,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+def test_panels_do_not_share_state():
+    """Test each panel has its own locks and last update time."""
+    first = ADTPulseAlarmPanel()
+    second = ADTPulseAlarmPanel()
+    assert first._state_lock is not second._state_lock
+    assert first._arm_lock is not second._arm_lock
+    held = Event()
+    release = Event()
+
+    def hold_lock() -> None:
+        with first._state_lock:
+            held.set()
+            release.wait(10)
+
+    holder = Thread(target=hold_lock)
+    holder.start()
+    try:
+        assert held.wait(10)
+        # another panel isn't blocked by the held lock
+        assert second.status == "Unknown"
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_status_events_sent_unlocked():
+    """Test status change events are sent after the state lock is released."""
+    panel = ADTPulseAlarmPanel()
+    locked: list[bool] = []
+
+    def sink(event) -> None:
+        locked.append(panel._state_lock._is_owned())
+
+    panel.event_sink = sink
+    panel.status = ADT_ALARM_AWAY
+    panel.status = ADT_ALARM_AWAY
+    assert locked == [False]
+
+
+@pytest.mark.asyncio
+async def test_panels_arm_concurrently():
+    """Test panels of several sites arm at once, readable meanwhile."""
+    latency = 0.5
+    async with PulseSimulator(latency=latency) as simulator:
+        simulator.add_account(USERNAME, PASSWORD, zone_count=1)
+        sites = [simulator.get_account(USERNAME)]
+        sites.extend(simulator.add_site(USERNAME, zone_count=1) for _ in range(3))
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        try:
+            await p.async_login()
+            panel = p.site.alarm_control_panel
+            start = perf_counter()
+            arming = asyncio.gather(*(site.async_arm_away() for site in p.sites))
+            await asyncio.sleep(latency / 2)
+
+            def read_status() -> float:
+                read_start = perf_counter()
+                assert panel.status
+                return perf_counter() - read_start
+
+            # the panel isn't locked while its request is in flight
+            assert await asyncio.to_thread(read_status) < latency / 2
+            assert all(await arming)
+            assert perf_counter() - start < len(sites) * latency
+            assert all(
+                s.alarm_control_panel.status in (ADT_ALARM_ARMING, ADT_ALARM_AWAY)
+                for s in p.sites
+            )
+            assert all(site.alarm_status == ALARM_ARMED_AWAY for site in sites)
+        finally:
+            await p.async_logout()
+            await t.close()
@@ -318,3 +318,16 @@ def test_custom_values():
     assert gateway._device_lan_mac == "AA:BB:CC:DD:EE:FF"
     assert gateway.router_lan_ip_address == IPv4Address("192.168.1.1")
     assert gateway.router_wan_ip_address == IPv4Address("10.0.0.1")
+
+
+# each gateway has its own backoff and lock
+def test_gateways_do_not_share_state():
+    """Test that one gateway going offline doesn't back off another."""
+    first = ADTPulseGateway()
+    second = ADTPulseGateway()
+    assert first.backoff is not second.backoff
+    assert first._attribute_lock is not second._attribute_lock
+    first.backoff.increment_backoff()
+    first.poll_interval = 5.0
+    assert second.backoff._backoff_count == 0
+    assert second.poll_interval == ADT_DEFAULT_POLL_INTERVAL
@@ -0,0 +1,36 @@
+"""Test importing pyadtpulse only loads the modules it needs."""
+
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import pyadtpulse
+
+BENCHMARK = Path(__file__).parent.parent / "benchmarks" / "import_benchmark.py"
+
+
+def test_lazy_attributes():
+    """Test public names are imported on first use."""
+    assert "PyADTPulse" in dir(pyadtpulse)
+    assert set(pyadtpulse.__all__) == {
+        *pyadtpulse._LAZY_ATTRIBUTES,
+        "enable_fast_zlib",
+    }
+    assert pyadtpulse.PyADTPulse.__name__ == "PyADTPulse"
+    assert pyadtpulse.PyADTPulseAsync.__name__ == "PyADTPulseAsync"
+    assert "PyADTPulse" in vars(pyadtpulse)
+    with pytest.raises(AttributeError):
+        _ = pyadtpulse.NotAName
+
+
+def test_import_time_budget():
+    """Test imports are within budget and don't load unneeded modules."""
+    result = subprocess.run(
+        [sys.executable, str(BENCHMARK), "--check", "--runs", "3"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -316,3 +316,25 @@ class TestPulseAuthenticationProperties:
         # Act and Assert
         with pytest.raises(typeguard.TypeCheckError):
             properties.last_login_time = "invalid_time"  # type: ignore
+
+    def test_login_form(self):
+        """Test the login form is encoded once and rebuilt when a value changes."""
+        properties = PulseAuthenticationProperties(
+            "test@example.com", "password123", "fingerprint123"
+        )
+        form = properties.login_form
+        assert form == {
+            "usernameForm": "test@example.com",
+            "passwordForm": "password123",
+            "fingerprint": "fingerprint123",
+        }
+        assert form.encoded == (
+            b"usernameForm=test%40example.com&passwordForm=password123"
+            b"&fingerprint=fingerprint123"
+        )
+        assert properties.login_form is form
+        properties.site_id = "12345"
+        assert properties.login_form["networkid"] == "12345"
+        properties.fingerprint = "new_fingerprint"
+        assert properties.login_form["fingerprint"] == "new_fingerprint"
+        assert properties.login_form is not form
@@ -0,0 +1,95 @@
+"""Test running many accounts with PulseAccountManager."""
+
+import asyncio
+
+import pytest
+
+from pyadtpulse.const import ADT_LOGIN_URI
+from pyadtpulse.exceptions import PulseAuthenticationError
+from pyadtpulse.pulse_events import ZoneStateChanged, ConnectionStateChanged
+from pyadtpulse.pulse_metrics import METRIC_REQUESTS, get_endpoint_name
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pulse_account_manager import PulseAccountManager
+
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+USERNAMES = [f"user{i}@example.com" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_account_manager():
+    """Test logging in accounts, aggregating events and metrics, and removal."""
+    with pytest.raises(ValueError):
+        PulseAccountManager(max_concurrent_logins=0)
+    async with (
+        PulseSimulator() as simulator,
+        PulseAccountManager(login_interval=0.05, max_concurrent_logins=2) as manager,
+    ):
+        for username in USERNAMES:
+            simulator.add_account(username, PASSWORD)
+        events = manager.events()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for username in [*USERNAMES, "bad@example.com"]:
+            manager.add_account(
+                username,
+                PASSWORD,
+                FINGERPRINT,
+                PulseSimulatorTransport(simulator.base_url),
+            )
+        with pytest.raises(ValueError):
+            manager.add_account(USERNAMES[0], PASSWORD, FINGERPRINT)
+        assert len(manager) == len(USERNAMES) + 1
+        failed = await manager.wait_for_logins()
+        # logins are spread out rather than started together
+        assert loop.time() - start >= 0.05 * len(USERNAMES)
+        assert list(failed) == ["bad@example.com"]
+        assert isinstance(failed["bad@example.com"], PulseAuthenticationError)
+        await manager.remove_account("bad@example.com")
+        with pytest.raises(KeyError):
+            manager.get_account("bad@example.com")
+
+        connected = [await anext(events) for _ in USERNAMES]
+        assert all(isinstance(e, ConnectionStateChanged) for e in connected)
+        account = manager.get_account(USERNAMES[2])
+        account.site.gateway.poll_interval = 0.1
+        simulator.apply_event(PulseSimulatedEvent(0, USERNAMES[2], 10, "Open"))
+        event = await asyncio.wait_for(anext(events), 10)
+        assert isinstance(event, ZoneStateChanged)
+        assert event.site_id == account.site.id
+
+        logins = {"endpoint": get_endpoint_name(ADT_LOGIN_URI)}
+        assert manager.metrics.get_counter(METRIC_REQUESTS, logins) == sum(
+            a.metrics.get_counter(METRIC_REQUESTS, logins)
+            for a in manager.accounts.values()
+        )
+        await manager.remove_account(USERNAMES[0])
+        assert len(manager) == len(USERNAMES) - 1
+        await events.aclose()
+    assert len(manager) == 0
+    assert all(not a.is_connected for a in manager.accounts.values())
+
+
+@pytest.mark.asyncio
+async def test_account_manager_connection_pool():
+    """Test accounts share one connection pool but not cookies."""
+    async with PulseAccountManager(login_interval=60) as manager:
+        first = manager.add_account("a@example.com", PASSWORD, FINGERPRINT)
+        second = manager.add_account("b@example.com", PASSWORD, FINGERPRINT)
+        first_session = first._pulse_connection_properties.session
+        second_session = second._pulse_connection_properties.session
+        assert first_session is not second_session
+        connector = first_session.connector
+        assert connector is not None
+        assert connector is second_session.connector
+        assert first_session.cookie_jar is not second_session.cookie_jar
+        # removing an account before its login starts cancels the login
+        await manager.remove_account("a@example.com")
+        assert not first.is_connected
+        assert first_session.closed
+        assert not connector.closed
+    assert connector.closed
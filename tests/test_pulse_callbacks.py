@@ -0,0 +1,116 @@
+"""Test Pulse event callback registry."""
+
+import asyncio
+import threading
+from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyadtpulse import PyADTPulse
+from pyadtpulse.pulse_events import (
+    ZoneStateChanged,
+    AlarmStateChanged,
+    ConnectionStateChanged,
+)
+from pyadtpulse.pulse_callbacks import PulseCallbackRegistry
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+def zone_event(zone: int) -> ZoneStateChanged:
+    """Return a zone opening event."""
+    return ZoneStateChanged(zone_id=zone, name="", old_state="OK", new_state="Open")
+
+
+def test_callback_targets():
+    """Test running callbacks on threads, executors and event loops."""
+    registry = PulseCallbackRegistry()
+    received: Queue = Queue()
+
+    def record(tag: str):
+        def callback(event):
+            received.put((tag, event, threading.current_thread().name))
+
+        return callback
+
+    def fail(event):
+        raise ValueError("callback failed")
+
+    registry.register(fail)
+    registry.register(record("default"))
+    registry.register(record("alarm"), event_types=(AlarmStateChanged,))
+    with ThreadPoolExecutor(thread_name_prefix="Caller") as executor:
+        unregister = registry.register(record("executor"), executor)
+        assert len(registry) == 4
+        event = zone_event(10)
+        registry.dispatch(event)
+        results = sorted(received.get(timeout=5) for _ in range(2))
+        assert [(tag, e) for tag, e, _ in results] == [
+            ("default", event),
+            ("executor", event),
+        ]
+        assert results[0][2].startswith("PyADTPulse Callback")
+        assert results[1][2].startswith("Caller")
+        unregister()
+        unregister()
+        assert len(registry) == 3
+    # a failing callback doesn't stop later events
+    alarm = AlarmStateChanged(old_status="Disarmed", new_status="Armed Away")
+    registry.dispatch(alarm)
+    assert sorted(received.get(timeout=5)[0] for _ in range(2)) == ["alarm", "default"]
+    assert received.empty()
+
+    loop = asyncio.new_event_loop()
+    try:
+        registry.register(record("loop"), loop)
+        registry.dispatch(zone_event(11))
+        loop.run_until_complete(asyncio.sleep(0))
+        tags = sorted(received.get(timeout=5)[0] for _ in range(2))
+        assert tags == ["default", "loop"]
+    finally:
+        loop.close()
+    registry.close()
+
+
+def test_sync_callbacks():
+    """Test callbacks from the synchronous PyADTPulse object."""
+    simulator = PulseSimulator()
+    simulator_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=simulator_loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(simulator.start(), simulator_loop).result(10)
+    try:
+        simulator.add_account(USERNAME, PASSWORD)
+        with pytest.deprecated_call():
+            p = PyADTPulse(USERNAME, PASSWORD, FINGERPRINT, do_login=False)
+        p._pulse_connection_properties.transport = PulseSimulatorTransport(
+            simulator.base_url
+        )
+        received: Queue = Queue()
+        p.register_callback(received.put)
+        p.login()
+        event = received.get(timeout=10)
+        assert event == ConnectionStateChanged(
+            connected=True, timestamp=event.timestamp
+        )
+        p.site.gateway.poll_interval = 0.1
+        simulator_loop.call_soon_threadsafe(
+            simulator.apply_event, PulseSimulatedEvent(0, USERNAME, 10, "Open")
+        )
+        event = received.get(timeout=10)
+        assert isinstance(event, ZoneStateChanged)
+        assert event.zone_id == 10
+        p.logout()
+    finally:
+        asyncio.run_coroutine_threadsafe(simulator.stop(), simulator_loop).result(10)
+        simulator_loop.call_soon_threadsafe(simulator_loop.stop)
+        thread.join(10)
+        simulator_loop.close()
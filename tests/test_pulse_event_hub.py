@@ -0,0 +1,145 @@
+"""Test Pulse update publish/subscribe hub."""
+
+import asyncio
+
+import pytest
+
+from pyadtpulse.exceptions import PulseNotLoggedInError
+from pyadtpulse.pulse_event_hub import (
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP_OLDEST,
+    PulseEventHub,
+)
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+@pytest.mark.asyncio
+async def test_fan_out_and_overflow():
+    """Test every subscriber gets every update and overflow policies."""
+    hub = PulseEventHub()
+    first = hub.subscribe("first")
+    second = hub.subscribe("second", queue_size=2, overflow=OVERFLOW_DROP_OLDEST)
+    third = hub.subscribe("third", queue_size=2, overflow=OVERFLOW_COALESCE)
+    assert hub.subscriber_count == 3
+    for zone in (10, 11, 12, 13):
+        hub.publish(zones={zone})
+    assert [(await first.get()).zones for _ in range(4)] == [
+        {10},
+        {11},
+        {12},
+        {13},
+    ]
+    assert [u.zones for u in (second.get_nowait(), second.get_nowait())] == [
+        {12},
+        {13},
+    ]
+    assert second.dropped == 2
+    assert second.get_nowait() is None
+    update = third.get_nowait()
+    assert update is not None
+    assert update.zones == {10}
+    update = third.get_nowait()
+    assert update is not None
+    assert (update.zones, update.sequence, update.coalesced) == ({11, 12, 13}, 4, 3)
+    assert third.dropped == 0
+    assert third.cursor == hub.cursor == 4
+
+    # errors are never coalesced
+    hub.publish(zones={10})
+    hub.publish(zones={11})
+    hub.publish(exception=PulseNotLoggedInError())
+    assert third.dropped == 1
+    updates = [third.get_nowait(), third.get_nowait()]
+    assert [u.zones for u in updates] == [{11}, set()]
+    assert isinstance(updates[1].exception, PulseNotLoggedInError)
+    assert third.cursor == 7
+
+    with pytest.raises(ValueError):
+        hub.subscribe(overflow="bogus")
+    with pytest.raises(ValueError):
+        hub.subscribe(queue_size=0)
+
+
+@pytest.mark.asyncio
+async def test_cursor_and_close():
+    """Test late subscribers catching up and closing subscriptions."""
+    hub = PulseEventHub(history_size=3)
+    for zone in range(5):
+        hub.publish(zones={zone})
+    late = hub.subscribe(cursor=1)
+    # only the last 3 updates are kept
+    assert [late.get_nowait().sequence for _ in range(3)] == [3, 4, 5]
+    late.close()
+    assert hub.subscriber_count == 0
+    hub.publish()
+    assert late.pending == 0
+
+    subscription = hub.subscribe()
+    received = []
+
+    async def consume():
+        async for update in subscription:
+            received.append(update.sequence)
+
+    task = asyncio.create_task(consume())
+    hub.publish()
+    await asyncio.sleep(0)
+    hub.close()
+    await asyncio.wait_for(task, 1)
+    assert received == [7]
+    assert subscription.closed
+
+
+def test_cursor_after_coalesce():
+    """Test resuming from the cursor of a merged update skips nothing."""
+    hub = PulseEventHub()
+    subscription = hub.subscribe(queue_size=2, overflow=OVERFLOW_COALESCE)
+    hub.publish(zones={10})
+    hub.publish(exception=PulseNotLoggedInError())
+    # merged past the error into the first update
+    hub.publish(zones={11})
+    update = subscription.get_nowait()
+    assert update is not None
+    assert (update.zones, update.sequence, update.coalesced) == ({10, 11}, 1, 2)
+    assert subscription.cursor == 1
+    subscription.close()
+    resumed = hub.subscribe(cursor=1)
+    updates = [resumed.get_nowait(), resumed.get_nowait()]
+    assert [u.sequence for u in updates] == [2, 3]
+    assert isinstance(updates[0].exception, PulseNotLoggedInError)
+    assert resumed.get_nowait() is None
+
+
+@pytest.mark.asyncio
+async def test_multiple_subscribers():
+    """Test several consumers receiving the same updates from Pulse."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD)
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        try:
+            subscriptions = [p.subscribe(name) for name in ("ha", "mqtt", "audit")]
+            await p.async_login()
+            p.site.gateway.poll_interval = 0.1
+            simulator.apply_event(PulseSimulatedEvent(0, USERNAME, 10, "Open"))
+            for subscription in subscriptions:
+                update = await asyncio.wait_for(subscription.get(), 10)
+                assert update.exception is None
+                assert update.zones == {10}
+                assert not update.alarm_changed
+            await p.async_logout()
+            for subscription in subscriptions:
+                update = await asyncio.wait_for(subscription.get(), 10)
+                assert isinstance(update.exception, PulseNotLoggedInError)
+                subscription.close()
+        finally:
+            await t.close()
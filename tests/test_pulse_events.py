@@ -0,0 +1,174 @@
+"""Test Pulse typed event stream."""
+
+import asyncio
+
+import pytest
+
+from pyadtpulse.alarm_panel import ADT_ALARM_OFF, ADT_ALARM_AWAY
+from pyadtpulse.pulse_events import (
+    ZoneStateChanged,
+    AlarmStateChanged,
+    ZoneStatusChanged,
+    GatewayOnlineChanged,
+    ConnectionStateChanged,
+)
+from pyadtpulse.pulse_event_hub import OVERFLOW_COALESCE, PulseEventHub
+from pyadtpulse.pulse_simulator import (
+    ALARM_ARMED_AWAY,
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+def test_event_coalescing():
+    """Test merging events for the same zone when a queue overflows."""
+    hub = PulseEventHub()
+    subscription = hub.subscribe(queue_size=3, overflow=OVERFLOW_COALESCE)
+    hub.publish_event(
+        ZoneStateChanged(
+            site_id="1", zone_id=1, name="Door", old_state="OK", new_state="Open"
+        )
+    )
+    hub.publish_event(
+        ZoneStatusChanged(
+            site_id="1",
+            zone_id=1,
+            name="Door",
+            old_status="Online",
+            new_status="Low Battery",
+        )
+    )
+    hub.publish_event(
+        AlarmStateChanged(site_id="1", old_status=ADT_ALARM_OFF, new_status="Arming")
+    )
+    # merged into the queued events
+    hub.publish_event(
+        ZoneStateChanged(
+            site_id="1", zone_id=1, name="Door", old_state="Open", new_state="OK"
+        )
+    )
+    hub.publish_event(
+        AlarmStateChanged(site_id="1", old_status="Arming", new_status=ADT_ALARM_AWAY)
+    )
+    # nothing to merge with, so the oldest event is dropped
+    hub.publish_event(ConnectionStateChanged(connected=False))
+    assert subscription.dropped == 1
+    events = [subscription.get_nowait() for _ in range(3)]
+    assert isinstance(events[0], ZoneStatusChanged)
+    assert events[1] == AlarmStateChanged(
+        site_id="1",
+        old_status=ADT_ALARM_OFF,
+        new_status=ADT_ALARM_AWAY,
+        timestamp=events[1].timestamp,
+    )
+    assert isinstance(events[2], ConnectionStateChanged)
+    assert subscription.cursor == hub.cursor == 6
+    assert (
+        ZoneStateChanged(zone_id=1, name="", old_state="OK", new_state="Open").merge(
+            ZoneStateChanged(zone_id=2, name="", old_state="OK", new_state="Open")
+        )
+        is None
+    )
+    newer = GatewayOnlineChanged(online=True)
+    assert GatewayOnlineChanged(online=False).merge(newer) is newer
+    assert ConnectionStateChanged(connected=True).merge(newer) is None
+
+
+@pytest.mark.asyncio
+async def test_event_stream():
+    """Test typed events from Pulse."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD)
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        events = p.events()
+        try:
+            await p.async_login()
+            p.site.gateway.poll_interval = 0.1
+
+            async def next_event():
+                return await asyncio.wait_for(anext(events), 10)
+
+            event = await next_event()
+            assert event == ConnectionStateChanged(
+                connected=True, timestamp=event.timestamp
+            )
+            simulator.apply_event(PulseSimulatedEvent(0, USERNAME, 10, "Open"))
+            event = await next_event()
+            assert isinstance(event, ZoneStateChanged)
+            assert (event.site_id, event.zone_id) == (p.site.id, 10)
+            assert (event.old_state, event.new_state) == ("OK", "Open")
+            simulator.apply_event(
+                PulseSimulatedEvent(0, USERNAME, alarm_status=ALARM_ARMED_AWAY)
+            )
+            event = await next_event()
+            assert isinstance(event, AlarmStateChanged)
+            assert (event.old_status, event.new_status) == (
+                ADT_ALARM_OFF,
+                ADT_ALARM_AWAY,
+            )
+            simulator.apply_event(
+                PulseSimulatedEvent(0, USERNAME, gateway_online=False)
+            )
+            event = await next_event()
+            while not isinstance(event, GatewayOnlineChanged):
+                event = await next_event()
+            assert event.site_id == p.site.id
+            assert not event.online
+        finally:
+            await events.aclose()
+            await p.async_logout()
+            await t.close()
+        assert p._typed_event_hub.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_events_sent_unlocked():
+    """Test zone and gateway events are sent after their locks are released."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD)
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        # subscribing starts the sync checks
+        subscription = p.subscribe()
+        try:
+            await p.async_login()
+            site = p.site
+            received: list[tuple[type, bool, bool]] = []
+
+            def sink(event) -> None:
+                received.append(
+                    (
+                        type(event),
+                        site._site_lock._is_owned(),
+                        site.gateway._attribute_lock._is_owned(),
+                    )
+                )
+
+            site.event_sink = sink
+            site.gateway.poll_interval = 0.1
+
+            async def wait_for_event(event_type: type) -> None:
+                async with asyncio.timeout(10):
+                    while event_type not in {seen for seen, _, _ in received}:
+                        await asyncio.sleep(0.05)
+
+            simulator.apply_event(PulseSimulatedEvent(0, USERNAME, 10, "Open"))
+            await wait_for_event(ZoneStateChanged)
+            simulator.apply_event(
+                PulseSimulatedEvent(0, USERNAME, gateway_online=False)
+            )
+            await wait_for_event(GatewayOnlineChanged)
+            subscription.close()
+            assert not any(
+                site_locked or gw_locked for _, site_locked, gw_locked in received
+            )
+        finally:
+            await p.async_logout()
+            await t.close()
@@ -0,0 +1,150 @@
+"""Test process-wide login admission."""
+
+import asyncio
+from itertools import pairwise
+from threading import Thread
+
+import pytest
+
+from pyadtpulse.pulse_metrics import (
+    METRIC_LOGINS_ACTIVE,
+    METRIC_LOGIN_QUEUE_DEPTH,
+    METRIC_LOGIN_ADMISSION_WAIT,
+    PulseMetrics,
+)
+from pyadtpulse.pulse_simulator import PulseSimulator, PulseSimulatorTransport
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_login_admission import (
+    LOGIN_PRIORITY_ARMED,
+    LOGIN_PRIORITY_LOGIN,
+    LOGIN_PRIORITY_RELOGIN,
+    PulseLoginAdmission,
+    get_login_admission,
+)
+
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+@pytest.mark.asyncio
+async def test_login_admission_limit():
+    """Test logins beyond the limit wait, and are admitted by priority."""
+    with pytest.raises(ValueError):
+        PulseLoginAdmission(0)
+    with pytest.raises(ValueError):
+        PulseLoginAdmission(relogin_spread=1.5)
+    admission = PulseLoginAdmission(2)
+    metrics = PulseMetrics()
+    removed = PulseMetrics()
+    admission.add_metrics(metrics)
+    admission.add_metrics(removed)
+    admission.remove_metrics(removed)
+    assert await admission.acquire() == 0.0
+    assert await admission.acquire() == 0.0
+    assert admission.active == 2
+    order: list[int] = []
+
+    async def login(priority: int) -> None:
+        async with admission.admit(priority):
+            order.append(priority)
+
+    tasks = [
+        asyncio.create_task(login(priority))
+        for priority in (
+            LOGIN_PRIORITY_RELOGIN,
+            LOGIN_PRIORITY_LOGIN,
+            LOGIN_PRIORITY_ARMED,
+        )
+    ]
+    await asyncio.sleep(0.01)
+    assert admission.queue_depth == 3
+    assert metrics.get_gauge(METRIC_LOGIN_QUEUE_DEPTH) == 3
+    assert metrics.get_gauge(METRIC_LOGINS_ACTIVE) == 2
+    assert removed.get_gauge(METRIC_LOGIN_QUEUE_DEPTH) == 0
+    admission.release()
+    admission.release()
+    await asyncio.gather(*tasks)
+    assert order == [LOGIN_PRIORITY_ARMED, LOGIN_PRIORITY_LOGIN, LOGIN_PRIORITY_RELOGIN]
+    assert admission.active == 0
+    assert admission.queue_depth == 0
+    assert metrics.get_gauge(METRIC_LOGIN_QUEUE_DEPTH) == 0
+    assert metrics.get_gauge(METRIC_LOGINS_ACTIVE) == 0
+
+
+@pytest.mark.asyncio
+async def test_login_admission_cancel():
+    """Test a cancelled waiter gives up its place in the queue."""
+    admission = PulseLoginAdmission(1)
+    await admission.acquire()
+    cancelled = asyncio.create_task(admission.acquire(LOGIN_PRIORITY_ARMED))
+    waiting = asyncio.create_task(admission.acquire())
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert admission.queue_depth == 1
+    admission.release()
+    assert await asyncio.wait_for(waiting, 1) >= 0.0
+    assert admission.active == 1
+    admission.max_concurrent = 2
+    assert await admission.acquire() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_login_admission_threads():
+    """Test logins on other threads' event loops share the limit."""
+    admission = PulseLoginAdmission(1)
+    await admission.acquire()
+    waited: list[float] = []
+
+    def other_loop() -> None:
+        waited.append(asyncio.run(admission.acquire()))
+        admission.release()
+
+    thread = Thread(target=other_loop)
+    thread.start()
+    await asyncio.sleep(0.1)
+    assert admission.queue_depth == 1
+    admission.release()
+    await asyncio.to_thread(thread.join)
+    assert waited[0] >= 0.05
+    assert admission.active == 0
+
+
+def test_relogin_delay():
+    """Test relogin delays are spread evenly over the last part of the interval."""
+    admission = PulseLoginAdmission(relogin_spread=0.5)
+    delays = sorted(admission.relogin_delay(1000) for _ in range(100))
+    assert all(500 <= delay <= 1000 for delay in delays)
+    gaps = [later - earlier for earlier, later in pairwise(delays)]
+    # evenly spread, no clumps or holes
+    assert max(gaps) < 3 * 500 / 100
+
+
+@pytest.mark.asyncio
+async def test_login_admission_metrics():
+    """Test logins wait for admission and report it in metrics."""
+    username = "admission@example.com"
+    async with PulseSimulator() as simulator:
+        simulator.add_account(username, PASSWORD)
+        transport = PulseSimulatorTransport(simulator.base_url)
+        pulse = PyADTPulseAsync(username, PASSWORD, FINGERPRINT, transport=transport)
+        assert pulse.login_admission is get_login_admission()
+        admission = PulseLoginAdmission(1)
+        pulse.login_admission = admission
+        try:
+            await admission.acquire()
+            login = asyncio.create_task(pulse.async_login())
+            await asyncio.sleep(0.1)
+            assert pulse.metrics.get_gauge(METRIC_LOGIN_QUEUE_DEPTH) == 1
+            assert pulse.metrics.get_gauge(METRIC_LOGINS_ACTIVE) == 1
+            assert not pulse.is_connected
+            admission.release()
+            await login
+            assert pulse.is_connected
+            waited = pulse.metrics.get_histogram(METRIC_LOGIN_ADMISSION_WAIT)
+            assert waited is not None and waited.sum >= 0.05
+            assert pulse.metrics.get_gauge(METRIC_LOGIN_QUEUE_DEPTH) == 0
+            await pulse.async_logout()
+        finally:
+            await transport.close()
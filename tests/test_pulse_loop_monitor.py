@@ -0,0 +1,58 @@
+"""Test Pulse event loop lag monitor."""
+
+import time
+import asyncio
+
+import pytest
+
+from pyadtpulse.pulse_metrics import METRIC_LOOP_LAG, METRIC_LOOP_STALLS
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_loop_monitor import PulseLoopMonitor
+
+
+def blocking_parse() -> None:
+    """Block the event loop, as a slow parse would."""
+    time.sleep(0.5)
+
+
+@pytest.mark.asyncio
+async def test_loop_stall():
+    """Test measuring lag and flagging the function stalling the loop."""
+    monitor = PulseLoopMonitor(interval=0.05, stall_threshold=0.1)
+    monitor.start()
+    with pytest.raises(RuntimeError):
+        monitor.start()
+    await asyncio.sleep(0.2)
+    assert monitor.running
+    assert not monitor.stalls
+    blocking_parse()
+    await asyncio.sleep(0.2)
+    monitor.stop()
+    assert not monitor.running
+    stalls = monitor.stalls
+    assert len(stalls) == 1
+    assert stalls[0].culprit == "test_pulse_loop_monitor.py:blocking_parse"
+    assert "blocking_parse" in stalls[0].stack
+    assert 0.1 <= stalls[0].duration < 0.5
+    metrics = monitor.metrics
+    assert metrics.get_counter(METRIC_LOOP_STALLS, {"culprit": stalls[0].culprit})
+    histogram = metrics.get_histogram(METRIC_LOOP_LAG)
+    assert histogram.count > 3
+    assert histogram.max >= 0.4
+    assert monitor.lag_percentile(50) < 0.1
+    with pytest.raises(ValueError):
+        PulseLoopMonitor(interval=0)
+
+
+@pytest.mark.asyncio
+async def test_pulse_loop_monitor():
+    """Test the monitor reporting through the Pulse metrics."""
+    p = PyADTPulseAsync("testuser@example.com", "testpassword", "testfingerprint")
+    assert p.loop_monitor is None
+    monitor = p.start_loop_monitor(interval=0.05)
+    assert p.start_loop_monitor() is monitor
+    await asyncio.sleep(0.2)
+    assert p.metrics.get_histogram(METRIC_LOOP_LAG).count > 0
+    p.stop_loop_monitor()
+    assert p.loop_monitor is None
+    assert not monitor.running
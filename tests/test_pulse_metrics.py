@@ -0,0 +1,139 @@
+"""Test Pulse metrics."""
+
+import pytest
+from aioresponses import aioresponses
+
+from pyadtpulse.const import ADT_ORB_URI, ADT_DEVICE_URI, ADT_SYNC_CHECK_URI
+from pyadtpulse.exceptions import PulseServerConnectionError
+from pyadtpulse.pulse_metrics import (
+    METRIC_ERRORS,
+    METRIC_REQUESTS,
+    METRIC_RESPONSES,
+    METRIC_PARSE_TIME,
+    METRIC_RECEIVED_BYTES,
+    METRIC_REQUEST_LATENCY,
+    METRIC_TIME_TO_FIRST_BYTE,
+    PulseMetrics,
+    PulseHistogram,
+    get_endpoint_name,
+)
+from pyadtpulse.pulse_query_manager import PulseQueryManager
+from pyadtpulse.pulse_connection_status import PulseConnectionStatus
+from pyadtpulse.pulse_connection_properties import PulseConnectionProperties
+
+
+def test_endpoint_names():
+    """Test mapping of URIs to endpoint names."""
+    assert get_endpoint_name(ADT_ORB_URI) == "orb"
+    assert get_endpoint_name(ADT_SYNC_CHECK_URI) == "sync_check"
+    assert get_endpoint_name(ADT_DEVICE_URI) == "device"
+    assert get_endpoint_name("/some/other.jsp") == "other"
+
+
+def test_histogram():
+    """Test histogram observations and percentiles."""
+    h = PulseHistogram((0.1, 0.5, 1.0))
+    assert h.percentile(99) == 0.0
+    for value in (0.05, 0.05, 0.2, 0.7, 3.0):
+        h.observe(value)
+    assert h.count == 5
+    assert h.sum == pytest.approx(4.0)
+    assert h.max == 3.0
+    assert h.cumulative_counts() == [2, 3, 4, 5]
+    assert h.percentile(40) == 0.1
+    assert h.percentile(60) == 0.5
+    # overflow bucket returns the largest observation
+    assert h.percentile(100) == 3.0
+    with pytest.raises(ValueError):
+        h.percentile(101)
+    with pytest.raises(ValueError):
+        PulseHistogram((1.0, 0.5))
+    other = PulseHistogram((0.1, 0.5, 1.0))
+    other.observe(0.3)
+    h.merge(other)
+    assert h.count == 6
+    with pytest.raises(ValueError):
+        h.merge(PulseHistogram((0.1,)))
+
+
+def test_metrics_registry():
+    """Test counters, gauges, histograms and merging."""
+    m = PulseMetrics()
+    m.increment("requests_total", {"endpoint": "orb"})
+    m.increment("requests_total", {"endpoint": "orb"}, 2)
+    m.set_gauge("queue_depth", 4)
+    m.observe("latency_seconds", 0.2, {"endpoint": "orb"})
+    with m.timer("latency_seconds", {"endpoint": "orb"}):
+        pass
+    assert m.get_counter("requests_total", {"endpoint": "orb"}) == 3
+    assert m.get_counter("requests_total", {"endpoint": "device"}) == 0
+    assert m.get_gauge("queue_depth") == 4
+    assert m.get_gauge("missing") is None
+    h = m.get_histogram("latency_seconds", {"endpoint": "orb"})
+    assert h is not None and h.count == 2
+    snapshot = m.snapshot()
+    assert snapshot["counters"]["requests_total"][(("endpoint", "orb"),)] == 3
+    assert (
+        snapshot["histograms"]["latency_seconds"][(("endpoint", "orb"),)]["count"] == 2
+    )
+
+    other = PulseMetrics()
+    other.increment("requests_total", {"endpoint": "orb"})
+    other.observe("latency_seconds", 0.3, {"endpoint": "orb"})
+    m.merge(other)
+    assert m.get_counter("requests_total", {"endpoint": "orb"}) == 4
+    h = m.get_histogram("latency_seconds", {"endpoint": "orb"})
+    assert h is not None and h.count == 3
+    m.reset()
+    assert m.snapshot() == {"counters": {}, "gauges": {}, "histograms": {}}
+
+
+def test_prometheus_format():
+    """Test Prometheus text exposition."""
+    m = PulseMetrics()
+    assert m.to_prometheus() == ""
+    m.increment("requests_total", {"endpoint": "orb", "method": "GET"})
+    m.set_gauge("timeout_seconds", 1.5, {"endpoint": "orb"})
+    m.observe("latency_seconds", 0.2, {"endpoint": "orb"})
+    text = m.to_prometheus()
+    assert "# TYPE pyadtpulse_requests_total counter" in text
+    assert 'pyadtpulse_requests_total{endpoint="orb",method="GET"} 1' in text
+    assert 'pyadtpulse_timeout_seconds{endpoint="orb"} 1.5' in text
+    assert "# TYPE pyadtpulse_latency_seconds histogram" in text
+    assert 'pyadtpulse_latency_seconds_bucket{endpoint="orb",le="0.1"} 0' in text
+    assert 'pyadtpulse_latency_seconds_bucket{endpoint="orb",le="0.25"} 1' in text
+    assert 'pyadtpulse_latency_seconds_bucket{endpoint="orb",le="+Inf"} 1' in text
+    assert 'pyadtpulse_latency_seconds_count{endpoint="orb"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_query_metrics(
+    mocked_server_responses: aioresponses,
+    get_mocked_connection_properties: PulseConnectionProperties,
+    read_file,
+):
+    """Test that queries record metrics."""
+    s = PulseConnectionStatus()
+    cp = get_mocked_connection_properties
+    p = PulseQueryManager(s, cp)
+    orb = read_file("orb.html")
+    mocked_server_responses.get(cp.make_url(ADT_ORB_URI), status=200, body=orb)
+    s.authenticated_flag.set()
+    tree = await p.query_orb(10, "orb failed")
+    assert tree is not None
+    labels = {"endpoint": "orb"}
+    m = p.metrics
+    assert m.get_counter(METRIC_REQUESTS, {"endpoint": "orb", "method": "GET"}) == 1
+    assert m.get_counter(METRIC_RESPONSES, {"endpoint": "orb", "status": "200"}) == 1
+    assert m.get_counter(METRIC_RECEIVED_BYTES, labels) == len(orb.encode())
+    for name in (METRIC_REQUEST_LATENCY, METRIC_TIME_TO_FIRST_BYTE, METRIC_PARSE_TIME):
+        h = m.get_histogram(name, labels)
+        assert h is not None and h.count == 1, name
+    mocked_server_responses.get(cp.make_url(ADT_ORB_URI), status=404)
+    with pytest.raises(PulseServerConnectionError):
+        await p.async_query(ADT_ORB_URI)
+    assert m.get_counter(METRIC_RESPONSES, {"endpoint": "orb", "status": "404"}) == 1
+    assert m.get_counter(METRIC_ERRORS, {"endpoint": "orb", "error": "timeout"}) == 0
+    assert 'pyadtpulse_responses_total{endpoint="orb",status="404"} 1' in (
+        m.to_prometheus()
+    )
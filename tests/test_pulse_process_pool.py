@@ -0,0 +1,103 @@
+"""Test running accounts in worker processes with PulseProcessPool."""
+
+import asyncio
+from functools import partial
+from collections import Counter
+
+import pytest
+
+from pyadtpulse.const import ADT_LOGIN_URI
+from pyadtpulse.exceptions import PulseAuthenticationError
+from pyadtpulse.pulse_events import ZoneStateChanged
+from pyadtpulse.pulse_metrics import METRIC_REQUESTS, get_endpoint_name
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pulse_process_pool import PulseHashRing, PulseProcessPool
+
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+USERNAMES = [f"user{i}@example.com" for i in range(6)]
+
+
+def test_hash_ring():
+    """Test keys are spread over nodes and only a removed node's keys move."""
+    with pytest.raises(ValueError):
+        PulseHashRing(0)
+    ring = PulseHashRing()
+    with pytest.raises(LookupError):
+        ring.get("key")
+    for node in range(4):
+        ring.add(node)
+    assert ring.nodes == {0, 1, 2, 3}
+    keys = [f"key{i}" for i in range(4000)]
+    before = {key: ring.get(key) for key in keys}
+    counts = Counter(before.values())
+    assert all(600 < count < 1400 for count in counts.values())
+    ring.remove(2)
+    after = {key: ring.get(key) for key in keys}
+    assert all(after[key] == before[key] for key in keys if before[key] != 2)
+    assert 2 not in after.values()
+    ring.add(4)
+    added = {key: ring.get(key) for key in keys}
+    assert all(added[key] in (after[key], 4) for key in keys)
+
+
+@pytest.mark.asyncio
+async def test_process_pool():
+    """Test accounts run in workers and move when a worker dies."""
+    with pytest.raises(ValueError):
+        PulseProcessPool(worker_count=0)
+    async with PulseSimulator() as simulator:
+        for username in USERNAMES:
+            simulator.add_account(username, PASSWORD)
+        async with PulseProcessPool(
+            worker_count=2,
+            login_interval=0.01,
+            transport_factory=partial(PulseSimulatorTransport, simulator.base_url),
+            metrics_interval=0.2,
+        ) as pool:
+            events = pool.events()
+            for username in [*USERNAMES, "bad@example.com"]:
+                pool.add_account(username, PASSWORD, FINGERPRINT)
+            with pytest.raises(ValueError):
+                pool.add_account(USERNAMES[0], PASSWORD, FINGERPRINT)
+            assert len(pool.workers) == 2
+            failed = await asyncio.wait_for(pool.wait_for_logins(), 60)
+            assert list(failed) == ["bad@example.com"]
+            assert isinstance(failed["bad@example.com"], PulseAuthenticationError)
+            await pool.remove_account("bad@example.com")
+            assert len(pool) == len(USERNAMES)
+            owners = {username: pool.get_worker(username) for username in USERNAMES}
+            assert set(owners.values()) == {0, 1}
+
+            simulator.apply_event(PulseSimulatedEvent(0, USERNAMES[3], 10, "Open"))
+            site_id = simulator.get_account(USERNAMES[3]).site_id
+            event = await asyncio.wait_for(anext(events), 30)
+            while not isinstance(event, ZoneStateChanged):
+                event = await asyncio.wait_for(anext(events), 30)
+            assert (event.site_id, event.zone_id) == (site_id, 10)
+
+            await asyncio.sleep(0.5)
+            logins = {"endpoint": get_endpoint_name(ADT_LOGIN_URI), "method": "POST"}
+            assert pool.metrics.get_counter(METRIC_REQUESTS, logins) >= len(USERNAMES)
+
+            # a dead worker's accounts move to the other one
+            pool._workers[0].process.kill()
+            while 0 in pool.workers:
+                await asyncio.sleep(0.1)
+            failed = await asyncio.wait_for(pool.wait_for_logins(), 60)
+            assert not failed
+            assert all(pool.get_worker(username) == 1 for username in USERNAMES)
+
+            # a new worker takes back a share
+            assert pool.add_worker() == 2
+            failed = await asyncio.wait_for(pool.wait_for_logins(), 60)
+            assert not failed
+            assert {pool.get_worker(username) for username in USERNAMES} == {1, 2}
+            await events.aclose()
+        assert pool.workers == []
+        with pytest.raises(RuntimeError):
+            pool.add_account("late@example.com", PASSWORD, FINGERPRINT)
@@ -0,0 +1,100 @@
+"""Test Pulse request rate limiting."""
+
+import asyncio
+from time import time
+
+import pytest
+
+from pyadtpulse.const import DEFAULT_API_HOST
+from pyadtpulse.exceptions import PulseServiceTemporarilyUnavailableError
+from pyadtpulse.pulse_metrics import METRIC_RATE_LIMIT_WAIT
+from pyadtpulse.pulse_simulator import PulseSimulator, PulseSimulatorTransport
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_rate_limiter import (
+    MIN_RATE_FACTOR,
+    ENDPOINT_CLASS_ORB,
+    ENDPOINT_CLASS_DEVICE,
+    PulseRateLimiter,
+)
+
+HOST = "https://portal.example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_buckets():
+    """Test each host and endpoint class has its own bucket."""
+    with pytest.raises(ValueError):
+        PulseRateLimiter({"bogus": (1.0, 1.0)})
+    with pytest.raises(ValueError):
+        PulseRateLimiter({ENDPOINT_CLASS_ORB: (0.0, 1.0)})
+    limiter = PulseRateLimiter({ENDPOINT_CLASS_ORB: (10.0, 2.0)})
+    assert limiter.get_endpoint_class("gateway") == ENDPOINT_CLASS_DEVICE
+    assert await limiter.acquire(HOST, "orb") == 0
+    assert await limiter.acquire(HOST, "orb") == 0
+    # burst used up, the next two requests are spaced at the rate
+    waits = await asyncio.gather(
+        limiter.acquire(HOST, "orb"), limiter.acquire(HOST, "orb")
+    )
+    assert waits[0] == pytest.approx(0.1, abs=0.02)
+    assert waits[1] == pytest.approx(0.2, abs=0.02)
+    assert await limiter.acquire(HOST, "sync_check") == 0
+    assert await limiter.acquire(DEFAULT_API_HOST, "orb") == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_penalize():
+    """Test a 429/503 lowers rates and blocks the host until Retry-After."""
+    limiter = PulseRateLimiter({ENDPOINT_CLASS_ORB: (10.0, 1.0)}, 0.2)
+    await limiter.acquire(HOST, "orb")
+    limiter.penalize(HOST)
+    assert limiter.rate_factor(HOST) == 0.5
+    assert await limiter.acquire(HOST, "orb") == pytest.approx(0.2, abs=0.03)
+    for _ in range(10):
+        limiter.penalize(HOST)
+    assert limiter.rate_factor(HOST) == MIN_RATE_FACTOR
+    assert limiter.rate_factor(DEFAULT_API_HOST) == 1.0
+    limiter.penalize(DEFAULT_API_HOST, time() + 0.2)
+    assert await limiter.acquire(DEFAULT_API_HOST, "login") == pytest.approx(
+        0.2, abs=0.03
+    )
+    await asyncio.sleep(0.2)
+    assert limiter.rate_factor(HOST) == 2 * MIN_RATE_FACTOR
+
+
+@pytest.mark.asyncio
+async def test_shared_rate_limiter():
+    """Test a 429 seen by one account holds back another's requests."""
+    usernames = ["a@example.com", "b@example.com"]
+    limiter = PulseRateLimiter()
+    async with PulseSimulator() as simulator:
+        transports = []
+        pulses = []
+        for username in usernames:
+            simulator.add_account(username, PASSWORD)
+            transports.append(PulseSimulatorTransport(simulator.base_url))
+            pulses.append(
+                PyADTPulseAsync(
+                    username, PASSWORD, FINGERPRINT, transport=transports[-1]
+                )
+            )
+            pulses[-1].rate_limiter = limiter
+        assert pulses[0].rate_limiter is limiter
+        try:
+            simulator.set_unavailable(1)
+            with pytest.raises(PulseServiceTemporarilyUnavailableError):
+                await pulses[0].async_login()
+            assert limiter.rate_factor(DEFAULT_API_HOST) == 0.5
+            # the other account waits out Retry-After before its first request
+            simulator.set_unavailable(0)
+            await pulses[1].async_login()
+            assert pulses[1].is_connected
+            waited = pulses[1].metrics.get_histogram(
+                METRIC_RATE_LIMIT_WAIT, {"endpoint": "version"}
+            )
+            assert waited is not None and waited.count == 1
+            await pulses[1].async_logout()
+        finally:
+            for transport in transports:
+                await transport.close()
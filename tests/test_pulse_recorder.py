@@ -0,0 +1,111 @@
+"""Test Pulse session recorder and player."""
+
+import time
+from itertools import pairwise
+
+import pytest
+
+from tests.conftest import test_file_dir
+from pyadtpulse.const import (
+    ADT_ORB_URI,
+    ADT_LOGIN_URI,
+    ADT_LOGOUT_URI,
+    ADT_SUMMARY_URI,
+    ADT_SYNC_CHECK_URI,
+)
+from pyadtpulse.pulse_replay import PulseReplayTransport
+from pyadtpulse.pulse_recorder import (
+    REDACTED,
+    PulsePlayer,
+    PulseRecorder,
+    PulseRecordedExchange,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+@pytest.mark.asyncio
+async def test_record_session(tmp_path):
+    """Test recording a login and logout."""
+    path = tmp_path / "session.jsonl"
+    recorder = PulseRecorder(path, flush_threshold=5)
+    t = PulseReplayTransport.from_directory(test_file_dir)
+    p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+    p.recorder = recorder
+    await p.async_login()
+    await p.async_logout()
+    p.recorder = None
+    recorder.close()
+    assert p.recorder is None
+    text = path.read_text()
+    for secret in (USERNAME, PASSWORD, FINGERPRINT):
+        assert secret not in text
+    exchanges = PulseRecorder.load(path)
+    assert len(exchanges) == recorder.record_count == t.requests_total
+    assert exchanges[0].uri == "/"
+    assert exchanges[0].redirect_uri == ADT_LOGIN_URI
+    login = exchanges[1]
+    assert (login.method, login.uri) == ("POST", ADT_LOGIN_URI)
+    assert login.params is not None
+    assert login.params["passwordForm"] == REDACTED
+    assert login.redirect_uri == ADT_SUMMARY_URI
+    assert login.status == 200
+    assert exchanges[-1].uri == ADT_LOGOUT_URI
+    for a, b in pairwise(exchanges):
+        assert a.time <= b.time
+    with pytest.raises(ValueError):
+        PulseRecorder(path, flush_threshold=0)
+
+
+def test_exchange_dict():
+    """Test converting exchanges to and from dictionaries."""
+    exchange = PulseRecordedExchange(1.23456, "GET", ADT_ORB_URI, status=200)
+    value = exchange.to_dict()
+    assert value == {
+        "time": 1.235,
+        "method": "GET",
+        "uri": ADT_ORB_URI,
+        "status": 200,
+        "latency": 0.0,
+    }
+    assert PulseRecordedExchange.from_dict(value).uri == ADT_ORB_URI
+
+
+@pytest.mark.asyncio
+async def test_play_session(tmp_path, read_file):
+    """Test playing back a recorded session with an update."""
+    path = tmp_path / "session.jsonl"
+    recorder = PulseRecorder(path)
+    t = PulseReplayTransport.from_directory(test_file_dir)
+    p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+    p.recorder = recorder
+    await p.async_login()
+    await p.async_logout()
+    recorder.close()
+    exchanges = PulseRecorder.load(path)
+    logout = exchanges.pop()
+    now = time.time()
+    for body in ("1-0-0", "234532-456432-0"):
+        exchanges.append(
+            PulseRecordedExchange(
+                now, "GET", ADT_SYNC_CHECK_URI, {"ts": "1"}, 200, body, latency=0.5
+            )
+        )
+    exchanges.append(
+        PulseRecordedExchange(now, "GET", ADT_ORB_URI, None, 200, read_file("orb.html"))
+    )
+    exchanges.append(logout)
+
+    player = PulsePlayer(exchanges, speed=100.0)
+    p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=player.transport)
+    result = await player.play(p, timeout=30.0)
+    assert result.updates >= 1
+    assert result.errors == 0
+    assert player.transport.pending == 0
+    assert player.transport.request_count("GET", ADT_SYNC_CHECK_URI) >= 2
+    assert result.requests == player.transport.requests_total
+    with pytest.raises(ValueError):
+        PulsePlayer(exchanges, speed=0)
@@ -0,0 +1,127 @@
+"""Test Pulse replay transport."""
+
+import pytest
+from aiohttp import ClientConnectionError, ServerDisconnectedError
+
+from tests.conftest import MOCKED_API_VERSION, test_file_dir
+from pyadtpulse.const import (
+    ADT_ORB_URI,
+    ADT_LOGIN_URI,
+    ADT_DEVICE_URI,
+    ADT_SUMMARY_URI,
+    DEFAULT_API_HOST,
+    ADT_SYNC_CHECK_URI,
+)
+from pyadtpulse.exceptions import (
+    PulseClientConnectionError,
+    PulseServerConnectionError,
+)
+from pyadtpulse.pulse_replay import PulseReplayEntry, PulseReplayTransport
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_query_manager import PulseQueryManager
+from pyadtpulse.pulse_connection_status import PulseConnectionStatus
+from pyadtpulse.pulse_connection_properties import PulseConnectionProperties
+
+
+@pytest.mark.asyncio
+async def test_replay_entries(read_file):
+    """Test scripted and repeated entries."""
+    t = PulseReplayTransport()
+    url = f"{DEFAULT_API_HOST}/myhome/{MOCKED_API_VERSION}{ADT_SYNC_CHECK_URI}"
+    t.add("GET", ADT_SYNC_CHECK_URI, PulseReplayEntry(body="1-0-0"))
+    t.add("GET", ADT_SYNC_CHECK_URI, PulseReplayEntry(body="2-0-0"), repeat=True)
+    assert (await t.request("GET", url, timeout=1.0)).text == "1-0-0"
+    for _ in range(2):
+        response = await t.request("GET", url, params={"ts": "1"}, timeout=1.0)
+        assert response.text == "2-0-0"
+    assert str(response.url).endswith("?ts=1")
+    assert response.size == 5
+    assert t.request_count("GET", ADT_SYNC_CHECK_URI) == 3
+    response = await t.request("GET", f"{DEFAULT_API_HOST}/missing", timeout=1.0)
+    assert response.status == 404
+    assert t.requests_total == 4
+
+    # parameter matching
+    t.add("GET", ADT_DEVICE_URI, PulseReplayEntry(body="device 1"), {"id": "1"}, True)
+    t.add("GET", ADT_DEVICE_URI, PulseReplayEntry(body="device 2"), {"id": "2"}, True)
+    device_url = f"{DEFAULT_API_HOST}/myhome/{MOCKED_API_VERSION}{ADT_DEVICE_URI}"
+    response = await t.request("GET", device_url, params={"id": "2"}, timeout=1.0)
+    assert response.text == "device 2"
+    response = await t.request("GET", device_url, params={"id": "3"}, timeout=1.0)
+    assert response.status == 404
+
+
+@pytest.mark.asyncio
+async def test_replay_latency_and_errors(mock_sleep):
+    """Test scripted latency, timeouts and error injection."""
+    t = PulseReplayTransport(error_rate=0.5, seed=1)
+    url = f"{DEFAULT_API_HOST}/myhome/{MOCKED_API_VERSION}{ADT_ORB_URI}"
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(latency=0.2), repeat=True)
+    errors = 0
+    for _ in range(100):
+        try:
+            await t.request("GET", url, timeout=1.0)
+        except ServerDisconnectedError:
+            errors += 1
+    assert errors == t.injected_errors
+    assert 25 < errors < 75
+    mock_sleep.assert_called_with(0.2)
+
+    t = PulseReplayTransport()
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(latency=5.0))
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(exception=ServerDisconnectedError()))
+    with pytest.raises(TimeoutError):
+        await t.request("GET", url, timeout=1.0)
+    mock_sleep.assert_called_with(1.0)
+    with pytest.raises(ServerDisconnectedError):
+        await t.request("GET", url, timeout=1.0)
+    with pytest.raises(ValueError):
+        PulseReplayTransport(error_rate=2.0)
+
+
+@pytest.mark.asyncio
+async def test_query_manager_replay(
+    get_mocked_connection_properties: PulseConnectionProperties, mock_sleep
+):
+    """Test the query manager error handling with the replay transport."""
+    s = PulseConnectionStatus()
+    cp = get_mocked_connection_properties
+    t = PulseReplayTransport()
+    cp.transport = t
+    p = PulseQueryManager(s, cp)
+    s.authenticated_flag.set()
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(exception=ServerDisconnectedError()))
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(body="orb"))
+    code, text, _ = await p.async_query(ADT_ORB_URI)
+    assert (code, text) == (200, "orb")
+    assert t.request_count("GET", ADT_ORB_URI) == 2
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(status=404))
+    with pytest.raises(PulseServerConnectionError):
+        await p.async_query(ADT_ORB_URI)
+    for _ in range(3):
+        t.add("GET", ADT_ORB_URI, PulseReplayEntry(latency=5.0))
+    with pytest.raises(PulseServerConnectionError):
+        await p.async_query(ADT_ORB_URI)
+    s.get_backoff().reset_backoff()
+    for _ in range(3):
+        entry = PulseReplayEntry(exception=ClientConnectionError("reset"))
+        t.add("GET", ADT_ORB_URI, entry)
+    with pytest.raises(PulseClientConnectionError):
+        await p.async_query(ADT_ORB_URI)
+
+
+@pytest.mark.asyncio
+async def test_login_replay(extract_ids_from_data_directory: list[str]):
+    """Test logging in and out against the test data files."""
+    t = PulseReplayTransport.from_directory(test_file_dir)
+    p = PyADTPulseAsync(
+        "testuser@example.com", "testpassword", "testfingerprint", transport=t
+    )
+    await p.async_login()
+    assert p._pulse_connection_properties.api_version == MOCKED_API_VERSION
+    assert p.site.name == "Robert Lippmann"
+    assert len(p.site.zones_as_dict) == len(extract_ids_from_data_directory) - 3
+    assert t.request_count("POST", ADT_LOGIN_URI) == 1
+    assert t.request_count("GET", ADT_SUMMARY_URI) == 0
+    await p.async_logout()
+    assert not p._pulse_connection_status.authenticated_flag.is_set()
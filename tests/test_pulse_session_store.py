@@ -0,0 +1,203 @@
+"""Test saving Pulse sessions and resuming them after a restart."""
+
+import os
+import sys
+import json
+import stat
+import logging
+from time import time
+
+import pytest
+
+from pyadtpulse.const import ADT_LOGIN_URI, DEFAULT_API_HOST
+from pyadtpulse.pulse_metrics import (
+    METRIC_REQUESTS,
+    METRIC_SESSION_RESTORES,
+    get_endpoint_name,
+)
+from pyadtpulse.pulse_simulator import (
+    SESSION_COOKIE,
+    PulseSimulator,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pulse_transport import PulseCookie
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_session_store import PulseSavedSession, PulseSessionStore
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+LOGINS = {"endpoint": get_endpoint_name(ADT_LOGIN_URI), "method": "POST"}
+
+
+def make_session(last_login_time: float | None = None) -> PulseSavedSession:
+    """Return a saved session for USERNAME."""
+    return PulseSavedSession(
+        USERNAME,
+        DEFAULT_API_HOST,
+        "27.0.0-140",
+        int(time() if last_login_time is None else last_login_time),
+        (
+            PulseCookie(
+                "JSESSIONID",
+                "secretsessionid",
+                "portal.adtpulse.com",
+                "/myhome",
+                time() + 3600,
+                secure=True,
+                http_only=True,
+            ),
+        ),
+    )
+
+
+def test_session_store(tmp_path):
+    """Test sessions are encrypted, checked and expired."""
+    with pytest.raises(ValueError):
+        PulseSessionStore(tmp_path, b"short")
+    with pytest.raises(ValueError):
+        PulseSessionStore(tmp_path, os.urandom(32))
+    key = PulseSessionStore.generate_key()
+    with pytest.raises(ValueError):
+        PulseSessionStore(tmp_path, key, max_age=0)
+    store = PulseSessionStore(tmp_path / "sessions", key)
+    assert store.encrypted
+    assert store.load(USERNAME, DEFAULT_API_HOST) is None
+    session = make_session()
+    store.save(session)
+    assert store.load(USERNAME, DEFAULT_API_HOST) == session
+    assert store.load("other@example.com", DEFAULT_API_HOST) is None
+    (path,) = (tmp_path / "sessions").iterdir()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    data = path.read_bytes()
+    assert b"secretsessionid" not in data
+    assert USERNAME.encode() not in data
+
+    # another key, no key or an altered file can't read it
+    other_key = PulseSessionStore(tmp_path / "sessions", store.generate_key())
+    assert other_key.load(USERNAME, DEFAULT_API_HOST) is None
+    no_key = PulseSessionStore(tmp_path / "sessions", unencrypted=True)
+    assert no_key.load(USERNAME, DEFAULT_API_HOST) is None
+    path.write_bytes(data[:-40] + bytes([data[-40] ^ 1]) + data[-39:])
+    assert store.load(USERNAME, DEFAULT_API_HOST) is None
+
+    store.save(make_session(time() - store.max_age - 1))
+    assert store.load(USERNAME, DEFAULT_API_HOST) is None
+    store.delete(USERNAME, DEFAULT_API_HOST)
+    store.delete(USERNAME, DEFAULT_API_HOST)
+    assert not list((tmp_path / "sessions").iterdir())
+
+    plain = PulseSessionStore(tmp_path / "plain", unencrypted=True)
+    plain.save(session)
+    (path,) = (tmp_path / "plain").iterdir()
+    (cookie,) = json.loads(path.read_text())["cookies"]
+    assert cookie["path"] == "/myhome" and cookie["secure"]
+    assert plain.load(USERNAME, DEFAULT_API_HOST) == session
+    # plain and encrypted stores can't read each other's sessions
+    assert store.load(USERNAME, DEFAULT_API_HOST) is None
+    store.save(session)
+    (encrypted_path,) = (tmp_path / "sessions").iterdir()
+    os.replace(encrypted_path, path)
+    assert plain.load(USERNAME, DEFAULT_API_HOST) is None
+
+
+def test_session_store_without_cryptography(tmp_path, monkeypatch):
+    """Test sessions aren't saved unencrypted when a key can't be used."""
+    key = PulseSessionStore.generate_key()
+    monkeypatch.setitem(sys.modules, "cryptography", None)
+    with pytest.raises(ImportError):
+        PulseSessionStore(tmp_path, key)
+    with pytest.raises(ImportError):
+        PulseSessionStore.generate_key()
+    assert not PulseSessionStore(tmp_path, unencrypted=True).encrypted
+
+
+def test_session_store_unencrypted(tmp_path, caplog):
+    """Test sessions are only saved unencrypted when asked to, with a warning."""
+    with pytest.raises(ValueError):
+        PulseSessionStore(tmp_path)
+    with pytest.raises(ValueError):
+        PulseSessionStore(tmp_path, PulseSessionStore.generate_key(), unencrypted=True)
+    assert not caplog.records
+    with caplog.at_level(logging.WARNING):
+        store = PulseSessionStore(tmp_path, unencrypted=True)
+    assert not store.encrypted
+    (record,) = caplog.records
+    assert record.levelno == logging.WARNING
+    assert "unencrypted" in record.getMessage()
+
+
+def test_cookie_attributes():
+    """Test cookies keep their scope, flags and expiry through a cookie jar."""
+    now = time()
+    cookie = PulseCookie("JSESSIONID", "id", "portal.adtpulse.com", "/myhome", now + 60)
+    assert not cookie.expired(now)
+    assert cookie.expired(now + 60)
+    (morsel,) = cookie.to_morsels(now).values()
+    assert morsel["max-age"] == "60"
+    assert PulseCookie.from_morsel(morsel, now) == cookie
+    morsel["max-age"] = ""
+    morsel["expires"] = "Thu, 01 Jan 2099 00:00:00 GMT"
+    assert PulseCookie.from_morsel(morsel, now).expires == 4070908800
+
+
+@pytest.mark.asyncio
+async def test_session_restore(tmp_path):
+    """Test a new object resumes a saved session without logging in."""
+    store = PulseSessionStore(tmp_path, PulseSessionStore.generate_key())
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD, zone_count=3)
+        transports = [PulseSimulatorTransport(simulator.base_url) for _ in range(4)]
+        pulses = [
+            PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=transport)
+            for transport in transports
+        ]
+        for pulse in pulses:
+            pulse.session_store = store
+        try:
+            await pulses[0].async_login()
+            saved = store.load(USERNAME, DEFAULT_API_HOST)
+            assert saved is not None
+            login_time = pulses[0]._authentication_properties.last_login_time
+            assert saved.last_login_time == login_time
+            session_cookie = next(c for c in saved.cookies if c.name == SESSION_COOKIE)
+            assert session_cookie.path == "/"
+            assert session_cookie.domain == transports[0].get_cookies()[0].domain
+
+            # expired cookies aren't restored
+            transports[3].set_cookies(
+                [
+                    PulseCookie("old", "value", session_cookie.domain, expires=1.0),
+                    session_cookie,
+                ]
+            )
+            assert [c.name for c in transports[3].get_cookies()] == [SESSION_COOKIE]
+
+            # a restarted process resumes the session
+            await pulses[1].async_login()
+            assert pulses[1].is_connected
+            assert len(pulses[1].site.zones_as_dict) == 3
+            metrics = pulses[1].metrics
+            assert metrics.get_counter(METRIC_REQUESTS, LOGINS) == 0
+            restored = {"result": "restored"}
+            assert metrics.get_counter(METRIC_SESSION_RESTORES, restored) == 1
+
+            # logging out ends the session and deletes it
+            await pulses[0].async_logout()
+            assert store.load(USERNAME, DEFAULT_API_HOST) is None
+            await pulses[1].async_logout()
+
+            # a session Pulse no longer accepts falls back to logging in
+            store.save(saved)
+            await pulses[2].async_login()
+            assert pulses[2].is_connected
+            metrics = pulses[2].metrics
+            rejected = {"result": "rejected"}
+            assert metrics.get_counter(METRIC_SESSION_RESTORES, rejected) == 1
+            assert metrics.get_counter(METRIC_REQUESTS, LOGINS) == 1
+            resaved = store.load(USERNAME, DEFAULT_API_HOST)
+            assert resaved is not None and resaved.cookies != saved.cookies
+            await pulses[2].async_logout()
+        finally:
+            for transport in transports:
+                await transport.close()
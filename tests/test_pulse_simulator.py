@@ -0,0 +1,154 @@
+"""Test the Pulse portal simulator end to end."""
+
+import asyncio
+
+import pytest
+
+from pyadtpulse.const import ADT_LOGIN_URI, ADT_SYNC_CHECK_URI
+from pyadtpulse.exceptions import (
+    PulseAccountLockedError,
+    PulseAuthenticationError,
+    PulseGatewayOfflineError,
+    PulseServiceTemporarilyUnavailableError,
+)
+from pyadtpulse.pulse_events import ZoneStateChanged
+from pyadtpulse.pulse_simulator import (
+    ALARM_ARMED_AWAY,
+    ALARM_ARMED_STAY,
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+USERNAMES = ["a@example.com", "b@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_simulator_login_and_update():
+    """Test logging in, seeing zone and alarm changes and arming."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD, zone_count=12, site_name="Home")
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        try:
+            await p.async_login()
+            assert p.site.name == "Home"
+            assert len(p.site.zones_as_dict) == 12
+            assert p.site.alarm_control_panel.is_disarmed
+            p.site.gateway.poll_interval = 0.1
+            simulator.apply_event(PulseSimulatedEvent(0, USERNAME, 11, "Open"))
+            _, zones = await asyncio.wait_for(p.wait_for_update(), 10)
+            assert zones == {11}
+            assert p.site.zones_as_dict[11].state == "Open"
+            simulator.apply_event(
+                PulseSimulatedEvent(0, USERNAME, alarm_status=ALARM_ARMED_STAY)
+            )
+            alarm_changed, _ = await asyncio.wait_for(p.wait_for_update(), 10)
+            assert alarm_changed
+            assert p.site.alarm_control_panel.is_home
+            assert await p.site.async_disarm()
+            assert simulator.get_account(USERNAME).alarm_status == "Disarmed"
+            await p.async_logout()
+        finally:
+            await t.close()
+        assert simulator.request_counts[ADT_LOGIN_URI] >= 2
+        assert simulator.request_counts[ADT_SYNC_CHECK_URI] >= 2
+
+
+@pytest.mark.asyncio
+async def test_simulator_login_errors():
+    """Test failed logins, lockouts and the service being unavailable."""
+    async with PulseSimulator(lockout_threshold=2) as simulator:
+        simulator.add_account(USERNAME, PASSWORD)
+        t = PulseSimulatorTransport(simulator.base_url)
+        try:
+            p = PyADTPulseAsync(USERNAME, "wrong", FINGERPRINT, transport=t)
+            with pytest.raises(PulseAuthenticationError):
+                await p.async_login()
+            assert simulator.get_account(USERNAME).failed_logins == 1
+            simulator.lock_account(USERNAME)
+            p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+            with pytest.raises(PulseAccountLockedError):
+                await p.async_login()
+            simulator.get_account(USERNAME).locked_until = 0.0
+            simulator.set_unavailable(60)
+            p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+            with pytest.raises(PulseServiceTemporarilyUnavailableError):
+                await p.async_login()
+        finally:
+            await t.close()
+
+
+@pytest.mark.asyncio
+async def test_simulator_gateway_offline_and_accounts():
+    """Test a gateway going offline and accounts being kept apart."""
+    async with PulseSimulator() as simulator:
+        events = PulseSimulator.generate_events(USERNAMES, 20, 0.0, seed=1)
+        assert len(events) == 20
+        assert {e.username for e in events} == set(USERNAMES)
+        for username in USERNAMES:
+            simulator.add_account(username, PASSWORD, zone_count=2)
+        transports = [PulseSimulatorTransport(simulator.base_url) for _ in range(2)]
+        clients = [
+            PyADTPulseAsync(username, PASSWORD, FINGERPRINT, transport=t)
+            for username, t in zip(USERNAMES, transports, strict=True)
+        ]
+        try:
+            await asyncio.gather(*(p.async_login() for p in clients))
+            assert [p.site.id for p in clients] == [
+                a.site_id for a in simulator.accounts
+            ]
+            clients[0].site.gateway.poll_interval = 0.1
+            simulator.apply_event(
+                PulseSimulatedEvent(0, USERNAMES[0], gateway_online=False)
+            )
+            with pytest.raises(PulseGatewayOfflineError):
+                await asyncio.wait_for(clients[0].wait_for_update(), 10)
+            assert not clients[0].site.gateway.is_online
+            assert clients[1].site.gateway.is_online
+            for p in clients:
+                await p.async_logout()
+        finally:
+            for t in transports:
+                await t.close()
+
+
+@pytest.mark.asyncio
+async def test_simulator_multiple_sites():
+    """Test an account with several sites."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD, zone_count=2, site_name="Home")
+        cabin = simulator.add_site(USERNAME, zone_count=3, site_name="Cabin")
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        events = p.events()
+        try:
+            await p.async_login()
+            assert [site.name for site in p.sites] == ["Home", "Cabin"]
+            assert p.site.name == "Home"
+            site = p.get_site(cabin.site_id)
+            assert len(site.zones_as_dict) == 3
+            assert len(p.site.zones_as_dict) == 2
+            with pytest.raises(KeyError):
+                p.get_site("unknown")
+            for s in p.sites:
+                s.gateway.poll_interval = 0.1
+            simulator.apply_event(
+                PulseSimulatedEvent(0, USERNAME, 12, "Open", site_id=cabin.site_id)
+            )
+            event = await asyncio.wait_for(anext(events), 10)
+            while not isinstance(event, ZoneStateChanged):
+                event = await asyncio.wait_for(anext(events), 10)
+            assert (event.site_id, event.zone_id) == (cabin.site_id, 12)
+            assert site.zones_as_dict[12].state == "Open"
+            assert await site.async_arm_away()
+            assert cabin.alarm_status == ALARM_ARMED_AWAY
+            assert simulator.get_account(USERNAME).alarm_status == "Disarmed"
+        finally:
+            await events.aclose()
+            await p.async_logout()
+            await t.close()
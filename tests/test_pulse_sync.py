@@ -0,0 +1,214 @@
+"""Test the synchronous PyADTPulse lifecycle."""
+
+import asyncio
+import threading
+from time import sleep, monotonic
+from queue import Queue
+from collections.abc import Generator
+
+import pytest
+
+from pyadtpulse import PyADTPulse, pyadtpulse_async
+from pyadtpulse.exceptions import PulseAuthenticationError
+from pyadtpulse.pulse_events import ZoneStateChanged
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pulse_loop_runner import PulseLoopRunner
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+@pytest.fixture
+def simulator() -> Generator[PulseSimulator]:
+    """Run a simulator on its own thread, as sync callers have no event loop."""
+    sim = PulseSimulator()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(sim.start(), loop).result(10)
+    sim.add_account(USERNAME, PASSWORD)
+    yield sim
+    asyncio.run_coroutine_threadsafe(sim.stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+
+def make_pulse(simulator: PulseSimulator, password: str = PASSWORD) -> PyADTPulse:
+    """Return a sync PyADTPulse object talking to the simulator."""
+    with pytest.deprecated_call():
+        p = PyADTPulse(USERNAME, password, FINGERPRINT, do_login=False)
+    p._pulse_connection_properties.transport = PulseSimulatorTransport(
+        simulator.base_url
+    )
+    return p
+
+
+def test_sync_login_logout(simulator):
+    """Test sync login and logout return as soon as the work is done."""
+    p = make_pulse(simulator)
+    start = monotonic()
+    p.login()
+    assert monotonic() - start < 1.0
+    assert p.is_connected
+    assert p.loop is not None
+    thread = p._session_thread
+    assert thread is not None and thread.is_alive()
+    start = monotonic()
+    p.logout()
+    assert monotonic() - start < 1.0
+    assert not thread.is_alive()
+    assert p.loop is None
+    assert p._session_thread is None
+    # a logged out session can log in again
+    p.login()
+    assert p.is_connected
+    p.logout()
+
+
+def test_sync_keepalive_relogin(simulator, monkeypatch):
+    """Test a keepalive full relogin leaves callbacks and monitoring running."""
+    monkeypatch.setattr(pyadtpulse_async, "FULL_LOGOUT_INTERVAL", 0)
+    p = make_pulse(simulator)
+    received: Queue = Queue()
+    p.register_callback(received.put)
+    # intervals below the setters' minimums, in minutes
+    p._pulse_properties._keepalive_interval = 0.005
+    p._pulse_properties._relogin_interval = 0.005
+    p.login()
+    try:
+        loop_monitor = p.start_loop_monitor()
+        login_time = p._authentication_properties.last_login_time
+        deadline = monotonic() + 10
+        while p._authentication_properties.last_login_time == login_time:
+            assert monotonic() < deadline
+            sleep(0.1)
+        p._pulse_properties._relogin_interval = 0
+        assert p.is_connected
+        assert p.loop_monitor is loop_monitor
+        callback_task = p._callback_task
+        assert callback_task is not None and not callback_task.done()
+        while not received.empty():
+            received.get()
+        p.site.gateway.poll_interval = 0.1
+        simulator.apply_event(PulseSimulatedEvent(0, USERNAME, 10, "Open"))
+        event = received.get(timeout=10)
+        while not isinstance(event, ZoneStateChanged):
+            event = received.get(timeout=10)
+        assert event.zone_id == 10
+    finally:
+        p.logout()
+    assert p.loop_monitor is None
+    assert p._callback_task is None
+
+
+def test_sync_arm_wakes_sync_check(simulator):
+    """Test arming from a sync caller cuts short a stretched sync check wait."""
+    p = make_pulse(simulator)
+    p.login()
+    try:
+        scheduler = p.site.sync_scheduler
+        # stretch every wait to the idle SLO straight away
+        scheduler._active_until = 0.0
+        scheduler._idle_after = 0.0
+        scheduler._idle_growth = 1000.0
+        scheduler._idle_slo = 30.0
+        p.site.gateway.poll_interval = 0.1
+        # sync check polling starts on first use
+        _ = p.updates_exist
+        deadline = monotonic() + 10
+        while not scheduler._stretched:
+            assert monotonic() < deadline
+            sleep(0.05)
+        poll_count = scheduler.poll_count
+        start = monotonic()
+        assert p.site.arm_away()
+        assert scheduler.is_active
+        while scheduler.poll_count == poll_count:
+            assert monotonic() - start < 5
+            sleep(0.05)
+    finally:
+        p.logout()
+
+
+def test_sync_login_failure(simulator):
+    """Test a failed sync login raises without waiting and stops the thread."""
+    p = make_pulse(simulator, "wrong")
+    start = monotonic()
+    with pytest.raises(PulseAuthenticationError):
+        p.login()
+    assert monotonic() - start < 1.0
+    assert p._session_thread is None
+    assert p.loop is None
+    with pytest.raises(RuntimeError):
+        p.logout()
+
+
+def test_loop_runner_balancing():
+    """Test sessions are spread over the runner's loops."""
+    with pytest.raises(ValueError):
+        PulseLoopRunner(0)
+    with PulseLoopRunner(2) as runner:
+        first = runner.acquire()
+        second = runner.acquire()
+        assert first is not second
+        assert runner.acquire() in (first, second)
+        runner.release(first)
+        runner.release(first)
+        assert runner.acquire() is first
+        assert len(runner.loops) == 2
+        assert runner.session_count == 2
+    assert not runner.loops
+    with pytest.raises(RuntimeError):
+        runner.acquire()
+
+
+def test_loop_runner_sessions(simulator):
+    """Test many sync sessions sharing a few event loops."""
+    usernames = [f"user{i}@example.com" for i in range(6)]
+    for username in usernames:
+        simulator.add_account(username, PASSWORD)
+    threads_before = threading.active_count()
+    with PulseLoopRunner(2) as runner:
+        pulses = []
+        for username in usernames:
+            with pytest.deprecated_call():
+                p = PyADTPulse(
+                    username,
+                    PASSWORD,
+                    FINGERPRINT,
+                    do_login=False,
+                    loop_runner=runner,
+                )
+            p._pulse_connection_properties.transport = PulseSimulatorTransport(
+                simulator.base_url
+            )
+            p.login()
+            assert p.is_connected
+            assert p.loop in runner.loops
+            assert p._session_thread is None
+            pulses.append(p)
+        assert runner.session_count == len(usernames)
+        assert threading.active_count() - threads_before == 2
+        assert pulses[0].update()
+        for p in pulses:
+            p.logout()
+            assert p.loop is None
+        assert runner.session_count == 0
+        # a failed login releases its loop
+        with pytest.deprecated_call():
+            p = PyADTPulse(
+                USERNAME, "wrong", FINGERPRINT, do_login=False, loop_runner=runner
+            )
+        p._pulse_connection_properties.transport = PulseSimulatorTransport(
+            simulator.base_url
+        )
+        with pytest.raises(PulseAuthenticationError):
+            p.login()
+        assert runner.session_count == 0
+    assert threading.active_count() == threads_before
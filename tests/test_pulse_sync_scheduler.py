@@ -0,0 +1,188 @@
+"""Test Pulse adaptive sync check scheduler."""
+
+import asyncio
+import threading
+from time import perf_counter
+
+import pytest
+
+from pyadtpulse.const import ADT_ORB_URI
+from pyadtpulse.pulse_metrics import (
+    METRIC_SYNC_CHECK_RATE,
+    METRIC_SYNC_CHECK_INTERVAL,
+    PulseMetrics,
+)
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_sync_scheduler import PulseSyncCheckScheduler
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+def test_sync_check_intervals():
+    """Test shortening and stretching the poll interval."""
+    metrics = PulseMetrics()
+    s = PulseSyncCheckScheduler(
+        active_slo=0.5,
+        idle_slo=8.0,
+        active_window=30.0,
+        idle_after=60.0,
+        idle_growth=2.0,
+        metrics=metrics,
+        site_id="site123",
+    )
+    s.record_activity(now=1000.0)
+    assert s.next_interval(2.0, now=1010.0) == 0.5
+    site = {"site": "site123"}
+    assert metrics.get_gauge(METRIC_SYNC_CHECK_INTERVAL, site) == 0.5
+    assert metrics.get_gauge(METRIC_SYNC_CHECK_INTERVAL) is None
+    # base interval after the active window
+    assert s.next_interval(2.0, now=1040.0) == 2.0
+    # arming or disarming
+    assert s.next_interval(2.0, urgent=True, now=1040.0) == 0.5
+    # stretched while idle, up to the idle SLO
+    assert [s.next_interval(2.0, now=1060.0 + i) for i in range(4)] == [
+        2.0,
+        4.0,
+        8.0,
+        8.0,
+    ]
+    # a base interval longer than the idle SLO is never shortened
+    assert s.next_interval(20.0, now=1100.0) == 20.0
+    s.record_activity(now=1100.0)
+    assert s.next_interval(2.0, now=1100.0) == 0.5
+    assert s.interval == 0.5
+    with pytest.raises(ValueError):
+        PulseSyncCheckScheduler(active_slo=5.0, idle_slo=1.0)
+    with pytest.raises(ValueError):
+        PulseSyncCheckScheduler(idle_growth=0.5)
+
+
+def test_sync_check_rate():
+    """Test measuring the sync check request rate."""
+    metrics = PulseMetrics()
+    s = PulseSyncCheckScheduler(rate_window=10.0, metrics=metrics, site_id="1")
+    start = s._started
+    for i in range(20):
+        s.record_poll(now=start + i * 0.5)
+    assert s.poll_count == 20
+    assert s.request_rate(now=start + 10.0) == pytest.approx(1.9)
+    rate = metrics.get_gauge(METRIC_SYNC_CHECK_RATE, {"site": "1"})
+    assert rate == pytest.approx(2.0, rel=0.1)
+    # old polls fall out of the window
+    assert s.request_rate(now=start + 15.0) == pytest.approx(0.9)
+    assert s.request_rate(now=start + 30.0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_sync_check_wake():
+    """Test waking a stretched wait."""
+    s = PulseSyncCheckScheduler(idle_after=0.0, idle_slo=30.0, idle_growth=10.0)
+    s.next_interval(0.1)
+    interval = s.next_interval(0.1)
+    assert interval == pytest.approx(1.0)
+    start = perf_counter()
+    task = asyncio.create_task(s.sleep(interval))
+    await asyncio.sleep(0.1)
+    s.wake()
+    await task
+    assert perf_counter() - start < 0.5
+    # a wake before the wait ends the next stretched wait immediately
+    s.wake()
+    start = perf_counter()
+    await s.sleep(interval)
+    assert perf_counter() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_sync_check_wake_threadsafe():
+    """Test waking a stretched wait from another thread."""
+    s = PulseSyncCheckScheduler(idle_after=0.0, idle_slo=30.0, idle_growth=1000.0)
+    s.next_interval(0.1)
+    interval = s.next_interval(0.1)
+    assert interval == pytest.approx(30.0)
+    # debug mode raises on loop calls made from other threads
+    asyncio.get_running_loop().set_debug(True)
+    errors: list[Exception] = []
+
+    def wake() -> None:
+        try:
+            s.wake()
+        except RuntimeError as e:
+            errors.append(e)
+
+    start = perf_counter()
+    task = asyncio.create_task(s.sleep(interval))
+    await asyncio.sleep(0.1)
+    thread = threading.Thread(target=wake)
+    thread.start()
+    thread.join()
+    await asyncio.wait_for(task, 5)
+    assert not errors
+    assert perf_counter() - start < 1.0
+
+
+def test_coalesce_window():
+    """Test the window an orb fetch is delayed by during a burst."""
+    s = PulseSyncCheckScheduler(coalesce_window=0.15)
+    assert s.coalesce_delay(now=100.0) == 0.0
+    assert not s.burst_expired(now=100.0)
+    s.start_burst(now=100.0)
+    # later changes in the burst don't extend the window
+    s.start_burst(now=100.1)
+    assert s.coalesce_delay(now=100.05) == pytest.approx(0.1)
+    assert not s.burst_expired(now=100.1)
+    assert s.burst_expired(now=100.15)
+    assert s.coalesce_delay(now=101.0) == 0.0
+    s.end_burst()
+    assert not s.burst_expired(now=101.0)
+    with pytest.raises(ValueError):
+        s.coalesce_window = -1.0
+
+
+def test_coalesce_window_disabled():
+    """Test a window of 0 fetching without delay once the token settles."""
+    s = PulseSyncCheckScheduler(coalesce_window=0.0)
+    s.start_burst(now=100.0)
+    assert s.coalesce_delay(now=100.0) == 0.0
+    # the fetch waits for the token to settle, however long that takes
+    assert not s.burst_expired(now=100.0)
+    assert not s.burst_expired(now=1000.0)
+    s.end_burst()
+    # changing the window doesn't affect a burst already started
+    s.coalesce_window = 0.15
+    s.start_burst(now=1000.0)
+    s.coalesce_window = 0.0
+    assert s.burst_expired(now=1000.15)
+
+
+@pytest.mark.asyncio
+async def test_burst_single_fetch():
+    """Test a burst of changes being picked up by one orb fetch."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD)
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        try:
+            subscription = p.subscribe()
+            await p.async_login()
+            p.site.gateway.poll_interval = 0.1
+            p.site.sync_scheduler.coalesce_window = 0.5
+            while p.site.sync_scheduler.poll_count < 2:
+                await asyncio.sleep(0.05)
+            for zone in (10, 11, 12):
+                simulator.apply_event(PulseSimulatedEvent(0, USERNAME, zone, "Open"))
+                await asyncio.sleep(0.1)
+            update = await asyncio.wait_for(subscription.get(), 10)
+            assert {10, 11, 12} <= update.zones
+            assert simulator.request_counts[ADT_ORB_URI] == 1
+            subscription.close()
+        finally:
+            await p.async_logout()
+            await t.close()
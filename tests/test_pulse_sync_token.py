@@ -0,0 +1,86 @@
+"""Test Pulse sync check token tracking."""
+
+import asyncio
+
+import pytest
+
+from pyadtpulse.const import ADT_ORB_URI
+from pyadtpulse.pulse_events import ZoneStateChanged
+from pyadtpulse.pulse_metrics import METRIC_SYNC_TOKEN_RESULTS, PulseMetrics
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pulse_sync_token import (
+    RESULT_FALSE_NEGATIVE,
+    RESULT_FALSE_POSITIVE,
+    PulseSyncToken,
+    PulseSyncTokenTracker,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+def test_sync_token_tracker():
+    """Test deciding when tokens signal updates and scoring orb fetches."""
+    assert PulseSyncToken.parse("Not a token") is None
+    token = PulseSyncToken.parse("234532-456432-0")
+    assert token == PulseSyncToken(234532, 456432, 0)
+    assert str(token) == "234532-456432-0"
+    assert not token.is_transient
+    assert PulseSyncToken.parse("1-0-0").is_transient
+
+    metrics = PulseMetrics()
+    tracker = PulseSyncTokenTracker(metrics=metrics)
+    # the first stable token has nothing to compare with
+    assert not tracker.observe(token)
+    assert not tracker.observe(PulseSyncToken(234532, 456432, 5))
+    assert tracker.observe(PulseSyncToken(1, 0, 0))
+    assert tracker.observe(PulseSyncToken(234533, 456432, 0))
+    tracker.record_orb_fetch(changed=True)
+    # a stable token advancing without a transient one still signals updates
+    assert tracker.observe(PulseSyncToken(234534, 456432, 0))
+    assert tracker.stable_token == PulseSyncToken(234534, 456432, 0)
+    tracker.record_orb_fetch(changed=False)
+    assert not tracker.observe(PulseSyncToken(234534, 456432, 0))
+    tracker.record_orb_fetch(changed=True)
+    tracker.record_orb_fetch(changed=False)
+    assert (tracker.false_positives, tracker.false_negatives) == (1, 1)
+    assert tracker.false_positive_rate == 0.5
+    assert tracker.false_negative_rate == 0.5
+    for result in (RESULT_FALSE_POSITIVE, RESULT_FALSE_NEGATIVE):
+        assert metrics.get_counter(METRIC_SYNC_TOKEN_RESULTS, {"result": result}) == 1
+
+
+@pytest.mark.asyncio
+async def test_stable_token_advance():
+    """Test fetching the orb only when the stable token advances."""
+    async with PulseSimulator(transient_polls=0) as simulator:
+        simulator.add_account(USERNAME, PASSWORD)
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        events = p.events()
+        try:
+            await p.async_login()
+            p.site.gateway.poll_interval = 0.1
+            tracker = p.site.sync_tokens
+            while tracker.stable_token is None:
+                await asyncio.sleep(0.1)
+            await asyncio.sleep(0.5)
+            # nothing changed, so the orb wasn't fetched
+            assert ADT_ORB_URI not in simulator.request_counts
+            simulator.apply_event(PulseSimulatedEvent(0, USERNAME, 10, "Open"))
+            event = await asyncio.wait_for(anext(events), 10)
+            while not isinstance(event, ZoneStateChanged):
+                event = await asyncio.wait_for(anext(events), 10)
+            assert event.zone_id == 10
+            assert simulator.request_counts[ADT_ORB_URI] == 1
+            assert tracker.false_positives == tracker.false_negatives == 0
+        finally:
+            await events.aclose()
+            await p.async_logout()
+            await t.close()
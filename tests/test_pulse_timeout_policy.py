@@ -0,0 +1,79 @@
+"""Test Pulse adaptive request timeouts."""
+
+import pytest
+
+from pyadtpulse.const import ADT_ORB_URI, ADT_GATEWAY_URI
+from pyadtpulse.exceptions import PulseServerConnectionError
+from pyadtpulse.pulse_replay import PulseReplayEntry, PulseReplayTransport
+from pyadtpulse.pulse_metrics import METRIC_REQUEST_TIMEOUT
+from pyadtpulse.pulse_query_manager import PulseQueryManager
+from pyadtpulse.pulse_timeout_policy import (
+    DEFAULT_QUERY_TIMEOUT,
+    PulseTimeoutPolicy,
+)
+from pyadtpulse.pulse_connection_status import PulseConnectionStatus
+from pyadtpulse.pulse_connection_properties import PulseConnectionProperties
+
+
+def test_timeout_policy():
+    """Test deriving timeouts from latency percentiles."""
+    policy = PulseTimeoutPolicy(min_samples=5, window=10, floor=0.5, cap=10.0)
+    assert policy.get_timeout("gateway") == 10.0
+    assert policy.get_timeout("sync_check") == DEFAULT_QUERY_TIMEOUT
+    for _ in range(4):
+        policy.observe("sync_check", 0.1)
+    assert policy.get_timeout("sync_check") == DEFAULT_QUERY_TIMEOUT
+    policy.observe("sync_check", 0.4)
+    # p99 of 5 samples is the largest one
+    assert policy.get_timeout("sync_check") == pytest.approx(1.2)
+    # window only keeps the last 10 samples
+    for _ in range(10):
+        policy.observe("sync_check", 0.1)
+    assert policy.get_timeout("sync_check") == 0.5
+    for _ in range(10):
+        policy.observe("sync_check", 5.0)
+    assert policy.get_timeout("sync_check") == 10.0
+    assert policy.snapshot() == {"sync_check": 10.0}
+    policy.reset()
+    assert policy.get_timeout("sync_check") == DEFAULT_QUERY_TIMEOUT
+    with pytest.raises(ValueError):
+        PulseTimeoutPolicy(floor=2.0, cap=1.0)
+    with pytest.raises(ValueError):
+        PulseTimeoutPolicy(min_samples=20, window=10)
+    with pytest.raises(ValueError):
+        PulseTimeoutPolicy(percentile=0)
+
+
+@pytest.mark.asyncio
+async def test_query_timeouts(
+    get_mocked_connection_properties: PulseConnectionProperties, mock_sleep
+):
+    """Test queries using and adapting policy timeouts."""
+    s = PulseConnectionStatus()
+    cp = get_mocked_connection_properties
+    t = PulseReplayTransport()
+    cp.transport = t
+    policy = PulseTimeoutPolicy(min_samples=1, window=10)
+    p = PulseQueryManager(s, cp, timeout_policy=policy)
+    assert p.timeout_policy is policy
+    s.authenticated_flag.set()
+    t.add("GET", ADT_GATEWAY_URI, PulseReplayEntry(latency=5.0))
+    await p.async_query(ADT_GATEWAY_URI)
+    assert p.metrics.get_gauge(METRIC_REQUEST_TIMEOUT, {"endpoint": "gateway"}) == 10
+    # latency is only simulated, so the observed latency is tiny
+    assert policy.get_timeout("gateway") == policy.floor
+    for _ in range(3):
+        t.add("GET", ADT_ORB_URI, PulseReplayEntry(latency=2.0))
+    with pytest.raises(PulseServerConnectionError):
+        await p.async_query(ADT_ORB_URI)
+    # timed out requests raise the timeout
+    assert policy.get_timeout("orb") == 3.0
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(latency=2.0))
+    s.get_backoff().reset_backoff()
+    code, _, _ = await p.async_query(ADT_ORB_URI)
+    assert code == 200
+    assert p.metrics.get_gauge(METRIC_REQUEST_TIMEOUT, {"endpoint": "orb"}) == 3.0
+    t.add("GET", ADT_ORB_URI, PulseReplayEntry(latency=2.0))
+    with pytest.raises(PulseServerConnectionError):
+        await p.async_query(ADT_ORB_URI, timeout=0.5)
+    assert t.request_count("GET", ADT_ORB_URI) == 6
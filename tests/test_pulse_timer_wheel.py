@@ -0,0 +1,92 @@
+"""Test the Pulse timer wheel."""
+
+import asyncio
+from random import Random
+
+import pytest
+
+from pyadtpulse.pulse_timer_wheel import (
+    MAX_TICKS,
+    PulseTimerWheel,
+    jittered,
+    get_timer_wheel,
+)
+
+
+def test_jittered():
+    """Test jitter only ever shortens a delay."""
+    assert jittered(10.0, 0.0) == 10.0
+    for _ in range(100):
+        assert 7.5 <= jittered(10.0, 2.5) <= 10.0
+    assert 0.0 <= jittered(1.0, 5.0) <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel_fires_in_order():
+    """Test timers on every level fire on time and cancelled ones don't."""
+    with pytest.raises(ValueError):
+        PulseTimerWheel(resolution=0)
+    loop = asyncio.get_running_loop()
+    wheel = PulseTimerWheel(resolution=0.01)
+    rand = Random(42)
+    # first level covers 0.64 seconds, the second 40.96
+    delays = [rand.uniform(0, 1.5) for _ in range(200)] + [0.0, 0.64, 0.65]
+    fired: list[tuple[float, float]] = []
+    timers = []
+    start = loop.time()
+    for delay in delays:
+        timers.append(
+            wheel.call_later(
+                delay,
+                lambda delay=delay: fired.append((delay, loop.time() - start)),
+                name=f"timer {delay}",
+            )
+        )
+    for timer in timers[::4]:
+        timer.cancel()
+    assert all(timer.cancelled for timer in timers[::4])
+    assert len(wheel) == len(delays) - len(timers[::4])
+    upcoming = wheel.upcoming(5)
+    assert len(upcoming) == 5
+    assert [timer.when for timer in upcoming] == sorted(
+        timer.when for timer in upcoming
+    )
+    await asyncio.sleep(1.7)
+    assert len(fired) == len(delays) - len(timers[::4])
+    for delay, elapsed in fired:
+        assert delay <= elapsed < delay + 0.1
+    assert len(wheel) == 0
+    assert wheel.upcoming() == []
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel_far_timers():
+    """Test timers beyond the top level wait there until due."""
+    loop = asyncio.get_running_loop()
+    # a tiny resolution puts 0.5 seconds past the top level
+    resolution = 0.2 / MAX_TICKS
+    wheel = PulseTimerWheel(resolution=resolution)
+    fired: list[float] = []
+    start = loop.time()
+    wheel.call_later(0.5, lambda: fired.append(loop.time() - start))
+    await asyncio.sleep(0.7)
+    assert len(fired) == 1
+    assert fired[0] == pytest.approx(0.5, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel_sleep():
+    """Test sleeping on the shared wheel."""
+    wheel = get_timer_wheel()
+    assert get_timer_wheel(asyncio.get_running_loop()) is wheel
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await wheel.sleep(0.2, name="sleeper")
+    assert loop.time() - start == pytest.approx(0.2, abs=0.1)
+    task = asyncio.create_task(wheel.sleep(10.0, name="sleeper"))
+    await asyncio.sleep(0.1)
+    assert [timer.name for timer in wheel.upcoming()] == ["sleeper"]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert len(wheel) == 0
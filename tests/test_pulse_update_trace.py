@@ -0,0 +1,124 @@
+"""Test Pulse update pipeline latency tracing."""
+
+import asyncio
+
+import pytest
+
+from pyadtpulse.pulse_metrics import (
+    METRIC_UPDATE_LATENCY,
+    METRIC_UPDATE_STAGE_LATENCY,
+    PulseMetrics,
+)
+from pyadtpulse.pulse_simulator import (
+    PulseSimulator,
+    PulseSimulatedEvent,
+    PulseSimulatorTransport,
+)
+from pyadtpulse.pyadtpulse_async import PyADTPulseAsync
+from pyadtpulse.pulse_update_trace import (
+    STAGE_APPLIED,
+    UPDATE_STAGES,
+    STAGE_DELIVERED,
+    STAGE_SIGNALLED,
+    STAGE_ORB_PARSED,
+    STAGE_ORB_REQUEST,
+    STAGE_TOKEN_CHANGED,
+    PulseUpdateTrace,
+)
+
+USERNAME = "testuser@example.com"
+PASSWORD = "testpassword"
+FINGERPRINT = "testfingerprint"
+
+
+def test_update_trace():
+    """Test recording stage and total latencies."""
+    metrics = PulseMetrics()
+    trace = PulseUpdateTrace(metrics, started=10.0)
+    for stage, now in (
+        (STAGE_TOKEN_CHANGED, 10.2),
+        (STAGE_ORB_REQUEST, 10.35),
+        (STAGE_ORB_PARSED, 10.85),
+        (STAGE_APPLIED, 10.9),
+        (STAGE_SIGNALLED, 10.9),
+    ):
+        trace.mark(stage, now)
+    assert not trace.reached(STAGE_DELIVERED)
+    assert trace.mark(STAGE_DELIVERED, 11.5) == pytest.approx(0.6)
+    assert trace.stage_latencies[STAGE_ORB_PARSED] == pytest.approx(0.5)
+    assert trace.total_latency == pytest.approx(1.5)
+    histogram = metrics.get_histogram(
+        METRIC_UPDATE_STAGE_LATENCY, {"stage": STAGE_TOKEN_CHANGED}
+    )
+    assert histogram.count == 1
+    assert histogram.sum == pytest.approx(0.2)
+    for stage, total in ((STAGE_SIGNALLED, 0.9), (STAGE_DELIVERED, 1.5)):
+        histogram = metrics.get_histogram(METRIC_UPDATE_LATENCY, {"stage": stage})
+        assert histogram.sum == pytest.approx(total)
+    with pytest.raises(ValueError):
+        trace.mark("bogus")
+
+
+@pytest.mark.asyncio
+async def test_update_latency_metrics():
+    """Test every stage of an update from Pulse being timed."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD)
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        try:
+            await p.async_login()
+            p.site.gateway.poll_interval = 0.1
+            task = asyncio.create_task(p.wait_for_update())
+            await asyncio.sleep(0)
+            simulator.apply_event(PulseSimulatedEvent(0, USERNAME, 10, "Open"))
+            assert (await asyncio.wait_for(task, 10))[1] == {10}
+            for stage in UPDATE_STAGES:
+                histogram = p.metrics.get_histogram(
+                    METRIC_UPDATE_STAGE_LATENCY, {"stage": stage}
+                )
+                assert histogram is not None
+                assert histogram.count == 1
+            total = p.metrics.get_histogram(
+                METRIC_UPDATE_LATENCY, {"stage": STAGE_DELIVERED}
+            )
+            assert 0 < total.sum < 10
+        finally:
+            await p.async_logout()
+            await t.close()
+
+
+@pytest.mark.asyncio
+async def test_update_traces_by_site():
+    """Test updates at several sites at once are each traced."""
+    async with PulseSimulator() as simulator:
+        simulator.add_account(USERNAME, PASSWORD, zone_count=1)
+        site_ids = [
+            simulator.get_account(USERNAME).site_id,
+            simulator.add_site(USERNAME, zone_count=1).site_id,
+        ]
+        t = PulseSimulatorTransport(simulator.base_url)
+        p = PyADTPulseAsync(USERNAME, PASSWORD, FINGERPRINT, transport=t)
+        try:
+            await p.async_login()
+            for site in p.sites:
+                site.gateway.poll_interval = 0.1
+            task = asyncio.create_task(p.wait_for_update())
+            await asyncio.sleep(0.05)
+            assert set(p._sync_check_sleeping) == set(site_ids)
+            for site_id in site_ids:
+                simulator.apply_event(
+                    PulseSimulatedEvent(0, USERNAME, 10, "Open", site_id=site_id)
+                )
+            await asyncio.wait_for(task, 10)
+            for _ in range(20):
+                applied = p.metrics.get_histogram(
+                    METRIC_UPDATE_STAGE_LATENCY, {"stage": STAGE_APPLIED}
+                )
+                if applied is not None and applied.count == len(site_ids):
+                    break
+                await asyncio.sleep(0.1)
+            assert applied is not None and applied.count == len(site_ids)
+        finally:
+            await p.async_logout()
+            await t.close()
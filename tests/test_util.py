@@ -0,0 +1,35 @@
+"""Test pyadtpulse utility functions."""
+
+import os
+from base64 import urlsafe_b64decode
+
+from pyadtpulse.util import (
+    FINGERPRINT_LENGTH,
+    ALLOWABLE_CHARACTERS,
+    generate_random_fingerprint,
+    generate_fingerprint_from_browser_json,
+)
+
+
+def test_generate_random_fingerprint():
+    """Test random fingerprints use the whole alphabet and differ."""
+    fingerprints = [generate_random_fingerprint() for _ in range(20)]
+    assert all(len(f) == FINGERPRINT_LENGTH for f in fingerprints)
+    assert set("".join(fingerprints)) == set(ALLOWABLE_CHARACTERS)
+    assert len(set(fingerprints)) == len(fingerprints)
+
+
+def test_generate_fingerprint_from_browser_json(tmp_path):
+    """Test browser JSON fingerprints are cached until the file changes."""
+    path = tmp_path / "browser.json"
+    path.write_text('{"userAgent": "test",\n  "screen": [1920, 1080]}')
+    fingerprint = generate_fingerprint_from_browser_json(str(path))
+    expected = b'{"userAgent":"test","screen":[1920,1080]}'
+    assert urlsafe_b64decode(fingerprint) == expected
+    assert generate_fingerprint_from_browser_json(str(path)) is fingerprint
+
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text('{"userAgent": "other",\n  "screen": [1920, 1080]}')
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    changed = generate_fingerprint_from_browser_json(str(path))
+    assert urlsafe_b64decode(changed).startswith(b'{"userAgent":"other"')